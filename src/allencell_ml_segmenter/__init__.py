@@ -1,13 +1,24 @@
 __version__ = "1.0.0rc0"
 
-from allencell_ml_segmenter.napari.napari_reader import napari_get_reader
-from allencell_ml_segmenter.napari.sample_data import make_sample_data
-from allencell_ml_segmenter.napari.napari_writer import (
-    write_multiple,
-    write_single_image,
-)
+import importlib
+from typing import Any
+
+# napari (and with it Qt) is only imported once one of these is accessed, so
+# that headless entry points such as prediction.batch_prediction can import
+# this package on machines without a display
+_EXPORTS: dict[str, str] = {
+    "napari_get_reader": "allencell_ml_segmenter.napari.napari_reader",
+    "write_single_image": "allencell_ml_segmenter.napari.napari_writer",
+    "write_multiple": "allencell_ml_segmenter.napari.napari_writer",
+    "make_sample_data": "allencell_ml_segmenter.napari.sample_data",
+    "MainWidget": "allencell_ml_segmenter.main.main_widget",
+}
+
 
-from allencell_ml_segmenter.main.main_widget import MainWidget
+def __getattr__(name: str) -> Any:
+    if name in _EXPORTS:
+        return getattr(importlib.import_module(_EXPORTS[name]), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 __all__ = (
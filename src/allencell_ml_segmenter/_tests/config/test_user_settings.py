@@ -1,5 +1,9 @@
 from allencell_ml_segmenter._tests.fakes.fake_qsettings import FakeQSettings
 
+from allencell_ml_segmenter.config.loader_settings import (
+    LoaderSettings,
+    get_machine_id,
+)
 from allencell_ml_segmenter.config.user_settings import UserSettings
 
 
@@ -13,3 +17,18 @@ def test_set_get_user_experiments_path():
 
     # Assert
     assert str(userSettings.get_user_experiments_path()) == "foo"
+
+
+def test_set_get_loader_settings():
+    # Arrange
+    settings = FakeQSettings()
+    userSettings = UserSettings(settings=settings)
+    loader_settings = LoaderSettings(
+        num_workers=2, num_threads=6, machine=get_machine_id()
+    )
+
+    # Act / Assert
+    assert userSettings.get_loader_settings() is None
+    userSettings.set_loader_settings(loader_settings)
+    assert userSettings.get_loader_settings() == loader_settings
+    assert userSettings.get_loader_settings().is_for_this_machine()
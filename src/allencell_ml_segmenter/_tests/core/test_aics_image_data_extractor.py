@@ -0,0 +1,132 @@
+from pathlib import Path
+
+import dask.array as da
+import numpy as np
+import pytest
+import tifffile
+
+import allencell_ml_segmenter
+from allencell_ml_segmenter.core.image_data_extractor import (
+    AICSImageDataExtractor,
+    ImageData,
+)
+
+IMG_PATH: Path = (
+    Path(allencell_ml_segmenter.__file__).parent
+    / "_tests"
+    / "test_files"
+    / "images"
+    / "test_3_channels.tiff"
+)
+
+
+def test_extract_image_metadata_ome_tiff() -> None:
+    # Act
+    img_data: (
+        ImageData
+    ) = AICSImageDataExtractor.global_instance().extract_image_metadata(
+        IMG_PATH
+    )
+
+    # Assert
+    assert img_data.dim_x == 2
+    assert img_data.dim_y == 2
+    assert img_data.dim_z == 2
+    assert img_data.channels == 3
+    assert img_data.np_data is None
+    assert img_data.path == IMG_PATH
+
+
+def test_extract_image_metadata_matches_full_extraction() -> None:
+    # Arrange
+    extractor = AICSImageDataExtractor.global_instance()
+
+    # Act
+    metadata: ImageData = extractor.extract_image_metadata(IMG_PATH)
+    full: ImageData = extractor.extract_image_data(IMG_PATH)
+
+    # Assert
+    assert (
+        metadata.dim_x,
+        metadata.dim_y,
+        metadata.dim_z,
+        metadata.channels,
+    ) == (full.dim_x, full.dim_y, full.dim_z, full.channels)
+
+
+def test_extract_image_data_no_np_data_uses_metadata() -> None:
+    # Act
+    img_data: (
+        ImageData
+    ) = AICSImageDataExtractor.global_instance().extract_image_data(
+        IMG_PATH, np_data=False
+    )
+
+    # Assert
+    assert img_data.channels == 3
+    assert img_data.np_data is None
+
+
+def test_extract_image_metadata_non_ome_tiff(tmp_path: Path) -> None:
+    # Arrange
+    img_path: Path = tmp_path / "plain.tiff"
+    tifffile.imwrite(img_path, np.zeros((4, 3), dtype=np.uint8))
+
+    # Act
+    img_data: (
+        ImageData
+    ) = AICSImageDataExtractor.global_instance().extract_image_metadata(
+        img_path
+    )
+
+    # Assert
+    assert img_data.dim_x == 3
+    assert img_data.dim_y == 4
+    assert img_data.channels == 1
+    assert img_data.np_data is None
+
+
+@pytest.fixture
+def seg_path(tmp_path: Path) -> Path:
+    path: Path = tmp_path / "seg.ome.tiff"
+    data: np.ndarray = np.zeros((2, 2, 4, 4), dtype=np.uint8)
+    data[1, :, 1:3, 1:3] = 7
+    tifffile.imwrite(
+        path,
+        data,
+        ome=True,
+        photometric="minisblack",
+        metadata={"axes": "ZCYX"},
+    )
+    return path
+
+
+def test_extract_image_data_lazy(seg_path: Path) -> None:
+    # Arrange
+    extractor = AICSImageDataExtractor.global_instance()
+
+    # Act
+    lazy: ImageData = extractor.extract_image_data(
+        seg_path, channel=1, lazy=True
+    )
+    eager: ImageData = extractor.extract_image_data(seg_path, channel=1)
+
+    # Assert
+    assert isinstance(lazy.np_data, da.Array)
+    assert isinstance(eager.np_data, np.ndarray)
+    assert lazy.channels == eager.channels == 2
+    assert np.array_equal(lazy.np_data.compute(), eager.np_data)
+
+
+def test_extract_image_data_lazy_seg(seg_path: Path) -> None:
+    # Act
+    img_data: ImageData = (
+        AICSImageDataExtractor.global_instance().extract_image_data(
+            seg_path, seg=2, lazy=True
+        )
+    )
+
+    # Assert
+    assert isinstance(img_data.np_data, da.Array)
+    computed: np.ndarray = img_data.np_data.compute()
+    assert set(np.unique(computed)) == {0, 2}
@@ -0,0 +1,155 @@
+import os
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from allencell_ml_segmenter.core.image_data_extractor import (
+    CachingImageDataExtractor,
+    FakeImageDataExtractor,
+    ImageData,
+)
+from allencell_ml_segmenter.core.image_data_extractor.caching_image_data_extractor import (
+    CacheStats,
+)
+
+# FakeImageDataExtractor always returns a 5x5 float64 array
+FAKE_IMG_BYTES: int = 5 * 5 * 8
+
+
+@pytest.fixture
+def img_paths(tmp_path: Path) -> list[Path]:
+    paths: list[Path] = []
+    for i in range(3):
+        path: Path = tmp_path / f"img_{i}.tiff"
+        path.write_bytes(b"0")
+        paths.append(path)
+    return paths
+
+
+def test_repeated_extraction_hits_cache(img_paths: list[Path]) -> None:
+    # Arrange
+    cache: CachingImageDataExtractor = CachingImageDataExtractor(
+        FakeImageDataExtractor.global_instance()
+    )
+
+    # Act
+    first: ImageData = cache.extract_image_data(img_paths[0])
+    second: ImageData = cache.extract_image_data(img_paths[0])
+
+    # Assert
+    stats: CacheStats = cache.get_stats()
+    assert stats.misses == 1
+    assert stats.hits == 1
+    assert stats.current_bytes == FAKE_IMG_BYTES
+    assert first.np_data is second.np_data
+
+
+def test_channel_and_seg_are_part_of_key(img_paths: list[Path]) -> None:
+    # Arrange
+    cache: CachingImageDataExtractor = CachingImageDataExtractor(
+        FakeImageDataExtractor.global_instance()
+    )
+
+    # Act
+    cache.extract_image_data(img_paths[0], channel=0)
+    cache.extract_image_data(img_paths[0], channel=1)
+    cache.extract_image_data(img_paths[0], channel=0, seg=1)
+
+    # Assert
+    assert cache.get_stats().misses == 3
+    assert cache.get_stats().hits == 0
+
+
+def test_modified_file_is_extracted_again(img_paths: list[Path]) -> None:
+    # Arrange
+    cache: CachingImageDataExtractor = CachingImageDataExtractor(
+        FakeImageDataExtractor.global_instance()
+    )
+    cache.extract_image_data(img_paths[0])
+
+    # Act
+    stat: os.stat_result = os.stat(img_paths[0])
+    os.utime(
+        img_paths[0], ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000)
+    )
+    cache.extract_image_data(img_paths[0])
+
+    # Assert
+    assert cache.get_stats().misses == 2
+
+
+def test_lru_eviction_respects_max_bytes(img_paths: list[Path]) -> None:
+    # Arrange
+    cache: CachingImageDataExtractor = CachingImageDataExtractor(
+        FakeImageDataExtractor.global_instance(),
+        max_bytes=2 * FAKE_IMG_BYTES,
+    )
+    cache.extract_image_data(img_paths[0])
+    cache.extract_image_data(img_paths[1])
+    # touch img 0 so that img 1 becomes least recently used
+    cache.extract_image_data(img_paths[0])
+
+    # Act
+    cache.extract_image_data(img_paths[2])
+
+    # Assert
+    stats: CacheStats = cache.get_stats()
+    assert stats.evictions == 1
+    assert stats.num_entries == 2
+    assert stats.current_bytes <= stats.max_bytes
+    cache.extract_image_data(img_paths[0])
+    assert cache.get_stats().hits == 2
+    cache.extract_image_data(img_paths[1])
+    assert cache.get_stats().misses == 4
+
+
+def test_set_max_bytes_evicts(img_paths: list[Path]) -> None:
+    # Arrange
+    cache: CachingImageDataExtractor = CachingImageDataExtractor(
+        FakeImageDataExtractor.global_instance()
+    )
+    for path in img_paths:
+        cache.extract_image_data(path)
+
+    # Act
+    cache.set_max_bytes(FAKE_IMG_BYTES)
+
+    # Assert
+    assert cache.get_stats().num_entries == 1
+    assert cache.get_stats().evictions == 2
+
+
+def test_cached_data_protected_from_callers(img_paths: list[Path]) -> None:
+    # Arrange
+    cache: CachingImageDataExtractor = CachingImageDataExtractor(
+        FakeImageDataExtractor.global_instance()
+    )
+
+    # Act
+    raw: ImageData = cache.extract_image_data(img_paths[0])
+    seg: ImageData = cache.extract_image_data(img_paths[1], seg=1)
+    seg_again: ImageData = cache.extract_image_data(img_paths[1], seg=1)
+
+    # Assert
+    assert raw.np_data is not None and not raw.np_data.flags.writeable
+    assert seg.np_data is not None and seg.np_data.flags.writeable
+    assert seg_again.np_data is not None
+    seg.np_data[0, 0] = 1
+    assert np.all(seg_again.np_data == 0)
+
+
+def test_dims_false_strips_dims(img_paths: list[Path]) -> None:
+    # Arrange
+    cache: CachingImageDataExtractor = CachingImageDataExtractor(
+        FakeImageDataExtractor.global_instance()
+    )
+    cache.extract_image_data(img_paths[0])
+
+    # Act
+    img_data: ImageData = cache.extract_image_data(img_paths[0], dims=False)
+
+    # Assert
+    assert img_data.channels is None
+    assert img_data.np_data is not None
+    assert cache.get_stats().hits == 1
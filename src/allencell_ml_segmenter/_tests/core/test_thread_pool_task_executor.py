@@ -0,0 +1,149 @@
+import threading
+from typing import List
+from unittest.mock import Mock
+
+from pytestqt.qtbot import QtBot
+
+from allencell_ml_segmenter.core.task_executor import (
+    ThreadPoolTaskExecutor,
+    TaskHandle,
+    TaskPriority,
+)
+
+
+def test_exec_calls_callbacks(qtbot: QtBot) -> None:
+    # Arrange
+    executor: ThreadPoolTaskExecutor = ThreadPoolTaskExecutor(max_workers=1)
+    on_start: Mock = Mock()
+    on_return: Mock = Mock()
+    on_finish: Mock = Mock()
+
+    # Act
+    executor.exec(
+        lambda: 5,
+        on_start=on_start,
+        on_return=on_return,
+        on_finish=on_finish,
+    )
+
+    # Assert
+    qtbot.waitUntil(lambda: on_finish.called)
+    on_start.assert_called_once()
+    on_return.assert_called_once_with(5)
+
+
+def test_exec_calls_on_error(qtbot: QtBot) -> None:
+    # Arrange
+    executor: ThreadPoolTaskExecutor = ThreadPoolTaskExecutor(max_workers=1)
+    err: ValueError = ValueError("bad")
+    on_error: Mock = Mock()
+    on_return: Mock = Mock()
+
+    def task() -> None:
+        raise err
+
+    # Act
+    executor.exec(task, on_return=on_return, on_error=on_error)
+
+    # Assert
+    qtbot.waitUntil(lambda: on_error.called)
+    on_error.assert_called_once_with(err)
+    on_return.assert_not_called()
+
+
+def test_queued_tasks_start_in_priority_order(qtbot: QtBot) -> None:
+    # Arrange
+    executor: ThreadPoolTaskExecutor = ThreadPoolTaskExecutor(max_workers=1)
+    release: threading.Event = threading.Event()
+    order: List[str] = []
+    # occupy the only worker so that the rest of the tasks are queued
+    executor.exec(lambda: release.wait(5))
+    executor.exec(
+        lambda: order.append("background"),
+        priority=TaskPriority.BACKGROUND,
+    )
+    executor.exec(
+        lambda: order.append("prefetch"), priority=TaskPriority.PREFETCH
+    )
+    executor.exec(
+        lambda: order.append("interactive"),
+        priority=TaskPriority.INTERACTIVE,
+    )
+
+    # Act
+    release.set()
+
+    # Assert
+    assert executor.wait_for_done(5000)
+    assert order == ["interactive", "prefetch", "background"]
+
+
+def test_cancel_queued_task(qtbot: QtBot) -> None:
+    # Arrange
+    executor: ThreadPoolTaskExecutor = ThreadPoolTaskExecutor(max_workers=1)
+    release: threading.Event = threading.Event()
+    task: Mock = Mock()
+    on_finish: Mock = Mock()
+    executor.exec(lambda: release.wait(5))
+    handle: TaskHandle = executor.exec(task, on_finish=on_finish)
+
+    # Act
+    handle.cancel()
+    release.set()
+
+    # Assert
+    assert executor.wait_for_done(5000)
+    qtbot.wait(50)
+    assert handle.is_cancelled()
+    task.assert_not_called()
+    on_finish.assert_not_called()
+
+
+def test_cancel_running_task_suppresses_callbacks(qtbot: QtBot) -> None:
+    # Arrange
+    executor: ThreadPoolTaskExecutor = ThreadPoolTaskExecutor(max_workers=1)
+    started: threading.Event = threading.Event()
+    release: threading.Event = threading.Event()
+    on_return: Mock = Mock()
+
+    def task() -> int:
+        started.set()
+        release.wait(5)
+        return 1
+
+    handle: TaskHandle = executor.exec(task, on_return=on_return)
+    assert started.wait(5)
+
+    # Act
+    handle.cancel()
+    release.set()
+
+    # Assert
+    assert executor.wait_for_done(5000)
+    qtbot.wait(50)
+    on_return.assert_not_called()
+
+
+def test_max_workers_is_respected(qtbot: QtBot) -> None:
+    # Arrange
+    executor: ThreadPoolTaskExecutor = ThreadPoolTaskExecutor(max_workers=2)
+    lock: threading.Lock = threading.Lock()
+    running: List[int] = [0]
+    peak: List[int] = [0]
+
+    def task() -> None:
+        with lock:
+            running[0] += 1
+            peak[0] = max(peak[0], running[0])
+        threading.Event().wait(0.02)
+        with lock:
+            running[0] -= 1
+
+    # Act
+    for _ in range(10):
+        executor.exec(task, priority=TaskPriority.PREFETCH)
+
+    # Assert
+    assert executor.wait_for_done(5000)
+    assert executor.get_max_workers() == 2
+    assert peak[0] <= 2
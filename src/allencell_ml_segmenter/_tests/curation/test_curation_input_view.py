@@ -259,3 +259,16 @@ def test_seg2_channel_selected(
     assert test_env.model.get_selected_channel(ImageType.SEG2) == 1
     combo_box.setCurrentIndex(2)
     assert test_env.model.get_selected_channel(ImageType.SEG2) == 2
+
+
+def test_lazy_loading_checkbox(
+    qtbot: QtBot, test_env: TestEnvironment
+) -> None:
+    # Assert (sanity check)
+    assert not test_env.model.is_lazy_loading()
+    assert not test_env.view.lazy_loading_checkbox.isChecked()
+    # Act / Assert
+    test_env.view.lazy_loading_checkbox.setChecked(True)
+    assert test_env.model.is_lazy_loading()
+    test_env.view.lazy_loading_checkbox.setChecked(False)
+    assert not test_env.model.is_lazy_loading()
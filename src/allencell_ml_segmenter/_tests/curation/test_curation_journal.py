@@ -0,0 +1,191 @@
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from allencell_ml_segmenter.curation.curation_data_class import (
+    CurationRecord,
+    PackedRaster,
+)
+from allencell_ml_segmenter.curation.curation_journal import (
+    CurationJournal,
+    JournalReplay,
+)
+from allencell_ml_segmenter.utils.file_utils import FileUtils
+from allencell_ml_segmenter.utils.file_writer import (
+    FakeFileWriter,
+    FileWriter,
+)
+
+MASK: np.ndarray = np.asarray([[[1, 2], [3, 4], [5, 6]]])
+
+
+def _generate_records(n: int) -> List[CurationRecord]:
+    return [
+        CurationRecord(
+            Path(f"raw_{i}.tiff"),
+            Path(f"seg1_{i}.tiff"),
+            None,
+            None,
+            None,
+            "seg1",
+            True,
+        )
+        for i in range(n)
+    ]
+
+
+def test_replay_restores_decisions(tmp_path: Path) -> None:
+    # Arrange
+    journal: CurationJournal = CurationJournal(
+        tmp_path, tmp_path, FileWriter.global_instance()
+    )
+    records: List[CurationRecord] = _generate_records(5)
+    records[0].to_use = False
+    records[1].excluding_mask = MASK
+    records[1].base_image = "seg2"
+    journal.append(0, 0, 1, records[0])
+    journal.append(1, 1, 2, records[1])
+    # a later decision for the same image wins
+    records[0].to_use = True
+    journal.append(2, 0, 0, records[0])
+
+    # Act
+    resumed: List[CurationRecord] = _generate_records(5)
+    replay: Optional[JournalReplay] = journal.replay(resumed)
+
+    # Assert
+    assert replay == JournalReplay(cursor=0, furthest=2, next_seq=3)
+    assert resumed[0].to_use
+    assert resumed[1].base_image == "seg2"
+    assert np.array_equal(resumed[1].excluding_mask, MASK)
+    assert resumed[1].excluding_mask_path is not None
+    assert resumed[2].excluding_mask is None
+
+
+def test_replay_restores_rasters(tmp_path: Path) -> None:
+    # Arrange
+    journal: CurationJournal = CurationJournal(
+        tmp_path, tmp_path, FileWriter.global_instance()
+    )
+    raster: np.ndarray = np.zeros((3, 5, 7), dtype=bool)
+    raster[1, 2:4, 3:6] = True
+    records: List[CurationRecord] = _generate_records(2)
+    records[0].excluding_mask = MASK
+    records[0].excluding_mask_raster = PackedRaster.pack(raster)
+    records[1].merging_mask = MASK
+    journal.append(0, 0, 1, records[0])
+    merg_path: Optional[Path] = journal.append(1, 1, 1, records[1])[1]
+    # rasterized after its mask was journaled
+    assert merg_path is not None
+    journal.append_raster(merg_path, PackedRaster.pack(~raster))
+
+    # Act
+    resumed: List[CurationRecord] = _generate_records(2)
+    journal.replay(resumed)
+
+    # Assert
+    assert resumed[0].excluding_mask_raster is not None
+    assert np.array_equal(resumed[0].excluding_mask_raster.unpack(), raster)
+    assert resumed[1].merging_mask_raster is not None
+    assert np.array_equal(resumed[1].merging_mask_raster.unpack(), ~raster)
+
+
+def test_replay_ignores_other_images_and_partial_lines(
+    tmp_path: Path,
+) -> None:
+    # Arrange
+    journal: CurationJournal = CurationJournal(
+        tmp_path, tmp_path, FileWriter.global_instance()
+    )
+    journal.append(0, 0, 1, _generate_records(1)[0])
+    # killed mid-write
+    with open(journal.get_journal_path(), "a") as fa:
+        fa.write('{"seq": 1, "img_idx"')
+
+    # Act
+    other: List[CurationRecord] = _generate_records(2)
+    other[0].raw_file = Path("other.tiff")
+    replay: Optional[JournalReplay] = journal.replay(other)
+
+    # Assert
+    assert len(journal.read_entries()) == 1
+    assert replay is None
+
+
+def test_append_only_writes_changed_masks() -> None:
+    # Arrange
+    writer: FakeFileWriter = FakeFileWriter()
+    journal: CurationJournal = CurationJournal(Path("j"), Path("m"), writer)
+    record: CurationRecord = _generate_records(1)[0]
+    record.merging_mask = MASK
+
+    # Act
+    paths: Tuple[Optional[Path], Optional[Path]] = journal.append(
+        0, 0, 0, record
+    )
+    record.merging_mask_path = paths[1]
+    journal.append(1, 0, 1, record)
+
+    # Assert
+    assert paths[0] is None
+    assert len(writer.np_save_state) == 1
+    entries: List[dict] = writer.json_lines_state[journal.get_journal_path()]
+    assert len(entries) == 2
+    assert entries[0]["merging_mask"] == entries[1]["merging_mask"]
+
+
+def test_compact_deletes_unused_mask_versions(tmp_path: Path) -> None:
+    # Arrange
+    journal: CurationJournal = CurationJournal(
+        tmp_path, tmp_path, FileWriter.global_instance()
+    )
+    records: List[CurationRecord] = _generate_records(2)
+    records[0].excluding_mask = MASK
+    records[0].excluding_mask_raster = PackedRaster.pack(
+        np.ones((2, 2), dtype=bool)
+    )
+    first: Optional[Path] = journal.append(0, 0, 1, records[0])[0]
+    # the mask is edited twice after going back to it
+    records[0].excluding_mask = MASK + 1
+    second: Optional[Path] = journal.append(1, 0, 1, records[0])[0]
+    records[0].excluding_mask = MASK + 2
+    third: Optional[Path] = journal.append(2, 0, 1, records[0])[0]
+    journal.append(3, 1, 2, records[1])
+    records[0].excluding_mask_path = third
+    assert first is not None and second is not None and third is not None
+
+    # Act
+    journal.compact(records)
+
+    # Assert
+    assert not first.exists()
+    assert not FileUtils.get_raster_path(first).exists()
+    assert not second.exists()
+    assert third.exists()
+    # the latest decision for each image is kept
+    assert [e.seq for e in journal.read_entries()] == [2, 3]
+    resumed: List[CurationRecord] = _generate_records(2)
+    assert journal.replay(resumed) == JournalReplay(
+        cursor=2, furthest=2, next_seq=4
+    )
+    assert np.array_equal(resumed[0].excluding_mask, MASK + 2)
+
+
+def test_compact_keeps_masks_saved_records_use(tmp_path: Path) -> None:
+    # Arrange
+    journal: CurationJournal = CurationJournal(
+        tmp_path, tmp_path, FileWriter.global_instance()
+    )
+    records: List[CurationRecord] = _generate_records(1)
+    records[0].merging_mask = MASK
+    saved: Optional[Path] = journal.append(0, 0, 0, records[0])[1]
+    records[0].merging_mask = MASK + 1
+    journal.append(1, 0, 0, records[0])
+    records[0].merging_mask_path = saved
+
+    # Act
+    journal.compact(records)
+
+    # Assert
+    assert saved is not None and saved.exists()
@@ -1064,3 +1064,30 @@ def test_exclud_viewer_unsaved_not_to_use(
     # Assert
     record: CurationRecord = env.model.get_curation_record()[0]
     assert record.excluding_mask is None
+
+
+def test_back_button(
+    qtbot: QtBot, test_environment_first_images_ready: TestEnvironment
+) -> None:
+    # Arrange
+    env: TestEnvironment = test_environment_first_images_ready
+    assert not env.view.back_button.isEnabled()
+    env.view.no_radio.click()
+    env.view.next_button.click()
+    env.model.set_next_image_data(ImageType.RAW, FAKE_IMG_DATA[2])
+    env.model.set_next_image_data(ImageType.SEG1, FAKE_IMG_DATA[2])
+    env.model.set_next_image_data(ImageType.SEG2, FAKE_IMG_DATA[2])
+    assert env.view.back_button.isEnabled()
+
+    # Act
+    env.view.back_button.click()
+
+    # Assert
+    assert env.view.progress_bar.value() == 1
+    assert env.viewer.contains_layer(f"[raw] {IMG_DIR_FILES[0].name}")
+    assert not env.viewer.contains_layer(f"[raw] {IMG_DIR_FILES[1].name}")
+    # the choice made for the first image is restored
+    assert env.view.no_radio.isChecked()
+    assert not env.model.get_use_image()
+    assert not env.view.back_button.isEnabled()
+    assert env.view.next_button.isEnabled()
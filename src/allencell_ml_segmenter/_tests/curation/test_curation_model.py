@@ -1,5 +1,6 @@
 import pytest
 from pathlib import Path
+from typing import List
 from unittest.mock import Mock
 import numpy as np
 
@@ -15,7 +16,6 @@ from allencell_ml_segmenter.main.main_model import MainModel
 from allencell_ml_segmenter.core.image_data_extractor import ImageData
 import numpy as np
 
-
 FAKE_IMAGE_DATA: ImageData = ImageData(
     28, 28, 28, 1, np.zeros((28, 28, 28)), Path("fake")
 )
@@ -454,3 +454,175 @@ def test_save_curation_record_to_disk(
 
     # Assert
     save_requested_slot.assert_called_once()
+
+
+def test_stale_image_data_is_dropped(
+    curation_model_main_view: CurationModel,
+) -> None:
+    # Arrange
+    curation_model_main_view.start_loading_images()
+    stale_generation: int = curation_model_main_view.get_load_generation()
+    stopped_slot: Mock = Mock()
+    curation_model_main_view.image_loading_stopped.connect(stopped_slot)
+
+    # Act
+    curation_model_main_view.stop_loading_images()
+    curation_model_main_view.set_curr_image_data(
+        ImageType.RAW, FAKE_IMAGE_DATA, stale_generation
+    )
+
+    # Assert
+    stopped_slot.assert_called_once()
+    assert curation_model_main_view.get_load_generation() != stale_generation
+    # nothing was written, so the current image data dict is still empty
+    assert curation_model_main_view.is_waiting_for_curr_images()
+
+
+def test_current_image_data_is_kept(
+    curation_model_main_view: CurationModel,
+) -> None:
+    # Arrange
+    curation_model_main_view.start_loading_images()
+
+    # Act
+    curation_model_main_view.set_curr_image_data(
+        ImageType.RAW,
+        FAKE_IMAGE_DATA,
+        curation_model_main_view.get_load_generation(),
+    )
+
+    # Assert
+    assert (
+        curation_model_main_view.get_curr_image_data(ImageType.RAW)
+        == FAKE_IMAGE_DATA
+    )
+
+
+def test_next_image_keeps_prefetched_data(
+    curation_model_loading_started: CurationModel,
+) -> None:
+    # Arrange
+    generation: int = curation_model_loading_started.get_load_generation()
+    img_loading_finished_slot: Mock = Mock()
+    curation_model_loading_started.image_loading_finished.connect(
+        img_loading_finished_slot
+    )
+    # image 2 is prefetched before the user moves on
+    for img_type in [ImageType.RAW, ImageType.SEG1, ImageType.SEG2]:
+        curation_model_loading_started.set_image_data(
+            2, img_type, FAKE_IMAGE_DATA, generation
+        )
+
+    # Act
+    curation_model_loading_started.next_image()
+
+    # Assert
+    # moving does not invalidate loads for images still in the window
+    assert curation_model_loading_started.get_load_generation() == generation
+    assert not curation_model_loading_started.is_waiting_for_images()
+    img_loading_finished_slot.assert_called_once()
+
+
+def test_prefetch_indices(curation_model: CurationModel) -> None:
+    # Arrange
+    paths: List[Path] = [Path(f"img_{i}") for i in range(10)]
+    curation_model.set_image_directory_paths(ImageType.RAW, paths)
+    curation_model.set_image_directory_paths(ImageType.SEG1, paths)
+    curation_model.set_current_view(CurationView.MAIN_VIEW)
+    curation_model.set_prefetch_depth(3)
+    curation_model.set_look_behind(1)
+
+    # Act
+    curation_model.start_loading_images()
+
+    # Assert
+    assert curation_model.get_prefetch_indices() == [0, 1, 2, 3]
+
+    # Act
+    for idx in range(2):
+        curation_model.set_image_data(idx, ImageType.RAW, FAKE_IMAGE_DATA)
+        curation_model.set_image_data(idx, ImageType.SEG1, FAKE_IMAGE_DATA)
+    curation_model.next_image()
+
+    # Assert
+    # look behind comes after the images ahead of the cursor
+    assert curation_model.get_prefetch_indices() == [1, 2, 3, 4, 0]
+
+
+def test_prefetch_window_respects_memory_budget(
+    curation_model_main_view: CurationModel,
+) -> None:
+    # Arrange
+    img_bytes: int = 3 * int(FAKE_IMAGE_DATA.np_data.nbytes)
+    curation_model_main_view.set_prefetch_depth(5)
+    curation_model_main_view.set_look_behind(2)
+    curation_model_main_view.set_prefetch_max_bytes(img_bytes)
+    curation_model_main_view.start_loading_images()
+    # size of images is unknown until one has loaded
+    assert curation_model_main_view.get_prefetch_indices() == [0, 1, 2]
+
+    # Act
+    for img_type in [ImageType.RAW, ImageType.SEG1, ImageType.SEG2]:
+        curation_model_main_view.set_curr_image_data(img_type, FAKE_IMAGE_DATA)
+
+    # Assert
+    # the current and next images are always kept
+    assert curation_model_main_view.get_prefetch_indices() == [0, 1]
+    curation_model_main_view.set_image_data(2, ImageType.RAW, FAKE_IMAGE_DATA)
+    assert curation_model_main_view.get_image_data(2, ImageType.RAW) is None
+
+
+def test_set_prefetch_depth_invalid(curation_model: CurationModel) -> None:
+    with pytest.raises(ValueError):
+        curation_model.set_prefetch_depth(0)
+    with pytest.raises(ValueError):
+        curation_model.set_look_behind(-1)
+
+
+def test_previous_image_keeps_curation_choices(
+    curation_model_loading_started: CurationModel,
+) -> None:
+    # Arrange
+    cursor_moved_slot: Mock = Mock()
+    curation_model_loading_started.cursor_moved.connect(cursor_moved_slot)
+    img_loading_finished_slot: Mock = Mock()
+    curation_model_loading_started.image_loading_finished.connect(
+        img_loading_finished_slot
+    )
+    curation_model_loading_started.set_use_image(False)
+    curation_model_loading_started.next_image()
+
+    # Act
+    curation_model_loading_started.previous_image()
+
+    # Assert
+    assert curation_model_loading_started.get_curr_image_index() == 0
+    assert cursor_moved_slot.call_count == 2
+    # image 0 is still in memory, so nothing needs to load
+    img_loading_finished_slot.assert_called_once()
+    assert not curation_model_loading_started.get_use_image()
+    # image 1 has been seen, so it counts towards the max
+    assert curation_model_loading_started.get_max_num_images_to_use() == 3
+    with pytest.raises(RuntimeError):
+        curation_model_loading_started.previous_image()
+
+
+def test_go_to_image(
+    curation_model_loading_started: CurationModel,
+) -> None:
+    # Arrange
+    img_loading_finished_slot: Mock = Mock()
+    curation_model_loading_started.image_loading_finished.connect(
+        img_loading_finished_slot
+    )
+
+    # Act
+    curation_model_loading_started.go_to_image(2)
+
+    # Assert
+    assert curation_model_loading_started.get_curr_image_index() == 2
+    assert curation_model_loading_started.is_waiting_for_curr_images()
+    img_loading_finished_slot.assert_not_called()
+    assert curation_model_loading_started.get_use_image()
+    with pytest.raises(ValueError):
+        curation_model_loading_started.go_to_image(3)
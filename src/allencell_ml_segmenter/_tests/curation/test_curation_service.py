@@ -1,6 +1,11 @@
+import threading
 from pathlib import Path
+from unittest.mock import Mock
 from dataclasses import dataclass
+from typing import List
 
+import dask.array as da
+import numpy as np
 import pytest
 from pytestqt.qtbot import QtBot
 
@@ -14,15 +19,23 @@ from allencell_ml_segmenter.curation.curation_service import (
 )
 from allencell_ml_segmenter.core.image_data_extractor import (
     FakeImageDataExtractor,
+    ImageData,
 )
 from allencell_ml_segmenter._tests.fakes.fake_experiments_model import (
     FakeExperimentsModel,
 )
-from allencell_ml_segmenter.utils.file_writer import FakeFileWriter
+from allencell_ml_segmenter.core.task_executor import (
+    ThreadPoolTaskExecutor,
+    SynchroTaskExecutor,
+)
+from allencell_ml_segmenter.utils.file_utils import FileUtils
+from allencell_ml_segmenter.utils.file_writer import (
+    FakeFileWriter,
+    FileWriter,
+)
 import allencell_ml_segmenter
 from allencell_ml_segmenter.main.main_model import MainModel
 
-
 FAKE_CHANNEL_SELECTION_PATH: Path = Path("channel_sel")
 
 IMG_DIR_PATH = (
@@ -157,6 +170,25 @@ def test_service_reacts_to_cursor_moved(
     assert test_env.model.get_curr_image_data(ImageType.SEG2) is not None
 
 
+def test_service_lazy_loads_raw_images(
+    qtbot: QtBot, test_env_main_view: TestEnvironment
+) -> None:
+    test_env: TestEnvironment = test_env_main_view
+    # Arrange
+    test_env.model.set_lazy_loading(True)
+
+    # Act
+    with qtbot.waitSignal(test_env.model.image_loading_finished):
+        test_env.model.start_loading_images()
+
+    # Assert
+    # raw images should be handed over as dask arrays, segmentations always in memory
+    raw: ImageData = test_env.model.get_curr_image_data(ImageType.RAW)
+    seg1: ImageData = test_env.model.get_curr_image_data(ImageType.SEG1)
+    assert isinstance(raw.np_data, da.Array)
+    assert isinstance(seg1.np_data, np.ndarray)
+
+
 def test_service_reacts_to_save_csv(
     qtbot: QtBot, test_env_main_view: TestEnvironment
 ) -> None:
@@ -183,3 +215,247 @@ def test_service_reacts_to_save_csv(
 
     # Assert
     assert len(test_env.file_writer.csv_state) > 0
+
+
+def test_service_cancels_loads_when_loading_stopped(
+    qtbot: QtBot, test_env_main_view: TestEnvironment
+) -> None:
+    # Arrange
+    # a single, blocked worker so that every load stays queued
+    executor: ThreadPoolTaskExecutor = ThreadPoolTaskExecutor(max_workers=1)
+    extractor: Mock = Mock(wraps=FakeImageDataExtractor.global_instance())
+    model: CurationModel = test_env_main_view.model
+    # keep a reference, the service's connections go away with it
+    service: CurationService = CurationService(
+        model,
+        FakeExperimentsModel(),
+        img_data_extractor=extractor,
+        task_executor=executor,
+        file_writer=FakeFileWriter(),
+    )
+    release: threading.Event = threading.Event()
+    executor.exec(lambda: release.wait(5))
+    model.start_loading_images()
+
+    # Act
+    model.stop_loading_images()
+    release.set()
+
+    # Assert
+    assert executor.wait_for_done(5000)
+    qtbot.wait(50)
+    extractor.extract_image_data.assert_not_called()
+    # nothing was written, so the current image data dict is still empty
+    assert model.is_waiting_for_curr_images()
+
+
+def test_service_prefetches_images_ahead(
+    qtbot: QtBot, test_env_main_view: TestEnvironment
+) -> None:
+    test_env: TestEnvironment = test_env_main_view
+    # Arrange
+    test_env.model.set_prefetch_depth(3)
+
+    # Act
+    with qtbot.waitSignal(test_env.model.image_loading_finished):
+        test_env.model.start_loading_images()
+    qtbot.waitUntil(lambda: not test_env.model.is_waiting_for_image(3))
+
+    # Assert
+    for idx in range(4):
+        assert not test_env.model.is_waiting_for_image(idx)
+    # the image after next is already loaded, so moving on is instant
+    img_loading_finished_slot: Mock = Mock()
+    test_env.model.image_loading_finished.connect(img_loading_finished_slot)
+    test_env.model.next_image()
+    img_loading_finished_slot.assert_called_once()
+
+
+def test_service_loads_images_around_new_cursor(
+    qtbot: QtBot, test_env_main_view: TestEnvironment
+) -> None:
+    test_env: TestEnvironment = test_env_main_view
+    # Arrange
+    test_env.model.set_prefetch_depth(1)
+    with qtbot.waitSignal(test_env.model.image_loading_finished):
+        test_env.model.start_loading_images()
+    last_idx: int = test_env.model.get_num_images() - 1
+
+    # Act
+    with qtbot.waitSignal(test_env.model.image_loading_finished):
+        test_env.model.go_to_image(last_idx)
+
+    # Assert
+    assert test_env.model.get_curr_image_data(ImageType.RAW) is not None
+    # with a look behind, going back does not wait on any loads
+    qtbot.waitUntil(
+        lambda: not test_env.model.is_waiting_for_image(last_idx - 1)
+    )
+    test_env.model.previous_image()
+    assert not test_env.model.is_waiting_for_images()
+
+
+def test_service_journals_curation_decisions(
+    qtbot: QtBot, test_env_main_view: TestEnvironment
+) -> None:
+    test_env: TestEnvironment = test_env_main_view
+    # Arrange
+    with qtbot.waitSignal(test_env.model.image_loading_finished):
+        test_env.model.start_loading_images()
+    test_env.model.set_use_image(False)
+
+    # Act
+    test_env.model.next_image()
+
+    # Assert
+    qtbot.waitUntil(lambda: len(test_env.file_writer.json_lines_state) > 0)
+    entries: List[dict] = list(test_env.file_writer.json_lines_state.values())[
+        0
+    ]
+    assert entries[0]["img_idx"] == 0
+    assert entries[0]["cursor"] == 1
+    assert not entries[0]["to_use"]
+
+
+def test_service_resumes_from_journal(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    # Arrange
+    exp_mod: FakeExperimentsModel = FakeExperimentsModel()
+    model: CurationModel = CurationModel(exp_mod, MainModel())
+    monkeypatch.setattr(model, "get_csv_path", lambda: tmp_path)
+    monkeypatch.setattr(model, "get_save_masks_path", lambda: tmp_path)
+    # keep a reference, the service's connections go away with it
+    service: CurationService = CurationService(
+        model,
+        exp_mod,
+        img_data_extractor=FakeImageDataExtractor.global_instance(),
+        task_executor=SynchroTaskExecutor.global_instance(),
+        file_writer=FileWriter.global_instance(),
+    )
+    model.set_image_directory_paths(ImageType.RAW, IMG_DIR_FILES)
+    model.set_image_directory_paths(ImageType.SEG1, IMG_DIR_FILES)
+    model.set_selected_channel(ImageType.RAW, 0)
+    model.set_selected_channel(ImageType.SEG1, 0)
+    model.set_current_view(CurationView.MAIN_VIEW)
+    model.start_loading_images()
+    model.set_use_image(False)
+    model.next_image()
+    model.next_image()
+    # the napari session is killed here, and curation is started over
+    model.set_current_view(CurationView.INPUT_VIEW)
+
+    # Act
+    model.set_current_view(CurationView.MAIN_VIEW)
+    model.start_loading_images()
+
+    # Assert
+    assert model.is_resumed()
+    assert model.get_curr_image_index() == 2
+    assert not model.get_curation_record()[0].to_use
+    assert model.get_curation_record()[1].to_use
+
+
+def test_service_rasterizes_masks(
+    qtbot: QtBot, test_env_main_view: TestEnvironment
+) -> None:
+    test_env: TestEnvironment = test_env_main_view
+    # Arrange
+    with qtbot.waitSignal(test_env.model.image_loading_finished):
+        test_env.model.start_loading_images()
+    square: np.ndarray = np.array([[1, 1], [1, 3], [3, 3], [3, 1]])
+
+    # Act
+    test_env.model.set_excluding_mask(np.array([square]))
+
+    # Assert
+    record = test_env.model.get_curation_record()[0]
+    qtbot.waitUntil(lambda: record.excluding_mask_raster is not None)
+    raster: np.ndarray = record.excluding_mask_raster.unpack()
+    # FakeImageDataExtractor images are 5x5
+    assert raster.shape == (5, 5)
+    assert raster[2, 2]
+    assert not raster[0, 0]
+    assert record.merging_mask_raster is None
+
+
+def test_service_resumes_rasters_from_journal(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    # Arrange
+    exp_mod: FakeExperimentsModel = FakeExperimentsModel()
+    model: CurationModel = CurationModel(exp_mod, MainModel())
+    monkeypatch.setattr(model, "get_csv_path", lambda: tmp_path)
+    monkeypatch.setattr(model, "get_save_masks_path", lambda: tmp_path)
+    # keep a reference, the service's connections go away with it
+    service: CurationService = CurationService(
+        model,
+        exp_mod,
+        img_data_extractor=FakeImageDataExtractor.global_instance(),
+        task_executor=SynchroTaskExecutor.global_instance(),
+        file_writer=FileWriter.global_instance(),
+    )
+    model.set_image_directory_paths(ImageType.RAW, IMG_DIR_FILES)
+    model.set_image_directory_paths(ImageType.SEG1, IMG_DIR_FILES)
+    model.set_selected_channel(ImageType.RAW, 0)
+    model.set_selected_channel(ImageType.SEG1, 0)
+    model.set_current_view(CurationView.MAIN_VIEW)
+    model.start_loading_images()
+    model.set_excluding_mask(np.array([[[1, 1], [1, 3], [3, 3], [3, 1]]]))
+    model.next_image()
+    # the napari session is killed here, and curation is started over
+    model.set_current_view(CurationView.INPUT_VIEW)
+
+    # Act
+    model.set_current_view(CurationView.MAIN_VIEW)
+    model.start_loading_images()
+
+    # Assert
+    raster = model.get_curation_record()[0].excluding_mask_raster
+    assert raster is not None
+    assert raster.shape == (5, 5)
+    assert raster.unpack()[2, 2]
+
+
+def test_service_compacts_journal_after_save(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    # Arrange
+    exp_mod: FakeExperimentsModel = FakeExperimentsModel()
+    model: CurationModel = CurationModel(exp_mod, MainModel())
+    monkeypatch.setattr(model, "get_csv_path", lambda: tmp_path)
+    monkeypatch.setattr(model, "get_save_masks_path", lambda: tmp_path)
+    # keep a reference, the service's connections go away with it
+    service: CurationService = CurationService(
+        model,
+        exp_mod,
+        img_data_extractor=FakeImageDataExtractor.global_instance(),
+        task_executor=SynchroTaskExecutor.global_instance(),
+        file_writer=FileWriter.global_instance(),
+    )
+    model.set_image_directory_paths(ImageType.RAW, IMG_DIR_FILES)
+    model.set_image_directory_paths(ImageType.SEG1, IMG_DIR_FILES)
+    model.set_selected_channel(ImageType.RAW, 0)
+    model.set_selected_channel(ImageType.SEG1, 0)
+    model.set_current_view(CurationView.MAIN_VIEW)
+    model.start_loading_images()
+    model.set_excluding_mask(np.array([[[1, 1], [1, 3], [3, 3], [3, 1]]]))
+    model.next_image()
+    edited: Path = model.get_curation_record()[0].excluding_mask_path
+    model.previous_image()
+    model.set_excluding_mask(np.array([[[0, 0], [0, 2], [2, 2], [2, 0]]]))
+    for _ in range(4):
+        model.next_image()
+
+    # Act
+    model.save_curr_curation_record_to_disk()
+
+    # Assert
+    current: Path = model.get_curation_record()[0].excluding_mask_path
+    assert current != edited
+    assert current.exists()
+    assert not edited.exists()
+    assert not FileUtils.get_raster_path(edited).exists()
+    img_idxs: List[int] = [e.img_idx for e in service._journal.read_entries()]
+    # one decision per image
+    assert len(img_idxs) == len(set(img_idxs))
@@ -6,7 +6,8 @@ class FakeQSettings(QSettings):
         self.keys = {}
 
     def value(self, key):
-        return self.keys[key]
+        # QSettings has no value for keys that were never set
+        return self.keys.get(key)
 
     def setValue(self, key, value):
         self.keys[key] = value
@@ -1,5 +1,7 @@
 from pathlib import Path
+from typing import Optional
 from allencell_ml_segmenter.config.i_user_settings import IUserSettings
+from allencell_ml_segmenter.config.loader_settings import LoaderSettings
 from qtpy.QtWidgets import QWidget
 
 
@@ -15,6 +17,7 @@ class FakeUserSettings(IUserSettings):
         self.user_experiments_path = user_experiments_path
         self.prompt_response: Path = init_prompt_response
         self.change_prompt_response: Path = change_prompt_response
+        self.loader_settings: Optional[LoaderSettings] = None
 
     def get_cyto_dl_home_path(self) -> Path:
         return self.cyto_dl_home_path
@@ -28,6 +31,12 @@ class FakeUserSettings(IUserSettings):
     def set_user_experiments_path(self, path: str):
         self.user_experiments_path = path
 
+    def get_loader_settings(self) -> Optional[LoaderSettings]:
+        return self.loader_settings
+
+    def set_loader_settings(self, settings: LoaderSettings) -> None:
+        self.loader_settings = settings
+
     def prompt_for_user_experiments_home(self, parent: QWidget):
         if self.prompt_response:
             self.set_user_experiments_path(Path(self.prompt_response))
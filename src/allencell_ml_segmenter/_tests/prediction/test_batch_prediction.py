@@ -0,0 +1,118 @@
+import csv
+import shutil
+import subprocess
+import sys
+from pathlib import Path
+from unittest.mock import Mock, patch
+
+import pytest
+
+import allencell_ml_segmenter
+from allencell_ml_segmenter.prediction.batch_prediction import (
+    BatchPredictionSummary,
+    run_batch_prediction,
+    main,
+)
+
+EXPERIMENTS_HOME: Path = (
+    Path(allencell_ml_segmenter.__file__).parent
+    / "_tests"
+    / "main"
+    / "experiments_home"
+)
+
+
+@pytest.fixture
+def experiment_path(tmp_path: Path) -> Path:
+    # copied so that the input csv is not written into the test files
+    path: Path = tmp_path / "experiments_home" / "0_exp"
+    shutil.copytree(EXPERIMENTS_HOME / "0_exp", path)
+    (path / "checkpoints").mkdir()
+    (path / "checkpoints" / "epoch_002.ckpt").write_bytes(b"")
+    return path
+
+
+@pytest.fixture
+def input_dir(tmp_path: Path) -> Path:
+    path: Path = tmp_path / "input"
+    path.mkdir()
+    for i in range(3):
+        (path / f"img_{i}.tiff").write_bytes(b"")
+    return path
+
+
+def test_run_batch_prediction_from_dir(
+    experiment_path: Path, input_dir: Path, tmp_path: Path
+) -> None:
+    # Arrange
+    run_prediction: Mock = Mock()
+
+    # Act
+    with patch(
+        "allencell_ml_segmenter.services.prediction_service.PredictionService.run_prediction",
+        run_prediction,
+    ):
+        summary: BatchPredictionSummary = run_batch_prediction(
+            experiment_path, input_dir, tmp_path / "output", channel=1
+        )
+
+    # Assert
+    assert summary.num_images == 3
+    run_prediction.assert_called_once_with(
+        experiment_path / "checkpoints" / "epoch_002.ckpt"
+    )
+    with open(
+        experiment_path / "data" / "prediction_csv" / "test_csv.csv"
+    ) as file:
+        rows: list = list(csv.reader(file))
+    assert rows[0] == ["", "raw", "split"]
+    assert len(rows) == 4
+
+
+def test_main_rejects_untrained_experiment(
+    input_dir: Path, tmp_path: Path
+) -> None:
+    # Act
+    code: int = main(
+        [
+            "--experiment",
+            str(EXPERIMENTS_HOME / "one_ckpt_exp"),
+            "--input",
+            str(input_dir),
+            "--output",
+            str(tmp_path / "output"),
+        ]
+    )
+
+    # Assert
+    assert code == 1
+
+
+def test_summary_throughput() -> None:
+    # Arrange
+    summary: BatchPredictionSummary = BatchPredictionSummary(10, 1.0, 4.0)
+
+    # Act / Assert
+    assert summary.get_images_per_second() == 2.5
+    assert "10 images" in str(summary)
+    assert "0.40s/image" in str(summary)
+
+
+def test_batch_prediction_does_not_import_qt() -> None:
+    # Act
+    result: subprocess.CompletedProcess = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            "import sys; "
+            "import allencell_ml_segmenter.prediction.batch_prediction; "
+            "print(sorted({m.split('.')[0] for m in sys.modules} "
+            "& {'napari', 'qtpy', 'PyQt5', 'PySide2'}))",
+        ],
+        capture_output=True,
+        text=True,
+    )
+
+    # Assert
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.strip().splitlines()[-1] == "[]"
@@ -0,0 +1,100 @@
+from pathlib import Path
+from typing import Dict, List
+
+import numpy as np
+import pytest
+import tifffile
+
+from allencell_ml_segmenter.prediction.batched_prediction import (
+    BYTES_PER_IMAGE_VOXEL,
+    BatchedPrediction,
+    SpatialShape,
+    bucket_by_shape,
+    get_spatial_shape,
+)
+from allencell_ml_segmenter.prediction.tiled_inference import (
+    BYTES_PER_TILE_VOXEL,
+)
+
+
+def _write_image(path: Path, shape: List[int]) -> Path:
+    tifffile.imwrite(path, np.zeros(shape, dtype=np.uint8))
+    return path
+
+
+def test_invalid_batched_prediction() -> None:
+    # Act / Assert
+    with pytest.raises(ValueError):
+        BatchedPrediction(memory_budget_mb=0)
+    with pytest.raises(ValueError):
+        BatchedPrediction(max_batch_size=0)
+
+
+def test_get_batch_size_fits_budget() -> None:
+    # Arrange
+    batched_prediction: BatchedPrediction = BatchedPrediction(
+        memory_budget_mb=64, max_batch_size=1000
+    )
+    per_image: int = 64 * 64 * (BYTES_PER_TILE_VOXEL + BYTES_PER_IMAGE_VOXEL)
+
+    # Act
+    batch_size: int = batched_prediction.get_batch_size(
+        (1, 64, 64), [64, 64], num_images=1000
+    )
+
+    # Assert
+    assert batch_size == 64 * 1024 * 1024 // per_image
+
+
+def test_get_batch_size_limits() -> None:
+    # Arrange
+    batched_prediction: BatchedPrediction = BatchedPrediction(
+        memory_budget_mb=1024, max_batch_size=8
+    )
+
+    # Act / Assert
+    assert batched_prediction.get_batch_size((1, 16, 16), None, 100) == 8
+    # no larger than the bucket
+    assert batched_prediction.get_batch_size((1, 16, 16), None, 3) == 3
+    # one at a time if even one does not fit
+    assert (
+        batched_prediction.get_batch_size((64, 1024, 1024), [64, 512, 512], 5)
+        == 1
+    )
+
+
+def test_get_batch_size_pads_small_images_to_window() -> None:
+    # Arrange
+    batched_prediction: BatchedPrediction = BatchedPrediction(
+        memory_budget_mb=64, max_batch_size=1000
+    )
+
+    # Act / Assert
+    assert batched_prediction.get_batch_size(
+        (1, 16, 16), [64, 64], 1000
+    ) < batched_prediction.get_batch_size((1, 16, 16), None, 1000)
+
+
+def test_get_spatial_shape(tmp_path: Path) -> None:
+    # Arrange
+    image_2d: Path = _write_image(tmp_path / "2d.tif", [32, 48])
+    image_3d: Path = _write_image(tmp_path / "3d.tif", [5, 32, 48])
+
+    # Act / Assert
+    assert get_spatial_shape(image_2d) == (1, 32, 48)
+    assert get_spatial_shape(image_3d) == (5, 32, 48)
+
+
+def test_bucket_by_shape(tmp_path: Path) -> None:
+    # Arrange
+    images: List[Path] = [
+        _write_image(tmp_path / f"{i}.tif", shape)
+        for i, shape in enumerate([[32, 32], [16, 16], [32, 32], [16, 16]])
+    ]
+
+    # Act
+    buckets: Dict[SpatialShape, List[int]] = bucket_by_shape(images)
+
+    # Assert
+    assert buckets == {(1, 32, 32): [0, 2], (1, 16, 16): [1, 3]}
+    assert list(buckets) == [(1, 32, 32), (1, 16, 16)]
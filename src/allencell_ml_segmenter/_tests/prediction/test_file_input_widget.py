@@ -12,6 +12,7 @@ from allencell_ml_segmenter.prediction.file_input_widget import (
 from allencell_ml_segmenter.prediction.model import (
     PredictionModel,
     PredictionInputMode,
+    PredictionBackend,
 )
 
 MOCK_PATH: str = "/path/to/file"
@@ -128,3 +129,63 @@ def test_populate_input_channel_combobox(qtbot: QtBot) -> None:
 
     # Assert
     assert prediction_file_input._channel_select_dropdown.isEnabled()
+
+
+def test_incremental_checkbox(
+    qtbot: QtBot,
+    file_input_widget: PredictionFileInput,
+    prediction_model: PredictionModel,
+) -> None:
+    """
+    Test that the skip predicted images checkbox sets incremental prediction.
+    """
+    # ACT
+    file_input_widget._incremental_checkbox.setChecked(True)
+
+    # ASSERT
+    assert prediction_model.is_incremental()
+
+    # ACT
+    file_input_widget._incremental_checkbox.setChecked(False)
+
+    # ASSERT
+    assert not prediction_model.is_incremental()
+
+
+def test_backend_dropdown(
+    qtbot: QtBot,
+    file_input_widget: PredictionFileInput,
+    prediction_model: PredictionModel,
+) -> None:
+    """
+    Test that the backend dropdown selects the prediction backend.
+    """
+    for backend in PredictionBackend:
+        # ACT
+        file_input_widget._backend_dropdown.setCurrentIndex(
+            file_input_widget._backend_dropdown.findData(backend)
+        )
+
+        # ASSERT
+        assert prediction_model.get_backend() == backend
+
+
+def test_batched_checkbox(
+    qtbot: QtBot,
+    file_input_widget: PredictionFileInput,
+    prediction_model: PredictionModel,
+) -> None:
+    """
+    Test that the batch checkbox sets batched prediction.
+    """
+    # ACT
+    file_input_widget._batched_checkbox.setChecked(True)
+
+    # ASSERT
+    assert prediction_model.get_batched_prediction() is not None
+
+    # ACT
+    file_input_widget._batched_checkbox.setChecked(False)
+
+    # ASSERT
+    assert prediction_model.get_batched_prediction() is None
@@ -153,3 +153,22 @@ def test_postprocessing_auto_threshold(
         prediction_model.get_postprocessing_auto_threshold()
         == "example threshold"
     )
+
+
+def test_num_shards(prediction_model: PredictionModel) -> None:
+    """
+    Tests that the number of shards defaults to 1 and cannot be less than 1.
+    """
+    # ASSERT (defaults)
+    assert prediction_model.get_num_shards() == 1
+    assert prediction_model.get_threads_per_shard() is None
+
+    # ACT
+    prediction_model.set_num_shards(4)
+
+    # ASSERT
+    assert prediction_model.get_num_shards() == 4
+    with pytest.raises(ValueError):
+        prediction_model.set_num_shards(0)
+    with pytest.raises(ValueError):
+        prediction_model.set_threads_per_shard(0)
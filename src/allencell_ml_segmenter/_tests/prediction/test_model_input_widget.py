@@ -6,6 +6,9 @@ from unittest.mock import patch
 from qtpy.QtWidgets import QFileDialog
 from pytestqt.qtbot import QtBot
 
+from allencell_ml_segmenter.prediction.postprocessing import (
+    AUTO_THRESHOLD_METHODS,
+)
 from allencell_ml_segmenter.prediction.model_input_widget import (
     ModelInputWidget,
 )
@@ -150,7 +153,7 @@ def test_postprocessing_auto_threshold(
     Tests that selecting the associated combo box option updates the postprocessing auto threshold in the model.
     """
     # ACT
-    model_input_widget._auto_thresh_selection.setCurrentIndex(4)
+    model_input_widget._auto_thresh_selection.setCurrentIndex(3)
 
     # ASSERT
     assert (
@@ -163,6 +166,18 @@ def test_postprocessing_auto_threshold(
 
     # ASSERT
     assert (
-        model_input_widget._model.get_postprocessing_auto_threshold()
-        == "niblack"
+        model_input_widget._model.get_postprocessing_auto_threshold() == "yen"
+    )
+
+
+def test_auto_threshold_lists_supported_methods(
+    model_input_widget: ModelInputWidget,
+) -> None:
+    """
+    Tests that only the auto thresholds prediction supports can be selected.
+    """
+    # ASSERT
+    combo_box = model_input_widget._auto_thresh_selection
+    assert [combo_box.itemText(i) for i in range(combo_box.count())] == list(
+        AUTO_THRESHOLD_METHODS
     )
@@ -0,0 +1,146 @@
+import os
+from pathlib import Path
+from typing import Dict, List
+
+import pytest
+import torch
+from lightning import LightningModule
+
+from allencell_ml_segmenter.prediction.onnx_backend import (
+    OnnxForward,
+    export_experiment,
+    export_to_onnx,
+    get_onnx_path,
+    is_exported,
+    is_onnx_available,
+)
+
+
+class TinyMultiTaskModel(LightningModule):
+    """
+    Stands in for a cyto-dl multi task model: a 2D convolution as backbone,
+    and its output through a sigmoid as the only head.
+    """
+
+    def __init__(self, **kwargs: object) -> None:
+        super().__init__()
+        self.backbone: torch.nn.Conv2d = torch.nn.Conv2d(
+            1, 1, kernel_size=3, padding=1
+        )
+        self.inference_heads: List[str] = ["seg"]
+
+    def forward(
+        self, x: torch.Tensor, run_heads: List[str]
+    ) -> Dict[str, torch.Tensor]:
+        return {head: torch.sigmoid(self.backbone(x)) for head in run_heads}
+
+
+CONFIG: str = """
+model:
+  _target_: allencell_ml_segmenter._tests.prediction.test_onnx_backend.TinyMultiTaskModel
+  inference_args:
+    roi_size: [16, 16]
+checkpoint:
+  ckpt_path: null
+"""
+
+
+@pytest.fixture
+def experiment(tmp_path: Path) -> Path:
+    path: Path = tmp_path / "exp"
+    (path / "checkpoints").mkdir(parents=True)
+    (path / "train_config.yaml").write_text(CONFIG)
+    torch.save(
+        {
+            "state_dict": {
+                f"backbone.{k}": v
+                for k, v in torch.nn.Conv2d(1, 1, 3, padding=1)
+                .state_dict()
+                .items()
+            }
+        },
+        path / "checkpoints" / "epoch=1.ckpt",
+    )
+    return path
+
+
+def test_get_onnx_path() -> None:
+    # Act
+    onnx_path: Path = get_onnx_path(
+        Path("home") / "exp" / "checkpoints" / "epoch=1.ckpt"
+    )
+
+    # Assert
+    assert onnx_path == Path("home") / "exp" / "onnx" / "epoch=1.onnx"
+
+
+def test_is_exported(experiment: Path) -> None:
+    # Arrange
+    ckpt: Path = experiment / "checkpoints" / "epoch=1.ckpt"
+    onnx_path: Path = get_onnx_path(ckpt)
+    onnx_path.parent.mkdir()
+    onnx_path.write_text("graph")
+
+    # Act / Assert
+    os.utime(ckpt, ns=(1, 1))
+    assert is_exported(ckpt)
+    # checkpoint written again since the export
+    os.utime(onnx_path, ns=(0, 0))
+    assert not is_exported(ckpt)
+
+
+def test_export_experiment_without_checkpoints(tmp_path: Path) -> None:
+    # Arrange
+    (tmp_path / "exp").mkdir()
+
+    # Act / Assert
+    with pytest.raises(ValueError):
+        export_experiment(tmp_path / "exp")
+
+
+@pytest.mark.skipif(
+    is_onnx_available(), reason="onnx and onnxruntime are installed"
+)
+def test_missing_onnxruntime(tmp_path: Path) -> None:
+    # Act / Assert
+    with pytest.raises(ImportError, match="allencell-segmenter-ml\\[onnx\\]"):
+        OnnxForward(tmp_path / "model.onnx")
+
+
+@pytest.mark.skipif(
+    not is_onnx_available(), reason="needs onnx and onnxruntime"
+)
+def test_export_matches_torch(experiment: Path) -> None:
+    # Arrange
+    ckpt: Path = experiment / "checkpoints" / "epoch=1.ckpt"
+    model: TinyMultiTaskModel = TinyMultiTaskModel()
+    model.load_state_dict(torch.load(ckpt)["state_dict"])
+    # another size than the exported roi_size, as sliding windows may be
+    x: torch.Tensor = torch.rand(2, 1, 24, 40)
+
+    # Act
+    onnx_path: Path = export_experiment(experiment)
+    outputs: Dict[str, torch.Tensor] = OnnxForward(onnx_path)(x, ["seg"])
+
+    # Assert
+    assert onnx_path == get_onnx_path(ckpt)
+    assert is_exported(ckpt)
+    with torch.no_grad():
+        expected: torch.Tensor = model(x, ["seg"])["seg"]
+    assert torch.allclose(outputs["seg"], expected, atol=1e-5)
+
+
+@pytest.mark.skipif(
+    not is_onnx_available(), reason="needs onnx and onnxruntime"
+)
+def test_export_to_given_path(experiment: Path, tmp_path: Path) -> None:
+    # Act
+    onnx_path: Path = export_to_onnx(
+        experiment / "train_config.yaml",
+        experiment / "checkpoints" / "epoch=1.ckpt",
+        tmp_path / "model.onnx",
+    )
+
+    # Assert
+    assert onnx_path == tmp_path / "model.onnx"
+    assert onnx_path.exists()
@@ -0,0 +1,119 @@
+import csv
+from pathlib import Path
+from typing import List
+
+import dask.array as da
+import numpy as np
+import pytest
+import tifffile
+from skimage.filters import threshold_li, threshold_otsu, threshold_triangle
+
+from allencell_ml_segmenter.prediction.postprocessing import (
+    PostprocessingCallback,
+    get_threshold,
+    threshold_segmentation,
+)
+
+
+@pytest.fixture
+def probabilities() -> np.ndarray:
+    # bimodal, like sigmoid outputs rescaled to uint8
+    rng: np.random.Generator = np.random.default_rng(0)
+    background: np.ndarray = rng.normal(40, 10, (4, 32, 32))
+    foreground: np.ndarray = rng.normal(200, 20, (4, 32, 32))
+    mask: np.ndarray = rng.random((4, 32, 32)) < 0.3
+    return np.clip(np.where(mask, foreground, background), 0, 255).astype(
+        np.uint8
+    )
+
+
+def _write_seg(path: Path, data: np.ndarray) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tifffile.imwrite(path, data, photometric="minisblack")
+
+
+@pytest.mark.parametrize(
+    "method, expected",
+    [
+        ("otsu", threshold_otsu),
+        ("li", threshold_li),
+        ("triangle", threshold_triangle),
+    ],
+)
+def test_auto_threshold_matches_skimage(
+    probabilities: np.ndarray, method: str, expected
+) -> None:
+    # Act
+    threshold: float = get_threshold(
+        da.from_array(probabilities, chunks=(1, 32, 32)),
+        auto_threshold=method,
+    )
+
+    # Assert
+    assert abs(threshold - float(expected(probabilities))) <= 1
+
+
+def test_simple_threshold_is_percentage_of_range() -> None:
+    # Act / Assert
+    assert get_threshold(da.zeros(4, dtype=np.uint8), 50) == 127.5
+    assert get_threshold(da.zeros(4, dtype=np.float32), 50) == 0.5
+
+
+def test_unsupported_auto_threshold() -> None:
+    # Act / Assert
+    with pytest.raises(ValueError):
+        get_threshold(da.zeros(4), auto_threshold="niblack")
+
+
+def test_threshold_segmentation(
+    probabilities: np.ndarray, tmp_path: Path
+) -> None:
+    # Arrange
+    _write_seg(tmp_path / "seg" / "img.tif", probabilities)
+
+    # Act
+    threshold_segmentation(
+        tmp_path / "seg" / "img.tif",
+        tmp_path / "postprocessed" / "img.tif",
+        simple_threshold=50,
+    )
+
+    # Assert
+    labels: np.ndarray = tifffile.imread(
+        tmp_path / "postprocessed" / "img.tif"
+    )
+    assert labels.dtype == np.uint8
+    assert np.array_equal(labels, (probabilities > 127.5).astype(np.uint8))
+
+
+def test_callback_postprocesses_written_segmentations(
+    probabilities: np.ndarray, tmp_path: Path
+) -> None:
+    # Arrange
+    stems: List[str] = ["img_0", "img_1", "img_2"]
+    with open(tmp_path / "inputs.csv", "w", newline="") as file:
+        writer = csv.writer(file)
+        writer.writerow(["", "raw", "split"])
+        for i, stem in enumerate(stems):
+            writer.writerow([i, f"/input/{stem}.tiff", "test"])
+    callback: PostprocessingCallback = PostprocessingCallback(
+        str(tmp_path / "seg"),
+        str(tmp_path / "postprocessed"),
+        str(tmp_path / "inputs.csv"),
+        auto_threshold="otsu",
+    )
+    callback.on_predict_start(None, None)
+
+    # Act
+    _write_seg(tmp_path / "seg" / "img_0.tif", probabilities)
+    callback.on_predict_batch_end(None, None, None, None, 0)
+    # written out of order, picked up when prediction ends
+    _write_seg(tmp_path / "seg" / "img_2.tif", probabilities)
+    callback.on_predict_batch_end(None, None, None, None, 1)
+    _write_seg(tmp_path / "seg" / "other.tif", probabilities)
+    callback.on_predict_end(None, None)
+
+    # Assert
+    assert sorted(
+        path.name for path in (tmp_path / "postprocessed").iterdir()
+    ) == ["img_0.tif", "img_2.tif"]
@@ -1,3 +1,5 @@
+from pathlib import Path
+
 from allencell_ml_segmenter.prediction.prediction_folder_event_handler import (
     PredictionFolderEventHandler,
 )
@@ -60,3 +62,21 @@ def test_file_creation_bad_ext():
 
     handler.on_created(Mock(src_path="/bad/file/path.zip"))
     progress_callback_mock.assert_not_called()
+
+
+def test_file_closed_calls_prediction_callback():
+    # ARRANGE
+    progress_callback_mock: Mock = Mock()
+    prediction_callback_mock: Mock = Mock()
+    handler: PredictionFolderEventHandler = PredictionFolderEventHandler(
+        progress_callback_mock, prediction_callback_mock
+    )
+
+    # ACT
+    handler.on_created(Mock(src_path="/path/to/some.tif"))
+    handler.on_closed(Mock(src_path="/path/to/some.tif"))
+    handler.on_closed(Mock(src_path="/bad/file/path.png"))
+
+    # ASSERT
+    prediction_callback_mock.assert_called_once_with(Path("/path/to/some.tif"))
+    progress_callback_mock.assert_called_once_with(1)
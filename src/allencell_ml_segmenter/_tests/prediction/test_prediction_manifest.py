@@ -0,0 +1,102 @@
+import os
+from pathlib import Path
+from typing import List
+
+import pytest
+
+from allencell_ml_segmenter.prediction.prediction_manifest import (
+    PredictionManifest,
+)
+from allencell_ml_segmenter.utils.file_writer import FileWriter
+
+
+@pytest.fixture
+def inputs(tmp_path: Path) -> List[Path]:
+    input_dir: Path = tmp_path / "input"
+    input_dir.mkdir()
+    paths: List[Path] = []
+    for i in range(3):
+        path: Path = input_dir / f"img_{i}.tiff"
+        path.write_bytes(b"0")
+        paths.append(path)
+    return paths
+
+
+def _predict(inputs: List[Path], seg_dir: Path) -> None:
+    seg_dir.mkdir(parents=True, exist_ok=True)
+    for path in inputs:
+        (seg_dir / f"{path.stem}.tif").write_bytes(b"seg")
+
+
+def _get_manifest(tmp_path: Path) -> PredictionManifest:
+    return PredictionManifest(
+        tmp_path / "output",
+        tmp_path / "output" / "seg",
+        FileWriter.global_instance(),
+    )
+
+
+def test_only_new_and_changed_inputs_are_unpredicted(
+    tmp_path: Path, inputs: List[Path]
+) -> None:
+    # Arrange
+    _predict(inputs[:2], tmp_path / "output" / "seg")
+    _get_manifest(tmp_path).record(inputs[:2], "ckpt", None)
+    # changed since it was predicted
+    stat: os.stat_result = os.stat(inputs[1])
+    os.utime(inputs[1], ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+    # Act
+    unpredicted: List[Path] = _get_manifest(tmp_path).get_unpredicted(
+        inputs, "ckpt", None
+    )
+
+    # Assert
+    assert unpredicted == inputs[1:]
+    # the out of date segmentation is gone, so progress counts the new one
+    assert not (tmp_path / "output" / "seg" / "img_1.tif").exists()
+    assert (tmp_path / "output" / "seg" / "img_0.tif").exists()
+
+
+def test_other_checkpoint_or_channel_predicts_again(
+    tmp_path: Path, inputs: List[Path]
+) -> None:
+    # Arrange
+    _predict(inputs, tmp_path / "output" / "seg")
+    _get_manifest(tmp_path).record(inputs, "ckpt", 0)
+    manifest: PredictionManifest = _get_manifest(tmp_path)
+
+    # Act / Assert
+    assert manifest.get_unpredicted(inputs, "ckpt", 0) == []
+    assert manifest.get_unpredicted(inputs, "ckpt", 1) == inputs
+
+
+def test_missing_segmentation_predicts_again(
+    tmp_path: Path, inputs: List[Path]
+) -> None:
+    # Arrange
+    seg_dir: Path = tmp_path / "output" / "seg"
+    _predict(inputs, seg_dir)
+    _get_manifest(tmp_path).record(inputs, "ckpt", None)
+    (seg_dir / "img_2.tif").unlink()
+
+    # Act
+    unpredicted: List[Path] = _get_manifest(tmp_path).get_unpredicted(
+        inputs, "ckpt", None
+    )
+
+    # Assert
+    assert unpredicted == [inputs[2]]
+
+
+def test_checkpoint_id_changes_when_overwritten(tmp_path: Path) -> None:
+    # Arrange
+    ckpt: Path = tmp_path / "epoch_000.ckpt"
+    ckpt.write_bytes(b"weights")
+    before: str = PredictionManifest.get_checkpoint_id(ckpt)
+
+    # Act
+    ckpt.write_bytes(b"new weights")
+
+    # Assert
+    assert PredictionManifest.get_checkpoint_id(ckpt) != before
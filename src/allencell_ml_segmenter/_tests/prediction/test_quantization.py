@@ -0,0 +1,176 @@
+import csv
+import os
+from pathlib import Path
+from typing import Dict, List
+
+import numpy as np
+import pytest
+import tifffile
+
+from allencell_ml_segmenter.prediction import batch_prediction, quantization
+from allencell_ml_segmenter.prediction.batch_prediction import (
+    BatchPredictionSummary,
+)
+from allencell_ml_segmenter.prediction.onnx_backend import get_onnx_path
+from allencell_ml_segmenter.prediction.quantization import (
+    QuantizationReport,
+    evaluate_quantization,
+    get_calibration_images,
+    get_dice,
+    get_mean_dice,
+    get_quantized_path,
+    is_quantized,
+)
+
+
+def _write_train_csv(path: Path, num_images: int) -> None:
+    path.write_text(
+        "raw,seg1\n"
+        + "".join(f"raw_{i}.tif,seg_{i}.tif\n" for i in range(num_images))
+    )
+
+
+def test_get_quantized_path() -> None:
+    # Act
+    quantized_path: Path = get_quantized_path(
+        Path("home") / "exp" / "checkpoints" / "epoch=1.ckpt"
+    )
+
+    # Assert
+    assert (
+        quantized_path == Path("home") / "exp" / "onnx" / "epoch=1.int8.onnx"
+    )
+
+
+def test_is_quantized(tmp_path: Path) -> None:
+    # Arrange
+    ckpt: Path = tmp_path / "checkpoints" / "best.ckpt"
+    ckpt.parent.mkdir()
+    ckpt.write_text("weights")
+    get_onnx_path(ckpt).parent.mkdir()
+    get_onnx_path(ckpt).write_text("graph")
+    get_quantized_path(ckpt).write_text("int8 graph")
+    os.utime(ckpt, ns=(1, 1))
+
+    # Act / Assert
+    os.utime(get_onnx_path(ckpt), ns=(2, 2))
+    assert is_quantized(ckpt)
+    # exported again since quantizing
+    os.utime(get_quantized_path(ckpt), ns=(1, 1))
+    assert not is_quantized(ckpt)
+
+
+def test_get_calibration_images(tmp_path: Path) -> None:
+    # Arrange
+    train_csv: Path = tmp_path / "train.csv"
+    _write_train_csv(train_csv, 20)
+
+    # Act
+    images: List[Path] = get_calibration_images(train_csv, num_images=5)
+
+    # Assert
+    assert len(set(images)) == 5
+    assert all(image.name.startswith("raw_") for image in images)
+    # the same sample every time
+    assert get_calibration_images(train_csv, num_images=5) == images
+    # no more than there are
+    assert len(get_calibration_images(train_csv, num_images=50)) == 20
+
+
+def test_get_calibration_images_empty_csv(tmp_path: Path) -> None:
+    # Arrange
+    train_csv: Path = tmp_path / "train.csv"
+    _write_train_csv(train_csv, 0)
+
+    # Act / Assert
+    with pytest.raises(ValueError):
+        get_calibration_images(train_csv)
+
+
+def test_get_dice() -> None:
+    # Arrange
+    prediction: np.ndarray = np.array([[1, 1, 0, 0]])
+    truth: np.ndarray = np.array([[1, 0, 0, 0]])
+
+    # Act / Assert
+    assert get_dice(prediction, truth) == pytest.approx(2 / 3)
+    assert get_dice(truth, truth) == 1.0
+    assert get_dice(np.zeros((2, 2)), np.zeros((2, 2))) == 1.0
+
+
+def test_get_mean_dice(tmp_path: Path) -> None:
+    # Arrange
+    seg_dir: Path = tmp_path / "seg"
+    seg_dir.mkdir()
+    # probabilities rescaled to uint8, as cyto-dl saves them
+    prediction: np.ndarray = np.zeros((2, 4, 4), dtype=np.uint8)
+    prediction[:, :2] = 200
+    prediction[:, 2] = 100
+    tifffile.imwrite(seg_dir / "img.tif", prediction)
+    truth: np.ndarray = np.zeros((2, 4, 4), dtype=np.uint8)
+    truth[:, :2] = 1
+    tifffile.imwrite(tmp_path / "truth.tif", truth)
+
+    # Act
+    dice: float = get_mean_dice(
+        seg_dir, [Path("raw") / "img.czi"], [tmp_path / "truth.tif"]
+    )
+
+    # Assert
+    assert dice == pytest.approx(1.0)
+
+
+def test_quantization_report() -> None:
+    # Arrange
+    report: QuantizationReport = QuantizationReport(
+        num_images=4,
+        fp32_images_per_second=1.0,
+        int8_images_per_second=2.5,
+        fp32_dice=0.9,
+        int8_dice=0.88,
+    )
+
+    # Act / Assert
+    assert report.get_speedup() == pytest.approx(2.5)
+    assert report.get_dice_delta() == pytest.approx(-0.02)
+    assert "2.50x" in str(report)
+    assert "-0.0200" in str(report)
+
+
+def test_evaluate_quantization_predicts_from_split_csv(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    # Arrange
+    images_csv: Path = tmp_path / "test.csv"
+    _write_train_csv(images_csv, 2)
+    input_rows: List[Dict[str, str]] = []
+
+    def run_batch_prediction(
+        experiment_path: Path, input_csv: Path, output_dir: Path, **kwargs
+    ) -> BatchPredictionSummary:
+        with open(input_csv, newline="") as file:
+            input_rows.extend(csv.DictReader(file))
+        return BatchPredictionSummary(
+            num_images=2, setup_seconds=0.0, predict_seconds=1.0
+        )
+
+    monkeypatch.setattr(
+        batch_prediction, "run_batch_prediction", run_batch_prediction
+    )
+    monkeypatch.setattr(quantization, "get_mean_dice", lambda *args: 0.9)
+
+    # Act
+    report: QuantizationReport = evaluate_quantization(
+        tmp_path / "exp",
+        tmp_path / "exp" / "checkpoints" / "best.ckpt",
+        images_csv,
+        tmp_path / "out",
+    )
+
+    # Assert
+    # cyto-dl's datamodule needs both the raw and the split column
+    assert [(row["raw"], row["split"]) for row in input_rows] == [
+        ("raw_0.tif", "test"),
+        ("raw_1.tif", "test"),
+    ] * 2
+    assert report.num_images == 2
@@ -0,0 +1,63 @@
+import pytest
+
+from allencell_ml_segmenter.prediction.tiled_inference import (
+    BYTES_PER_TILE_VOXEL,
+    DEFAULT_TILE_DEPTH,
+    TILE_MULTIPLE,
+    BlendMode,
+    TiledInference,
+    get_tile_shape_for_budget,
+)
+
+
+@pytest.mark.parametrize("spatial_dims", [2, 3])
+def test_tile_shape_fits_budget(spatial_dims: int) -> None:
+    # Act
+    tile_shape = get_tile_shape_for_budget(512, spatial_dims)
+
+    # Assert
+    assert len(tile_shape) == spatial_dims
+    assert all(side % TILE_MULTIPLE == 0 for side in tile_shape)
+    voxels: int = 1
+    for side in tile_shape:
+        voxels *= side
+    assert voxels * BYTES_PER_TILE_VOXEL <= 512 * 1024 * 1024
+    # a bigger budget gives bigger tiles
+    assert get_tile_shape_for_budget(2048, spatial_dims)[-1] > tile_shape[-1]
+
+
+def test_tiny_budget_gives_smallest_tile() -> None:
+    # Act / Assert
+    assert get_tile_shape_for_budget(1, 3) == [
+        DEFAULT_TILE_DEPTH,
+        TILE_MULTIPLE,
+        TILE_MULTIPLE,
+    ]
+
+
+def test_overrides() -> None:
+    # Arrange
+    tiled_inference: TiledInference = TiledInference(
+        tile_shape=[16, 128, 128], overlap=0.5, blend_mode=BlendMode.CONSTANT
+    )
+
+    # Act
+    overrides = tiled_inference.get_overrides(3)
+
+    # Assert
+    assert overrides["model.inference_args.roi_size"] == [16, 128, 128]
+    assert overrides["model.inference_args.overlap"] == 0.5
+    assert overrides["model.inference_args.mode"] == "constant"
+    assert overrides["model.inference_args.device"] == "cpu"
+
+
+def test_invalid_settings() -> None:
+    # Act / Assert
+    with pytest.raises(ValueError):
+        TiledInference()
+    with pytest.raises(ValueError):
+        TiledInference(tile_shape=[128], memory_budget_mb=512)
+    with pytest.raises(ValueError):
+        TiledInference(memory_budget_mb=512, overlap=1.0)
+    with pytest.raises(ValueError):
+        TiledInference(tile_shape=[128, 128]).get_overrides(3)
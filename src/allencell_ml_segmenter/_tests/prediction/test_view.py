@@ -1,5 +1,6 @@
 from pathlib import Path
 
+import numpy as np
 import pytest
 from pytestqt.qtbot import QtBot
 
@@ -14,6 +15,7 @@ from allencell_ml_segmenter.prediction.model import (
 from allencell_ml_segmenter.core.image_data_extractor import (
     FakeImageDataExtractor,
 )
+from allencell_ml_segmenter.core.task_executor import SynchroTaskExecutor
 from allencell_ml_segmenter.prediction.view import PredictionView
 
 
@@ -73,6 +75,7 @@ def test_show_results(main_model: MainModel) -> None:
         prediction_model,
         fake_viewer,
         img_data_extractor=FakeImageDataExtractor.global_instance(),
+        task_executor=SynchroTaskExecutor.global_instance(),
     )
 
     # ACT
@@ -113,6 +116,7 @@ def test_show_results_non_empty_folder(main_model: MainModel) -> None:
         prediction_model,
         fake_viewer,
         img_data_extractor=FakeImageDataExtractor.global_instance(),
+        task_executor=SynchroTaskExecutor.global_instance(),
     )
 
     # ACT
@@ -125,3 +129,56 @@ def test_show_results_non_empty_folder(main_model: MainModel) -> None:
     assert fake_viewer.contains_layer("[seg] output_3.tiff")
     assert fake_viewer.contains_layer("[raw] output_4.tiff")
     assert fake_viewer.contains_layer("[seg] output_4.tiff")
+
+
+def test_results_shown_as_written(main_model: MainModel) -> None:
+    """
+    Testing that each segmentation is shown as soon as it is written, and
+    that showResults does not show it again
+    """
+    # ARRANGE
+    output_dir: Path = (
+        Path(allencell_ml_segmenter.__file__).parent
+        / "_tests"
+        / "test_files"
+        / "output_test_folder"
+    )
+    prediction_model: PredictionModel = PredictionModel()
+    prediction_model.set_output_directory(output_dir)
+    prediction_model.set_prediction_input_mode(
+        PredictionInputMode.FROM_NAPARI_LAYERS
+    )
+    prediction_model.set_image_input_channel_index(0)
+    fake_viewer: FakeViewer = FakeViewer()
+    fake_viewer.add_image(np.zeros((5, 5)), "input")
+    prediction_view: PredictionView = PredictionView(
+        main_model,
+        prediction_model,
+        fake_viewer,
+        img_data_extractor=FakeImageDataExtractor.global_instance(),
+        task_executor=SynchroTaskExecutor.global_instance(),
+    )
+    # as selected in the file input widget
+    prediction_model.set_selected_paths(
+        [Path("output_1.tiff"), Path("output_2.tiff")]
+    )
+    prediction_view._reset_results()
+
+    # ACT
+    prediction_view._on_prediction_written(
+        output_dir / "seg" / "output_2.tiff"
+    )
+
+    # ASSERT
+    assert not fake_viewer.contains_layer("input")
+    assert fake_viewer.contains_layer("[raw] output_2.tiff")
+    assert fake_viewer.contains_layer("[seg] output_2.tiff")
+    assert not fake_viewer.contains_layer("[raw] output_1.tiff")
+
+    # ACT
+    prediction_view.showResults()
+
+    # ASSERT
+    assert len(fake_viewer.get_all_labels()) == 2
+    assert len(fake_viewer.get_all_images()) == 2
+    assert fake_viewer.contains_layer("[seg] output_1.tiff")
@@ -0,0 +1,184 @@
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import pytest
+import torch
+from lightning import LightningModule
+
+from allencell_ml_segmenter.services import prediction_model_cache
+from allencell_ml_segmenter.services.prediction_model_cache import (
+    PredictionModelCache,
+)
+
+
+class TinyModel(LightningModule):
+    """
+    Stands in for a cyto-dl model: writes one file per prediction to its
+    save_dir, and counts how often it is built.
+    """
+
+    instances: int = 0
+
+    def __init__(
+        self, save_dir: str, inference_args: Optional[Dict[str, Any]] = None
+    ) -> None:
+        super().__init__()
+        self.save_hyperparameters("inference_args")
+        TinyModel.instances += 1
+        self.save_dir: str = save_dir
+        self.layer: torch.nn.Linear = torch.nn.Linear(1, 1)
+
+    def update_params(self, params: Dict[str, Any]) -> None:
+        for key, value in params.items():
+            setattr(self, key, value)
+
+    @property
+    def task_heads(self) -> Dict[str, "TinyModel"]:
+        # the model is its own only head
+        return {"seg": self}
+
+    def predict_step(self, batch: torch.Tensor, batch_idx: int) -> None:
+        Path(self.save_dir).mkdir(parents=True, exist_ok=True)
+        (Path(self.save_dir) / f"{batch_idx}.txt").write_text(
+            str(self.layer(batch).item())
+        )
+
+
+CONFIG: str = """
+model:
+  _target_: allencell_ml_segmenter._tests.services.test_prediction_model_cache.TinyModel
+  save_dir: ${paths.output_dir}
+  inference_args:
+    sw_batch_size: 1
+data:
+  _target_: torch.utils.data.DataLoader
+  dataset:
+    _target_: torch.ones
+    _args_: [2, 1]
+  batch_size: 1
+trainer:
+  _target_: lightning.Trainer
+  accelerator: cpu
+  enable_progress_bar: false
+  enable_model_summary: false
+  default_root_dir: ${paths.output_dir}
+checkpoint:
+  ckpt_path: null
+paths:
+  output_dir: null
+"""
+
+
+@pytest.fixture
+def config_path(tmp_path: Path) -> Path:
+    path: Path = tmp_path / "train_config.yaml"
+    path.write_text(CONFIG)
+    return path
+
+
+@pytest.fixture
+def ckpt(tmp_path: Path) -> Path:
+    path: Path = tmp_path / "model.ckpt"
+    model: torch.nn.Linear = torch.nn.Linear(1, 1)
+    torch.nn.init.constant_(model.weight, 2.0)
+    torch.nn.init.constant_(model.bias, 0.0)
+    torch.save(
+        {
+            "state_dict": {
+                f"layer.{k}": v for k, v in model.state_dict().items()
+            }
+        },
+        path,
+    )
+    return path
+
+
+def _overrides(ckpt: Path, output_dir: Path) -> Dict[str, Any]:
+    return {
+        "checkpoint.ckpt_path": str(ckpt),
+        "paths.output_dir": str(output_dir),
+    }
+
+
+def test_predict_reuses_model(
+    tmp_path: Path, config_path: Path, ckpt: Path
+) -> None:
+    # Arrange
+    cache: PredictionModelCache = PredictionModelCache()
+    TinyModel.instances = 0
+
+    # Act
+    cache.predict(config_path, _overrides(ckpt, tmp_path / "out_1"))
+    cache.predict(config_path, _overrides(ckpt, tmp_path / "out_2"))
+
+    # Assert
+    assert TinyModel.instances == 1
+    # predicted with the checkpoint's weights, into each run's output dir
+    for output_dir in ["out_1", "out_2"]:
+        outputs: List[Path] = sorted((tmp_path / output_dir).glob("*.txt"))
+        assert [float(path.read_text()) for path in outputs] == [2.0, 2.0]
+
+
+def test_predict_buckets_with_different_batch_sizes_reuses_model(
+    tmp_path: Path,
+    config_path: Path,
+    ckpt: Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    # Arrange
+    cache: PredictionModelCache = PredictionModelCache()
+    loaded: List[Any] = []
+    original_load_model: Any = prediction_model_cache.load_model
+
+    def load_model(cfg: Any) -> Any:
+        loaded.append(cfg)
+        return original_load_model(cfg)
+
+    monkeypatch.setattr(prediction_model_cache, "load_model", load_model)
+
+    # Act
+    for i, batch_size in enumerate([2, 1]):
+        cache.predict(
+            config_path,
+            {
+                **_overrides(ckpt, tmp_path / f"out_{i}"),
+                "model.inference_args.sw_batch_size": batch_size,
+            },
+        )
+
+    # Assert
+    assert len(loaded) == 1
+    # predicted with the last bucket's batch size
+    assert cache._model.hparams.inference_args == {"sw_batch_size": 1}
+
+
+def test_new_checkpoint_rebuilds_model(
+    tmp_path: Path, config_path: Path, ckpt: Path
+) -> None:
+    # Arrange
+    cache: PredictionModelCache = PredictionModelCache()
+    TinyModel.instances = 0
+    cache.predict(config_path, _overrides(ckpt, tmp_path / "out_1"))
+    new_ckpt: Path = tmp_path / "new_model.ckpt"
+    new_ckpt.write_bytes(ckpt.read_bytes())
+
+    # Act
+    cache.predict(config_path, _overrides(new_ckpt, tmp_path / "out_2"))
+
+    # Assert
+    assert TinyModel.instances == 2
+
+
+def test_release(tmp_path: Path, config_path: Path, ckpt: Path) -> None:
+    # Arrange
+    cache: PredictionModelCache = PredictionModelCache()
+    TinyModel.instances = 0
+    cache.predict(config_path, _overrides(ckpt, tmp_path / "out_1"))
+
+    # Act
+    cache.release()
+
+    # Assert
+    assert not cache.is_loaded()
+    cache.predict(config_path, _overrides(ckpt, tmp_path / "out_2"))
+    assert TinyModel.instances == 2
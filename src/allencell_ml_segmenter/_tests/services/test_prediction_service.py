@@ -1,6 +1,8 @@
 import csv
+import os
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import List, Dict, Union
+from typing import Any, List, Dict, Union
 
 from allencell_ml_segmenter._tests.fakes.fake_user_settings import (
     FakeUserSettings,
@@ -8,8 +10,22 @@ from allencell_ml_segmenter._tests.fakes.fake_user_settings import (
 from allencell_ml_segmenter.config.i_user_settings import IUserSettings
 from allencell_ml_segmenter.core.event import Event
 from allencell_ml_segmenter.main.experiments_model import ExperimentsModel
-from allencell_ml_segmenter.prediction.model import PredictionModel
+from allencell_ml_segmenter.prediction.model import (
+    PredictionModel,
+    PredictionBackend,
+    SIMPLE_THRESHOLD,
+    AUTO_THRESHOLD,
+)
+from allencell_ml_segmenter.prediction.batched_prediction import (
+    BatchedPrediction,
+)
+from allencell_ml_segmenter.prediction.tiled_inference import (
+    TiledInference,
+    get_tile_shape_for_budget,
+)
+import numpy as np
 import pytest
+import tifffile
 from unittest.mock import patch, MagicMock, mock_open, call
 
 from allencell_ml_segmenter.services.prediction_service import (
@@ -187,3 +203,351 @@ def test_write_csv_for_inputs() -> None:
     assert (
         call().writerow(["1", "image2", "test"]) in mock_csv_write.mock_calls
     )
+
+
+@pytest.fixture
+def sharding_service(tmp_path: Path) -> PredictionService:
+    experiments_model: ExperimentsModel = ExperimentsModel(
+        FakeUserSettings(user_experiments_path=tmp_path)
+    )
+    experiments_model.apply_experiment_name("exp")
+    prediction_model: PredictionModel = PredictionModel()
+    prediction_model.set_output_directory(tmp_path / "output")
+    service: PredictionService = PredictionService(
+        prediction_model, experiments_model
+    )
+    service.write_csv_for_inputs([Path(f"img_{i}.tiff") for i in range(5)])
+    return service
+
+
+def test_split_prediction_csv(
+    sharding_service: PredictionService, tmp_path: Path
+) -> None:
+    # Arrange
+    csv_path: Path = tmp_path / "exp" / "data" / "prediction_csv"
+    csv_path = csv_path / "test_csv.csv"
+
+    # Act
+    shards: List[Path] = sharding_service.split_prediction_csv(csv_path, 2)
+
+    # Assert
+    rows: List[List[List[str]]] = []
+    for shard in shards:
+        with open(shard) as file:
+            rows.append(list(csv.reader(file)))
+    assert [len(shard_rows) for shard_rows in rows] == [3, 4]
+    assert all(shard_rows[0] == ["", "raw", "split"] for shard_rows in rows)
+    assert [row[1] for row in rows[0][1:] + rows[1][1:]] == [
+        f"img_{i}.tiff" for i in range(5)
+    ]
+
+
+def test_split_prediction_csv_more_shards_than_images(
+    sharding_service: PredictionService, tmp_path: Path
+) -> None:
+    # Act
+    shards: List[Path] = sharding_service.split_prediction_csv(
+        tmp_path / "exp" / "data" / "prediction_csv" / "test_csv.csv", 8
+    )
+
+    # Assert
+    assert len(shards) == 5
+
+
+def test_run_sharded_prediction(sharding_service: PredictionService) -> None:
+    # Arrange
+    sharding_service._prediction_model.set_num_shards(3)
+    sharding_service._prediction_model.set_threads_per_shard(2)
+    predict_shard: MagicMock = MagicMock()
+
+    # Act
+    with patch(
+        "allencell_ml_segmenter.services.prediction_service.predict_shard",
+        predict_shard,
+    ):
+        sharding_service.run_sharded_prediction(
+            Path("model.ckpt"), executor=ThreadPoolExecutor(max_workers=3)
+        )
+
+    # Assert
+    assert predict_shard.call_count == 3
+    data_paths: List[str] = [
+        c.args[1]["data.path"] for c in predict_shard.call_args_list
+    ]
+    assert sorted(Path(p).name for p in data_paths) == [
+        f"test_csv_shard_{i}.csv" for i in range(3)
+    ]
+    assert all(c.args[2] == 2 for c in predict_shard.call_args_list)
+    assert all(
+        c.args[1]["checkpoint.ckpt_path"] == "model.ckpt"
+        for c in predict_shard.call_args_list
+    )
+
+
+def test_incremental_setup_only_includes_unpredicted(
+    tmp_path: Path,
+) -> None:
+    # Arrange
+    experiments_model: ExperimentsModel = ExperimentsModel(
+        FakeUserSettings(user_experiments_path=tmp_path)
+    )
+    experiments_model.apply_experiment_name("exp")
+    ckpt: Path = tmp_path / "model.ckpt"
+    ckpt.write_bytes(b"weights")
+    input_dir: Path = tmp_path / "input"
+    input_dir.mkdir()
+    for i in range(4):
+        (input_dir / f"img_{i}.tiff").write_bytes(b"0")
+    prediction_model: PredictionModel = PredictionModel()
+    prediction_model.set_input_image_path(input_dir)
+    prediction_model.set_output_directory(tmp_path / "output")
+    prediction_model.set_incremental(True)
+    service: PredictionService = PredictionService(
+        prediction_model, experiments_model, model_cache=None
+    )
+    service.setup_inputs_from_path(ckpt)
+    # the first run predicts 2 of the images, e.g. before it is cancelled
+    seg_dir: Path = tmp_path / "output" / "seg"
+    seg_dir.mkdir(parents=True)
+    for i in range(2):
+        (seg_dir / f"img_{i}.tif").write_bytes(b"seg")
+    with patch(
+        "allencell_ml_segmenter.services.prediction_service.CytoDLModel"
+    ):
+        service.run_prediction(ckpt)
+    prediction_model.set_input_image_path(input_dir)
+
+    # Act
+    num_images: int = service.setup_inputs_from_path(ckpt)
+
+    # Assert
+    assert num_images == 2
+    with open(
+        tmp_path / "exp" / "data" / "prediction_csv" / "test_csv.csv"
+    ) as file:
+        rows: List[List[str]] = list(csv.reader(file))
+    assert [Path(row[1]).name for row in rows[1:]] == [
+        "img_2.tiff",
+        "img_3.tiff",
+    ]
+
+
+def test_experiment_change_releases_model() -> None:
+    # Arrange
+    experiments_model: ExperimentsModel = ExperimentsModel(
+        FakeUserSettings(
+            cyto_dl_home_path=Path(__file__).parent / "cyto_dl_home",
+            user_experiments_path=Path(__file__).parent.parent
+            / "main"
+            / "experiments_home",
+        )
+    )
+    model_cache: MagicMock = MagicMock()
+    PredictionService(
+        PredictionModel(), experiments_model, model_cache=model_cache
+    )
+
+    # Act
+    experiments_model.apply_experiment_name("one_ckpt_exp")
+
+    # Assert
+    model_cache.release.assert_called_once()
+
+
+def test_build_overrides_tiled_from_budget(tmp_path: Path) -> None:
+    # Arrange
+    experiments_model: ExperimentsModel = ExperimentsModel(
+        FakeUserSettings(user_experiments_path=tmp_path)
+    )
+    experiments_model.apply_experiment_name("exp")
+    (tmp_path / "exp").mkdir()
+    (tmp_path / "exp" / "train_config.yaml").write_text("spatial_dims: 2\n")
+    prediction_model: PredictionModel = PredictionModel()
+    prediction_model.set_input_image_path(Path("fake_img_path"))
+    prediction_model.set_tiled_inference(TiledInference(memory_budget_mb=256))
+    service: PredictionService = PredictionService(
+        prediction_model, experiments_model
+    )
+
+    # Act
+    overrides: Dict[str, Any] = service.build_overrides(Path("fake.ckpt"))
+
+    # Assert
+    assert overrides["model.inference_args.roi_size"] == (
+        get_tile_shape_for_budget(256, 2)
+    )
+    assert overrides["model.inference_args.mode"] == "gaussian"
+
+
+def test_build_overrides_postprocessing(tmp_path: Path) -> None:
+    # Arrange
+    experiments_model: ExperimentsModel = ExperimentsModel(
+        FakeUserSettings(user_experiments_path=tmp_path)
+    )
+    prediction_model: PredictionModel = PredictionModel()
+    prediction_model.set_input_image_path(Path("fake_img_path"))
+    prediction_model.set_output_directory(tmp_path / "output")
+    prediction_model.set_postprocessing_method(SIMPLE_THRESHOLD)
+    prediction_model.set_postprocessing_simple_threshold(40)
+    service: PredictionService = PredictionService(
+        prediction_model, experiments_model
+    )
+
+    # Act
+    overrides: Dict[str, Any] = service.build_overrides(Path("fake.ckpt"))
+
+    # Assert
+    callback: Dict[str, Any] = overrides["callbacks.postprocessing"]
+    assert callback["seg_dir"] == str(tmp_path / "output" / "seg")
+    assert callback["output_dir"] == str(
+        prediction_model.get_output_seg_directory()
+    )
+    assert callback["input_csv"] == "${data.path}"
+    assert callback["simple_threshold"] == 40
+    assert prediction_model.get_output_seg_directory() == (
+        tmp_path / "output" / "postprocessed"
+    )
+
+
+def test_build_overrides_rejects_unsupported_auto_threshold(
+    tmp_path: Path,
+) -> None:
+    # Arrange
+    experiments_model: ExperimentsModel = ExperimentsModel(
+        FakeUserSettings(user_experiments_path=tmp_path)
+    )
+    prediction_model: PredictionModel = PredictionModel()
+    prediction_model.set_input_image_path(Path("fake_img_path"))
+    prediction_model.set_output_directory(tmp_path / "output")
+    prediction_model.set_postprocessing_method(AUTO_THRESHOLD)
+    prediction_model.set_postprocessing_auto_threshold("try all")
+    service: PredictionService = PredictionService(
+        prediction_model, experiments_model
+    )
+
+    # Act / Assert
+    with pytest.raises(ValueError):
+        service.build_overrides(Path("fake.ckpt"))
+
+
+def test_run_prediction_with_exported_onnx_model(tmp_path: Path) -> None:
+    # Arrange
+    experiments_model: ExperimentsModel = ExperimentsModel(
+        FakeUserSettings(user_experiments_path=tmp_path)
+    )
+    experiments_model.apply_experiment_name("exp")
+    (tmp_path / "exp" / "checkpoints").mkdir(parents=True)
+    (tmp_path / "exp" / "onnx").mkdir()
+    (tmp_path / "exp" / "train_config.yaml").write_text("spatial_dims: 2\n")
+    ckpt: Path = tmp_path / "exp" / "checkpoints" / "best.ckpt"
+    ckpt.write_text("weights")
+    onnx_path: Path = tmp_path / "exp" / "onnx" / "best.onnx"
+    onnx_path.write_text("graph")
+    # exported after the checkpoint was written
+    os.utime(ckpt, ns=(1, 1))
+    prediction_model: PredictionModel = PredictionModel()
+    prediction_model.set_input_image_path(Path("fake_img_path"))
+    prediction_model.set_output_directory(tmp_path / "output")
+    prediction_model.set_backend(PredictionBackend.ONNX)
+    model_cache: MagicMock = MagicMock()
+    service: PredictionService = PredictionService(
+        prediction_model, experiments_model, model_cache=model_cache
+    )
+
+    # Act
+    with patch(
+        "allencell_ml_segmenter.services.prediction_service.export_to_onnx"
+    ) as export:
+        service.run_prediction(ckpt)
+
+    # Assert
+    export.assert_not_called()
+    assert model_cache.predict.call_args.args[2] == onnx_path
+
+
+def test_torch_backend_has_no_onnx_model(tmp_path: Path) -> None:
+    # Arrange
+    service: PredictionService = PredictionService(
+        PredictionModel(),
+        ExperimentsModel(FakeUserSettings(user_experiments_path=tmp_path)),
+        model_cache=None,
+    )
+
+    # Act / Assert
+    assert service.get_onnx_model(tmp_path / "best.ckpt") is None
+
+
+def test_run_prediction_with_quantized_model(tmp_path: Path) -> None:
+    # Arrange
+    experiments_model: ExperimentsModel = ExperimentsModel(
+        FakeUserSettings(user_experiments_path=tmp_path)
+    )
+    experiments_model.apply_experiment_name("exp")
+    (tmp_path / "exp" / "checkpoints").mkdir(parents=True)
+    (tmp_path / "exp" / "onnx").mkdir()
+    (tmp_path / "exp" / "train_config.yaml").write_text("spatial_dims: 2\n")
+    ckpt: Path = tmp_path / "exp" / "checkpoints" / "best.ckpt"
+    ckpt.write_text("weights")
+    (tmp_path / "exp" / "onnx" / "best.onnx").write_text("graph")
+    quantized_path: Path = tmp_path / "exp" / "onnx" / "best.int8.onnx"
+    quantized_path.write_text("int8 graph")
+    os.utime(ckpt, ns=(1, 1))
+    prediction_model: PredictionModel = PredictionModel()
+    prediction_model.set_input_image_path(Path("fake_img_path"))
+    prediction_model.set_output_directory(tmp_path / "output")
+    prediction_model.set_backend(PredictionBackend.ONNX_INT8)
+    model_cache: MagicMock = MagicMock()
+    service: PredictionService = PredictionService(
+        prediction_model, experiments_model, model_cache=model_cache
+    )
+
+    # Act
+    with patch(
+        "allencell_ml_segmenter.services.prediction_service.quantize"
+    ) as quantize:
+        service.run_prediction(ckpt)
+
+    # Assert
+    quantize.assert_not_called()
+    assert model_cache.predict.call_args.args[2] == quantized_path
+
+
+def test_run_batched_prediction(tmp_path: Path) -> None:
+    # Arrange
+    experiments_model: ExperimentsModel = ExperimentsModel(
+        FakeUserSettings(user_experiments_path=tmp_path)
+    )
+    experiments_model.apply_experiment_name("exp")
+    (tmp_path / "exp").mkdir()
+    (tmp_path / "exp" / "train_config.yaml").write_text(
+        "model:\n  inference_args:\n    roi_size: [16, 16]\n"
+    )
+    images: List[Path] = []
+    for i, shape in enumerate([[16, 16], [32, 32], [16, 16]]):
+        images.append(tmp_path / f"{i}.tif")
+        tifffile.imwrite(images[-1], np.zeros(shape, dtype=np.uint8))
+    prediction_model: PredictionModel = PredictionModel()
+    prediction_model.set_output_directory(tmp_path / "output")
+    prediction_model.set_batched_prediction(BatchedPrediction())
+    model_cache: MagicMock = MagicMock()
+    service: PredictionService = PredictionService(
+        prediction_model, experiments_model, model_cache=model_cache
+    )
+    service.write_csv_for_inputs(images)
+
+    # Act
+    service.run_batched_prediction(Path("fake.ckpt"))
+
+    # Assert
+    assert model_cache.predict.call_count == 2
+    bucket_sizes: List[int] = []
+    for predict_call in model_cache.predict.call_args_list:
+        overrides: Dict[str, Any] = predict_call.args[1]
+        assert overrides["model.inference_args.sw_batch_size"] == (
+            overrides["data.batch_size"]
+        )
+        bucket_sizes.append(overrides["data.batch_size"])
+        with open(overrides["data.path"], "r", newline="") as file:
+            rows: List[Dict[str, str]] = list(csv.DictReader(file))
+        assert len(rows) == overrides["data.batch_size"]
+    assert bucket_sizes == [2, 1]
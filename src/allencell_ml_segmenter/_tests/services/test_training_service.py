@@ -1,5 +1,9 @@
 from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+from unittest.mock import Mock
+
 import pytest
+from omegaconf import DictConfig, OmegaConf
 from pytestqt.qtbot import QtBot
 
 from allencell_ml_segmenter._tests.fakes.fake_user_settings import (
@@ -8,9 +12,11 @@ from allencell_ml_segmenter._tests.fakes.fake_user_settings import (
 from allencell_ml_segmenter.core.image_data_extractor import (
     FakeImageDataExtractor,
 )
+from allencell_ml_segmenter.core.task_executor import SynchroTaskExecutor
 from allencell_ml_segmenter.main.experiments_model import ExperimentsModel
 from allencell_ml_segmenter.main.main_model import MainModel
 
+from allencell_ml_segmenter.services import training_service
 from allencell_ml_segmenter.services.training_service import (
     TrainingService,
 )
@@ -18,6 +24,18 @@ from allencell_ml_segmenter.training.training_model import (
     TrainingModel,
     ImageType,
 )
+from allencell_ml_segmenter.training.patch_size_recommender import (
+    PatchSizeRecommendation,
+)
+from allencell_ml_segmenter.training.training_runner import (
+    MESSAGE_EPOCH,
+    MESSAGE_STARTED,
+    TrainingResult,
+)
+from allencell_ml_segmenter.config.loader_settings import (
+    LoaderSettings,
+    get_machine_id,
+)
 import allencell_ml_segmenter
 
 
@@ -71,3 +89,275 @@ def test_service_reacts_to_image_dir_set(
         ]
     ):
         training_model.set_images_directory(img_dir)
+
+
+def test_service_recommends_patch_size(
+    qtbot: QtBot,
+    training_model: TrainingModel,
+    experiments_model: ExperimentsModel,
+) -> None:
+    # Arrange
+    service: TrainingService = TrainingService(
+        training_model,
+        experiments_model,
+        img_data_extractor=FakeImageDataExtractor.global_instance(),
+        task_executor=SynchroTaskExecutor.global_instance(),
+    )
+    img_dir: Path = (
+        Path(allencell_ml_segmenter.__file__).parent
+        / "_tests"
+        / "test_files"
+        / "multiple_csv"
+    )
+
+    # Act
+    training_model.set_images_directory(img_dir)
+
+    # Assert
+    # the fake images are 3 x 2 x 1 (ZYX), smaller than the smallest patch,
+    # so they are patched whole
+    recommendation: Optional[PatchSizeRecommendation] = (
+        training_model.get_patch_size_recommendation()
+    )
+    assert recommendation is not None
+    assert recommendation.patch_size == [3, 2, 1]
+    assert training_model.get_image_shape() == [3, 2, 1]
+
+    # a larger model needs more memory for the same patch
+    with qtbot.waitSignal(training_model.signals.patch_size_recommended):
+        training_model.set_model_size("large")
+
+
+class FakeCytoDLModel:
+    """
+    Stands in for cyto-dl's api model, with an empty default config.
+    """
+
+    def __init__(self) -> None:
+        self.cfg: DictConfig = OmegaConf.create({})
+
+    def load_default_experiment(self, experiment_type: str, **kwargs) -> None:
+        pass
+
+    def override_config(self, overrides: Dict[str, Any]) -> None:
+        for key, value in overrides.items():
+            OmegaConf.update(self.cfg, key, value)
+
+    def print_config(self) -> None:
+        pass
+
+    def save_config(self, path: Path) -> None:
+        OmegaConf.save(self.cfg, path)
+
+
+def test_prepare_dataset(
+    monkeypatch: pytest.MonkeyPatch,
+    training_model: TrainingModel,
+    experiments_model: ExperimentsModel,
+) -> None:
+    # Arrange
+    prepare_dataset: Mock = Mock()
+    monkeypatch.setattr(training_service, "CytoDLModel", FakeCytoDLModel)
+    monkeypatch.setattr(training_service, "prepare_dataset", prepare_dataset)
+    TrainingService(
+        training_model,
+        experiments_model,
+        img_data_extractor=FakeImageDataExtractor.global_instance(),
+    )
+    experiments_model.apply_experiment_name("0_exp")
+    training_model.set_spatial_dims(2)
+    # set directly, so that the service does not read images that do not exist
+    training_model._images_directory = Path("images")
+    training_model.set_patch_size([8, 8])
+    training_model.set_num_epochs(1)
+    training_model.set_model_size("small")
+
+    # Act
+    training_model.dispatch_dataset_preparation()
+
+    # Assert
+    prepare_dataset.assert_called_once()
+    cfg: DictConfig = prepare_dataset.call_args.args[0]
+    assert cfg.data.path == "images"
+    assert Path(cfg.data.cache_dir).parent == (
+        experiments_model.get_user_experiments_path() / ".datasets"
+    )
+
+
+class FakeTrainingRunner:
+    """
+    Stands in for the training runner, failing after an epoch as training
+    would.
+    """
+
+    def __init__(
+        self,
+        config_path: Path,
+        on_message: Optional[Callable[[str, Any], None]] = None,
+    ) -> None:
+        self.config_path: Path = config_path
+        self.on_message: Optional[Callable[[str, Any], None]] = on_message
+        self.num_threads: Optional[int] = None
+        self.cancelled: bool = False
+
+    def run(self, num_threads: Optional[int] = None) -> TrainingResult:
+        self.num_threads = num_threads
+        if self.on_message is not None:
+            self.on_message(MESSAGE_STARTED, 2)
+            self.on_message(MESSAGE_EPOCH, 1)
+        return TrainingResult(
+            exit_code=1, cancelled=False, error="RuntimeError: out of memory"
+        )
+
+    def cancel(self) -> None:
+        self.cancelled = True
+
+
+def test_cancel_dataset_preparation(
+    monkeypatch: pytest.MonkeyPatch,
+    training_model: TrainingModel,
+    experiments_model: ExperimentsModel,
+) -> None:
+    # Arrange
+    cancelled: List[bool] = []
+
+    def prepare_dataset(cfg: DictConfig, cancel_event: Any) -> None:
+        # cancelled from the UI while preparing
+        training_model.dispatch_dataset_preparation_cancel()
+        cancelled.append(cancel_event.is_set())
+
+    monkeypatch.setattr(training_service, "CytoDLModel", FakeCytoDLModel)
+    monkeypatch.setattr(training_service, "prepare_dataset", prepare_dataset)
+    service: TrainingService = TrainingService(
+        training_model,
+        experiments_model,
+        img_data_extractor=FakeImageDataExtractor.global_instance(),
+    )
+    experiments_model.apply_experiment_name("0_exp")
+    training_model.set_spatial_dims(2)
+    # set directly, so that the service does not read images that do not exist
+    training_model._images_directory = Path("images")
+    training_model.set_patch_size([8, 8])
+    training_model.set_num_epochs(1)
+    training_model.set_model_size("small")
+
+    # Act
+    training_model.dispatch_dataset_preparation()
+
+    # Assert
+    assert cancelled == [True]
+    assert service._preparation_cancel_event is None
+
+
+def test_train_in_subprocess(
+    monkeypatch: pytest.MonkeyPatch,
+    tmp_path: Path,
+    training_model: TrainingModel,
+    experiments_model: ExperimentsModel,
+) -> None:
+    # Arrange
+    runners: List[FakeTrainingRunner] = []
+
+    def create_runner(
+        config_path: Path, on_message: Callable[[str, Any], None]
+    ) -> FakeTrainingRunner:
+        runners.append(FakeTrainingRunner(config_path, on_message))
+        return runners[-1]
+
+    monkeypatch.setattr(training_service, "CytoDLModel", FakeCytoDLModel)
+    monkeypatch.setattr(training_service, "TrainingRunner", create_runner)
+    config_path: Path = tmp_path / "train_config.yaml"
+    monkeypatch.setattr(
+        experiments_model, "get_train_config_path", lambda: config_path
+    )
+    experiments_model.get_user_settings().set_loader_settings(
+        LoaderSettings(num_workers=2, num_threads=3, machine=get_machine_id())
+    )
+    TrainingService(
+        training_model,
+        experiments_model,
+        img_data_extractor=FakeImageDataExtractor.global_instance(),
+    )
+    experiments_model.apply_experiment_name("0_exp")
+    training_model.set_spatial_dims(2)
+    # set directly, so that the service does not read images that do not exist
+    training_model._images_directory = Path("images")
+    training_model.set_patch_size([8, 8])
+    training_model.set_num_epochs(1)
+    training_model.set_model_size("small")
+
+    # Act
+    training_model.dispatch_training()
+
+    # Assert
+    # trained with the saved config, and the tuned torch threads
+    assert len(runners) == 1
+    assert runners[0].config_path == config_path
+    assert OmegaConf.load(config_path).data.path == "images"
+    assert runners[0].num_threads == 3
+    # progress reported by the training process
+    assert training_model.get_epochs_trained() == 1
+    assert training_model.get_epochs_to_train() == 2
+    assert training_model.get_training_error() == (
+        "RuntimeError: out of memory"
+    )
+
+
+def test_train_clears_runner_when_set_up_fails(
+    monkeypatch: pytest.MonkeyPatch,
+    tmp_path: Path,
+    training_model: TrainingModel,
+    experiments_model: ExperimentsModel,
+) -> None:
+    # Arrange
+    monkeypatch.setattr(training_service, "CytoDLModel", FakeCytoDLModel)
+    monkeypatch.setattr(training_service, "TrainingRunner", FakeTrainingRunner)
+    monkeypatch.setattr(
+        experiments_model,
+        "get_train_config_path",
+        lambda: tmp_path / "train_config.yaml",
+    )
+    service: TrainingService = TrainingService(
+        training_model,
+        experiments_model,
+        img_data_extractor=FakeImageDataExtractor.global_instance(),
+    )
+
+    def get_training_config() -> None:
+        raise RuntimeError("invalid config")
+
+    monkeypatch.setattr(service, "_get_training_config", get_training_config)
+    experiments_model.apply_experiment_name("0_exp")
+    training_model.set_spatial_dims(2)
+    # set directly, so that the service does not read images that do not exist
+    training_model._images_directory = Path("images")
+    training_model.set_patch_size([8, 8])
+    training_model.set_num_epochs(1)
+    training_model.set_model_size("small")
+
+    # Act
+    with pytest.raises(RuntimeError):
+        training_model.dispatch_training()
+
+    # Assert
+    assert service._training_runner is None
+
+
+def test_cancel_training(
+    training_model: TrainingModel,
+    experiments_model: ExperimentsModel,
+) -> None:
+    # Arrange
+    service: TrainingService = TrainingService(
+        training_model,
+        experiments_model,
+        img_data_extractor=FakeImageDataExtractor.global_instance(),
+    )
+    runner: FakeTrainingRunner = FakeTrainingRunner(Path("train_config.yaml"))
+    service._training_runner = runner  # type: ignore
+
+    # Act
+    training_model.dispatch_training_cancel()
+
+    # Assert
+    assert runner.cancelled
@@ -0,0 +1,285 @@
+import multiprocessing
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+import pytest
+from monai.data import Dataset, PersistentDataset
+from monai.transforms import Lambdad
+from omegaconf import DictConfig, OmegaConf
+
+import allencell_ml_segmenter
+from allencell_ml_segmenter._tests.fakes.fake_experiments_model import (
+    FakeExperimentsModel,
+)
+from allencell_ml_segmenter.main.main_model import MainModel
+from allencell_ml_segmenter.training.dataset_preparation import (
+    DatasetPreparationSummary,
+    count_dataset_items,
+    get_cache_file,
+    get_dataset_cache_dir,
+    get_dataset_overrides,
+    main,
+    prepare_dataset,
+)
+from allencell_ml_segmenter.training.training_model import (
+    ImageType,
+    TrainingModel,
+)
+
+
+def _double(x: int) -> int:
+    return 2 * x
+
+
+class TinyDatamodule:
+    """
+    Stands in for a cyto-dl dataframe datamodule: :param num_items: integers
+    per split, cached doubled for the train and val splits.
+    """
+
+    def __init__(self, path: str, cache_dir: str, num_items: int) -> None:
+        data: List[Dict[str, Any]] = [
+            {"raw": i, "path": path} for i in range(num_items)
+        ]
+        transform: Lambdad = Lambdad(keys="raw", func=_double)
+        self.datasets: Dict[str, Dataset] = {
+            split: PersistentDataset(
+                data, transform=transform, cache_dir=Path(cache_dir) / split
+            )
+            for split in ["train", "val"]
+        }
+        self.datasets["test"] = Dataset(data, transform=transform)
+
+
+def _get_config(tmp_path: Path, num_items: int = 3) -> DictConfig:
+    return OmegaConf.create(
+        {
+            "data": {
+                "_target_": f"{__name__}.TinyDatamodule",
+                "path": str(tmp_path),
+                "cache_dir": str(tmp_path / "cache"),
+                "num_items": num_items,
+                "_aux": {"patch_shape": [4, 4]},
+            }
+        }
+    )
+
+
+@pytest.fixture
+def training_model() -> TrainingModel:
+    model: TrainingModel = TrainingModel(MainModel(), FakeExperimentsModel())
+    model.set_images_directory(Path("images"))
+    model.set_spatial_dims(3)
+    model.set_patch_size([4, 8, 8])
+    model.set_selected_channel(ImageType.RAW, 1)
+    model.set_selected_channel(ImageType.SEG1, 0)
+    return model
+
+
+def test_get_dataset_overrides(training_model: TrainingModel) -> None:
+    # Act
+    overrides: Dict[str, Any] = get_dataset_overrides(training_model)
+
+    # Assert
+    assert overrides == {
+        "data.path": "images",
+        "data._aux.patch_shape": [4, 8, 8],
+        "spatial_dims": 3,
+        "input_channel": 1,
+        "target_col1_channel": 0,
+    }
+
+
+def test_get_dataset_overrides_without_images() -> None:
+    # Arrange
+    model: TrainingModel = TrainingModel(MainModel(), FakeExperimentsModel())
+    model.set_patch_size([4, 8, 8])
+
+    # Act / Assert
+    with pytest.raises(ValueError):
+        get_dataset_overrides(model)
+
+
+def test_get_dataset_cache_dir(
+    training_model: TrainingModel, tmp_path: Path
+) -> None:
+    # Arrange
+    overrides: Dict[str, Any] = get_dataset_overrides(training_model)
+
+    # Act
+    cache_dir: Path = get_dataset_cache_dir(tmp_path, overrides)
+
+    # Assert
+    assert cache_dir.parent == tmp_path / ".datasets"
+    assert get_dataset_cache_dir(tmp_path, dict(overrides)) == cache_dir
+    # the same images by another path
+    assert (
+        get_dataset_cache_dir(
+            tmp_path,
+            {**overrides, "data.path": str(Path("images").resolve())},
+        )
+        == cache_dir
+    )
+    assert (
+        get_dataset_cache_dir(
+            tmp_path, {**overrides, "data._aux.patch_shape": [8, 8, 8]}
+        )
+        != cache_dir
+    )
+
+
+def test_get_dataset_cache_dir_changes_with_images(
+    training_model: TrainingModel, tmp_path: Path
+) -> None:
+    # Arrange
+    image: Path = tmp_path / "raw.tiff"
+    image.write_bytes(b"raw")
+    images_directory: Path = tmp_path / "images"
+    images_directory.mkdir()
+    (images_directory / "train.csv").write_text(f",raw\n0,{image}\n")
+    overrides: Dict[str, Any] = {
+        **get_dataset_overrides(training_model),
+        "data.path": str(images_directory),
+    }
+    cache_dir: Path = get_dataset_cache_dir(tmp_path, overrides)
+
+    # Act
+    # re-curated at the same path
+    image.write_bytes(b"raw, edited")
+
+    # Assert
+    assert get_dataset_cache_dir(tmp_path, overrides) != cache_dir
+    assert get_dataset_cache_dir(tmp_path, overrides) == (
+        get_dataset_cache_dir(tmp_path, overrides)
+    )
+
+
+def test_count_dataset_items() -> None:
+    # Arrange
+    images_directory: Path = (
+        Path(allencell_ml_segmenter.__file__).parent
+        / "_tests"
+        / "test_files"
+        / "multiple_csv"
+    )
+
+    # Act / Assert
+    # three rows in each of train.csv and val.csv, test.csv is not cached
+    assert count_dataset_items(images_directory) == 6
+
+
+def test_prepare_dataset(tmp_path: Path) -> None:
+    # Arrange
+    progress: List[int] = []
+
+    # Act
+    summary: DatasetPreparationSummary = prepare_dataset(
+        _get_config(tmp_path),
+        max_workers=1,
+        progress_callback=lambda done, total: progress.append(done),
+    )
+
+    # Assert
+    assert summary == DatasetPreparationSummary(num_items=6, num_skipped=0)
+    assert progress == [0, 1, 2, 3, 4, 5, 6]
+    datamodule: TinyDatamodule = TinyDatamodule(
+        str(tmp_path), str(tmp_path / "cache"), 3
+    )
+    for split in ["train", "val"]:
+        for i in range(3):
+            assert get_cache_file(datamodule.datasets[split], i).is_file()
+    assert not (tmp_path / "cache" / "test").exists()
+
+
+def test_prepare_dataset_resumes(tmp_path: Path) -> None:
+    # Arrange
+    prepare_dataset(_get_config(tmp_path), max_workers=1)
+    datamodule: TinyDatamodule = TinyDatamodule(
+        str(tmp_path), str(tmp_path / "cache"), 3
+    )
+    get_cache_file(datamodule.datasets["val"], 1).unlink()
+
+    # Act
+    summary: DatasetPreparationSummary = prepare_dataset(
+        _get_config(tmp_path), max_workers=1
+    )
+
+    # Assert
+    assert summary.num_skipped == 5
+    assert summary.get_num_cached() == 1
+    assert get_cache_file(datamodule.datasets["val"], 1).is_file()
+
+
+def test_prepare_dataset_in_processes(tmp_path: Path) -> None:
+    # Act
+    summary: DatasetPreparationSummary = prepare_dataset(
+        _get_config(tmp_path, num_items=4), max_workers=2
+    )
+
+    # Assert
+    assert summary.get_num_cached() == 8
+    assert len(list((tmp_path / "cache").rglob("*.pt"))) == 8
+
+
+def test_prepare_dataset_cancelled(tmp_path: Path) -> None:
+    # Arrange
+    cancel_event: threading.Event = threading.Event()
+
+    # Act
+    prepare_dataset(
+        _get_config(tmp_path),
+        max_workers=1,
+        progress_callback=lambda done, total: (
+            cancel_event.set() if done == 2 else None
+        ),
+        cancel_event=cancel_event,
+    )
+
+    # Assert
+    assert len(list((tmp_path / "cache").rglob("*.pt"))) == 2
+
+
+def test_prepare_dataset_in_processes_cancelled(tmp_path: Path) -> None:
+    # Arrange
+    cancel_event: threading.Event = threading.Event()
+
+    # Act
+    prepare_dataset(
+        _get_config(tmp_path, num_items=20),
+        max_workers=2,
+        progress_callback=lambda done, total: (
+            cancel_event.set() if done > 0 else None
+        ),
+        cancel_event=cancel_event,
+    )
+
+    # Assert
+    # the workers are reaped, so nothing is cached after returning
+    assert multiprocessing.active_children() == []
+    num_cached: int = len(list((tmp_path / "cache").rglob("*.pt")))
+    assert num_cached < 40
+    time.sleep(0.5)
+    assert len(list((tmp_path / "cache").rglob("*.pt"))) == num_cached
+
+
+def test_prepare_dataset_without_cache_dir(tmp_path: Path) -> None:
+    # Arrange
+    cfg: DictConfig = _get_config(tmp_path)
+    cfg.data.cache_dir = None
+
+    # Act / Assert
+    with pytest.raises(ValueError):
+        prepare_dataset(cfg)
+
+
+def test_main(tmp_path: Path) -> None:
+    # Arrange
+    config_path: Path = tmp_path / "train_config.yaml"
+    OmegaConf.save(_get_config(tmp_path), config_path)
+
+    # Act / Assert
+    assert main(["--config", str(config_path), "--workers", "1"]) == 0
+    assert len(list((tmp_path / "cache").rglob("*.pt"))) == 6
+    assert main(["--config", str(tmp_path / "missing.yaml")]) == 1
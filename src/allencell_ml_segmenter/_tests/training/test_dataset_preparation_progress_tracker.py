@@ -0,0 +1,33 @@
+from pathlib import Path
+
+from allencell_ml_segmenter.training.dataset_preparation_progress_tracker import (
+    DatasetPreparationProgressTracker,
+)
+
+
+def test_counts_files_cached_before(tmp_path: Path) -> None:
+    # Arrange
+    (tmp_path / "cache" / "train").mkdir(parents=True)
+    (tmp_path / "cache" / "train" / "a.pt").write_text("")
+    (tmp_path / "cache" / "train" / "b.pt").write_text("")
+
+    # Act
+    tracker: DatasetPreparationProgressTracker = (
+        DatasetPreparationProgressTracker(tmp_path / "cache", 4)
+    )
+
+    # Assert
+    assert tracker.get_progress() == 2
+    assert tracker.get_progress_maximum() == 4
+    assert tracker.get_label_text() == "Files cached: 2 / 4"
+
+
+def test_creates_cache_dir(tmp_path: Path) -> None:
+    # Act
+    tracker: DatasetPreparationProgressTracker = (
+        DatasetPreparationProgressTracker(tmp_path / "cache", 4)
+    )
+
+    # Assert
+    assert (tmp_path / "cache").is_dir()
+    assert tracker.get_progress() == 0
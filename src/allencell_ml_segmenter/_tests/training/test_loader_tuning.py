@@ -0,0 +1,115 @@
+import csv
+import time
+from pathlib import Path
+from typing import Dict, List
+
+import pytest
+from omegaconf import DictConfig, OmegaConf
+from torch.utils.data import DataLoader
+
+from allencell_ml_segmenter.config.loader_settings import LoaderSettings
+from allencell_ml_segmenter.training import loader_tuning
+from allencell_ml_segmenter.training.loader_tuning import (
+    Candidate,
+    get_candidates,
+    tune_loader,
+)
+
+
+class FastWithTwoWorkersDatamodule:
+    """
+    Stands in for a cyto-dl dataframe datamodule over the rows of the
+    train.csv at :param path:, which starts loading more slowly with any
+    number of workers but two. Loads in the main process either way.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        cache_dir: None,
+        num_workers: int,
+        batch_size: int,
+    ) -> None:
+        assert cache_dir is None
+        with open(Path(path) / "train.csv", newline="") as fr:
+            self.rows: List[Dict[str, str]] = list(csv.DictReader(fr))
+        self.num_workers: int = num_workers
+        self.batch_size: int = batch_size
+
+    def train_dataloader(self) -> DataLoader:
+        if self.num_workers != 2:
+            time.sleep(0.2)
+        return DataLoader(
+            [int(row["raw"]) for row in self.rows], batch_size=self.batch_size
+        )
+
+
+def _get_config(tmp_path: Path) -> DictConfig:
+    with open(tmp_path / "train.csv", "w", newline="") as fw:
+        writer: csv.DictWriter = csv.DictWriter(fw, fieldnames=["raw"])
+        writer.writeheader()
+        writer.writerows([{"raw": i} for i in range(100)])
+    return OmegaConf.create(
+        {
+            "data": {
+                "_target_": f"{__name__}.FastWithTwoWorkersDatamodule",
+                "path": str(tmp_path),
+                "cache_dir": str(tmp_path / "cache"),
+                "num_workers": 0,
+                "batch_size": 2,
+                "_aux": {"patch_shape": [4, 4]},
+            }
+        }
+    )
+
+
+def test_get_candidates() -> None:
+    # Act / Assert
+    assert get_candidates(1, can_use_workers=True) == [(0, 1)]
+    assert get_candidates(4, can_use_workers=True) == [
+        (0, 4),
+        (0, 2),
+        (1, 3),
+        (1, 1),
+        (2, 2),
+        (2, 1),
+    ]
+    assert get_candidates(8, can_use_workers=False) == [(0, 8), (0, 4)]
+
+
+def test_tune_loader_picks_fastest(tmp_path: Path) -> None:
+    # Act
+    settings: LoaderSettings = tune_loader(
+        _get_config(tmp_path), candidates=[(0, 2), (2, 1), (4, 1)]
+    )
+
+    # Assert
+    assert (settings.num_workers, settings.num_threads) == (2, 1)
+    assert settings.is_for_this_machine()
+    # the probe neither reads nor writes the dataset cache
+    assert not (tmp_path / "cache").exists()
+
+
+def test_tune_loader_warms_up_before_timing(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    # Arrange
+    probed: List[Candidate] = []
+
+    def probe_loader(
+        data_cfg: DictConfig, candidate: Candidate, num_batches: int
+    ) -> float:
+        probed.append(candidate)
+        # the first pass reads the files from disk, and would otherwise win
+        return 10.0 if len(probed) == 1 else 1.0 / len(probed)
+
+    monkeypatch.setattr(loader_tuning, "probe_loader", probe_loader)
+
+    # Act
+    settings: LoaderSettings = tune_loader(
+        _get_config(tmp_path), candidates=[(0, 2), (2, 1)]
+    )
+
+    # Assert
+    assert probed[1:] == [(0, 2), (2, 1)]
+    assert (settings.num_workers, settings.num_threads) == (2, 1)
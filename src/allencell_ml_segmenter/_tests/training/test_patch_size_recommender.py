@@ -0,0 +1,146 @@
+from typing import List, Optional
+
+from allencell_ml_segmenter.training.patch_size_recommender import (
+    MAX_BATCH_SIZE,
+    MEMORY_HEADROOM,
+    PatchSizeRecommendation,
+    can_allocate,
+    estimate_training_bytes,
+    get_candidate_patch_sizes,
+    recommend_patch_size,
+)
+from allencell_ml_segmenter.training.training_model import ModelSize
+
+FILTERS: List[int] = ModelSize.MEDIUM.value
+
+
+def test_candidate_patch_sizes_fit_image() -> None:
+    # Act
+    candidates: List[List[int]] = get_candidate_patch_sizes([40, 300, 100], 3)
+
+    # Assert
+    assert candidates[0] == [32, 288, 96]
+    assert candidates[-1] == [16, 16, 16]
+    for z, y, x in candidates:
+        assert z % 16 == 0 and y % 16 == 0 and x % 16 == 0
+
+
+def test_candidate_patch_sizes_of_thin_image() -> None:
+    # Act
+    candidates: List[List[int]] = get_candidate_patch_sizes([10, 64, 64], 3)
+
+    # Assert
+    # no larger than the image along z
+    assert candidates == [[10, 64, 64], [10, 32, 32], [10, 16, 16]]
+
+
+def test_candidate_patch_sizes_2d() -> None:
+    # Act
+    candidates: List[List[int]] = get_candidate_patch_sizes([1, 64, 64], 2)
+
+    # Assert
+    assert candidates == [[1, 64, 64], [1, 32, 32], [1, 16, 16]]
+
+
+def test_estimate_grows_with_patch_batch_and_model() -> None:
+    # Arrange
+    small: int = estimate_training_bytes([16, 64, 64], 1, 1, 1, FILTERS)
+
+    # Act / Assert
+    assert estimate_training_bytes([16, 64, 64], 2, 1, 1, FILTERS) == (
+        2 * small
+    )
+    assert estimate_training_bytes([32, 64, 64], 1, 1, 1, FILTERS) > small
+    assert (
+        estimate_training_bytes([16, 64, 64], 1, 1, 1, ModelSize.LARGE.value)
+        > small
+    )
+
+
+def test_recommends_largest_patch_that_fits() -> None:
+    # Arrange
+    per_patch: int = estimate_training_bytes([1, 128, 128], 1, 1, 1, FILTERS)
+    # room for 3 patches of 128x128 once the headroom is left
+    available: int = int(3 * per_patch / MEMORY_HEADROOM) + 1
+
+    # Act
+    recommendation: Optional[PatchSizeRecommendation] = recommend_patch_size(
+        [1, 128, 600], 2, 1, 1, FILTERS, available, allocate=lambda _: True
+    )
+
+    # Assert
+    # a larger patch is preferred to a larger batch
+    assert recommendation == PatchSizeRecommendation(
+        patch_size=[1, 128, 256],
+        batch_size=1,
+        num_bytes=estimate_training_bytes([1, 128, 256], 1, 1, 1, FILTERS),
+    )
+
+
+def test_recommends_largest_batch_that_fits() -> None:
+    # Arrange
+    per_patch: int = estimate_training_bytes([1, 128, 128], 1, 1, 1, FILTERS)
+    available: int = int(3 * per_patch / MEMORY_HEADROOM) + 1
+
+    # Act
+    recommendation: Optional[PatchSizeRecommendation] = recommend_patch_size(
+        [1, 128, 128], 2, 1, 1, FILTERS, available, allocate=lambda _: True
+    )
+
+    # Assert
+    assert recommendation == PatchSizeRecommendation(
+        patch_size=[1, 128, 128], batch_size=3, num_bytes=3 * per_patch
+    )
+
+
+def test_recommended_batch_size_is_capped() -> None:
+    # Act
+    recommendation: Optional[PatchSizeRecommendation] = recommend_patch_size(
+        [1, 16, 16], 2, 1, 1, FILTERS, 2**40, allocate=lambda _: True
+    )
+
+    # Assert
+    assert recommendation is not None
+    assert recommendation.batch_size == MAX_BATCH_SIZE
+
+
+def test_recommendation_backs_off_when_allocation_fails() -> None:
+    # Arrange
+    per_patch: int = estimate_training_bytes([32, 32, 32], 1, 1, 1, FILTERS)
+    attempts: List[int] = []
+
+    def allocate(num_bytes: int) -> bool:
+        attempts.append(num_bytes)
+        # the estimate fits, but only 2 patches of 32^3 can be allocated
+        return num_bytes <= 2 * per_patch
+
+    # Act
+    recommendation: Optional[PatchSizeRecommendation] = recommend_patch_size(
+        [32, 32, 32], 3, 1, 1, FILTERS, 2**40, allocate=allocate
+    )
+
+    # Assert
+    assert recommendation is not None
+    assert recommendation.patch_size == [32, 32, 32]
+    assert recommendation.batch_size == 2
+    assert attempts == [
+        16 * per_patch,
+        8 * per_patch,
+        4 * per_patch,
+        2 * per_patch,
+    ]
+
+
+def test_no_recommendation_without_memory() -> None:
+    # Act / Assert
+    assert (
+        recommend_patch_size(
+            [64, 64, 64], 3, 1, 1, FILTERS, 0, allocate=lambda _: True
+        )
+        is None
+    )
+
+
+def test_can_allocate() -> None:
+    # Act / Assert
+    assert can_allocate(1024)
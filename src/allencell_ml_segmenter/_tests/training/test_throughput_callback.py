@@ -0,0 +1,141 @@
+import csv
+from pathlib import Path
+from typing import Dict, List, Optional
+from unittest.mock import Mock
+
+import torch
+from lightning.pytorch import LightningModule, Trainer
+from lightning.pytorch.loggers import CSVLogger
+from torch.utils.data import DataLoader, TensorDataset
+
+from allencell_ml_segmenter.training.throughput_callback import (
+    THROUGHPUT_CSV,
+    THROUGHPUT_FIELDS,
+    ThroughputCallback,
+    ThroughputSummary,
+    read_last_throughput_row,
+    read_throughput_summary,
+)
+from allencell_ml_segmenter.training.throughput_csv_event_handler import (
+    ThroughputCSVEventHandler,
+)
+
+
+class TinyRegression(LightningModule):
+    def __init__(self) -> None:
+        super().__init__()
+        self.linear: torch.nn.Linear = torch.nn.Linear(4, 1)
+
+    def training_step(
+        self, batch: List[torch.Tensor], batch_idx: int
+    ) -> torch.Tensor:
+        x, y = batch
+        loss: torch.Tensor = torch.nn.functional.mse_loss(self.linear(x), y)
+        self.log("train/loss", loss)
+        return loss
+
+    def configure_optimizers(self) -> torch.optim.Optimizer:
+        return torch.optim.SGD(self.parameters(), lr=0.1)
+
+
+def _train(tmp_path: Path) -> Path:
+    trainer: Trainer = Trainer(
+        max_epochs=2,
+        log_every_n_steps=1,
+        logger=CSVLogger(tmp_path, name="csv"),
+        callbacks=[ThroughputCallback()],
+        enable_checkpointing=False,
+        enable_progress_bar=False,
+        enable_model_summary=False,
+        accelerator="cpu",
+    )
+    trainer.fit(
+        TinyRegression(),
+        DataLoader(
+            TensorDataset(torch.rand(10, 4), torch.rand(10, 1)), batch_size=4
+        ),
+    )
+    return tmp_path / "csv" / "version_0"
+
+
+def test_records_every_step(tmp_path: Path) -> None:
+    # Act
+    log_dir: Path = _train(tmp_path)
+
+    # Assert
+    with open(log_dir / THROUGHPUT_CSV, newline="") as fr:
+        rows: List[Dict[str, str]] = list(csv.DictReader(fr))
+    # 3 batches (4, 4 and 2 samples) per epoch
+    assert len(rows) == 6
+    assert list(rows[0].keys()) == THROUGHPUT_FIELDS
+    assert [int(row["batch_size"]) for row in rows] == [4, 4, 2] * 2
+    for row in rows:
+        assert float(row["step_s"]) >= float(row["forward_s"]) > 0
+        assert float(row["backward_s"]) > 0
+        assert float(row["samples_per_s"]) > 0
+    assert (log_dir / "metrics.csv").exists()
+
+
+def test_writes_summary(tmp_path: Path) -> None:
+    # Act
+    summary: Optional[ThroughputSummary] = read_throughput_summary(
+        _train(tmp_path)
+    )
+
+    # Assert
+    assert summary is not None
+    assert summary.num_steps == 6
+    assert summary.num_samples == 20
+    assert 0 < summary.data_wait_fraction < 1
+    assert "samples/s" in summary.describe()
+
+
+def test_read_throughput_summary_of_unfinished_run(tmp_path: Path) -> None:
+    # Act / Assert
+    assert read_throughput_summary(tmp_path) is None
+
+
+def test_read_last_row_being_written(tmp_path: Path) -> None:
+    # Arrange
+    csv_path: Path = tmp_path / THROUGHPUT_CSV
+    csv_path.write_text(
+        ",".join(THROUGHPUT_FIELDS)
+        + "\n0,1,4,0.1,0.2,0.3,0.6,5.714,100.0\n0,2,4,0.1"
+    )
+
+    # Act
+    row: Optional[Dict[str, str]] = read_last_throughput_row(csv_path)
+
+    # Assert
+    assert row is not None
+    assert row["step"] == "1"
+
+
+def test_read_last_row_without_rows(tmp_path: Path) -> None:
+    # Arrange
+    csv_path: Path = tmp_path / THROUGHPUT_CSV
+    csv_path.write_text(",".join(THROUGHPUT_FIELDS) + "\n")
+
+    # Act / Assert
+    assert read_last_throughput_row(csv_path) is None
+
+
+def test_event_handler_describes_latest_step(tmp_path: Path) -> None:
+    # Arrange
+    csv_path: Path = tmp_path / THROUGHPUT_CSV
+    csv_path.write_text(
+        ",".join(THROUGHPUT_FIELDS) + "\n0,1,4,0.1,0.2,0.3,0.6,5.714,100.0\n"
+    )
+    label_mock: Mock = Mock()
+    handler: ThroughputCSVEventHandler = ThroughputCSVEventHandler(
+        csv_path, label_mock
+    )
+
+    # Act
+    handler.on_any_event(Mock(src_path=str(tmp_path / "metrics.csv")))
+    handler.on_any_event(Mock(src_path=str(csv_path)))
+
+    # Assert
+    label_mock.assert_called_once_with(
+        "5.7 samples/s, step 0.60s, data wait 0.10s, peak memory 100 MB"
+    )
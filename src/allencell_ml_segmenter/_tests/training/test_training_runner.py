@@ -0,0 +1,267 @@
+import os
+import threading
+import time
+from multiprocessing.connection import Connection
+from pathlib import Path
+from typing import Any, List, Optional, Tuple
+
+import pytest
+import torch
+from lightning.pytorch import LightningModule, Trainer
+from torch.utils.data import DataLoader, TensorDataset
+
+from allencell_ml_segmenter.training import training_runner
+from allencell_ml_segmenter.training.training_runner import (
+    MESSAGE_CANCELLED,
+    MESSAGE_EPOCH,
+    MESSAGE_ERROR,
+    MESSAGE_FINISHED,
+    MESSAGE_STARTED,
+    RunnerCallback,
+    TrainingResult,
+    TrainingRunner,
+)
+
+# targets run in the training process, so at module level to be importable
+
+
+def _finish(
+    config_path: str,
+    num_threads: Optional[int],
+    connection: Connection,
+    cancel_event: Any,
+) -> None:
+    connection.send((MESSAGE_STARTED, num_threads))
+    connection.send((MESSAGE_EPOCH, config_path))
+    connection.send((MESSAGE_FINISHED, None))
+
+
+def _crash(
+    config_path: str,
+    num_threads: Optional[int],
+    connection: Connection,
+    cancel_event: Any,
+) -> None:
+    # as when the OS kills a process running out of memory
+    os._exit(3)
+
+
+def _stop_when_cancelled(
+    config_path: str,
+    num_threads: Optional[int],
+    connection: Connection,
+    cancel_event: Any,
+) -> None:
+    connection.send((MESSAGE_STARTED, None))
+    cancel_event.wait()
+    connection.send((MESSAGE_CANCELLED, None))
+
+
+def _ignore_cancel(
+    config_path: str,
+    num_threads: Optional[int],
+    connection: Connection,
+    cancel_event: Any,
+) -> None:
+    connection.send((MESSAGE_STARTED, None))
+    time.sleep(60)
+
+
+def test_run_streams_messages() -> None:
+    # Arrange
+    messages: List[Tuple[str, Any]] = []
+    runner: TrainingRunner = TrainingRunner(
+        Path("train_config.yaml"),
+        on_message=lambda kind, payload: messages.append((kind, payload)),
+        target=_finish,
+    )
+
+    # Act
+    result: TrainingResult = runner.run(num_threads=3)
+
+    # Assert
+    assert messages == [
+        (MESSAGE_STARTED, 3),
+        (MESSAGE_EPOCH, "train_config.yaml"),
+        (MESSAGE_FINISHED, None),
+    ]
+    assert result == TrainingResult(exit_code=0, cancelled=False, error=None)
+    assert result.succeeded()
+
+
+def test_run_reports_crash() -> None:
+    # Act
+    result: TrainingResult = TrainingRunner(
+        Path("train_config.yaml"), target=_crash
+    ).run()
+
+    # Assert
+    assert not result.succeeded()
+    assert result.exit_code == 3
+    assert result.error == "Training exited with code 3"
+
+
+def test_run_reports_training_error(tmp_path: Path) -> None:
+    # Arrange
+    messages: List[Tuple[str, Any]] = []
+
+    # Act
+    result: TrainingResult = TrainingRunner(
+        tmp_path / "missing.yaml",
+        on_message=lambda kind, payload: messages.append((kind, payload)),
+    ).run()
+
+    # Assert
+    assert [kind for kind, _ in messages] == [MESSAGE_ERROR]
+    assert result.error is not None
+    assert "missing.yaml does not exist" in result.error
+    assert not result.cancelled
+
+
+def _run_and_cancel(runner: TrainingRunner) -> TrainingResult:
+    started: threading.Event = threading.Event()
+    runner._on_message = lambda kind, payload: started.set()
+    results: List[TrainingResult] = []
+    thread: threading.Thread = threading.Thread(
+        target=lambda: results.append(runner.run())
+    )
+    thread.start()
+    assert started.wait(30)
+    runner.cancel()
+    thread.join(30)
+    return results[0]
+
+
+def test_cancel() -> None:
+    # Act
+    result: TrainingResult = _run_and_cancel(
+        TrainingRunner(Path("train_config.yaml"), target=_stop_when_cancelled)
+    )
+
+    # Assert
+    assert result == TrainingResult(exit_code=0, cancelled=True, error=None)
+
+
+def test_cancel_terminates_training_that_does_not_stop(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    # Arrange
+    monkeypatch.setattr(training_runner, "CANCEL_TIMEOUT_S", 0.5)
+
+    # Act
+    result: TrainingResult = _run_and_cancel(
+        TrainingRunner(Path("train_config.yaml"), target=_ignore_cancel)
+    )
+
+    # Assert
+    assert result.cancelled
+    assert result.error is None
+    assert result.exit_code != 0
+
+
+def test_cancel_before_run() -> None:
+    # Arrange
+    runner: TrainingRunner = TrainingRunner(
+        Path("train_config.yaml"), target=_crash
+    )
+
+    # Act
+    runner.cancel()
+    result: TrainingResult = runner.run()
+
+    # Assert
+    assert result == TrainingResult(exit_code=None, cancelled=True, error=None)
+
+
+class TinyRegression(LightningModule):
+    def __init__(self) -> None:
+        super().__init__()
+        self.linear: torch.nn.Linear = torch.nn.Linear(4, 1)
+
+    def training_step(
+        self, batch: List[torch.Tensor], batch_idx: int
+    ) -> torch.Tensor:
+        x, y = batch
+        return torch.nn.functional.mse_loss(self.linear(x), y)
+
+    def configure_optimizers(self) -> torch.optim.Optimizer:
+        return torch.optim.SGD(self.parameters(), lr=0.1)
+
+
+class FakeConnection:
+    def __init__(self) -> None:
+        self.sent: List[Tuple[str, Any]] = []
+
+    def send(self, message: Tuple[str, Any]) -> None:
+        self.sent.append(message)
+
+
+def _fit(max_epochs: int) -> Trainer:
+    trainer: Trainer = Trainer(
+        max_epochs=max_epochs,
+        logger=False,
+        callbacks=[RunnerCallback()],
+        enable_checkpointing=False,
+        enable_progress_bar=False,
+        enable_model_summary=False,
+        accelerator="cpu",
+    )
+    trainer.fit(
+        TinyRegression(),
+        DataLoader(
+            TensorDataset(torch.rand(10, 4), torch.rand(10, 1)), batch_size=4
+        ),
+    )
+    return trainer
+
+
+def test_callback_sends_progress(monkeypatch: pytest.MonkeyPatch) -> None:
+    # Arrange
+    connection: FakeConnection = FakeConnection()
+    monkeypatch.setattr(training_runner, "_connection", connection)
+    monkeypatch.setattr(training_runner, "_cancel_event", threading.Event())
+
+    # Act
+    _fit(max_epochs=2)
+
+    # Assert
+    assert connection.sent == [
+        (MESSAGE_STARTED, 2),
+        (MESSAGE_EPOCH, 1),
+        (MESSAGE_EPOCH, 2),
+    ]
+
+
+def test_callback_stops_cancelled_training(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    # Arrange
+    cancel_event: threading.Event = threading.Event()
+    cancel_event.set()
+    monkeypatch.setattr(training_runner, "_connection", FakeConnection())
+    monkeypatch.setattr(training_runner, "_cancel_event", cancel_event)
+
+    # Act
+    trainer: Trainer = _fit(max_epochs=5)
+
+    # Assert
+    # stopped after its first step
+    assert trainer.global_step == 1
+
+
+def test_callback_stops_cancelled_validation(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    # Arrange
+    cancel_event: threading.Event = threading.Event()
+    cancel_event.set()
+    monkeypatch.setattr(training_runner, "_cancel_event", cancel_event)
+    trainer: Trainer = Trainer(logger=False, enable_checkpointing=False)
+
+    # Act
+    RunnerCallback().on_validation_batch_end(
+        trainer, TinyRegression(), None, None, 0
+    )
+
+    # Assert
+    assert trainer.should_stop
@@ -10,11 +10,15 @@ from allencell_ml_segmenter.training.training_model import (
     ImageType,
 )
 from allencell_ml_segmenter.training.view import TrainingView
+from allencell_ml_segmenter.training.patch_size_recommender import (
+    PatchSizeRecommendation,
+)
 from allencell_ml_segmenter.core.task_executor import SynchroTaskExecutor
 import pytest
 from pytestqt.qtbot import QtBot
 import allencell_ml_segmenter
 from pathlib import Path
+from typing import List
 
 
 @pytest.fixture
@@ -383,3 +387,73 @@ def test_model_size_combo_box(
 
     # ASSERT
     assert training_view._model_size_combo_box.isEnabled()
+
+
+def test_recommendation_prefills_patch_and_batch_size(
+    training_view: TrainingView, training_model: TrainingModel
+) -> None:
+    # Arrange
+    training_model.set_spatial_dims(3)
+
+    # Act
+    training_model.set_patch_size_recommendation(
+        PatchSizeRecommendation(
+            patch_size=[32, 64, 128], batch_size=4, num_bytes=1
+        )
+    )
+
+    # Assert
+    assert training_view.z_patch_size.text() == "32"
+    assert training_view.y_patch_size.text() == "64"
+    assert training_view.x_patch_size.text() == "128"
+    assert training_view._batch_size_input.text() == "4"
+    assert training_model.get_batch_size() == 4
+
+
+def test_recommendation_keeps_values_set_by_user(
+    training_view: TrainingView, training_model: TrainingModel
+) -> None:
+    # Arrange
+    training_model.set_spatial_dims(2)
+    training_model.set_patch_size_recommendation(
+        PatchSizeRecommendation(
+            patch_size=[1, 64, 64], batch_size=4, num_bytes=1
+        )
+    )
+    training_view.y_patch_size.setText("16")
+
+    # Act
+    training_model.set_patch_size_recommendation(
+        PatchSizeRecommendation(
+            patch_size=[1, 32, 32], batch_size=8, num_bytes=1
+        )
+    )
+
+    # Assert
+    assert training_view.z_patch_size.text() == ""
+    assert training_view.y_patch_size.text() == "16"
+    # still the previous recommendation, so replaced by the new one
+    assert training_view.x_patch_size.text() == "32"
+    assert training_view._batch_size_input.text() == "8"
+
+
+def test_cancel_dataset_preparation(
+    training_view: TrainingView,
+    training_model: TrainingModel,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    # Arrange
+    dispatched: List[str] = []
+    monkeypatch.setattr(
+        training_model,
+        "dispatch_dataset_preparation_cancel",
+        lambda: dispatched.append("dataset_preparation_cancel"),
+    )
+    training_view._preparing_dataset = True
+
+    # Act
+    training_view.cancelWork()
+
+    # Assert
+    # stopped by the service, rather than by terminating the thread
+    assert dispatched == ["dataset_preparation_cancel"]
@@ -5,12 +5,17 @@ import pytest
 from allencell_ml_segmenter._tests.fakes.fake_user_settings import (
     FakeUserSettings,
 )
+from allencell_ml_segmenter.config.loader_settings import (
+    LoaderSettings,
+    get_machine_id,
+)
 from allencell_ml_segmenter.main.experiments_model import ExperimentsModel
 from allencell_ml_segmenter.main.main_model import MainModel
 from allencell_ml_segmenter.training.training_model import (
     TrainingModel,
     ImageType,
 )
+from allencell_ml_segmenter.utils.cuda_util import CUDAUtils
 from allencell_ml_segmenter.utils.cyto_overrides_manager import (
     CytoDLOverridesManager,
 )
@@ -223,3 +228,99 @@ def test_max_epochs_no_existing_ckpt(
         training_overrides["trainer.max_epochs"]
         == training_model.get_num_epochs()
     )
+
+
+def test_experiments_share_dataset_cache(
+    experiments_model: ExperimentsModel, training_model: TrainingModel
+) -> None:
+    # Arrange
+    cyto_overrides_manager: CytoDLOverridesManager = CytoDLOverridesManager(
+        experiments_model, training_model
+    )
+
+    # Act
+    experiments_model.apply_experiment_name("0_exp")
+    cache_dir: str = cyto_overrides_manager.get_training_overrides()[
+        "data.cache_dir"
+    ]
+    experiments_model.apply_experiment_name("one_ckpt_exp")
+    other_cache_dir: str = cyto_overrides_manager.get_training_overrides()[
+        "data.cache_dir"
+    ]
+    training_model.set_selected_channel(ImageType.RAW, 0)
+    other_channel_cache_dir: str = (
+        cyto_overrides_manager.get_training_overrides()["data.cache_dir"]
+    )
+
+    # Assert
+    assert (
+        Path(cache_dir).parent
+        == experiments_model.get_user_experiments_path() / ".datasets"
+    )
+    assert other_cache_dir == cache_dir
+    assert other_channel_cache_dir != cache_dir
+
+
+def test_num_workers_tuned_for_this_machine(
+    experiments_model: ExperimentsModel, training_model: TrainingModel
+) -> None:
+    # Arrange
+    cyto_overrides_manager: CytoDLOverridesManager = CytoDLOverridesManager(
+        experiments_model, training_model
+    )
+    experiments_model.apply_experiment_name("0_exp")
+
+    # Act / Assert
+    experiments_model.get_user_settings().set_loader_settings(
+        LoaderSettings(num_workers=3, num_threads=5, machine=get_machine_id())
+    )
+    assert (
+        cyto_overrides_manager.get_training_overrides()["data.num_workers"]
+        == 3
+    )
+    # tuned on another machine
+    experiments_model.get_user_settings().set_loader_settings(
+        LoaderSettings(num_workers=3, num_threads=5, machine="other/64")
+    )
+    assert (
+        cyto_overrides_manager.get_training_overrides()["data.num_workers"]
+        == CUDAUtils.get_num_workers()
+    )
+
+
+def test_training_records_throughput(
+    experiments_model: ExperimentsModel, training_model: TrainingModel
+) -> None:
+    # Arrange
+    experiments_model.apply_experiment_name("0_exp")
+    cyto_overrides_manager: CytoDLOverridesManager = CytoDLOverridesManager(
+        experiments_model, training_model
+    )
+
+    # Act / Assert
+    assert cyto_overrides_manager.get_training_overrides()[
+        "callbacks.throughput"
+    ] == {
+        "_target_": "allencell_ml_segmenter.training.throughput_callback.ThroughputCallback"
+    }
+
+
+def test_batch_size(
+    experiments_model: ExperimentsModel, training_model: TrainingModel
+) -> None:
+    # Arrange
+    experiments_model.apply_experiment_name("0_exp")
+    cyto_overrides_manager: CytoDLOverridesManager = CytoDLOverridesManager(
+        experiments_model, training_model
+    )
+
+    # Act / Assert
+    # the config's batch size is used unless one is set
+    assert (
+        "data.batch_size"
+        not in cyto_overrides_manager.get_training_overrides()
+    )
+    training_model.set_batch_size(4)
+    assert (
+        cyto_overrides_manager.get_training_overrides()["data.batch_size"] == 4
+    )
@@ -6,10 +6,15 @@ from allencell_ml_segmenter.utils.file_utils import FileUtils
 from allencell_ml_segmenter.utils.file_writer import (
     IFileWriter,
     FakeFileWriter,
+    FileWriter,
+)
+from allencell_ml_segmenter.curation.curation_data_class import (
+    CurationRecord,
+    PackedRaster,
 )
-from allencell_ml_segmenter.curation.curation_data_class import CurationRecord
 
 from typing import List, Set
+from unittest.mock import Mock
 import numpy as np
 
 
@@ -382,3 +387,102 @@ def test_get_min_loss_from_csv_empty_loss_col() -> None:
 
     # Act / Assert
     assert FileUtils.get_min_loss_from_csv(csv_path) is None
+
+
+def test_write_curation_record_reuses_persisted_masks():
+    # Arrange
+    fake_writer: FakeFileWriter = FakeFileWriter()
+    f_utils: FileUtils = FileUtils(fake_writer)
+    fake_curation_record: List[CurationRecord] = _generate_default_records(4)
+    persisted_path: Path = Path("journal_mask.npy")
+    fake_curation_record[0].excluding_mask = np.asarray([[[1, 2], [3, 4]]])
+    fake_curation_record[0].excluding_mask_path = persisted_path
+
+    # Act
+    f_utils.write_curation_record(
+        fake_curation_record, FAKE_CSV_PATH, FAKE_MASK_PATH
+    )
+
+    # Assert
+    # the mask is already on disk, so it is referenced rather than written again
+    assert len(fake_writer.np_save_state) == 0
+    rows: List[List[str]] = (
+        fake_writer.csv_state[EXP_TRAIN_PATH]["rows"]
+        + fake_writer.csv_state[EXP_TEST_PATH]["rows"]
+    )
+    assert str(persisted_path) in [row[5] for row in rows]
+
+
+def test_write_curation_record_writes_shared_masks_once():
+    # Arrange
+    fake_writer: Mock = Mock(wraps=FakeFileWriter())
+    f_utils: FileUtils = FileUtils(fake_writer)
+    fake_curation_record: List[CurationRecord] = _generate_default_records(4)
+    for record in fake_curation_record:
+        record.excluding_mask = np.asarray([[[1, 2], [3, 4]]])
+
+    # Act
+    f_utils.write_curation_record(
+        fake_curation_record, FAKE_CSV_PATH, FAKE_MASK_PATH, max_workers=4
+    )
+
+    # Assert
+    # test records are listed in both test.csv and val.csv, but saved once
+    assert fake_writer.np_save.call_count == 4
+
+
+def test_write_curation_record_writes_rasters(tmp_path: Path):
+    # Arrange
+    f_utils: FileUtils = FileUtils(FileWriter.global_instance())
+    fake_curation_record: List[CurationRecord] = _generate_default_records(4)
+    polygons: np.ndarray = np.asarray([[[1.0, 2.0], [3.0, 4.0], [5.0, 6.0]]])
+    raster: np.ndarray = np.zeros((5, 7), dtype=bool)
+    raster[2:4, 3:6] = True
+    fake_curation_record[0].merging_mask = polygons
+    fake_curation_record[0].merging_mask_raster = PackedRaster.pack(raster)
+
+    # Act
+    f_utils.write_curation_record(fake_curation_record, tmp_path, tmp_path)
+
+    # Assert
+    merg_path: Path = tmp_path / "merging_masks" / "merging_mask_raw_0.npy"
+    assert np.array_equal(FileUtils.load_mask(merg_path), polygons)
+    assert np.array_equal(
+        FileUtils.load_mask(FileUtils.get_raster_path(merg_path)), raster
+    )
+    assert not (tmp_path / "excluding_masks").exists()
+
+
+def test_write_curation_record_again_writes_nothing():
+    # Arrange
+    fake_writer: FakeFileWriter = FakeFileWriter()
+    f_utils: FileUtils = FileUtils(fake_writer)
+    fake_curation_record: List[CurationRecord] = _generate_default_records(4)
+    raster: PackedRaster = PackedRaster.pack(np.ones((5, 7), dtype=bool))
+    for record in fake_curation_record:
+        record.excluding_mask = np.asarray([[[1, 2], [3, 4]]])
+        record.excluding_mask_raster = raster
+    f_utils.write_curation_record(
+        fake_curation_record, FAKE_CSV_PATH, FAKE_MASK_PATH
+    )
+    assert len(fake_writer.np_save_state) == 4
+    assert len(fake_writer.np_save_compressed_state) == 4
+    fake_writer.np_save_state.clear()
+    fake_writer.np_save_compressed_state.clear()
+
+    # Act
+    f_utils.write_curation_record(
+        fake_curation_record, FAKE_CSV_PATH, FAKE_MASK_PATH
+    )
+
+    # Assert
+    # nothing changed since, so masks and rasters are not written again
+    assert len(fake_writer.np_save_state) == 0
+    assert len(fake_writer.np_save_compressed_state) == 0
+    rows: List[List[str]] = (
+        fake_writer.csv_state[EXP_TRAIN_PATH]["rows"]
+        + fake_writer.csv_state[EXP_TEST_PATH]["rows"]
+    )
+    assert str(
+        FAKE_MASK_PATH / "excluding_masks" / "excluding_mask_raw_0.npy"
+    ) in [row[5] for row in rows]
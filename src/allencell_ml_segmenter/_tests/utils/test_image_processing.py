@@ -1,7 +1,8 @@
-from numpy import zeros, ones, ndarray
+from numpy import array as np_array, zeros, ones, ndarray
 
 from allencell_ml_segmenter.utils.image_processing import (
     set_all_nonzero_values_to,
+    rasterize_polygons,
 )
 
 
@@ -55,3 +56,36 @@ def test_set_all_nonzero_values_to_ones_array():
     assert (
         array.sum() == 54
     )  # we set all values in a array of size 27 to 2, so we expect 54
+
+
+def test_rasterize_polygons_yx():
+    # ARRANGE
+    square: ndarray = np_array([[1, 1], [1, 3], [3, 3], [3, 1]])
+
+    # ACT
+    raster: ndarray = rasterize_polygons([square], (5, 5))
+
+    # ASSERT
+    assert raster.dtype == bool
+    assert raster.shape == (5, 5)
+    assert raster[2, 2]
+    assert not raster[0, 0]
+    assert not raster[4, 4]
+
+
+def test_rasterize_polygons_zyx():
+    # ARRANGE
+    # drawn on z plane 1 in napari
+    square: ndarray = np_array([[1, 1, 1], [1, 1, 3], [1, 3, 3], [1, 3, 1]])
+    # drawn on a 2D view, applies to every plane
+    triangle: ndarray = np_array([[0, 4], [0, 7], [3, 7]])
+
+    # ACT
+    raster: ndarray = rasterize_polygons([square, triangle], (3, 8, 8))
+
+    # ASSERT
+    assert raster.shape == (3, 8, 8)
+    assert raster[1, 2, 2]
+    assert not raster[0, 2, 2] and not raster[2, 2, 2]
+    assert raster[:, 1, 6].all()
+    assert not raster[:, 6, 1].any()
@@ -1,29 +1,49 @@
 from abc import ABC, abstractmethod
 from pathlib import Path
-from qtpy.QtWidgets import QWidget
-from typing import Optional
+from typing import Optional, TYPE_CHECKING
 
+from allencell_ml_segmenter.config.loader_settings import LoaderSettings
+
+if TYPE_CHECKING:
+    # only needed for annotations, headless entry points must not import Qt
+    from qtpy.QtWidgets import QWidget
+
+
+class IExperimentsHomeSettings(ABC):
+    """
+    The settings an ExperimentsModel reads and writes, which headless entry
+    points such as batch prediction can provide without a UI.
+    """
 
-class IUserSettings(ABC):
     def __init__(self) -> None:
         super().__init__()
 
     @abstractmethod
-    def get_cyto_dl_home_path(self) -> Path:
+    def get_user_experiments_path(self) -> Optional[Path]:
         pass
 
     @abstractmethod
-    def get_user_experiments_path(self) -> Optional[Path]:
+    def set_user_experiments_path(self, path: Path) -> None:
         pass
 
     @abstractmethod
-    def set_user_experiments_path(self, path: Path) -> None:
+    def get_loader_settings(self) -> Optional[LoaderSettings]:
+        pass
+
+    @abstractmethod
+    def set_loader_settings(self, settings: LoaderSettings) -> None:
+        pass
+
+
+class IUserSettings(IExperimentsHomeSettings):
+    @abstractmethod
+    def get_cyto_dl_home_path(self) -> Path:
         pass
 
     @abstractmethod
-    def prompt_for_user_experiments_home(self, parent: QWidget) -> None:
+    def prompt_for_user_experiments_home(self, parent: "QWidget") -> None:
         pass
 
     @abstractmethod
-    def display_change_user_experiments_home(self, parent: QWidget) -> None:
+    def display_change_user_experiments_home(self, parent: "QWidget") -> None:
         pass
@@ -0,0 +1,34 @@
+import json
+import os
+import platform
+from dataclasses import asdict, dataclass
+
+
+def get_machine_id() -> str:
+    """
+    Identifies this machine and its core count, as loader settings tuned on
+    one machine do not carry over to another.
+    """
+    return f"{platform.node()}/{os.cpu_count()}"
+
+
+@dataclass
+class LoaderSettings:
+    """
+    Number of DataLoader worker processes and of torch threads to train with
+    on :param machine: (see get_machine_id).
+    """
+
+    num_workers: int
+    num_threads: int
+    machine: str
+
+    def is_for_this_machine(self) -> bool:
+        return self.machine == get_machine_id()
+
+    def to_json(self) -> str:
+        return json.dumps(asdict(self))
+
+    @staticmethod
+    def from_json(text: str) -> "LoaderSettings":
+        return LoaderSettings(**json.loads(text))
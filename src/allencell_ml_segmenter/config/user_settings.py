@@ -6,9 +6,11 @@ from qtpy.QtWidgets import QWidget
 from typing import Optional
 
 from allencell_ml_segmenter.config.i_user_settings import IUserSettings
+from allencell_ml_segmenter.config.loader_settings import LoaderSettings
 
 CYTO_DL_HOME_PATH = "/Users/chrishu/dev/code/test2/cyto-dl"
 EXPERIMENTS_HOME_KEY = "experimentshome"
+LOADER_SETTINGS_KEY = "loadersettings"
 
 
 class UserSettings(IUserSettings):
@@ -32,6 +34,17 @@ class UserSettings(IUserSettings):
     def set_user_experiments_path(self, path: Path) -> None:
         self.settings.setValue(EXPERIMENTS_HOME_KEY, path)
 
+    def get_loader_settings(self) -> Optional[LoaderSettings]:
+        if self.settings.value(LOADER_SETTINGS_KEY) is None:
+            return None
+        else:
+            return LoaderSettings.from_json(
+                self.settings.value(LOADER_SETTINGS_KEY)
+            )
+
+    def set_loader_settings(self, settings: LoaderSettings) -> None:
+        self.settings.setValue(LOADER_SETTINGS_KEY, settings.to_json())
+
     def prompt_for_user_experiments_home(self, parent: QWidget) -> None:
         message_dialog = QMessageBox(
             QMessageBox.Icon.NoIcon,
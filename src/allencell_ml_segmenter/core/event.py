@@ -9,9 +9,12 @@ class Event(Enum):
     # Process events. This signals that a long-running process is active. Progress updates should be shown to the user.
     PROCESS_TRAINING = "training"
     PROCESS_TRAINING_PROGRESS = "training_progress"
+    PROCESS_TRAINING_CANCEL = "training_cancel"
     PROCESS_TRAINING_SHOW_ERROR = "training_error"
     PROCESS_TRAINING_CLEAR_ERROR = "training_clear_error"
     PROCESS_TRAINING_COMPLETE = "training_complete"
+    PROCESS_DATASET_PREPARATION = "dataset_preparation"
+    PROCESS_DATASET_PREPARATION_CANCEL = "dataset_preparation_cancel"
     PROCESS_PREDICTION = "prediction"
     PROCESS_PREDICTION_COMPLETE = "prediction_complete"
     PROCESS_CURATION_INPUT_STARTED = "curation_input_started"
@@ -1,4 +1,5 @@
-from .image_data import ImageData
+from .image_data import ImageData, ImageArray
 from .i_image_data_extractor import IImageDataExtractor
 from .aics_image_data_extractor import AICSImageDataExtractor
 from .fake_image_data_extractor import FakeImageDataExtractor
+from .caching_image_data_extractor import CachingImageDataExtractor
@@ -1,9 +1,14 @@
 from pathlib import Path
 from typing import Optional
+from xml.etree import ElementTree
+
+import dask.array as da
+import tifffile
 
 from allencell_ml_segmenter.core.image_data_extractor import (
     IImageDataExtractor,
     ImageData,
+    ImageArray,
 )
 from bioio.bio_image import BioImage
 
@@ -11,6 +16,8 @@ from allencell_ml_segmenter.utils.image_processing import (
     set_all_nonzero_values_to,
 )
 
+TIFF_EXTS: set[str] = {".tif", ".tiff"}
+
 
 class AICSImageDataExtractor(IImageDataExtractor):
     """
@@ -26,19 +33,32 @@ class AICSImageDataExtractor(IImageDataExtractor):
         dims: bool = True,
         np_data: bool = True,
         seg: Optional[int] = None,
+        lazy: bool = False,
     ) -> ImageData:
+        if not np_data:
+            # no pixel data requested, so avoid building a full BioImage
+            return (
+                self.extract_image_metadata(img_path)
+                if dims
+                else ImageData(None, None, None, None, None, img_path)
+            )
 
         aics_img: BioImage = BioImage(img_path)
         if aics_img.dims.T > 1:
             raise RuntimeError("Cannot load timeseries images")
 
-        img_data = None
-        if np_data:
-            img_data = aics_img.get_image_dask_data("ZYX", C=channel).compute()
-            if seg:
-                # if this image is a segmentation, replace all values in image with 1 or 2,
-                # so it renders correctly as a napari labels layer.
-                img_data = set_all_nonzero_values_to(img_data, seg)
+        dask_data: da.Array = aics_img.get_image_dask_data("ZYX", C=channel)
+        if seg:
+            # if this image is a segmentation, replace all values in image with 1 or 2,
+            # so it renders correctly as a napari labels layer.
+            dask_data = da.map_blocks(
+                set_all_nonzero_values_to,
+                dask_data,
+                seg,
+                dtype=dask_data.dtype,
+            )
+        # lazy data stays chunked so napari only reads the planes it displays
+        img_data: ImageArray = dask_data if lazy else dask_data.compute()
 
         return ImageData(
             aics_img.dims.X if dims else None,
@@ -49,6 +69,71 @@ class AICSImageDataExtractor(IImageDataExtractor):
             img_path,
         )
 
+    def extract_image_metadata(self, img_path: Path) -> ImageData:
+        # OME-TIFFs carry their dims in the first IFD's description, so we can
+        # skip bioio's reader selection and full metadata parse for them
+        img_data: Optional[ImageData] = self._extract_ome_tiff_metadata(
+            img_path
+        )
+        if img_data is not None:
+            return img_data
+
+        aics_img: BioImage = BioImage(img_path)
+        if aics_img.dims.T > 1:
+            raise RuntimeError("Cannot load timeseries images")
+        return ImageData(
+            aics_img.dims.X,
+            aics_img.dims.Y,
+            aics_img.dims.Z,
+            aics_img.dims.C,
+            None,
+            img_path,
+        )
+
+    def _extract_ome_tiff_metadata(
+        self, img_path: Path
+    ) -> Optional[ImageData]:
+        """
+        Returns dims for :param img_path: read from the OME-XML header of the
+        first image in the file, or None if the file is not an OME-TIFF that
+        can be read this way.
+        """
+        if Path(img_path).suffix.lower() not in TIFF_EXTS:
+            return None
+
+        try:
+            with tifffile.TiffFile(img_path) as tiff:
+                ome_xml: Optional[str] = tiff.ome_metadata
+            if ome_xml is None:
+                return None
+            pixels: Optional[ElementTree.Element] = next(
+                (
+                    el
+                    for el in ElementTree.fromstring(ome_xml).iter()
+                    if el.tag.endswith("}Pixels") or el.tag == "Pixels"
+                ),
+                None,
+            )
+        except (tifffile.TiffFileError, ElementTree.ParseError, OSError):
+            return None
+
+        if pixels is None:
+            return None
+        sizes: dict[str, int] = {
+            dim: int(pixels.get(f"Size{dim}", 1)) for dim in "XYZCT"
+        }
+        if sizes["T"] > 1:
+            raise RuntimeError("Cannot load timeseries images")
+
+        return ImageData(
+            sizes["X"],
+            sizes["Y"],
+            sizes["Z"],
+            sizes["C"],
+            None,
+            img_path,
+        )
+
     @classmethod
     def global_instance(cls) -> IImageDataExtractor:
         if cls._instance is None:
@@ -0,0 +1,199 @@
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, replace
+from pathlib import Path
+from typing import Optional, Tuple
+
+import numpy as np
+
+from allencell_ml_segmenter.core.image_data_extractor import (
+    IImageDataExtractor,
+    ImageData,
+    ImageArray,
+    AICSImageDataExtractor,
+)
+
+# default memory cap for decoded image data held by the global instance
+DEFAULT_CACHE_MAX_BYTES: int = 2 * 1024**3
+
+# (resolved path, mtime in ns, size in bytes, channel, seg)
+CacheKey = Tuple[str, int, int, int, Optional[int]]
+
+
+@dataclass
+class CacheStats:
+    hits: int
+    misses: int
+    evictions: int
+    num_entries: int
+    current_bytes: int
+    max_bytes: int
+
+
+class CachingImageDataExtractor(IImageDataExtractor):
+    """
+    Wraps another IImageDataExtractor and keeps recently decoded image data in
+    memory, evicting least recently used entries once the total size of cached
+    np_data exceeds max_bytes. Entries are keyed on file path, mtime and size,
+    so a file that changes on disk is decoded again.
+
+    Cached arrays are shared between callers and marked read-only. Segmentations
+    are returned as copies so that napari labels layers remain editable.
+    """
+
+    _instance = None
+
+    def __init__(
+        self,
+        extractor: IImageDataExtractor,
+        max_bytes: int = DEFAULT_CACHE_MAX_BYTES,
+    ) -> None:
+        # intentionally skip IImageDataExtractor.__init__, this is a decorator
+        # around a singleton rather than a singleton itself
+        self._extractor: IImageDataExtractor = extractor
+        self._max_bytes: int = max_bytes
+        self._cache: OrderedDict[CacheKey, ImageData] = OrderedDict()
+        self._current_bytes: int = 0
+        self._hits: int = 0
+        self._misses: int = 0
+        self._evictions: int = 0
+        self._lock: threading.Lock = threading.Lock()
+
+    def extract_image_data(
+        self,
+        img_path: Path,
+        channel: int = 0,
+        dims: bool = True,
+        np_data: bool = True,
+        seg: Optional[int] = None,
+        lazy: bool = False,
+    ) -> ImageData:
+        if not np_data or lazy:
+            # nothing has been decoded yet in either case, so nothing to cache
+            return self._extractor.extract_image_data(
+                img_path,
+                channel=channel,
+                dims=dims,
+                np_data=np_data,
+                seg=seg,
+                lazy=lazy,
+            )
+
+        key: Optional[CacheKey] = self._get_key(img_path, channel, seg)
+        if key is None:
+            # cannot stat the file, let the wrapped extractor raise if needed
+            return self._extractor.extract_image_data(
+                img_path, channel=channel, dims=dims, seg=seg
+            )
+
+        with self._lock:
+            cached: Optional[ImageData] = self._cache.get(key)
+            if cached is not None:
+                self._cache.move_to_end(key)
+                self._hits += 1
+            else:
+                self._misses += 1
+
+        if cached is None:
+            cached = self._extractor.extract_image_data(
+                img_path, channel=channel, seg=seg
+            )
+            if isinstance(cached.np_data, np.ndarray):
+                cached.np_data.setflags(write=False)
+            self._put(key, cached)
+
+        return self._copy_for_caller(cached, img_path, dims, seg)
+
+    def extract_image_metadata(self, img_path: Path) -> ImageData:
+        return self._extractor.extract_image_metadata(img_path)
+
+    def get_stats(self) -> CacheStats:
+        with self._lock:
+            return CacheStats(
+                self._hits,
+                self._misses,
+                self._evictions,
+                len(self._cache),
+                self._current_bytes,
+                self._max_bytes,
+            )
+
+    def get_max_bytes(self) -> int:
+        return self._max_bytes
+
+    def set_max_bytes(self, max_bytes: int) -> None:
+        """
+        Sets the memory cap for cached image data, evicting entries right away
+        if the cache is now over the cap.
+        """
+        with self._lock:
+            self._max_bytes = max_bytes
+            self._evict_to_fit(0)
+
+    def clear(self) -> None:
+        """
+        Drops all cached image data. Counters are left untouched.
+        """
+        with self._lock:
+            self._cache.clear()
+            self._current_bytes = 0
+
+    def _put(self, key: CacheKey, img_data: ImageData) -> None:
+        size: int = self._get_size(img_data)
+        with self._lock:
+            if key in self._cache or size > self._max_bytes:
+                return
+            self._evict_to_fit(size)
+            self._cache[key] = img_data
+            self._current_bytes += size
+
+    def _evict_to_fit(self, size: int) -> None:
+        """
+        Evicts least recently used entries until :param size: additional bytes
+        fit under the cap. Caller must hold self._lock.
+        """
+        while self._cache and self._current_bytes + size > self._max_bytes:
+            _, evicted = self._cache.popitem(last=False)
+            self._current_bytes -= self._get_size(evicted)
+            self._evictions += 1
+
+    def _get_key(
+        self, img_path: Path, channel: int, seg: Optional[int]
+    ) -> Optional[CacheKey]:
+        try:
+            stat: os.stat_result = os.stat(img_path)
+        except OSError:
+            return None
+        return (
+            str(Path(img_path).resolve()),
+            stat.st_mtime_ns,
+            stat.st_size,
+            channel,
+            seg,
+        )
+
+    @staticmethod
+    def _get_size(img_data: ImageData) -> int:
+        return (
+            int(img_data.np_data.nbytes) if img_data.np_data is not None else 0
+        )
+
+    @staticmethod
+    def _copy_for_caller(
+        cached: ImageData, img_path: Path, dims: bool, seg: Optional[int]
+    ) -> ImageData:
+        np_data: Optional[ImageArray] = cached.np_data
+        if seg and np_data is not None:
+            np_data = np.copy(np_data)
+        if dims:
+            return replace(cached, np_data=np_data, path=img_path)
+        return ImageData(None, None, None, None, np_data, img_path)
+
+    @classmethod
+    def global_instance(cls) -> "CachingImageDataExtractor":
+        if cls._instance is None:
+            cls._instance = CachingImageDataExtractor(
+                AICSImageDataExtractor.global_instance()
+            )
+        return cls._instance
@@ -2,6 +2,7 @@ from pathlib import Path
 from typing import Optional
 
 import numpy as np
+import dask.array as da
 from allencell_ml_segmenter.core.image_data_extractor import (
     IImageDataExtractor,
     ImageData,
@@ -22,16 +23,24 @@ class FakeImageDataExtractor(IImageDataExtractor):
         dims: bool = True,
         np_data: bool = True,
         seg: Optional[int] = None,
+        lazy: bool = False,
     ) -> ImageData:
         return ImageData(
             1 if dims else None,
             2 if dims else None,
             3 if dims else None,
             4 if dims else None,
-            np.zeros((5, 5)) if np_data else None,
+            (
+                (da.zeros((5, 5)) if lazy else np.zeros((5, 5)))
+                if np_data
+                else None
+            ),
             img_path,
         )
 
+    def extract_image_metadata(self, img_path: Path) -> ImageData:
+        return self.extract_image_data(img_path, np_data=False)
+
     @classmethod
     def global_instance(cls) -> IImageDataExtractor:
         if cls._instance is None:
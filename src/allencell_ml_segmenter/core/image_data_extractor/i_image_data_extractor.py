@@ -19,7 +19,21 @@ class IImageDataExtractor(ABC):
         dims: bool = True,
         np_data: bool = True,
         seg: Optional[int] = None,
+        lazy: bool = False,
     ) -> ImageData:
+        """
+        Returns the image at :param img_path:. If :param lazy: is True, np_data
+        will be a chunked dask array that reads from disk only when computed
+        (e.g. when napari displays a plane) instead of an in-memory array.
+        """
+        pass
+
+    @abstractmethod
+    def extract_image_metadata(self, img_path: Path) -> ImageData:
+        """
+        Returns the dims and channel count of the image at :param img_path:
+        without reading any pixel data (np_data will always be None).
+        """
         pass
 
     @classmethod
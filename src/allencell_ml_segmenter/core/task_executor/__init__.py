@@ -1,3 +1,5 @@
+from .task_handle import TaskHandle, TaskPriority
 from .i_task_executor import ITaskExecutor
 from .napari_thread_task_executor import NapariThreadTaskExecutor
 from .synchro_task_executor import SynchroTaskExecutor
+from .thread_pool_task_executor import ThreadPoolTaskExecutor
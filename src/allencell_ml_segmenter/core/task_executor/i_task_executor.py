@@ -1,6 +1,11 @@
 from abc import ABC, abstractmethod
 from typing import Callable, Optional, Any
 
+from allencell_ml_segmenter.core.task_executor import (
+    TaskHandle,
+    TaskPriority,
+)
+
 
 class ITaskExecutor(ABC):
     """
@@ -20,14 +25,17 @@ class ITaskExecutor(ABC):
         on_finish: Optional[Callable[[], None]] = None,
         on_return: Optional[Callable[[Any], None]] = None,
         on_error: Optional[Callable[[Exception], None]] = None,
-    ) -> None:
+        priority: TaskPriority = TaskPriority.INTERACTIVE,
+    ) -> TaskHandle:
         """
         Execute the provided task. Note that on_return must take the return type of task as a param.
+        Returns a TaskHandle that can be used to cancel the task.
         :param task: task to execute
         :param on_start: runs upon the task starting
         :param on_finish: runs upon the task finishing
         :param on_return: runs upon the task returning, must take return type of task as its only param
         :param on_error: runs upon the task throwing an Exception, must take an Exception as its only param
+        :param priority: priority class of the task, executors that do not queue tasks may ignore this
         """
         pass
 
@@ -1,9 +1,17 @@
-from allencell_ml_segmenter.core.task_executor import ITaskExecutor
+from allencell_ml_segmenter.core.task_executor import (
+    ITaskExecutor,
+    TaskHandle,
+    TaskPriority,
+)
 from typing import Callable, Optional, Any
 from napari.qt.threading import FunctionWorker, create_worker  # type: ignore
 
 
 class NapariThreadTaskExecutor(ITaskExecutor):
+    """
+    Runs every task immediately in its own napari worker thread. Priorities are
+    ignored since nothing is queued.
+    """
 
     _instance = None
 
@@ -14,17 +22,20 @@ class NapariThreadTaskExecutor(ITaskExecutor):
         on_finish: Optional[Callable[[], None]] = None,
         on_return: Optional[Callable[[Any], None]] = None,
         on_error: Optional[Callable[[Exception], None]] = None,
-    ) -> None:
-        worker: FunctionWorker = create_worker(task)
+        priority: TaskPriority = TaskPriority.INTERACTIVE,
+    ) -> TaskHandle:
+        handle: TaskHandle = TaskHandle()
+        worker: FunctionWorker = create_worker(handle.guard(task))
         if on_start is not None:
-            worker.started.connect(on_start)
+            worker.started.connect(handle.guard(on_start))
         if on_finish is not None:
-            worker.finished.connect(on_finish)
+            worker.finished.connect(handle.guard(on_finish))
         if on_return is not None:
-            worker.returned.connect(on_return)
+            worker.returned.connect(handle.guard(on_return))
         if on_error is not None:
-            worker.errored.connect(on_error)
+            worker.errored.connect(handle.guard(on_error))
         worker.start()
+        return handle
 
     @classmethod
     def global_instance(cls) -> ITaskExecutor:
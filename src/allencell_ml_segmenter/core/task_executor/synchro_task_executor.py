@@ -1,4 +1,8 @@
-from allencell_ml_segmenter.core.task_executor import ITaskExecutor
+from allencell_ml_segmenter.core.task_executor import (
+    ITaskExecutor,
+    TaskHandle,
+    TaskPriority,
+)
 from typing import Callable, Optional, Any
 
 
@@ -13,7 +17,10 @@ class SynchroTaskExecutor(ITaskExecutor):
         on_finish: Optional[Callable[[], None]] = None,
         on_return: Optional[Callable[[Any], None]] = None,
         on_error: Optional[Callable[[Exception], None]] = None,
-    ) -> None:
+        priority: TaskPriority = TaskPriority.INTERACTIVE,
+    ) -> TaskHandle:
+        # tasks run to completion before exec returns, so cancelling has no effect
+        handle: TaskHandle = TaskHandle()
         if on_start is not None:
             on_start()
 
@@ -22,12 +29,13 @@ class SynchroTaskExecutor(ITaskExecutor):
         except Exception as e:
             if on_error is not None:
                 on_error(e)
-            return
+            return handle
 
         if on_return is not None:
             on_return(output)
         if on_finish is not None:
             on_finish()
+        return handle
 
     @classmethod
     def global_instance(cls) -> ITaskExecutor:
@@ -0,0 +1,62 @@
+import threading
+from enum import Enum
+from typing import Callable, Any, List
+
+
+class TaskPriority(Enum):
+    """
+    Priority classes for tasks given to an ITaskExecutor. Executors that support
+    priorities will always start queued tasks of a higher priority first.
+    """
+
+    # work the user is actively waiting on, e.g. loading the current image
+    INTERACTIVE = 2
+    # speculative work, e.g. loading the next image ahead of time
+    PREFETCH = 1
+    # work no one is waiting on, e.g. saving or cleanup
+    BACKGROUND = 0
+
+
+class TaskHandle:
+    """
+    Returned by ITaskExecutor.exec to allow a task to be cancelled. A task that
+    is cancelled before it starts will never run. A task that is cancelled while
+    running will run to completion, but none of its callbacks will be called.
+    """
+
+    def __init__(self) -> None:
+        self._cancelled: threading.Event = threading.Event()
+        self._cancel_callbacks: List[Callable[[], Any]] = []
+
+    def cancel(self) -> None:
+        """
+        Cancel the task. Safe to call more than once and from any thread.
+        """
+        if self._cancelled.is_set():
+            return
+        self._cancelled.set()
+        for callback in self._cancel_callbacks:
+            callback()
+
+    def is_cancelled(self) -> bool:
+        return self._cancelled.is_set()
+
+    def add_cancel_callback(self, callback: Callable[[], Any]) -> None:
+        """
+        Used by executors to react to cancellation, e.g. by removing the task
+        from a queue.
+        """
+        self._cancel_callbacks.append(callback)
+
+    def guard(self, fn: Callable[..., Any]) -> Callable[..., Any]:
+        """
+        Returns a version of :param fn: that does nothing once this handle has
+        been cancelled.
+        """
+
+        def guarded(*args: Any) -> Any:
+            if not self.is_cancelled():
+                return fn(*args)
+            return None
+
+        return guarded
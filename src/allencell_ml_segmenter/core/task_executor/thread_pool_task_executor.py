@@ -0,0 +1,128 @@
+import os
+from typing import Callable, Optional, Any, Set
+
+from qtpy.QtCore import QObject, QRunnable, QThreadPool, Signal
+
+from allencell_ml_segmenter.core.task_executor import (
+    ITaskExecutor,
+    TaskHandle,
+    TaskPriority,
+)
+
+# decoding images is mostly I/O and numpy work that releases the GIL, but more
+# than a handful of concurrent decodes only adds memory pressure
+DEFAULT_MAX_WORKERS: int = max(1, min(4, os.cpu_count() or 1))
+
+
+class _TaskSignals(QObject):
+    """
+    Signals for a single task. Created on the thread that called exec, so
+    connected callbacks run on that thread (the main thread for our services).
+    """
+
+    started: Signal = Signal()
+    finished: Signal = Signal()
+    returned: Signal = Signal(object)
+    errored: Signal = Signal(object)
+
+
+class _TaskRunnable(QRunnable):
+    def __init__(
+        self,
+        task: Callable[[], Any],
+        signals: _TaskSignals,
+        handle: TaskHandle,
+    ) -> None:
+        super().__init__()
+        # the executor keeps a reference until the task finishes, and we need
+        # the runnable to outlive the pool for QThreadPool.tryTake
+        self.setAutoDelete(False)
+        self._task: Callable[[], Any] = task
+        self._signals: _TaskSignals = signals
+        self._handle: TaskHandle = handle
+
+    # override
+    def run(self) -> None:
+        if self._handle.is_cancelled():
+            self._signals.finished.emit()
+            return
+
+        self._signals.started.emit()
+        try:
+            output: Any = self._task()
+        except Exception as e:
+            self._signals.errored.emit(e)
+        else:
+            self._signals.returned.emit(output)
+        self._signals.finished.emit()
+
+
+class ThreadPoolTaskExecutor(ITaskExecutor):
+    """
+    Runs tasks on a fixed number of worker threads. Queued tasks are started in
+    order of TaskPriority, so interactive work never waits behind speculative
+    work that has not started yet. Cancelled tasks are removed from the queue,
+    and any that are already running have their callbacks suppressed.
+    """
+
+    _instance = None
+
+    def __init__(self, max_workers: int = DEFAULT_MAX_WORKERS) -> None:
+        # intentionally skip ITaskExecutor.__init__ so that pools of other sizes
+        # can be created alongside the global instance
+        self._pool: QThreadPool = QThreadPool()
+        self._pool.setMaxThreadCount(max_workers)
+        # keeps runnables and their signals alive until they finish
+        self._active: Set[_TaskRunnable] = set()
+
+    def exec(
+        self,
+        task: Callable[[], Any],
+        on_start: Optional[Callable[[], Any]] = None,
+        on_finish: Optional[Callable[[], None]] = None,
+        on_return: Optional[Callable[[Any], None]] = None,
+        on_error: Optional[Callable[[Exception], None]] = None,
+        priority: TaskPriority = TaskPriority.INTERACTIVE,
+    ) -> TaskHandle:
+        handle: TaskHandle = TaskHandle()
+        signals: _TaskSignals = _TaskSignals()
+        runnable: _TaskRunnable = _TaskRunnable(task, signals, handle)
+
+        if on_start is not None:
+            signals.started.connect(handle.guard(on_start))
+        if on_return is not None:
+            signals.returned.connect(handle.guard(on_return))
+        if on_error is not None:
+            signals.errored.connect(handle.guard(on_error))
+        if on_finish is not None:
+            signals.finished.connect(handle.guard(on_finish))
+        signals.finished.connect(lambda: self._active.discard(runnable))
+
+        handle.add_cancel_callback(lambda: self._on_cancel(runnable))
+        self._active.add(runnable)
+        self._pool.start(runnable, priority.value)
+        return handle
+
+    def get_max_workers(self) -> int:
+        return self._pool.maxThreadCount()
+
+    def get_num_active_threads(self) -> int:
+        return self._pool.activeThreadCount()
+
+    def wait_for_done(self, msecs: int = -1) -> bool:
+        """
+        Blocks until all queued and running tasks are done, or until :param msecs:
+        have elapsed. Returns True if all tasks are done.
+        """
+        return self._pool.waitForDone(msecs)
+
+    def _on_cancel(self, runnable: _TaskRunnable) -> None:
+        # if the task is still queued, it will never run and never emit finished
+        if self._pool.tryTake(runnable):
+            self._active.discard(runnable)
+
+    @classmethod
+    def global_instance(cls) -> "ThreadPoolTaskExecutor":
+        if cls._instance is None:
+            cls._instance = ThreadPoolTaskExecutor()
+        return cls._instance
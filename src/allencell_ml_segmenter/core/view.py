@@ -51,7 +51,7 @@ class View(QWidget, Subscriber, metaclass=ViewMeta):
         self.progressDialog.setWindowModality(
             Qt.WindowModality.ApplicationModal
         )
-        self.progressDialog.canceled.connect(self.longTaskThread.terminate)
+        self.progressDialog.canceled.connect(self.cancelWork)
         # stop the watchdog thread for file watching inside of the progress tracker
         self.progressDialog.canceled.connect(progress_tracker.stop_tracker)
 
@@ -97,6 +97,13 @@ class View(QWidget, Subscriber, metaclass=ViewMeta):
     def doWork(self) -> None:
         pass
 
+    def cancelWork(self) -> None:
+        """
+        Stops the long task, by default by terminating its thread. Work that
+        can stop cleanly should override this, and let doWork return.
+        """
+        self.longTaskThread.terminate()
+
     @abstractmethod
     def getTypeOfWork(self) -> str:
         pass
@@ -1,7 +1,31 @@
 import numpy as np
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Optional
+from typing import Optional, Tuple
+
+
+@dataclass(frozen=True)
+class PackedRaster:
+    """
+    A boolean raster of :param shape:, bit-packed (see np.packbits) into
+    :param bits: to take an eighth of the memory.
+    """
+
+    bits: np.ndarray
+    shape: Tuple[int, ...]
+
+    @staticmethod
+    def pack(raster: np.ndarray) -> "PackedRaster":
+        return PackedRaster(
+            np.packbits(raster, axis=None), tuple(np.shape(raster))
+        )
+
+    def unpack(self) -> np.ndarray:
+        return (
+            np.unpackbits(self.bits, count=int(np.prod(self.shape)))
+            .reshape(self.shape)
+            .astype(bool)
+        )
 
 
 @dataclass
@@ -13,3 +37,11 @@ class CurationRecord:
     merging_mask: Optional[np.ndarray]
     base_image: Optional[str]
     to_use: bool
+    # where the current masks have already been written to disk (by the
+    # curation journal), None if they have not been written since last changed
+    excluding_mask_path: Optional[Path] = None
+    merging_mask_path: Optional[Path] = None
+    # rasters of the polygon masks at the raw image's ZYX resolution, filled
+    # in the background after a mask is saved, None until then
+    excluding_mask_raster: Optional[PackedRaster] = None
+    merging_mask_raster: Optional[PackedRaster] = None
@@ -0,0 +1,308 @@
+import json
+import threading
+from dataclasses import dataclass, asdict
+from pathlib import Path
+from typing import Dict, List, Optional, Set, Tuple
+
+import numpy as np
+
+from allencell_ml_segmenter.curation.curation_data_class import (
+    CurationRecord,
+    PackedRaster,
+)
+from allencell_ml_segmenter.utils.file_utils import FileUtils
+from allencell_ml_segmenter.utils.file_writer import IFileWriter
+
+JOURNAL_FILE_NAME: str = "curation_journal.jsonl"
+
+
+@dataclass
+class JournalEntry:
+    """
+    A single curation decision. Paths are stored as strings so that entries
+    can be written as JSON as-is.
+    """
+
+    seq: int
+    img_idx: int
+    # cursor position at the time the decision was recorded
+    cursor: int
+    raw_file: str
+    seg1: str
+    seg2: Optional[str]
+    to_use: bool
+    base_image: Optional[str]
+    excluding_mask: Optional[str]
+    merging_mask: Optional[str]
+
+
+@dataclass
+class JournalReplay:
+    """
+    Where to pick curation back up after replaying a journal.
+    """
+
+    cursor: int
+    # highest image index that was reviewed
+    furthest: int
+    next_seq: int
+
+
+class CurationJournal:
+    """
+    Append-only log of curation decisions. Every entry records the state of one
+    CurationRecord, and any mask that changed since it was last recorded is
+    written next to the journal, so recording a decision costs one line plus
+    the changed masks. The raster of a mask is written next to it, see
+    FileUtils.get_raster_path. Replaying the journal restores the curation record and
+    cursor of a session that was not saved, for example because napari was
+    killed.
+    """
+
+    def __init__(
+        self,
+        journal_dir_path: Path,
+        mask_dir_path: Path,
+        file_writer: IFileWriter,
+    ) -> None:
+        self._journal_path: Path = journal_dir_path / JOURNAL_FILE_NAME
+        self._mask_dir_path: Path = mask_dir_path
+        self._file_writer: IFileWriter = file_writer
+        self._file_utils: FileUtils = FileUtils(file_writer)
+        # entries may be appended from several worker threads
+        self._lock: threading.Lock = threading.Lock()
+
+    def get_journal_path(self) -> Path:
+        return self._journal_path
+
+    def append(
+        self, seq: int, img_idx: int, cursor: int, record: CurationRecord
+    ) -> Tuple[Optional[Path], Optional[Path]]:
+        """
+        Records the state of :param record: (at :param img_idx:) as entry
+        :param seq:. Masks, and their rasters, are only written if they do not
+        have a path yet. Returns the paths of the (excluding, merging) masks of
+        the entry.
+        """
+        excl_path: Optional[Path] = self._persist_mask(
+            seq,
+            record,
+            "excluding",
+            record.excluding_mask,
+            record.excluding_mask_path,
+            record.excluding_mask_raster,
+        )
+        merg_path: Optional[Path] = self._persist_mask(
+            seq,
+            record,
+            "merging",
+            record.merging_mask,
+            record.merging_mask_path,
+            record.merging_mask_raster,
+        )
+        entry: JournalEntry = JournalEntry(
+            seq,
+            img_idx,
+            cursor,
+            str(record.raw_file),
+            str(record.seg1),
+            str(record.seg2) if record.seg2 is not None else None,
+            record.to_use,
+            record.base_image,
+            str(excl_path) if excl_path is not None else None,
+            str(merg_path) if merg_path is not None else None,
+        )
+        with self._lock:
+            self._file_writer.append_json_line(
+                asdict(entry), self._journal_path
+            )
+        return excl_path, merg_path
+
+    def append_raster(self, mask_path: Path, raster: PackedRaster) -> None:
+        """
+        Records :param raster: of the journaled mask at :param mask_path:, for
+        rasters that were not ready when their mask was journaled.
+        """
+        self._file_utils.save_packed_raster(
+            FileUtils.get_raster_path(mask_path), raster
+        )
+
+    def compact(self, saved_records: List[CurationRecord]) -> None:
+        """
+        Drops entries that a later entry for the same image supersedes, and
+        deletes the mask versions (and their rasters) that only dropped entries
+        reference, unless one of :param saved_records: holds them. Call once
+        :param saved_records: have been saved, so that the journal does not
+        grow for as long as curation goes on.
+        """
+        with self._lock:
+            entries: List[JournalEntry] = self.read_entries()
+            if len(entries) == 0:
+                return
+            latest: Dict[int, JournalEntry] = {e.img_idx: e for e in entries}
+            # the last entry gives the cursor to resume at, and the one with the
+            # furthest cursor how far curation got
+            kept_seqs: Set[int] = {e.seq for e in latest.values()}
+            kept_seqs.add(entries[-1].seq)
+            kept_seqs.add(max(entries, key=lambda e: e.cursor).seq)
+
+            referenced: Set[str] = set()
+            for entry in latest.values():
+                referenced.update(self._get_mask_paths(entry))
+            for record in saved_records:
+                for saved_path in [
+                    record.excluding_mask_path,
+                    record.merging_mask_path,
+                ]:
+                    if saved_path is not None:
+                        referenced.add(str(saved_path))
+            unreferenced: Set[str] = set()
+            for entry in entries:
+                unreferenced.update(self._get_mask_paths(entry))
+            unreferenced -= referenced
+
+            self._file_writer.write_json_lines(
+                [asdict(e) for e in entries if e.seq in kept_seqs],
+                self._journal_path,
+            )
+        # removed once no entry references them
+        for path in unreferenced:
+            self._file_writer.remove(Path(path))
+            self._file_writer.remove(FileUtils.get_raster_path(Path(path)))
+
+    def read_entries(self) -> List[JournalEntry]:
+        """
+        Returns all complete entries in the journal, in the order they were
+        recorded. A line left incomplete by a crash is skipped.
+        """
+        if not self._journal_path.exists():
+            return []
+        entries: List[JournalEntry] = []
+        with open(self._journal_path) as fr:
+            for line in fr:
+                try:
+                    entries.append(JournalEntry(**json.loads(line)))
+                except (json.JSONDecodeError, TypeError):
+                    continue
+        return sorted(entries, key=lambda e: e.seq)
+
+    def replay(
+        self, curation_records: List[CurationRecord]
+    ) -> Optional[JournalReplay]:
+        """
+        Applies the latest journaled decision for each image to
+        :param curation_records:, in place. Entries for images other than the
+        ones at the same index in :param curation_records: are ignored. Returns
+        None if no entry applies.
+        """
+        entries: List[JournalEntry] = self.read_entries()
+        latest: Dict[int, JournalEntry] = {}
+        last: Optional[JournalEntry] = None
+        furthest: int = 0
+        for entry in entries:
+            if self._matches(entry, curation_records):
+                latest[entry.img_idx] = entry
+                last = entry
+                furthest = max(furthest, entry.img_idx, entry.cursor)
+        if last is None:
+            return None
+
+        for img_idx, entry in latest.items():
+            record: CurationRecord = curation_records[img_idx]
+            record.to_use = entry.to_use
+            record.base_image = entry.base_image
+            record.excluding_mask_path = self._get_existing_path(
+                entry.excluding_mask
+            )
+            record.excluding_mask = self._load_mask(record.excluding_mask_path)
+            record.excluding_mask_raster = self._load_raster(
+                record.excluding_mask_path
+            )
+            record.merging_mask_path = self._get_existing_path(
+                entry.merging_mask
+            )
+            record.merging_mask = self._load_mask(record.merging_mask_path)
+            record.merging_mask_raster = self._load_raster(
+                record.merging_mask_path
+            )
+
+        return JournalReplay(last.cursor, furthest, entries[-1].seq + 1)
+
+    def _persist_mask(
+        self,
+        seq: int,
+        record: CurationRecord,
+        mask_type: str,
+        mask: Optional[np.ndarray],
+        persisted_path: Optional[Path],
+        raster: Optional[PackedRaster],
+    ) -> Optional[Path]:
+        if mask is None:
+            return None
+        if persisted_path is not None:
+            return persisted_path
+        # masks are never overwritten, so earlier entries stay valid
+        path: Path = (
+            self._mask_dir_path
+            / f"{mask_type}_masks"
+            / f"{mask_type}_mask_{record.raw_file.stem}_{seq}.npy"
+        )
+        self._file_writer.np_save(path, self._to_array(mask))
+        if raster is not None:
+            self.append_raster(path, raster)
+        return path
+
+    @staticmethod
+    def _matches(
+        entry: JournalEntry, curation_records: List[CurationRecord]
+    ) -> bool:
+        if not 0 <= entry.img_idx < len(curation_records):
+            return False
+        record: CurationRecord = curation_records[entry.img_idx]
+        seg2: Optional[str] = (
+            str(record.seg2) if record.seg2 is not None else None
+        )
+        return (
+            entry.raw_file == str(record.raw_file)
+            and entry.seg1 == str(record.seg1)
+            and entry.seg2 == seg2
+        )
+
+    @staticmethod
+    def _get_mask_paths(entry: JournalEntry) -> List[str]:
+        return [
+            path
+            for path in [entry.excluding_mask, entry.merging_mask]
+            if path is not None
+        ]
+
+    @staticmethod
+    def _to_array(mask: np.ndarray) -> np.ndarray:
+        # shapes layer data is a list of polygons, which may have different
+        # numbers of vertices
+        try:
+            return np.asarray(mask)
+        except ValueError:
+            polygons: np.ndarray = np.empty(len(mask), dtype=object)
+            polygons[:] = list(mask)
+            return polygons
+
+    @staticmethod
+    def _get_existing_path(path: Optional[str]) -> Optional[Path]:
+        return Path(path) if path is not None and Path(path).exists() else None
+
+    @staticmethod
+    def _load_raster(mask_path: Optional[Path]) -> Optional[PackedRaster]:
+        if mask_path is None:
+            return None
+        raster_path: Path = FileUtils.get_raster_path(mask_path)
+        return (
+            FileUtils.load_packed_raster(raster_path)
+            if raster_path.exists()
+            else None
+        )
+
+    @staticmethod
+    def _load_mask(path: Optional[Path]) -> Optional[np.ndarray]:
+        # shapes layer data is saved as an object array of polygons
+        return np.load(path, allow_pickle=True) if path is not None else None
@@ -10,6 +10,13 @@ from allencell_ml_segmenter.main.experiments_model import ExperimentsModel
 from allencell_ml_segmenter.main.main_model import MainModel, ImageType
 from allencell_ml_segmenter.core.image_data_extractor import ImageData
 
+# number of images after the current one to keep loaded or loading
+DEFAULT_PREFETCH_DEPTH: int = 3
+# number of images before the current one to keep in memory
+DEFAULT_LOOK_BEHIND: int = 1
+# memory budget for decoded image data held in prefetch slots
+DEFAULT_PREFETCH_MAX_BYTES: int = 1024**3
+
 
 class CurationView(Enum):
     INPUT_VIEW = "input_view"
@@ -27,6 +34,13 @@ class CurationModel(QObject):
 
     cursor_moved: Signal = Signal()
     image_loading_finished: Signal = Signal()
+    image_loading_stopped: Signal = Signal()
+    # emitted with an image index when the user is done with (or saves) the
+    # curation choices for that image
+    record_committed: Signal = Signal(int)
+    # emitted with an image index when a new excluding or merging mask is set
+    # for that image
+    mask_changed: Signal = Signal(int)
 
     save_to_disk_requested: Signal = Signal()
     saved_to_disk: Signal = Signal(bool)
@@ -58,19 +72,35 @@ class CurationModel(QObject):
             self._get_placeholder_dict()
         )
 
+        # when True, raw images are extracted as chunked dask arrays so napari
+        # only reads the planes it displays. Segmentations are always loaded
+        # into memory since they are shown as (editable) labels layers.
+        self._lazy_loading: bool = False
+
         self._curation_record: Optional[List[CurationRecord]] = None
         # None until start_image_loading is called
         self._cursor: Optional[int] = None
+        # highest index the cursor has reached, images up to and including this
+        # one have been reviewed by the user
+        self._furthest_cursor: Optional[int] = None
+        # where start_loading_images picks up when resuming an earlier session
+        self._resume_cursor: Optional[int] = None
+        self._resume_furthest_cursor: Optional[int] = None
         # True when images have been dropped from memory
         self._image_loading_stopped: bool = False
-        # private invariant: _next_img_data will only have < self._get_num_data_dict_keys() keys if
-        # a thread is currently updating _next_img_data. Same goes for curr
-        self._curr_img_data: Optional[dict[ImageType, Optional[ImageData]]] = (
-            None
-        )
-        self._next_img_data: Optional[dict[ImageType, Optional[ImageData]]] = (
-            None
-        )
+        # image data by image index for the images in the prefetch window, None
+        # outside of the main view.
+        # private invariant: a slot will only have < self._get_num_data_dict_keys() keys if
+        # a thread is currently loading images for that index
+        self._img_data_slots: Optional[
+            Dict[int, Dict[ImageType, ImageData]]
+        ] = None
+        self._prefetch_depth: int = DEFAULT_PREFETCH_DEPTH
+        self._look_behind: int = DEFAULT_LOOK_BEHIND
+        self._prefetch_max_bytes: int = DEFAULT_PREFETCH_MAX_BYTES
+        # incremented whenever loading is reset, so that results of loads started
+        # before the reset can be dropped
+        self._load_generation: int = 0
 
     def get_merging_mask(self) -> Optional[np.ndarray]:
         return (
@@ -82,6 +112,10 @@ class CurationModel(QObject):
     def set_merging_mask(self, mask: Optional[np.ndarray]) -> None:
         if self._curation_record is not None and self._cursor is not None:
             self._curation_record[self._cursor].merging_mask = mask
+            self._curation_record[self._cursor].merging_mask_path = None
+            self._curation_record[self._cursor].merging_mask_raster = None
+            if mask is not None:
+                self.mask_changed.emit(self._cursor)
 
     def get_excluding_mask(self) -> Optional[np.ndarray]:
         return (
@@ -93,6 +127,10 @@ class CurationModel(QObject):
     def set_excluding_mask(self, mask: Optional[np.ndarray]) -> None:
         if self._curation_record is not None and self._cursor is not None:
             self._curation_record[self._cursor].excluding_mask = mask
+            self._curation_record[self._cursor].excluding_mask_path = None
+            self._curation_record[self._cursor].excluding_mask_raster = None
+            if mask is not None:
+                self.mask_changed.emit(self._cursor)
 
     def get_base_image(self) -> Optional[str]:
         return (
@@ -139,6 +177,45 @@ class CurationModel(QObject):
     def get_selected_channel(self, img_type: ImageType) -> Optional[int]:
         return self._selected_channels[img_type]
 
+    def set_lazy_loading(self, lazy: bool) -> None:
+        self._lazy_loading = lazy
+
+    def is_lazy_loading(self) -> bool:
+        return self._lazy_loading
+
+    def set_prefetch_depth(self, depth: int) -> None:
+        """
+        Sets the number of images after the current one to keep loaded. Must be
+        at least 1, since moving to the next image requires it to be loaded.
+        """
+        if depth < 1:
+            raise ValueError("Prefetch depth must be at least 1")
+        self._prefetch_depth = depth
+
+    def get_prefetch_depth(self) -> int:
+        return self._prefetch_depth
+
+    def set_look_behind(self, look_behind: int) -> None:
+        """
+        Sets the number of images before the current one to keep in memory.
+        """
+        if look_behind < 0:
+            raise ValueError("Look behind must not be negative")
+        self._look_behind = look_behind
+
+    def get_look_behind(self) -> int:
+        return self._look_behind
+
+    def set_prefetch_max_bytes(self, max_bytes: int) -> None:
+        """
+        Sets the memory budget for image data held in prefetch slots. The
+        current and next images are always kept, regardless of the budget.
+        """
+        self._prefetch_max_bytes = max_bytes
+
+    def get_prefetch_max_bytes(self) -> int:
+        return self._prefetch_max_bytes
+
     def set_current_view(self, view: CurationView) -> None:
         """
         Set current curation view
@@ -146,27 +223,45 @@ class CurationModel(QObject):
         # TODO: reset all state? only relevant if we expect a nonlinear path through curation, or multiple curation
         # rounds in a single session
         if view != self._current_view:
+            self._load_generation += 1
+            self._cursor = None
+            self._furthest_cursor = None
+            self._resume_cursor = None
+            self._resume_furthest_cursor = None
             if view == CurationView.MAIN_VIEW:
                 self._curation_record = self._generate_new_curation_record()
-                seg2_exists: bool = (
-                    self._img_dir_paths[ImageType.SEG2] is not None
-                )
-                self._curr_img_data = self._get_placeholder_dict(
-                    incl_seg2=seg2_exists
-                )
-                self._next_img_data = self._get_placeholder_dict(
-                    incl_seg2=seg2_exists
-                )
+                self._img_data_slots = {}
                 self._curation_record_saved_to_disk = False
                 # set the central selected channels for the app once the user clicks 'start curation'
                 self._main_model.set_selected_channels(self._selected_channels)
             else:
                 self._curation_record = None
-                self._curr_img_data = None
-                self._next_img_data = None
+                self._img_data_slots = None
             self._current_view = view
             self.current_view_changed.emit()
 
+    def resume_curation(
+        self, curation_record: List[CurationRecord], cursor: int, furthest: int
+    ) -> None:
+        """
+        Replaces the curation record with :param curation_record: from an earlier
+        session, which start_loading_images will then pick up at :param cursor:.
+        Images up to :param furthest: are treated as already reviewed. Must be
+        called in the main view, before start_loading_images.
+        """
+        if self._curation_record is None or self._cursor is not None:
+            raise RuntimeError(
+                "Can only resume curation in the main view before loading starts"
+            )
+        if len(curation_record) != len(self._curation_record):
+            raise ValueError("Resumed curation record has the wrong length")
+        self._curation_record = curation_record
+        self._resume_cursor = cursor
+        self._resume_furthest_cursor = furthest
+
+    def is_resumed(self) -> bool:
+        return self._resume_cursor is not None
+
     def get_current_view(self) -> CurationView:
         """
         Get current curation view
@@ -194,31 +289,126 @@ class CurationModel(QObject):
     def get_curation_record(self) -> Optional[list[CurationRecord]]:
         return self._curation_record
 
+    def get_load_generation(self) -> int:
+        """
+        Returns the current load generation. Image data loaded for an earlier
+        generation is stale and will be ignored by the image data setters.
+        """
+        return self._load_generation
+
+    def _is_stale(self, generation: Optional[int]) -> bool:
+        return generation is not None and generation != self._load_generation
+
     # WARNING: methods that access data dicts must only be called from the main thread
+    def set_image_data(
+        self,
+        img_idx: int,
+        img_type: ImageType,
+        img_data: ImageData,
+        generation: Optional[int] = None,
+    ) -> None:
+        """
+        Sets image data for :param img_type: of the image at :param img_idx:. If
+        :param generation: is provided and does not match the current load
+        generation, the data is stale and is dropped. Data for images that are
+        no longer in the prefetch window is dropped as well.
+        """
+        if self._img_data_slots is None:
+            raise RuntimeError("Image data is uninitialized")
+        if self._is_stale(generation):
+            return
+        if img_idx not in self.get_prefetch_indices():
+            return
+        self._img_data_slots.setdefault(img_idx, {})[img_type] = img_data
+        self._evict_outside_prefetch_window()
+        if (
+            self._cursor is not None
+            and img_idx in (self._cursor, self._cursor + 1)
+            and not self.is_waiting_for_images()
+        ):
+            self.image_loading_finished.emit()
+
+    def get_image_data(
+        self, img_idx: int, img_type: ImageType
+    ) -> Optional[ImageData]:
+        if self._img_data_slots is None or img_idx not in self._img_data_slots:
+            return None
+        return self._img_data_slots[img_idx].get(img_type)
+
     def set_curr_image_data(
-        self, img_type: ImageType, img_data: ImageData
+        self,
+        img_type: ImageType,
+        img_data: ImageData,
+        generation: Optional[int] = None,
     ) -> None:
-        if self._curr_img_data is None:
+        """
+        Sets current image data for :param img_type:, see set_image_data.
+        """
+        if self._cursor is None:
             raise RuntimeError("Current image data is uninitialized")
-        self._curr_img_data[img_type] = img_data
-        if not self.is_waiting_for_images():
-            self.image_loading_finished.emit()
+        self.set_image_data(self._cursor, img_type, img_data, generation)
 
     def get_curr_image_data(self, img_type: ImageType) -> Optional[ImageData]:
         return (
-            self._curr_img_data[img_type]
-            if self._curr_img_data is not None
+            self.get_image_data(self._cursor, img_type)
+            if self._cursor is not None
             else None
         )
 
     def set_next_image_data(
-        self, img_type: ImageType, img_data: ImageData
+        self,
+        img_type: ImageType,
+        img_data: ImageData,
+        generation: Optional[int] = None,
     ) -> None:
-        if self._next_img_data is None:
+        """
+        Sets next image data for :param img_type:, see set_image_data.
+        """
+        if self._cursor is None:
             raise RuntimeError("Next image data is uninitialized")
-        self._next_img_data[img_type] = img_data
-        if not self.is_waiting_for_images():
-            self.image_loading_finished.emit()
+        self.set_image_data(self._cursor + 1, img_type, img_data, generation)
+
+    def get_prefetch_indices(self) -> List[int]:
+        """
+        Returns the indices of images that should be loaded or loading, most
+        urgent first: the current image, the images ahead of it up to the
+        prefetch depth, then the images behind it up to the look behind. Once
+        the size of loaded images is known, the list is truncated to fit the
+        prefetch memory budget, dropping look behind images first.
+        """
+        if self._cursor is None or self._img_data_slots is None:
+            return []
+        last_idx: int = self.get_num_images() - 1
+        indices: List[int] = list(
+            range(
+                self._cursor,
+                min(self._cursor + self._prefetch_depth, last_idx) + 1,
+            )
+        ) + list(
+            range(
+                self._cursor - 1,
+                max(self._cursor - self._look_behind, 0) - 1,
+                -1,
+            )
+        )
+        img_bytes: int = self._estimate_image_bytes()
+        if img_bytes > 0:
+            # current and next images are needed to move forward at all
+            max_slots: int = max(2, self._prefetch_max_bytes // img_bytes)
+            indices = indices[:max_slots]
+        return indices
+
+    def is_waiting_for_image(self, img_idx: int) -> bool:
+        """
+        Returns True if not all image data for the image at :param img_idx: is
+        loaded.
+        """
+        if self._img_data_slots is None:
+            return False
+        return (
+            len(self._img_data_slots.get(img_idx, {}))
+            != self._get_num_data_dict_keys()
+        )
 
     # note: I don't see a reason why we would need to get the next image data instead of
     # calling next_image, so leaving that out
@@ -245,15 +435,20 @@ class CurationModel(QObject):
             return False
         return self._cursor + 1 < self.get_num_images()
 
+    def has_previous_image(self) -> bool:
+        if self._cursor is None:
+            return False
+        return self._cursor > 0
+
     def is_waiting_for_curr_images(self) -> bool:
-        if self._curr_img_data is None:
+        if self._cursor is None:
             return False
-        return len(self._curr_img_data) != self._get_num_data_dict_keys()
+        return self.is_waiting_for_image(self._cursor)
 
     def is_waiting_for_next_images(self) -> bool:
-        if self._next_img_data is None:
+        if self._cursor is None or not self.has_next_image():
             return False
-        return len(self._next_img_data) != self._get_num_data_dict_keys()
+        return self.is_waiting_for_image(self._cursor + 1)
 
     def is_waiting_for_images(self) -> bool:
         return (
@@ -271,17 +466,23 @@ class CurationModel(QObject):
         immediate: cursor_moved
         at some point: image_loading_finished
         """
-        if self._curr_img_data is None or self._next_img_data is None:
+        if self._img_data_slots is None:
             raise RuntimeError(
                 "Cannot start loading when image data dict is uninitialized"
             )
 
-        self._cursor = 0
-        # need to set use image to true since we want this to be the default
-        self.set_use_image(True)
-        self._curr_img_data.clear()
-        if self.has_next_image():
-            self._next_img_data.clear()
+        self._load_generation += 1
+        self._img_data_slots.clear()
+        if self._resume_cursor is not None:
+            self._cursor = self._resume_cursor
+            self._furthest_cursor = max(
+                self._resume_cursor, self._resume_furthest_cursor or 0
+            )
+        else:
+            self._cursor = 0
+            self._furthest_cursor = 0
+            # need to set use image to true since we want this to be the default
+            self.set_use_image(True)
         self.cursor_moved.emit()
 
     def stop_loading_images(self) -> None:
@@ -289,14 +490,15 @@ class CurationModel(QObject):
         Drops pre-loaded images from memory and prevents further
         image loading from occurring in curation.
         """
-        if self._curr_img_data is None or self._next_img_data is None:
+        if self._img_data_slots is None:
             raise RuntimeError(
                 "Cannot stop loading when image data dict is uninitialized"
             )
 
         self._image_loading_stopped = True
-        self._curr_img_data.clear()
-        self._next_img_data.clear()
+        self._load_generation += 1
+        self._img_data_slots.clear()
+        self.image_loading_stopped.emit()
 
     def next_image(self) -> None:
         """
@@ -314,24 +516,61 @@ class CurationModel(QObject):
         if not self.has_next_image() or self._cursor is None:
             raise RuntimeError("No next image available")
 
-        self._curr_img_data = self._next_img_data
-        self._cursor += 1
-        self._next_img_data = (
-            {}
-            if self.has_next_image()
-            else self._get_placeholder_dict(incl_seg2=self.has_seg2_data())
-        )
-        # need to set use image to true since we want this to be the default
-        self.set_use_image(True)
+        self._move_cursor(self._cursor + 1)
+
+    def previous_image(self) -> None:
+        """
+        Move back to the previous image, keeping the curation choices made for it.
+        Signals emitted:
+        immediate: cursor_moved
+        at some point: image_loading_finished
+        """
+        if not self.has_previous_image() or self._cursor is None:
+            raise RuntimeError("No previous image available")
+        self.go_to_image(self._cursor - 1)
+
+    def go_to_image(self, img_idx: int) -> None:
+        """
+        Move to the image at :param img_idx:. Unlike next_image, this does not
+        require images to be done loading; loads that are no longer needed are
+        cancelled by the service. Images that have been curated before keep
+        their curation choices.
+        Signals emitted:
+        immediate: cursor_moved
+        at some point: image_loading_finished
+        """
+        if self.get_image_loading_stopped():
+            raise RuntimeError("Image loader is stopped.")
+        if self._cursor is None:
+            raise RuntimeError("Image loading has not started")
+        if not 0 <= img_idx < self.get_num_images():
+            raise ValueError(f"No image at index {img_idx}")
+
+        self._move_cursor(img_idx)
+
+    def _move_cursor(self, img_idx: int) -> None:
+        prev_idx: Optional[int] = self._cursor
+        self._cursor = img_idx
+        self._evict_outside_prefetch_window()
+        # if the images were already prefetched, there is nothing left to wait for
+        ready: bool = not self.is_waiting_for_images()
+        if self._furthest_cursor is None or img_idx > self._furthest_cursor:
+            self._furthest_cursor = img_idx
+            # need to set use image to true since we want this to be the default
+            self.set_use_image(True)
+        if prev_idx is not None:
+            self.record_committed.emit(prev_idx)
         self.cursor_moved.emit()
-        # client expects that calling next will eventually result in a image_loading_finished signal
-        if not self.has_next_image():
+        # client expects that moving will eventually result in a image_loading_finished signal
+        if ready:
             self.image_loading_finished.emit()
 
     def set_curation_record_saved_to_disk(self, saved: bool) -> None:
         self.saved_to_disk.emit(saved)
 
     def save_curr_curation_record_to_disk(self) -> None:
+        if self._cursor is not None:
+            self.record_committed.emit(self._cursor)
         self.save_to_disk_requested.emit()
 
     def get_csv_path(self) -> Optional[Path]:
@@ -351,14 +590,18 @@ class CurationModel(QObject):
         if the user has 12 images and has marked 3 as 'do not use', this method will return 9.
         Note that the current 'to_use' selection is not included, as it is not yet finalized.
         """
-        if self._cursor is None or self._curation_record is None:
+        if (
+            self._cursor is None
+            or self._furthest_cursor is None
+            or self._curation_record is None
+        ):
             raise RuntimeError(
                 "Cannot calculate with undefined cursor or curation record"
             )
 
         possible: int = self.get_num_images()
-        for i in range(self._cursor):
-            if not self._curation_record[i].to_use:
+        for i in range(self._furthest_cursor + 1):
+            if i != self._cursor and not self._curation_record[i].to_use:
                 possible -= 1
         return possible
 
@@ -404,6 +647,33 @@ class CurationModel(QObject):
             for i in range(len(raw_paths))
         ]
 
+    def _evict_outside_prefetch_window(self) -> None:
+        if self._img_data_slots is None:
+            return
+        window: List[int] = self.get_prefetch_indices()
+        for img_idx in list(self._img_data_slots):
+            if img_idx not in window:
+                del self._img_data_slots[img_idx]
+
+    def _estimate_image_bytes(self) -> int:
+        """
+        Returns the mean in-memory size of fully loaded images, or 0 if no image
+        has been loaded yet. Lazily loaded (dask) data is not counted, since it
+        is only read when displayed.
+        """
+        if self._img_data_slots is None:
+            return 0
+        sizes: List[int] = [
+            sum(
+                int(img_data.np_data.nbytes)
+                for img_data in slot.values()
+                if isinstance(img_data.np_data, np.ndarray)
+            )
+            for slot in self._img_data_slots.values()
+            if len(slot) == self._get_num_data_dict_keys()
+        ]
+        return sum(sizes) // len(sizes) if sizes else 0
+
     def _get_num_data_dict_keys(self) -> int:
         """
         Returns expected number of keys in an img data dict that is not being written to
@@ -5,26 +5,34 @@ from allencell_ml_segmenter.curation.curation_model import (
     ImageType,
     CurationView,
 )
+from allencell_ml_segmenter.curation.curation_data_class import PackedRaster
 from allencell_ml_segmenter.core.image_data_extractor import (
     IImageDataExtractor,
-    AICSImageDataExtractor,
+    CachingImageDataExtractor,
     ImageData,
 )
 from allencell_ml_segmenter.core.task_executor import (
     ITaskExecutor,
-    NapariThreadTaskExecutor,
+    ThreadPoolTaskExecutor,
+    TaskPriority,
+    TaskHandle,
+)
+from allencell_ml_segmenter.curation.curation_journal import (
+    CurationJournal,
+    JournalReplay,
 )
 from allencell_ml_segmenter.utils.file_utils import FileUtils
 from allencell_ml_segmenter.utils.file_writer import IFileWriter, FileWriter
+from allencell_ml_segmenter.utils.image_processing import rasterize_polygons
 from allencell_ml_segmenter.main.main_model import MIN_DATASET_SIZE
 
 from pathlib import Path
+import numpy as np
 from qtpy.QtCore import QObject
-from typing import List, Optional, Callable
-from copy import deepcopy
+from typing import Dict, List, Optional, Set, Tuple
+from copy import copy, deepcopy
 from collections import namedtuple
 
-
 DirectoryData = namedtuple("DirectoryData", ["fpaths", "channels"])
 
 
@@ -36,8 +44,8 @@ class CurationService(QObject):
         self,
         curation_model: CurationModel,
         experiments_model: IExperimentsModel,
-        img_data_extractor: IImageDataExtractor = AICSImageDataExtractor.global_instance(),
-        task_executor: ITaskExecutor = NapariThreadTaskExecutor.global_instance(),
+        img_data_extractor: IImageDataExtractor = CachingImageDataExtractor.global_instance(),
+        task_executor: ITaskExecutor = ThreadPoolTaskExecutor.global_instance(),
         file_writer: IFileWriter = FileWriter.global_instance(),
     ) -> None:
         super().__init__()
@@ -47,14 +55,33 @@ class CurationService(QObject):
         self._task_executor: ITaskExecutor = task_executor
         self._file_writer: IFileWriter = file_writer
         self._file_utils: FileUtils = FileUtils(file_writer)
+        # handles for image extraction tasks by image index, for images in the
+        # prefetch window that have been scheduled for loading
+        self._pending_load_handles: Dict[int, List[TaskHandle]] = {}
+        self._pending_load_generation: Optional[int] = None
+        # (image index, image type) of extraction tasks that have not returned yet
+        self._loading_images: Set[Tuple[int, ImageType]] = set()
+        # None until the main view is entered with an experiment selected
+        self._journal: Optional[CurationJournal] = None
+        self._next_journal_seq: int = 0
 
         self._curation_model.image_directory_set.connect(
             self._on_image_dir_set
         )
         self._curation_model.cursor_moved.connect(self._on_cursor_moved)
+        self._curation_model.image_loading_stopped.connect(
+            self._cancel_pending_loads
+        )
         self._curation_model.save_to_disk_requested.connect(
             self._on_save_to_disk
         )
+        self._curation_model.current_view_changed.connect(
+            self._on_view_changed
+        )
+        self._curation_model.record_committed.connect(
+            self._on_record_committed
+        )
+        self._curation_model.mask_changed.connect(self._on_mask_changed)
 
     def _get_dir_data(self, dir: Path) -> DirectoryData:
         files: List[Path] = (
@@ -66,8 +93,8 @@ class CurationService(QObject):
                 f"Curation requires at least {MIN_DATASET_SIZE} images and their segmentations"
             )
 
-        img_data: ImageData = self._img_data_extractor.extract_image_data(
-            files[0], np_data=False
+        img_data: ImageData = self._img_data_extractor.extract_image_metadata(
+            files[0]
         )
         return DirectoryData(files, img_data.channels)
 
@@ -98,16 +125,10 @@ class CurationService(QObject):
             on_error=lambda e: self._on_dir_data_errored(img_type, e),
         )
 
-    def _extract_images(
-        self,
-        img_idx: int,
-        setter_fn: Callable[[ImageType, ImageData], None],
-        err_str: str,
-    ) -> None:
+    def _extract_images(self, img_idx: int, priority: TaskPriority) -> None:
         """
-        Uses TaskExecutor to extract data for images at :param img_idx:, saves extracted data using
-        :param setter_fn: to set model state. Provides :param err_str: ('curr' or 'next') to the error
-        handler for additional debugging info.
+        Uses TaskExecutor to extract data for images at :param img_idx: and saves extracted data to
+        the prefetch slot for that index in the model. Tasks are queued with :param priority:.
         """
         raw_paths: Optional[list[Path]] = (
             self._curation_model.get_image_directory_paths(ImageType.RAW)
@@ -128,6 +149,7 @@ class CurationService(QObject):
         seg2_channel: Optional[int] = (
             self._curation_model.get_selected_channel(ImageType.SEG2)
         )
+        lazy: bool = self._curation_model.is_lazy_loading()
 
         if (
             raw_paths is None
@@ -137,41 +159,106 @@ class CurationService(QObject):
         ):
             raise RuntimeError("Must select raw and seg1 paths and channels")
 
-        self._task_executor.exec(
-            lambda: self._img_data_extractor.extract_image_data(
-                raw_paths[img_idx],
-                channel=raw_channel,
-            ),
-            on_return=lambda img_data: setter_fn(ImageType.RAW, img_data),
-            on_error=lambda e: self._on_cursor_moved_error(
-                ImageType.RAW, err_str, e
-            ),
+        generation: int = self._curation_model.get_load_generation()
+        self._exec_image_load(
+            img_idx,
+            raw_paths[img_idx],
+            raw_channel,
+            None,
+            lazy,
+            ImageType.RAW,
+            generation,
+            priority,
         )
-        self._task_executor.exec(
-            lambda: self._img_data_extractor.extract_image_data(
-                seg1_paths[img_idx], channel=seg1_channel, seg=1
-            ),
-            on_return=lambda img_data: setter_fn(ImageType.SEG1, img_data),
-            on_error=lambda e: self._on_cursor_moved_error(
-                ImageType.SEG1, err_str, e
-            ),
+        self._exec_image_load(
+            img_idx,
+            seg1_paths[img_idx],
+            seg1_channel,
+            1,
+            False,
+            ImageType.SEG1,
+            generation,
+            priority,
         )
         if seg2_paths is not None and seg2_channel is not None:
+            self._exec_image_load(
+                img_idx,
+                seg2_paths[img_idx],
+                seg2_channel,
+                2,
+                False,
+                ImageType.SEG2,
+                generation,
+                priority,
+            )
+
+    def _exec_image_load(
+        self,
+        img_idx: int,
+        path: Path,
+        channel: int,
+        seg: Optional[int],
+        lazy: bool,
+        img_type: ImageType,
+        generation: int,
+        priority: TaskPriority,
+    ) -> None:
+        """
+        Starts a single image extraction task tagged with :param generation:. The
+        handle is kept so the task can be cancelled once :param img_idx: leaves
+        the prefetch window.
+        """
+        self._loading_images.add((img_idx, img_type))
+        self._pending_load_handles.setdefault(img_idx, []).append(
             self._task_executor.exec(
                 lambda: self._img_data_extractor.extract_image_data(
-                    seg2_paths[img_idx], channel=seg2_channel, seg=2
+                    path, channel=channel, seg=seg, lazy=lazy
+                ),
+                on_return=lambda img_data: self._on_image_loaded(
+                    img_idx, img_type, img_data, generation
                 ),
-                on_return=lambda img_data: setter_fn(ImageType.SEG2, img_data),
-                on_error=lambda e: self._on_cursor_moved_error(
-                    ImageType.SEG2, err_str, e
+                on_error=lambda e: self._on_image_load_error(
+                    img_type, img_idx, e
                 ),
+                priority=priority,
             )
+        )
 
-    def _on_cursor_moved_error(
-        self, img_type: ImageType, curr_or_next: str, e: Exception
+    def _on_image_loaded(
+        self,
+        img_idx: int,
+        img_type: ImageType,
+        img_data: ImageData,
+        generation: int,
     ) -> None:
+        self._loading_images.discard((img_idx, img_type))
+        self._curation_model.set_image_data(
+            img_idx, img_type, img_data, generation
+        )
+
+    def _is_loading(self, img_idx: int) -> bool:
+        return any(idx == img_idx for idx, _ in self._loading_images)
+
+    def _cancel_pending_loads(self, keep: Optional[List[int]] = None) -> None:
+        """
+        Cancels image extraction tasks for all image indices not in :param keep:.
+        Tasks that have not started yet will not decode anything, and results of
+        tasks that are already running will be dropped.
+        """
+        for img_idx in list(self._pending_load_handles):
+            if keep is None or img_idx not in keep:
+                for handle in self._pending_load_handles.pop(img_idx):
+                    handle.cancel()
+                self._loading_images = {
+                    key for key in self._loading_images if key[0] != img_idx
+                }
+
+    def _on_image_load_error(
+        self, img_type: ImageType, img_idx: int, e: Exception
+    ) -> None:
+        self._loading_images.discard((img_idx, img_type))
         raise RuntimeError(
-            f"There was a problem loading {img_type} for the {curr_or_next} images"
+            f"There was a problem loading {img_type} for image {img_idx}"
         )
 
     def _on_cursor_moved(self) -> None:
@@ -179,26 +266,194 @@ class CurationService(QObject):
         if cursor is None:
             raise RuntimeError("Cursor must not be None")
 
-        if self._curation_model.is_waiting_for_curr_images():
-            # start extraction tasks for curr images (paths at cursor)
-            self._extract_images(
-                cursor, self._curation_model.set_curr_image_data, "curr"
+        generation: int = self._curation_model.get_load_generation()
+        if generation != self._pending_load_generation:
+            # loading was restarted, nothing in flight is still relevant
+            self._cancel_pending_loads()
+            self._pending_load_generation = generation
+
+        # loads for images that are still in the prefetch window carry on, the
+        # rest belong to positions the user has moved away from
+        window: List[int] = self._curation_model.get_prefetch_indices()
+        self._cancel_pending_loads(keep=window)
+
+        for img_idx in window:
+            if not self._is_loading(
+                img_idx
+            ) and self._curation_model.is_waiting_for_image(img_idx):
+                self._extract_images(
+                    img_idx,
+                    (
+                        TaskPriority.INTERACTIVE
+                        if img_idx == cursor
+                        else TaskPriority.PREFETCH
+                    ),
+                )
+
+    def _on_view_changed(self) -> None:
+        self._journal = None
+        if self._curation_model.get_current_view() != CurationView.MAIN_VIEW:
+            return
+        csv_path: Optional[Path] = self._curation_model.get_csv_path()
+        save_path: Optional[Path] = self._curation_model.get_save_masks_path()
+        record: Optional[list[CurationRecord]] = deepcopy(
+            self._curation_model.get_curation_record()
+        )
+        if csv_path is None or save_path is None or record is None:
+            return
+
+        self._journal = CurationJournal(csv_path, save_path, self._file_writer)
+        # runs on the main thread: the record must be restored before the model
+        # starts loading images at the resumed cursor
+        replay: Optional[JournalReplay] = self._journal.replay(record)
+        self._next_journal_seq = 0
+        if replay is not None:
+            self._next_journal_seq = replay.next_seq
+            self._curation_model.resume_curation(
+                record, replay.cursor, replay.furthest
             )
 
-        if self._curation_model.is_waiting_for_next_images():
-            # start extraction tasks for next images (paths at cursor + 1)
-            self._extract_images(
-                cursor + 1, self._curation_model.set_next_image_data, "next"
+    def _on_record_committed(self, img_idx: int) -> None:
+        journal: Optional[CurationJournal] = self._journal
+        curation_record: Optional[list[CurationRecord]] = (
+            self._curation_model.get_curation_record()
+        )
+        cursor: Optional[int] = self._curation_model.get_curr_image_index()
+        if journal is None or curation_record is None or cursor is None:
+            return
+
+        model_record: CurationRecord = curation_record[img_idx]
+        # masks and rasters are replaced, never modified in place, so a shallow
+        # copy keeps what is being journaled from changing
+        record: CurationRecord = copy(model_record)
+        seq: int = self._next_journal_seq
+        self._next_journal_seq += 1
+        self._task_executor.exec(
+            lambda: journal.append(seq, img_idx, cursor, record),
+            on_return=lambda paths: self._on_record_journaled(
+                model_record, record, paths
+            ),
+            priority=TaskPriority.BACKGROUND,
+        )
+
+    def _on_record_journaled(
+        self,
+        model_record: CurationRecord,
+        journaled: CurationRecord,
+        paths: Tuple[Optional[Path], Optional[Path]],
+    ) -> None:
+        # masks are replaced, never modified in place, so if the record still
+        # holds the journaled masks, they are on disk at the returned paths
+        excl_path, merg_path = paths
+        if model_record.excluding_mask is journaled.excluding_mask:
+            model_record.excluding_mask_path = excl_path
+            # rasterized while the mask was being journaled
+            if journaled.excluding_mask_raster is None:
+                self._journal_raster(
+                    excl_path, model_record.excluding_mask_raster
+                )
+        if model_record.merging_mask is journaled.merging_mask:
+            model_record.merging_mask_path = merg_path
+            if journaled.merging_mask_raster is None:
+                self._journal_raster(
+                    merg_path, model_record.merging_mask_raster
+                )
+
+    def _journal_raster(
+        self, mask_path: Optional[Path], raster: Optional[PackedRaster]
+    ) -> None:
+        journal: Optional[CurationJournal] = self._journal
+        if journal is None or mask_path is None or raster is None:
+            return
+        self._task_executor.exec(
+            lambda: journal.append_raster(mask_path, raster),
+            priority=TaskPriority.BACKGROUND,
+        )
+
+    def _on_mask_changed(self, img_idx: int) -> None:
+        """
+        Rasterizes the new masks of image :param img_idx: in the background, at
+        the resolution of its raw image, so that training can use the raster
+        instead of drawing the polygons again.
+        """
+        curation_record: Optional[list[CurationRecord]] = (
+            self._curation_model.get_curation_record()
+        )
+        raw_data: Optional[ImageData] = self._curation_model.get_image_data(
+            img_idx, ImageType.RAW
+        )
+        if (
+            curation_record is None
+            or raw_data is None
+            or raw_data.np_data is None
+        ):
+            return
+
+        shape: Tuple[int, ...] = tuple(raw_data.np_data.shape)
+        model_record: CurationRecord = curation_record[img_idx]
+        if (
+            model_record.excluding_mask is not None
+            and model_record.excluding_mask_raster is None
+        ):
+            self._exec_rasterize(
+                model_record, model_record.excluding_mask, shape, True
             )
+        if (
+            model_record.merging_mask is not None
+            and model_record.merging_mask_raster is None
+        ):
+            self._exec_rasterize(
+                model_record, model_record.merging_mask, shape, False
+            )
+
+    def _exec_rasterize(
+        self,
+        model_record: CurationRecord,
+        mask: np.ndarray,
+        shape: Tuple[int, ...],
+        excluding: bool,
+    ) -> None:
+        # masks are replaced, never modified in place, so the task can read the
+        # polygons without a copy. Rasters are kept bit-packed, as they are
+        # only written to disk
+        self._task_executor.exec(
+            lambda: PackedRaster.pack(rasterize_polygons(mask, shape)),
+            on_return=lambda raster: self._on_mask_rasterized(
+                model_record, mask, raster, excluding
+            ),
+            priority=TaskPriority.BACKGROUND,
+        )
+
+    def _on_mask_rasterized(
+        self,
+        model_record: CurationRecord,
+        mask: np.ndarray,
+        raster: PackedRaster,
+        excluding: bool,
+    ) -> None:
+        # a raster of a mask that has since been replaced is dropped, and one
+        # of a mask that has already been journaled is journaled next to it
+        if excluding and model_record.excluding_mask is mask:
+            model_record.excluding_mask_raster = raster
+            self._journal_raster(model_record.excluding_mask_path, raster)
+        elif not excluding and model_record.merging_mask is mask:
+            model_record.merging_mask_raster = raster
+            self._journal_raster(model_record.merging_mask_path, raster)
 
     def _on_save_to_disk_error(self, err: Exception) -> None:
         self._curation_model.set_curation_record_saved_to_disk(False)
         raise err
 
     def _on_save_to_disk(self) -> None:
-        record: Optional[list[CurationRecord]] = deepcopy(
+        model_record: Optional[list[CurationRecord]] = (
             self._curation_model.get_curation_record()
         )
+        # shallow copies, see _on_record_committed
+        record: Optional[list[CurationRecord]] = (
+            [copy(r) for r in model_record]
+            if model_record is not None
+            else None
+        )
         csv_path: Optional[Path] = self._curation_model.get_csv_path()
         save_path: Optional[Path] = self._curation_model.get_save_masks_path()
         if record is None or csv_path is None or save_path is None:
@@ -211,5 +466,34 @@ class CurationService(QObject):
             on_finish=lambda: self._curation_model.set_curation_record_saved_to_disk(
                 True
             ),
+            on_return=lambda _: self._on_saved_to_disk(model_record, record),
             on_error=self._on_save_to_disk_error,
         )
+
+    def _on_saved_to_disk(
+        self,
+        model_record: Optional[List[CurationRecord]],
+        saved_record: List[CurationRecord],
+    ) -> None:
+        # masks are replaced, never modified in place, so records that still
+        # hold the saved masks have them on disk where they were saved
+        for model, saved in zip(model_record or [], saved_record):
+            if model.excluding_mask is saved.excluding_mask:
+                model.excluding_mask_path = saved.excluding_mask_path
+            if model.merging_mask is saved.merging_mask:
+                model.merging_mask_path = saved.merging_mask_path
+        self._compact_journal(saved_record)
+
+    def _compact_journal(self, saved_record: List[CurationRecord]) -> None:
+        """
+        Deletes the journaled mask versions that neither :param saved_record:
+        nor the journal's latest decisions use any more, see
+        CurationJournal.compact.
+        """
+        journal: Optional[CurationJournal] = self._journal
+        if journal is None:
+            return
+        self._task_executor.exec(
+            lambda: journal.compact(saved_record),
+            priority=TaskPriority.BACKGROUND,
+        )
@@ -19,6 +19,8 @@ from qtpy.QtWidgets import (
     QComboBox,
     QPushButton,
     QWidget,
+    QCheckBox,
+    QHBoxLayout,
 )
 from pathlib import Path
 from napari.utils.notifications import show_info  # type: ignore
@@ -214,6 +216,25 @@ class CurationInputView(QWidget):
         # add grid to frame
         frame_layout.addLayout(seg2_grid_layout)
 
+        lazy_loading_layout: QHBoxLayout = QHBoxLayout()
+        lazy_loading_layout.setSpacing(0)
+        self.lazy_loading_checkbox: QCheckBox = QCheckBox()
+        self.lazy_loading_checkbox.setChecked(
+            self._curation_model.is_lazy_loading()
+        )
+        self.lazy_loading_checkbox.toggled.connect(
+            self._curation_model.set_lazy_loading
+        )
+        lazy_loading_layout.addWidget(self.lazy_loading_checkbox)
+        lazy_loading_label: LabelWithHint = LabelWithHint(
+            "Load raw images on demand"
+        )
+        lazy_loading_label.set_hint(
+            "Display raw images right away and read planes from disk as they are viewed, instead of loading whole images into memory first"
+        )
+        lazy_loading_layout.addWidget(lazy_loading_label)
+        frame_layout.addLayout(lazy_loading_layout)
+
         self.start_btn: QPushButton = QPushButton("Start")
         self.start_btn.clicked.connect(self._on_start)
         frame_layout.addWidget(self.start_btn)
@@ -75,9 +75,12 @@ class CurationMainView(QWidget):
 
         progress_bar_layout: QHBoxLayout = QHBoxLayout()
         # Button and progress bar on top row
-        # self.back_button: QPushButton = QPushButton("◄ Back")
-        # self.back_button.setObjectName("big_blue_btn")
-        # progress_bar_layout.addWidget(self.back_button, alignment=Qt.AlignLeft)
+        self.back_button: QPushButton = QPushButton("◄ Back")
+        self.back_button.setObjectName("big_blue_btn")
+        self.back_button.clicked.connect(self._on_back)
+        progress_bar_layout.addWidget(
+            self.back_button, alignment=Qt.AlignmentFlag.AlignLeft
+        )
 
         # inner progress bar frame and layout
         inner_progress_frame: QFrame = QFrame()
@@ -252,6 +255,8 @@ class CurationMainView(QWidget):
         )
 
         self._curation_model.saved_to_disk.connect(self._on_saved_to_disk)
+        # True when the cursor moved to images that were not loaded yet
+        self._show_images_when_loaded: bool = False
         self._set_to_initial_state()
 
     def _set_to_initial_state(self) -> None:
@@ -262,15 +267,18 @@ class CurationMainView(QWidget):
         self.use_img_stacked_spinner.start()
 
     def _on_image_loading_finished(self) -> None:
+        if self._show_images_when_loaded:
+            self._show_images_when_loaded = False
+            self._show_curr_images()
+            self._update_progress_bar()
         self._enable_next_button()
 
     def _on_first_image_loading_finished(self) -> None:
         self.use_img_stacked_spinner.stop()
-        self.update_save_csv_button_enabled_state()
         self._update_progress_bar()
-        self.add_curr_images_to_widget()
+        # a resumed session may start on an image that was already curated
+        self._show_curr_images()
         self._enable_next_button()
-        self.update_radio_buttons_enabled_state()
         self._curation_model.image_loading_finished.disconnect(
             self._on_first_image_loading_finished
         )
@@ -284,10 +292,12 @@ class CurationMainView(QWidget):
             self.next_button.setText("Next ►")
         else:
             self.next_button.setText("Finish ►")
+        self.back_button.setEnabled(self._curation_model.has_previous_image())
 
     def _set_next_button_to_loading(self) -> None:
         self.next_button.setEnabled(False)
         self.next_button.setText("Loading next...")
+        self.back_button.setEnabled(False)
 
     def add_curr_images_to_widget(self) -> None:
         raw_img_data: Optional[ImageData] = (
@@ -316,8 +326,41 @@ class CurationMainView(QWidget):
         self.enable_valid_masks()
         if raw_img_data is not None and raw_img_data.path is not None:
             self.file_name.setText(raw_img_data.path.name)
-        self.merging_mask_status.setText("Create and draw mask")
-        self.excluding_mask_status.setText("Create and draw mask")
+        # masks are kept when revisiting an image that was curated before
+        self.merging_mask_status.setText(
+            "Merging mask saved"
+            if self._curation_model.get_merging_mask() is not None
+            else "Create and draw mask"
+        )
+        self.excluding_mask_status.setText(
+            "Excluding mask saved"
+            if self._curation_model.get_excluding_mask() is not None
+            else "Create and draw mask"
+        )
+
+    def _show_curr_images(self) -> None:
+        """
+        Shows images at the cursor and syncs UI state with the curation choices
+        for them. Must be called after the cursor moves.
+        """
+        self.add_curr_images_to_widget()
+        # these lines will update UI and model state
+        if self._curation_model.get_use_image():
+            self.yes_radio.setChecked(True)
+            self._on_yes_radio_clicked()
+        else:
+            self.no_radio.setChecked(True)
+            self._on_no_radio_clicked()
+        self.update_radio_buttons_enabled_state()
+        self.update_save_csv_button_enabled_state()
+        self.merging_base_combo.setCurrentIndex(
+            max(
+                self.merging_base_combo.findText(
+                    self._curation_model.get_base_image() or "seg1"
+                ),
+                0,
+            )
+        )
 
     def _on_next(self) -> None:
         """
@@ -333,13 +376,7 @@ class CurationMainView(QWidget):
         if self._curation_model.has_next_image():
             self._set_next_button_to_loading()
             self._curation_model.next_image()
-            self.add_curr_images_to_widget()
-            # these lines will update UI and model state, must go after
-            # a call to next image
-            self.yes_radio.click()
-            self.update_radio_buttons_enabled_state()
-            self.update_save_csv_button_enabled_state()
-            self.merging_base_combo.setCurrentIndex(0)
+            self._show_curr_images()
         else:
             self._on_save_curation_csv()
             self.disable_all_masks()
@@ -347,6 +384,7 @@ class CurationMainView(QWidget):
             self.file_name.setText("None")
             self.next_button.setEnabled(False)
             self.next_button.setText("No more images")
+            self.back_button.setEnabled(False)
             self._curation_model.stop_loading_images()
             InfoDialogBox(
                 "You have reached the end of the dataset, and your curation CSV has been saved.\nPlease switch to the Training tab to start training a model."
@@ -354,6 +392,26 @@ class CurationMainView(QWidget):
 
         self._update_progress_bar()
 
+    def _on_back(self) -> None:
+        """
+        Go back to the previous image set.
+        """
+        if self.yes_radio.isChecked():
+            # prompt and conditionally save unsaved masks
+            self._check_unsaved_excluding_mask()
+            self._check_unsaved_merging_mask()
+
+        self._viewer.clear_layers()
+        self._set_next_button_to_loading()
+        self._curation_model.previous_image()
+        if self._curation_model.is_waiting_for_curr_images():
+            self.disable_all_masks()
+            self.disable_radio_buttons()
+            self._show_images_when_loaded = True
+        else:
+            self._show_curr_images()
+        self._update_progress_bar()
+
     def _should_prompt_to_save_mask(
         self,
         mask_layer: Optional[ShapesLayer],
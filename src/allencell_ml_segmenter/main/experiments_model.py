@@ -1,6 +1,8 @@
 from pathlib import Path
 from typing import Optional
-from allencell_ml_segmenter.config.i_user_settings import IUserSettings
+from allencell_ml_segmenter.config.i_user_settings import (
+    IExperimentsHomeSettings,
+)
 from allencell_ml_segmenter.utils.experiment_utils import ExperimentUtils
 
 import copy
@@ -9,9 +11,9 @@ from allencell_ml_segmenter.main.i_experiments_model import IExperimentsModel
 
 
 class ExperimentsModel(IExperimentsModel):
-    def __init__(self, config: IUserSettings) -> None:
+    def __init__(self, config: IExperimentsHomeSettings) -> None:
         super().__init__()
-        self.user_settings: IUserSettings = config
+        self.user_settings: IExperimentsHomeSettings = config
 
         # options
         self.experiments: list[str] = []
@@ -47,7 +49,7 @@ class ExperimentsModel(IExperimentsModel):
     def get_experiments(self) -> list[str]:
         return copy.deepcopy(self.experiments)
 
-    def get_user_settings(self) -> IUserSettings:
+    def get_user_settings(self) -> IExperimentsHomeSettings:
         return self.user_settings
 
     def get_user_experiments_path(self) -> Optional[Path]:
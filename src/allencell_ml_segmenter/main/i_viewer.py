@@ -6,6 +6,7 @@ from allencell_ml_segmenter.main.segmenter_layer import (
     LabelsLayer,
 )
 import numpy as np
+from allencell_ml_segmenter.core.image_data_extractor import ImageArray
 from napari.layers import Layer  # type: ignore
 from napari.utils.events import Event as NapariEvent  # type: ignore
 
@@ -15,7 +16,7 @@ class IViewer(ABC):
         super().__init__()
 
     @abstractmethod
-    def add_image(self, image: np.ndarray, name: str) -> None:
+    def add_image(self, image: ImageArray, name: str) -> None:
         pass
 
     @abstractmethod
@@ -39,7 +40,7 @@ class IViewer(ABC):
         pass
 
     @abstractmethod
-    def add_labels(self, data: np.ndarray, name: str) -> None:
+    def add_labels(self, data: ImageArray, name: str) -> None:
         pass
 
     @abstractmethod
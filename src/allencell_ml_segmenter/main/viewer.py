@@ -13,6 +13,7 @@ from allencell_ml_segmenter.main.segmenter_layer import (
 import napari  # type: ignore
 from typing import Callable, Optional
 import numpy as np
+from allencell_ml_segmenter.core.image_data_extractor import ImageArray
 
 
 class Viewer(IViewer):
@@ -23,7 +24,7 @@ class Viewer(IViewer):
         super().__init__()
         self.viewer: napari.Viewer = viewer
 
-    def add_image(self, image: np.ndarray, name: str) -> None:
+    def add_image(self, image: ImageArray, name: str) -> None:
         self.viewer.add_image(image, name=name)
 
     def get_image(self, name: str) -> Optional[ImageLayer]:
@@ -60,7 +61,7 @@ class Viewer(IViewer):
             if isinstance(l, Shapes)
         ]
 
-    def add_labels(self, data: np.ndarray, name: str) -> None:
+    def add_labels(self, data: ImageArray, name: str) -> None:
         self.viewer.add_labels(data, name=name)
 
     def get_labels(self, name: str) -> Optional[LabelsLayer]:
@@ -0,0 +1,376 @@
+import argparse
+import sys
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import List, Optional
+
+# nothing imported here (directly or indirectly) may import napari or Qt, this
+# module is meant to be run on servers without a display
+from allencell_ml_segmenter.config.i_user_settings import (
+    IExperimentsHomeSettings,
+)
+from allencell_ml_segmenter.config.loader_settings import LoaderSettings
+from allencell_ml_segmenter.main.experiments_model import ExperimentsModel
+from allencell_ml_segmenter.prediction.model import (
+    PredictionModel,
+    PredictionInputMode,
+    PredictionBackend,
+    SIMPLE_THRESHOLD,
+    AUTO_THRESHOLD,
+)
+from allencell_ml_segmenter.prediction.postprocessing import (
+    AUTO_THRESHOLD_METHODS,
+)
+from allencell_ml_segmenter.prediction.batched_prediction import (
+    DEFAULT_MAX_BATCH_SIZE,
+    BatchedPrediction,
+)
+from allencell_ml_segmenter.prediction.tiled_inference import (
+    BlendMode,
+    TiledInference,
+)
+from allencell_ml_segmenter.services.prediction_service import (
+    PredictionService,
+)
+
+
+class _ExperimentsHomeSettings(IExperimentsHomeSettings):
+    """
+    Settings with a fixed experiments home, in place of the QSettings backed
+    UserSettings of the plugin. Nothing is stored beyond the run.
+    """
+
+    def __init__(self, user_experiments_path: Path) -> None:
+        super().__init__()
+        self._user_experiments_path: Path = user_experiments_path
+        self._loader_settings: Optional[LoaderSettings] = None
+
+    def get_user_experiments_path(self) -> Optional[Path]:
+        return self._user_experiments_path
+
+    def set_user_experiments_path(self, path: Path) -> None:
+        self._user_experiments_path = path
+
+    def get_loader_settings(self) -> Optional[LoaderSettings]:
+        # None until set, prediction does not tune loading
+        return self._loader_settings
+
+    def set_loader_settings(self, settings: LoaderSettings) -> None:
+        self._loader_settings = settings
+
+
+@dataclass
+class BatchPredictionSummary:
+    num_images: int
+    # time spent finding inputs and writing the input csv
+    setup_seconds: float
+    # time spent in cyto-dl, including loading the model
+    predict_seconds: float
+
+    def get_images_per_second(self) -> float:
+        return (
+            self.num_images / self.predict_seconds
+            if self.predict_seconds > 0
+            else 0.0
+        )
+
+    def __str__(self) -> str:
+        seconds_per_image: float = (
+            self.predict_seconds / self.num_images
+            if self.num_images > 0
+            else 0.0
+        )
+        return (
+            f"Predicted {self.num_images} images in "
+            f"{self.predict_seconds:.1f}s "
+            f"({self.get_images_per_second():.2f} images/s, "
+            f"{seconds_per_image:.2f}s/image), "
+            f"setup took {self.setup_seconds:.1f}s"
+        )
+
+
+def get_experiments_model(experiment_path: Path) -> ExperimentsModel:
+    """
+    Returns an ExperimentsModel with the experiment at :param experiment_path:
+    (a directory in an experiments home) applied.
+    """
+    experiment_path = experiment_path.resolve()
+    experiments_model: ExperimentsModel = ExperimentsModel(
+        _ExperimentsHomeSettings(experiment_path.parent)
+    )
+    experiments_model.apply_experiment_name(experiment_path.name)
+    if not experiments_model.get_train_config_path().exists():
+        raise ValueError(
+            f"{experiment_path} is not a trained experiment, it has no train_config.yaml"
+        )
+    return experiments_model
+
+
+def get_checkpoint(
+    experiments_model: ExperimentsModel, checkpoint: Optional[Path]
+) -> Path:
+    """
+    Returns the path of :param checkpoint:, which may also be the name of a
+    checkpoint of the experiment, or the experiment's best checkpoint if None.
+    """
+    if checkpoint is None:
+        best: Optional[Path] = experiments_model.get_best_ckpt()
+        if best is None:
+            raise ValueError("Experiment has no checkpoints to predict with")
+        return best
+    if checkpoint.exists():
+        return checkpoint
+    in_experiment: Path = experiments_model.get_model_checkpoints_path(
+        experiments_model.get_experiment_name(), str(checkpoint)
+    )
+    if in_experiment.exists():
+        return in_experiment
+    raise ValueError(f"Checkpoint {checkpoint} does not exist")
+
+
+def run_batch_prediction(
+    experiment_path: Path,
+    input_path: Path,
+    output_dir: Path,
+    checkpoint: Optional[Path] = None,
+    channel: Optional[int] = None,
+    num_shards: int = 1,
+    threads_per_shard: Optional[int] = None,
+    incremental: bool = False,
+    tiled_inference: Optional[TiledInference] = None,
+    simple_threshold: Optional[float] = None,
+    auto_threshold: Optional[str] = None,
+    backend: PredictionBackend = PredictionBackend.TORCH,
+    batched_prediction: Optional[BatchedPrediction] = None,
+) -> BatchPredictionSummary:
+    """
+    Predicts segmentations for all images in :param input_path: (a directory
+    or a csv with a raw column) with the model of :param experiment_path:, and
+    saves them to :param output_dir:. Uses the same overrides as prediction
+    from the plugin, see PredictionService.build_overrides. If :param
+    num_shards: is more than 1, inputs are split across that many processes,
+    see PredictionService.run_sharded_prediction. If :param incremental:,
+    inputs that were already predicted into :param output_dir: with the same
+    checkpoint and channel are skipped, see PredictionManifest. If :param
+    tiled_inference: is given, images are predicted in tiles of that size.
+    With :param simple_threshold: (a percentage, see get_threshold) or
+    :param auto_threshold: (a method), segmentations are thresholded into
+    output_dir/postprocessed.
+    With the ONNX :param backend:, the model is exported to ONNX (unless it
+    already is) and run by ONNX Runtime, see onnx_backend. With :param
+    batched_prediction:, inputs of the same shape are predicted in batches
+    (unless sharded), see PredictionService.run_batched_prediction.
+    """
+    start: float = time.perf_counter()
+    experiments_model: ExperimentsModel = get_experiments_model(
+        experiment_path
+    )
+    ckpt: Path = get_checkpoint(experiments_model, checkpoint)
+    if not (input_path.is_dir() or input_path.suffix == ".csv"):
+        raise ValueError(f"{input_path} is not a directory or csv")
+
+    prediction_model: PredictionModel = PredictionModel()
+    prediction_model.set_prediction_input_mode(PredictionInputMode.FROM_PATH)
+    prediction_model.set_input_image_path(input_path)
+    prediction_model.set_output_directory(output_dir)
+    prediction_model.set_image_input_channel_index(channel)
+    prediction_model.set_num_shards(num_shards)
+    prediction_model.set_threads_per_shard(threads_per_shard)
+    prediction_model.set_incremental(incremental)
+    prediction_model.set_tiled_inference(tiled_inference)
+    if simple_threshold is not None:
+        prediction_model.set_postprocessing_method(SIMPLE_THRESHOLD)
+        prediction_model.set_postprocessing_simple_threshold(simple_threshold)
+    elif auto_threshold is not None:
+        prediction_model.set_postprocessing_method(AUTO_THRESHOLD)
+        prediction_model.set_postprocessing_auto_threshold(auto_threshold)
+    prediction_model.set_backend(backend)
+    prediction_model.set_batched_prediction(batched_prediction)
+    # a single run has no use for keeping the model loaded afterwards
+    service: PredictionService = PredictionService(
+        prediction_model, experiments_model, model_cache=None
+    )
+    # writes the input csv with write_csv_for_inputs if input is a directory
+    num_images: int = service.setup_inputs_from_path(ckpt)
+    setup_done: float = time.perf_counter()
+
+    # with incremental, earlier runs may have left nothing to predict
+    if num_images > 0 and num_shards > 1:
+        service.run_sharded_prediction(ckpt)
+    elif num_images > 0 and batched_prediction is not None:
+        service.run_batched_prediction(ckpt)
+    elif num_images > 0:
+        service.run_prediction(ckpt)
+    return BatchPredictionSummary(
+        num_images, setup_done - start, time.perf_counter() - setup_done
+    )
+
+
+def _get_parser() -> argparse.ArgumentParser:
+    parser: argparse.ArgumentParser = argparse.ArgumentParser(
+        description="Predict segmentations for a directory or csv of images "
+        "with a trained Segmenter ML experiment, without napari."
+    )
+    parser.add_argument(
+        "--experiment",
+        type=Path,
+        required=True,
+        help="experiment directory, inside the experiments home",
+    )
+    parser.add_argument(
+        "--input",
+        type=Path,
+        required=True,
+        help="directory of images, or csv with a raw column",
+    )
+    parser.add_argument(
+        "--output",
+        type=Path,
+        required=True,
+        help="directory to save segmentations to",
+    )
+    parser.add_argument(
+        "--checkpoint",
+        type=Path,
+        default=None,
+        help="checkpoint path or name (default: best checkpoint)",
+    )
+    parser.add_argument(
+        "--channel",
+        type=int,
+        default=None,
+        help="input channel (default: channel used for training)",
+    )
+    parser.add_argument(
+        "--shards",
+        type=int,
+        default=1,
+        help="number of processes to split the inputs across (default: 1)",
+    )
+    parser.add_argument(
+        "--threads-per-shard",
+        type=int,
+        default=None,
+        help="torch threads per process (default: cpu cores / shards)",
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="skip inputs already predicted into the output directory",
+    )
+    parser.add_argument(
+        "--tile-size",
+        type=int,
+        nargs="+",
+        default=None,
+        help="predict in tiles of this ZYX (or YX) size",
+    )
+    parser.add_argument(
+        "--memory-budget-mb",
+        type=int,
+        default=None,
+        help="predict in tiles sized to fit in this much memory, if no "
+        "--tile-size is given",
+    )
+    parser.add_argument(
+        "--tile-overlap",
+        type=float,
+        default=0.25,
+        help="fraction of a tile that overlaps its neighbours (default: 0.25)",
+    )
+    parser.add_argument(
+        "--blend",
+        choices=[mode.value for mode in BlendMode],
+        default=BlendMode.GAUSSIAN.value,
+        help="how overlapping tiles are combined (default: gaussian)",
+    )
+    threshold_group = parser.add_mutually_exclusive_group()
+    threshold_group.add_argument(
+        "--threshold",
+        type=float,
+        default=None,
+        help="threshold segmentations at this percentage of the range of "
+        "their dtype ([0, 1] for floats)",
+    )
+    threshold_group.add_argument(
+        "--auto-threshold",
+        choices=list(AUTO_THRESHOLD_METHODS),
+        default=None,
+        help="threshold segmentations with this method",
+    )
+    parser.add_argument(
+        "--backend",
+        choices=[backend.value for backend in PredictionBackend],
+        default=PredictionBackend.TORCH.value,
+        help="run the model with torch, or export it to ONNX and run it "
+        "with ONNX Runtime on the cpu (default: torch)",
+    )
+    parser.add_argument(
+        "--batch-memory-mb",
+        type=int,
+        default=None,
+        help="predict images of the same shape in batches that fit in this "
+        "much memory (default: one image at a time)",
+    )
+    parser.add_argument(
+        "--max-batch-size",
+        type=int,
+        default=DEFAULT_MAX_BATCH_SIZE,
+        help=f"largest batch with --batch-memory-mb "
+        f"(default: {DEFAULT_MAX_BATCH_SIZE})",
+    )
+    return parser
+
+
+def _get_tiled_inference(
+    args: argparse.Namespace,
+) -> Optional[TiledInference]:
+    if args.tile_size is None and args.memory_budget_mb is None:
+        return None
+    return TiledInference(
+        tile_shape=args.tile_size,
+        memory_budget_mb=args.memory_budget_mb,
+        overlap=args.tile_overlap,
+        blend_mode=BlendMode(args.blend),
+    )
+
+
+def _get_batched_prediction(
+    args: argparse.Namespace,
+) -> Optional[BatchedPrediction]:
+    if args.batch_memory_mb is None:
+        return None
+    return BatchedPrediction(
+        memory_budget_mb=args.batch_memory_mb,
+        max_batch_size=args.max_batch_size,
+    )
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args: argparse.Namespace = _get_parser().parse_args(argv)
+    try:
+        summary: BatchPredictionSummary = run_batch_prediction(
+            args.experiment,
+            args.input,
+            args.output,
+            checkpoint=args.checkpoint,
+            channel=args.channel,
+            num_shards=args.shards,
+            threads_per_shard=args.threads_per_shard,
+            incremental=args.incremental,
+            tiled_inference=_get_tiled_inference(args),
+            simple_threshold=args.threshold,
+            auto_threshold=args.auto_threshold,
+            backend=PredictionBackend(args.backend),
+            batched_prediction=_get_batched_prediction(args),
+        )
+    except (ValueError, ImportError) as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 1
+    print(summary)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,81 @@
+import math
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from bioio import BioImage
+
+from allencell_ml_segmenter.prediction.tiled_inference import (
+    BYTES_PER_TILE_VOXEL,
+)
+
+# memory per voxel of every image of a batch for the whole prediction: the
+# float32 input, and the output and blending weights sliding window
+# inference accumulates for it
+BYTES_PER_IMAGE_VOXEL: int = 4 * 4
+DEFAULT_MEMORY_BUDGET_MB: int = 2048
+# more gains nothing once the cores are busy, and delays the first results
+DEFAULT_MAX_BATCH_SIZE: int = 64
+
+# ZYX, with Z of 1 for 2D images
+SpatialShape = Tuple[int, ...]
+
+
+@dataclass
+class BatchedPrediction:
+    """
+    Predicts inputs of the same spatial shape in batches, as large as fit in
+    :param memory_budget_mb: but no larger than :param max_batch_size:.
+    """
+
+    memory_budget_mb: int = DEFAULT_MEMORY_BUDGET_MB
+    max_batch_size: int = DEFAULT_MAX_BATCH_SIZE
+
+    def __post_init__(self) -> None:
+        if self.memory_budget_mb < 1:
+            raise ValueError("memory budget must be at least 1 MB")
+        if self.max_batch_size < 1:
+            raise ValueError("max batch size must be at least 1")
+
+    def get_batch_size(
+        self,
+        shape: SpatialShape,
+        roi_size: Optional[List[int]],
+        num_images: int,
+    ) -> int:
+        """
+        Returns the batch size for :param num_images: images of :param
+        shape:, predicted in windows of :param roi_size: (None if images are
+        predicted whole). Never less than 1.
+        """
+        image_voxels: int = math.prod(shape)
+        # windows of a batch go through the model together, images smaller
+        # than a window are padded up to it
+        window_voxels: int = (
+            math.prod(roi_size) if roi_size is not None else image_voxels
+        )
+        per_image: int = (
+            window_voxels * BYTES_PER_TILE_VOXEL
+            + image_voxels * BYTES_PER_IMAGE_VOXEL
+        )
+        fits: int = self.memory_budget_mb * 1024 * 1024 // per_image
+        return max(1, min(fits, self.max_batch_size, num_images))
+
+
+def get_spatial_shape(image: Path) -> SpatialShape:
+    """
+    Returns the ZYX shape of :param image:, read from its metadata only.
+    """
+    dims = BioImage(image).dims
+    return (dims.Z, dims.Y, dims.X)
+
+
+def bucket_by_shape(images: List[Path]) -> Dict[SpatialShape, List[int]]:
+    """
+    Returns the indices of :param images: by spatial shape, in order of
+    first appearance, so that each bucket can be stacked into batches.
+    """
+    buckets: Dict[SpatialShape, List[int]] = {}
+    for i, image in enumerate(images):
+        buckets.setdefault(get_spatial_shape(image), []).append(i)
+    return buckets
@@ -1,5 +1,5 @@
 from pathlib import Path
-from typing import List, Optional
+from typing import Dict, List, Optional
 
 from napari.utils.events import Event as NapariEvent  # type: ignore
 from napari.utils.notifications import show_warning  # type: ignore
@@ -15,6 +15,7 @@ from qtpy.QtWidgets import (
     QFrame,
     QSizePolicy,
     QListWidgetItem,
+    QCheckBox,
 )
 
 from allencell_ml_segmenter.core.event import Event
@@ -26,8 +27,12 @@ from allencell_ml_segmenter.widgets.label_with_hint_widget import LabelWithHint
 from allencell_ml_segmenter.prediction.model import (
     PredictionModel,
     PredictionInputMode,
+    PredictionBackend,
 )
 
+from allencell_ml_segmenter.prediction.batched_prediction import (
+    BatchedPrediction,
+)
 from allencell_ml_segmenter.widgets.check_box_list_widget import (
     CheckBoxListWidget,
 )
@@ -36,6 +41,13 @@ from allencell_ml_segmenter.main.viewer import IViewer
 from allencell_ml_segmenter.prediction.service import ModelFileService
 from allencell_ml_segmenter.curation.stacked_spinner import StackedSpinner
 
+# names of the prediction backends as listed in the backend dropdown
+BACKEND_NAMES: Dict[PredictionBackend, str] = {
+    PredictionBackend.TORCH: "PyTorch",
+    PredictionBackend.ONNX: "ONNX Runtime",
+    PredictionBackend.ONNX_INT8: "ONNX Runtime int8",
+}
+
 
 class PredictionFileInput(QWidget):
     """
@@ -192,11 +204,59 @@ class PredictionFileInput(QWidget):
         grid_layout.addWidget(output_dir_label, 1, 0)
         grid_layout.addWidget(self._browse_output_edit, 1, 1)
 
+        incremental_label: LabelWithHint = LabelWithHint(
+            "Skip predicted images"
+        )
+        incremental_label.set_hint(
+            "Only predict images from the image directory that are new or have changed since they were last predicted into the output directory"
+        )
+        self._incremental_checkbox: QCheckBox = QCheckBox()
+        self._incremental_checkbox.setChecked(self._model.is_incremental())
+        self._incremental_checkbox.toggled.connect(self._model.set_incremental)
+        grid_layout.addWidget(incremental_label, 2, 0)
+        grid_layout.addWidget(self._incremental_checkbox, 2, 1)
+
+        backend_label: LabelWithHint = LabelWithHint("Predict with")
+        backend_label.set_hint(
+            "ONNX Runtime exports the model to ONNX and predicts on the CPU, int8 also quantizes it, which is faster but may be less accurate. Both need the onnx and onnxruntime packages, see allencell-segmenter-ml-quantize to compare int8 with the full model"
+        )
+        self._backend_dropdown: QComboBox = QComboBox()
+        for backend, name in BACKEND_NAMES.items():
+            self._backend_dropdown.addItem(name, backend)
+        self._backend_dropdown.setCurrentIndex(
+            self._backend_dropdown.findData(self._model.get_backend())
+        )
+        self._backend_dropdown.currentIndexChanged.connect(self._set_backend)
+        grid_layout.addWidget(backend_label, 3, 0)
+        grid_layout.addWidget(self._backend_dropdown, 3, 1)
+
+        batched_label: LabelWithHint = LabelWithHint(
+            "Batch images of the same size"
+        )
+        batched_label.set_hint(
+            "Predict images of the same size together, which is much faster for many small images"
+        )
+        self._batched_checkbox: QCheckBox = QCheckBox()
+        self._batched_checkbox.setChecked(
+            self._model.get_batched_prediction() is not None
+        )
+        self._batched_checkbox.toggled.connect(self._set_batched_prediction)
+        grid_layout.addWidget(batched_label, 4, 0)
+        grid_layout.addWidget(self._batched_checkbox, 4, 1)
+
         grid_layout.setColumnStretch(0, 1)
         grid_layout.setColumnStretch(1, 0)
 
         frame_layout.addLayout(grid_layout)
 
+    def _set_backend(self, index: int) -> None:
+        self._model.set_backend(self._backend_dropdown.itemData(index))
+
+    def _set_batched_prediction(self, checked: bool) -> None:
+        self._model.set_batched_prediction(
+            BatchedPrediction() if checked else None
+        )
+
     def _on_screen_slot(self) -> None:
         """Prohibits usage of non-related input fields if top button is checked."""
         self._reset_channel_combobox()
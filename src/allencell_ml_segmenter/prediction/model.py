@@ -4,6 +4,10 @@ from typing import List, Optional
 
 from allencell_ml_segmenter.core.event import Event
 from allencell_ml_segmenter.core.publisher import Publisher
+from allencell_ml_segmenter.prediction.tiled_inference import TiledInference
+from allencell_ml_segmenter.prediction.batched_prediction import (
+    BatchedPrediction,
+)
 
 
 class PredictionInputMode(Enum):
@@ -11,6 +15,20 @@ class PredictionInputMode(Enum):
     FROM_NAPARI_LAYERS = "from_napari_layers"
 
 
+class PredictionBackend(Enum):
+    # runs the model's forward pass, see PredictionModelCache.predict
+    TORCH = "torch"
+    ONNX = "onnx"
+    # the ONNX model quantized to int8, see quantization
+    ONNX_INT8 = "onnx-int8"
+
+
+# postprocessing methods, as selected in ModelInputWidget
+NO_POSTPROCESSING: str = "none"
+SIMPLE_THRESHOLD: str = "simple threshold"
+AUTO_THRESHOLD: str = "auto threshold"
+
+
 class PredictionModel(Publisher):
     """
     Stores state relevant to prediction processes.
@@ -41,6 +59,27 @@ class PredictionModel(Publisher):
         # prediction was not generated and prediction cannot continue.
         self.total_num_images: Optional[int] = None
 
+        # inputs are split into this many shards, each predicted in its own
+        # process, see PredictionService.run_sharded_prediction
+        self._num_shards: int = 1
+        # torch threads per shard process, None to split the cpu cores evenly
+        self._threads_per_shard: Optional[int] = None
+
+        # when True, inputs already predicted into the output directory (with
+        # the same checkpoint and channel) are skipped, see PredictionManifest
+        self._incremental: bool = False
+
+        # None to predict images as configured for the experiment, see
+        # TiledInference
+        self._tiled_inference: Optional[TiledInference] = None
+
+        # None to predict one image at a time, see BatchedPrediction
+        self._batched_prediction: Optional[BatchedPrediction] = None
+
+        # with ONNX, the model is exported to ONNX and run by ONNX Runtime on
+        # the cpu, see onnx_backend
+        self._backend: PredictionBackend = PredictionBackend.TORCH
+
     def get_input_image_path(self) -> Optional[Path]:
         """
         Gets list of paths to input images.
@@ -78,7 +117,18 @@ class PredictionModel(Publisher):
 
     def get_output_seg_directory(self) -> Optional[Path]:
         """
-        Gets path to where segmentation predictions are stored.
+        Gets path to where segmentations are stored, which are postprocessed
+        if a postprocessing method is selected.
+        """
+        if self._output_directory is None:
+            return None
+        if self.is_postprocessing():
+            return self._output_directory / "postprocessed"
+        return self.get_output_prediction_directory()
+
+    def get_output_prediction_directory(self) -> Optional[Path]:
+        """
+        Gets path to where cyto-dl stores predicted segmentations.
         """
         return (
             self._output_directory / "seg"
@@ -131,6 +181,12 @@ class PredictionModel(Publisher):
         self._postprocessing_method = method
         self.dispatch(Event.ACTION_PREDICTION_POSTPROCESSING_METHOD)
 
+    def is_postprocessing(self) -> bool:
+        return self._postprocessing_method in [
+            SIMPLE_THRESHOLD,
+            AUTO_THRESHOLD,
+        ]
+
     def get_postprocessing_simple_threshold(self) -> Optional[float]:
         """
         Gets simple threshold selected by user.
@@ -141,7 +197,8 @@ class PredictionModel(Publisher):
         self, threshold: Optional[float]
     ) -> None:
         """
-        Sets simple threshold selected by user from the slider.
+        Sets simple threshold selected by user from the slider, a percentage
+        of the range of the predictions' dtype ([0, 1] for floats).
         """
         self._postprocessing_simple_threshold = threshold
         self.dispatch(Event.ACTION_PREDICTION_POSTPROCESSING_SIMPLE_THRESHOLD)
@@ -208,3 +265,47 @@ class PredictionModel(Publisher):
 
     def get_total_num_images(self) -> Optional[int]:
         return self.total_num_images
+
+    def set_num_shards(self, num_shards: int) -> None:
+        if num_shards < 1:
+            raise ValueError("num_shards must be at least 1")
+        self._num_shards = num_shards
+
+    def get_num_shards(self) -> int:
+        return self._num_shards
+
+    def set_threads_per_shard(self, threads: Optional[int]) -> None:
+        if threads is not None and threads < 1:
+            raise ValueError("threads per shard must be at least 1")
+        self._threads_per_shard = threads
+
+    def get_threads_per_shard(self) -> Optional[int]:
+        return self._threads_per_shard
+
+    def set_incremental(self, incremental: bool) -> None:
+        self._incremental = incremental
+
+    def is_incremental(self) -> bool:
+        return self._incremental
+
+    def set_tiled_inference(
+        self, tiled_inference: Optional[TiledInference]
+    ) -> None:
+        self._tiled_inference = tiled_inference
+
+    def get_tiled_inference(self) -> Optional[TiledInference]:
+        return self._tiled_inference
+
+    def set_batched_prediction(
+        self, batched_prediction: Optional[BatchedPrediction]
+    ) -> None:
+        self._batched_prediction = batched_prediction
+
+    def get_batched_prediction(self) -> Optional[BatchedPrediction]:
+        return self._batched_prediction
+
+    def set_backend(self, backend: PredictionBackend) -> None:
+        self._backend = backend
+
+    def get_backend(self) -> PredictionBackend:
+        return self._backend
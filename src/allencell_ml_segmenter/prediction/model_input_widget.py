@@ -16,7 +16,15 @@ from qtpy.QtCore import Qt
 from magicgui.widgets import FloatSlider
 from allencell_ml_segmenter.core.aics_widget import AicsWidget
 
-from allencell_ml_segmenter.prediction.model import PredictionModel
+from allencell_ml_segmenter.prediction.model import (
+    PredictionModel,
+    NO_POSTPROCESSING,
+    SIMPLE_THRESHOLD,
+    AUTO_THRESHOLD,
+)
+from allencell_ml_segmenter.prediction.postprocessing import (
+    AUTO_THRESHOLD_METHODS,
+)
 from allencell_ml_segmenter.core.event import Event
 from allencell_ml_segmenter.widgets.label_with_hint_widget import (
     LabelWithHint,
@@ -29,9 +37,9 @@ class ModelInputWidget(AicsWidget):
     postprocessing selection for prediction.
     """
 
-    TOP_TEXT: str = "none"
-    MID_TEXT: str = "simple threshold"
-    BOTTOM_TEXT: str = "auto threshold"
+    TOP_TEXT: str = NO_POSTPROCESSING
+    MID_TEXT: str = SIMPLE_THRESHOLD
+    BOTTOM_TEXT: str = AUTO_THRESHOLD
     MIN: int = 0
     MAX: int = 100
     STEP: int = 1
@@ -201,22 +209,8 @@ class ModelInputWidget(AicsWidget):
         self._upper_bound.setObjectName("upperBound")
 
         # set default values for input fields
-        self._auto_thresh_selection.addItems(
-            [
-                "isodata",
-                "li",
-                "local",
-                "mean",
-                "minimum",
-                "multiotsu",
-                "niblack",
-                "otsu",
-                "savola",
-                "triangle",
-                "yen",
-                "try all",
-            ]
-        )
+        # only the methods prediction can threshold with
+        self._auto_thresh_selection.addItems(list(AUTO_THRESHOLD_METHODS))
 
         # set up disappearing placeholder text
         self._auto_thresh_selection.setEditable(True)
@@ -0,0 +1,222 @@
+import argparse
+import importlib
+import importlib.util
+import sys
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import torch
+from omegaconf import DictConfig, OmegaConf
+
+from allencell_ml_segmenter.utils.experiment_utils import ExperimentUtils
+
+# exported models are saved to <experiment>/onnx/<checkpoint name>.onnx
+ONNX_DIR: str = "onnx"
+ONNX_EXT: str = ".onnx"
+ONNX_OPSET: int = 17
+INPUT_NAME: str = "input"
+# dims of the exported graph's input that may vary between calls
+BATCH_AXIS: str = "batch"
+SPATIAL_AXES: List[str] = ["z", "y", "x"]
+
+
+def import_optional(module: str) -> Any:
+    try:
+        return importlib.import_module(module)
+    except ImportError as e:
+        raise ImportError(
+            f"{module} is needed for the ONNX backend, install it with "
+            f"pip install allencell-segmenter-ml[onnx]"
+        ) from e
+
+
+def is_onnx_available() -> bool:
+    """
+    True if the optional dependencies of the ONNX backend are installed.
+    """
+    return all(
+        importlib.util.find_spec(module) is not None
+        for module in ["onnx", "onnxruntime"]
+    )
+
+
+def get_onnx_path(checkpoint: Path) -> Path:
+    """
+    Returns where the model with the weights of :param checkpoint: (in an
+    experiment's checkpoints directory) is exported to.
+    """
+    return checkpoint.parent.parent / ONNX_DIR / f"{checkpoint.stem}{ONNX_EXT}"
+
+
+def is_exported(checkpoint: Path) -> bool:
+    """
+    True if the model with the weights of :param checkpoint: has been exported
+    since the checkpoint was last written.
+    """
+    onnx_path: Path = get_onnx_path(checkpoint)
+    return (
+        onnx_path.exists()
+        and onnx_path.stat().st_mtime_ns >= checkpoint.stat().st_mtime_ns
+    )
+
+
+class _ExportedForward(torch.nn.Module):
+    """
+    The forward pass of a cyto-dl multi task model with a tensor per head as
+    output, in the order of :param heads:, as ONNX needs.
+    """
+
+    def __init__(self, model: Any, heads: List[str]) -> None:
+        super().__init__()
+        self.model: Any = model
+        self.heads: List[str] = heads
+
+    def forward(self, x: torch.Tensor) -> Tuple[torch.Tensor, ...]:
+        outputs: Dict[str, torch.Tensor] = self.model.forward(x, self.heads)
+        return tuple(outputs[head] for head in self.heads)
+
+
+def _get_in_channels(model: Any) -> int:
+    # channels of the first convolution's weight, [out, in, *kernel]
+    for param in model.parameters():
+        if param.ndim >= 4:
+            return int(param.shape[1])
+    raise ValueError("Cannot find the number of input channels of the model")
+
+
+def export_to_onnx(
+    config_path: Path, checkpoint: Path, onnx_path: Optional[Path] = None
+) -> Path:
+    """
+    Exports the model of the train config at :param config_path: with the
+    weights of :param checkpoint: to :param onnx_path: (default: see
+    get_onnx_path), and returns that path. The exported graph runs the
+    backbone and all inference heads on tiles of any size, the way the
+    model's sliding window inference calls its forward pass.
+    """
+    import_optional("onnx")
+    # imported here, so that importing this module does not import cyto-dl
+    from allencell_ml_segmenter.services.prediction_model_cache import (
+        load_config,
+        load_model,
+    )
+
+    cfg: DictConfig = load_config(
+        config_path, {"checkpoint.ckpt_path": str(checkpoint)}
+    )
+    roi_size: Optional[List[int]] = OmegaConf.select(
+        cfg, "model.inference_args.roi_size"
+    )
+    if not roi_size:
+        raise ValueError("Model config has no inference roi_size to export")
+    model: Any = load_model(cfg)
+    model.eval()
+    heads: List[str] = list(model.inference_heads)
+
+    dynamic_axes: Dict[int, str] = {0: BATCH_AXIS}
+    for axis, name in enumerate(SPATIAL_AXES[-len(roi_size) :], start=2):
+        dynamic_axes[axis] = name
+    if onnx_path is None:
+        onnx_path = get_onnx_path(checkpoint)
+    onnx_path.parent.mkdir(parents=True, exist_ok=True)
+    with torch.no_grad():
+        torch.onnx.export(
+            _ExportedForward(model, heads),
+            (torch.zeros(1, _get_in_channels(model), *roi_size),),
+            str(onnx_path),
+            input_names=[INPUT_NAME],
+            output_names=heads,
+            dynamic_axes={name: dynamic_axes for name in [INPUT_NAME, *heads]},
+            opset_version=ONNX_OPSET,
+            dynamo=False,
+        )
+    return onnx_path
+
+
+def export_experiment(
+    experiment_path: Path, checkpoint: Optional[Path] = None
+) -> Path:
+    """
+    Exports the model of the experiment at :param experiment_path: (a
+    directory in an experiments home) with the weights of :param checkpoint:
+    (default: the best checkpoint), see export_to_onnx.
+    """
+    experiment_path = experiment_path.resolve()
+    if checkpoint is None:
+        checkpoint = ExperimentUtils.get_best_ckpt(
+            experiment_path.parent, experiment_path.name
+        )
+        if checkpoint is None:
+            raise ValueError("Experiment has no checkpoints to export")
+    config_path: Path = experiment_path / "train_config.yaml"
+    if not config_path.exists():
+        raise ValueError(f"{experiment_path} is not a trained experiment")
+    return export_to_onnx(config_path, checkpoint)
+
+
+class OnnxForward:
+    """
+    Stands in for the forward pass of a cyto-dl multi task model: runs the
+    graph exported to :param onnx_path: (see export_to_onnx) with ONNX
+    Runtime's CPU execution provider, using as many threads as torch.
+    """
+
+    def __init__(self, onnx_path: Path) -> None:
+        ort: Any = import_optional("onnxruntime")
+        options: Any = ort.SessionOptions()
+        options.intra_op_num_threads = torch.get_num_threads()
+        options.graph_optimization_level = (
+            ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        )
+        self._session: Any = ort.InferenceSession(
+            str(onnx_path),
+            sess_options=options,
+            providers=["CPUExecutionProvider"],
+        )
+
+    def __call__(
+        self, x: torch.Tensor, run_heads: List[str]
+    ) -> Dict[str, torch.Tensor]:
+        outputs: List[Any] = self._session.run(
+            run_heads,
+            {INPUT_NAME: x.detach().cpu().numpy().astype("float32")},
+        )
+        return {
+            head: torch.from_numpy(output).to(x.device)
+            for head, output in zip(run_heads, outputs)
+        }
+
+
+def _get_parser() -> argparse.ArgumentParser:
+    parser: argparse.ArgumentParser = argparse.ArgumentParser(
+        description="Export a trained Segmenter ML experiment's model to "
+        "ONNX, for prediction with --backend onnx."
+    )
+    parser.add_argument(
+        "--experiment",
+        type=Path,
+        required=True,
+        help="experiment directory, inside the experiments home",
+    )
+    parser.add_argument(
+        "--checkpoint",
+        type=Path,
+        default=None,
+        help="checkpoint path (default: best checkpoint)",
+    )
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args: argparse.Namespace = _get_parser().parse_args(argv)
+    try:
+        onnx_path: Path = export_experiment(args.experiment, args.checkpoint)
+    except (ValueError, ImportError) as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 1
+    print(f"Exported to {onnx_path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,282 @@
+import csv
+import os
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+import dask
+import dask.array as da
+import numpy as np
+import tifffile
+from bioio import BioImage
+from lightning import Callback
+from skimage.filters import (
+    threshold_isodata,
+    threshold_minimum,
+    threshold_otsu,
+    threshold_yen,
+)
+
+# simple thresholds are a percentage of the largest value the predictions'
+# dtype can hold (1 for floats), not of the values of each image, so that a
+# threshold means the same probability for every image
+SIMPLE_THRESHOLD_MAX: float = 100.0
+
+# cyto-dl saves the segmentation of <stem>.<ext> as <stem>.tif
+SEG_EXT: str = ".tif"
+NUM_BINS: int = 256
+# value of foreground voxels in postprocessed segmentations
+FOREGROUND: int = 1
+# thresholding is mostly numpy work that releases the GIL, but more than a
+# handful of concurrent files only adds memory pressure
+DEFAULT_MAX_WORKERS: int = max(1, min(4, os.cpu_count() or 1))
+
+Histogram = Tuple[np.ndarray, np.ndarray]
+
+
+def _threshold_mean(hist: Histogram) -> float:
+    counts, centers = hist
+    return float(np.average(centers, weights=counts))
+
+
+def _threshold_li(hist: Histogram) -> float:
+    # minimum cross entropy, as skimage's threshold_li but on a histogram
+    counts, centers = hist
+    offset: float = float(centers[0])
+    values: np.ndarray = centers - offset
+    tolerance: float = float(np.min(np.diff(centers))) / 2
+    t_next: float = _threshold_mean((counts, values))
+    t_curr: float = -2 * tolerance
+    while abs(t_next - t_curr) > tolerance:
+        t_curr = t_next
+        foreground: np.ndarray = values > t_curr
+        if not counts[foreground].any() or not counts[~foreground].any():
+            break
+        mean_fore: float = float(
+            np.average(values[foreground], weights=counts[foreground])
+        )
+        mean_back: float = float(
+            np.average(values[~foreground], weights=counts[~foreground])
+        )
+        if mean_back == 0:
+            break
+        t_next = (mean_back - mean_fore) / (
+            np.log(mean_back) - np.log(mean_fore)
+        )
+    return t_next + offset
+
+
+def _threshold_triangle(hist: Histogram) -> float:
+    # as skimage's threshold_triangle, which cannot take a histogram
+    counts, centers = hist
+    counts = counts.astype(float)
+    num_bins: int = len(counts)
+    arg_peak: int = int(np.argmax(counts))
+    arg_low, arg_high = np.flatnonzero(counts)[[0, -1]]
+    # the line is drawn to the end of the longer tail
+    flip: bool = arg_peak - arg_low < arg_high - arg_peak
+    if flip:
+        counts = counts[::-1]
+        arg_low = num_bins - arg_high - 1
+        arg_peak = num_bins - arg_peak - 1
+    width: int = arg_peak - arg_low
+    if width == 0:
+        return float(centers[arg_peak])
+    norm: float = float(np.sqrt(counts[arg_peak] ** 2 + width**2))
+    x: np.ndarray = np.arange(width)
+    distances: np.ndarray = (counts[arg_peak] / norm) * x - (
+        width / norm
+    ) * counts[x + arg_low]
+    arg_level: int = int(np.argmax(distances)) + arg_low
+    if flip:
+        arg_level = num_bins - arg_level - 1
+    return float(centers[arg_level])
+
+
+# auto threshold methods that are supported, by name as listed in
+# ModelInputWidget. All of them only need a histogram of the image.
+AUTO_THRESHOLD_METHODS: Dict[str, Callable[[Histogram], float]] = {
+    "isodata": lambda hist: float(threshold_isodata(hist=hist)),
+    "li": _threshold_li,
+    "mean": _threshold_mean,
+    "minimum": lambda hist: float(threshold_minimum(hist=hist)),
+    "otsu": lambda hist: float(threshold_otsu(hist=hist)),
+    "triangle": _threshold_triangle,
+    "yen": lambda hist: float(threshold_yen(hist=hist)),
+}
+
+
+def get_histogram(data: da.Array) -> Histogram:
+    """
+    Returns the counts and bin centers of a histogram of :param data:,
+    computed chunk by chunk. Integer images up to 8 bits get a bin per value.
+    """
+    if np.issubdtype(data.dtype, np.integer) and data.dtype.itemsize == 1:
+        info: np.iinfo = np.iinfo(data.dtype)
+        low: float = info.min - 0.5
+        high: float = info.max + 0.5
+    else:
+        low, high = (float(v) for v in dask.compute(data.min(), data.max()))
+        if low == high:
+            high = low + 1
+    counts, edges = da.histogram(data, bins=NUM_BINS, range=(low, high))
+    return counts.compute(), (edges[:-1] + edges[1:]) / 2
+
+
+def get_threshold(
+    data: da.Array,
+    simple_threshold: Optional[float] = None,
+    auto_threshold: Optional[str] = None,
+) -> float:
+    """
+    Returns the threshold for :param data: from :param simple_threshold: (a
+    percentage of the range of the data's dtype, or of [0, 1] for floats)
+    or else the :param auto_threshold: method.
+    """
+    if simple_threshold is not None:
+        if np.issubdtype(data.dtype, np.integer):
+            high: float = float(np.iinfo(data.dtype).max)
+        else:
+            high = 1.0
+        return simple_threshold / SIMPLE_THRESHOLD_MAX * high
+    if auto_threshold not in AUTO_THRESHOLD_METHODS:
+        raise ValueError(f"Unsupported auto threshold {auto_threshold}")
+    return AUTO_THRESHOLD_METHODS[auto_threshold](get_histogram(data))
+
+
+def threshold_segmentation(
+    seg_path: Path,
+    output_path: Path,
+    simple_threshold: Optional[float] = None,
+    auto_threshold: Optional[str] = None,
+) -> None:
+    """
+    Thresholds the segmentation (predicted probabilities) at :param
+    seg_path:, see get_threshold, and saves the result as uint8 labels to
+    :param output_path:. Works plane by plane, so memory use does not grow
+    with the depth of the image.
+    """
+    data: da.Array = BioImage(
+        seg_path, chunk_dims=["Y", "X"]
+    ).get_image_dask_data("ZYX", C=0)
+    threshold: float = get_threshold(data, simple_threshold, auto_threshold)
+    labels: da.Array = da.where(data > threshold, FOREGROUND, 0).astype(
+        np.uint8
+    )
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    tifffile.imwrite(
+        output_path,
+        data=(plane.compute() for plane in labels),
+        shape=labels.shape,
+        dtype=np.uint8,
+        photometric="minisblack",
+    )
+
+
+class PostprocessingCallback(Callback):
+    """
+    Thresholds segmentations while cyto-dl is still predicting: after every
+    batch, segmentations of the inputs in :param input_csv: that have been
+    written to :param seg_dir: are thresholded in a pool of :param
+    max_workers: threads, and saved to :param output_dir: under the same
+    name. Inputs are predicted in csv order, so only the next ones in order
+    are checked. Prediction ends once all of them are saved. Added to the
+    cyto-dl config by PredictionService.build_overrides.
+    """
+
+    def __init__(
+        self,
+        seg_dir: str,
+        output_dir: str,
+        input_csv: str,
+        simple_threshold: Optional[float] = None,
+        auto_threshold: Optional[str] = None,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+    ) -> None:
+        super().__init__()
+        if simple_threshold is None and (
+            auto_threshold not in AUTO_THRESHOLD_METHODS
+        ):
+            raise ValueError(f"Unsupported auto threshold {auto_threshold}")
+        self._seg_dir: Path = Path(seg_dir)
+        self._output_dir: Path = Path(output_dir)
+        self._input_csv: Path = Path(input_csv)
+        self._simple_threshold: Optional[float] = simple_threshold
+        self._auto_threshold: Optional[str] = auto_threshold
+        self._max_workers: int = max_workers
+
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._futures: List[Future] = []
+        # stems of inputs that have not been submitted yet, in csv order
+        self._pending: Deque[str] = deque()
+
+    # override
+    def on_predict_start(self, trainer: Any, pl_module: Any) -> None:
+        with open(self._input_csv, "r", newline="") as file:
+            self._pending = deque(
+                Path(row["raw"]).stem for row in csv.DictReader(file)
+            )
+        self._futures = []
+        self._pool = ThreadPoolExecutor(max_workers=self._max_workers)
+
+    # override
+    def on_predict_batch_end(
+        self,
+        trainer: Any,
+        pl_module: Any,
+        outputs: Any,
+        batch: Any,
+        batch_idx: int,
+        dataloader_idx: int = 0,
+    ) -> None:
+        self._submit_written()
+
+    # override
+    def on_predict_end(self, trainer: Any, pl_module: Any) -> None:
+        # including any written out of order
+        for stem in self._pending:
+            self._submit(stem)
+        self._pending.clear()
+        try:
+            for future in self._futures:
+                future.result()
+        finally:
+            self._shutdown()
+
+    # override
+    def on_exception(
+        self, trainer: Any, pl_module: Any, exception: BaseException
+    ) -> None:
+        self._shutdown()
+
+    def _submit_written(self) -> None:
+        # heads save segmentations before the batch ends, so they are complete
+        while self._pending and self._submit(self._pending[0]):
+            self._pending.popleft()
+
+    def _submit(self, stem: str) -> bool:
+        seg_path: Path = self._seg_dir / f"{stem}{SEG_EXT}"
+        if self._pool is None or not seg_path.exists():
+            return False
+        self._futures.append(
+            self._pool.submit(
+                self._threshold, seg_path, self._output_dir / seg_path.name
+            )
+        )
+        return True
+
+    def _threshold(self, seg_path: Path, output_path: Path) -> None:
+        # the pool is the parallelism, dask must not start threads of its own
+        with dask.config.set(scheduler="synchronous"):
+            threshold_segmentation(
+                seg_path,
+                output_path,
+                self._simple_threshold,
+                self._auto_threshold,
+            )
+
+    def _shutdown(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
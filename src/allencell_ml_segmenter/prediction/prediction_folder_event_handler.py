@@ -1,5 +1,6 @@
+from pathlib import Path
 from watchdog.events import FileSystemEvent, FileSystemEventHandler
-from typing import Callable, Set
+from typing import Callable, Optional, Set
 
 
 class PredictionFolderEventHandler(FileSystemEventHandler):
@@ -7,18 +8,37 @@ class PredictionFolderEventHandler(FileSystemEventHandler):
     A PredictionFolderEventHandler calls progress_callback upon creation of a file
     with an extension contained in PRED_FILE_EXTS. The argument to progress_callback
     will be how many files that fit these criteria have been created.
+    If given, prediction_callback is called with the path of each of these files
+    once it has been written and closed. Only some platforms (e.g. Linux) report
+    closed files, so on others prediction_callback is never called.
     """
 
     PRED_FILE_EXTS: Set[str] = {".tif", ".tiff"}
 
-    def __init__(self, progress_callback: Callable):
+    def __init__(
+        self,
+        progress_callback: Callable,
+        prediction_callback: Optional[Callable[[Path], None]] = None,
+    ):
         super().__init__()
         self._progress_callback: Callable = progress_callback
+        self._prediction_callback: Optional[Callable[[Path], None]] = (
+            prediction_callback
+        )
         self._num_pred_files_created = 0
 
     # override
     def on_created(self, event: FileSystemEvent) -> None:
-        src_path: str = str(event.src_path)
-        if any([src_path.endswith(ext) for ext in self.PRED_FILE_EXTS]):
+        if self._is_pred_file(event):
             self._num_pred_files_created += 1
             self._progress_callback(self._num_pred_files_created)
+
+    # override
+    def on_closed(self, event: FileSystemEvent) -> None:
+        # a created file may still be being written, a closed one is complete
+        if self._prediction_callback is not None and self._is_pred_file(event):
+            self._prediction_callback(Path(str(event.src_path)))
+
+    def _is_pred_file(self, event: FileSystemEvent) -> bool:
+        src_path: str = str(event.src_path)
+        return any([src_path.endswith(ext) for ext in self.PRED_FILE_EXTS])
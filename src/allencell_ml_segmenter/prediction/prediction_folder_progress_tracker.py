@@ -1,4 +1,5 @@
 from pathlib import Path
+from qtpy.QtCore import QObject, Signal
 from watchdog.observers.api import BaseObserver
 from watchdog.observers import Observer
 from allencell_ml_segmenter.core.progress_tracker import ProgressTracker
@@ -8,6 +9,12 @@ from allencell_ml_segmenter.prediction.prediction_folder_event_handler import (
 from typing import Optional
 
 
+class PredictionFolderSignals(QObject):
+    # path of a prediction that has been completely written, see
+    # PredictionFolderEventHandler
+    prediction_written: Signal = Signal(object)
+
+
 class PredictionFolderProgressTracker(ProgressTracker):
     """
     A PredictionFolderProgressTracker measures progress by observing a folder in
@@ -31,13 +38,21 @@ class PredictionFolderProgressTracker(ProgressTracker):
         self._prediction_folder_path: Path = prediction_folder_path
 
         self._observer: Optional[BaseObserver] = None
+        # emitted from the observer thread, so connected slots are queued to
+        # the thread the tracker was created on
+        self.prediction_signals: PredictionFolderSignals = (
+            PredictionFolderSignals()
+        )
 
     # override
     def start_tracker(self) -> None:
         self.stop_tracker()
         self._observer = Observer()
         event_handler: PredictionFolderEventHandler = (
-            PredictionFolderEventHandler(self.set_progress)
+            PredictionFolderEventHandler(
+                self.set_progress,
+                self.prediction_signals.prediction_written.emit,
+            )
         )
         self._observer.schedule(
             event_handler,
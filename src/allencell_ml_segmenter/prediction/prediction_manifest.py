@@ -0,0 +1,153 @@
+import json
+import os
+from dataclasses import dataclass, asdict
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from allencell_ml_segmenter.utils.file_writer import IFileWriter
+
+MANIFEST_FILE_NAME: str = "prediction_manifest.json"
+
+
+@dataclass
+class ManifestEntry:
+    # size and mtime of the input when it was predicted
+    size: int
+    mtime_ns: int
+    # see PredictionManifest.get_checkpoint_id
+    checkpoint: str
+    # None if predicted with the channel used for training
+    channel: Optional[int]
+
+
+class PredictionManifest:
+    """
+    Records which inputs have been predicted into an output directory, and
+    with which checkpoint and channel, so that predicting the same inputs
+    again only has to predict the ones that are new or have changed since.
+    An input only counts as predicted while its segmentation is still in the
+    output's segmentation directory.
+    """
+
+    def __init__(
+        self, output_dir: Path, seg_dir: Path, file_writer: IFileWriter
+    ) -> None:
+        self._path: Path = output_dir / MANIFEST_FILE_NAME
+        self._seg_dir: Path = seg_dir
+        self._file_writer: IFileWriter = file_writer
+        self._entries: Dict[str, ManifestEntry] = self._read()
+
+    def get_path(self) -> Path:
+        return self._path
+
+    @staticmethod
+    def get_checkpoint_id(checkpoint: Path) -> str:
+        """
+        Identifies :param checkpoint: by path, size and mtime, so that weights
+        saved over an existing checkpoint count as a different checkpoint.
+        """
+        stat: os.stat_result = checkpoint.stat()
+        return f"{checkpoint.resolve()}:{stat.st_size}:{stat.st_mtime_ns}"
+
+    def is_predicted(
+        self,
+        input_path: Path,
+        checkpoint_id: str,
+        channel: Optional[int],
+        segmentations: Optional[Dict[str, List[Path]]] = None,
+    ) -> bool:
+        """
+        :param segmentations: segmentations by stem, from get_segmentations.
+        Looked up if None, pass it in when checking many inputs.
+        """
+        entry: Optional[ManifestEntry] = self._entries.get(
+            self._get_key(input_path)
+        )
+        if entry is None or not input_path.exists():
+            return False
+        if segmentations is None:
+            segmentations = self.get_segmentations()
+        stat: os.stat_result = input_path.stat()
+        return (
+            entry.size == stat.st_size
+            and entry.mtime_ns == stat.st_mtime_ns
+            and entry.checkpoint == checkpoint_id
+            and entry.channel == channel
+            and input_path.stem in segmentations
+        )
+
+    def get_unpredicted(
+        self,
+        input_paths: List[Path],
+        checkpoint_id: str,
+        channel: Optional[int],
+    ) -> List[Path]:
+        """
+        Returns the inputs in :param input_paths: that are new or have changed
+        since they were predicted, in order. Segmentations of changed inputs
+        that were predicted before are deleted, they are out of date and the
+        new ones should count towards progress once written.
+        """
+        segmentations: Dict[str, List[Path]] = self.get_segmentations()
+        unpredicted: List[Path] = []
+        for input_path in input_paths:
+            if self.is_predicted(
+                input_path, checkpoint_id, channel, segmentations
+            ):
+                continue
+            if self._get_key(input_path) in self._entries:
+                for seg in segmentations.get(input_path.stem, []):
+                    seg.unlink()
+            unpredicted.append(input_path)
+        return unpredicted
+
+    def record(
+        self,
+        input_paths: List[Path],
+        checkpoint_id: str,
+        channel: Optional[int],
+    ) -> None:
+        """
+        Records the inputs in :param input_paths: that now have segmentations
+        as predicted, and saves the manifest.
+        """
+        segmentations: Dict[str, List[Path]] = self.get_segmentations()
+        for input_path in input_paths:
+            if not input_path.exists() or input_path.stem not in segmentations:
+                continue
+            stat: os.stat_result = input_path.stat()
+            self._entries[self._get_key(input_path)] = ManifestEntry(
+                stat.st_size, stat.st_mtime_ns, checkpoint_id, channel
+            )
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        self._file_writer.write_json(
+            {key: asdict(entry) for key, entry in self._entries.items()},
+            self._path,
+        )
+
+    def get_segmentations(self) -> Dict[str, List[Path]]:
+        """
+        Returns the files in the segmentation directory by stem. Segmentations
+        are named after their input, see PredictionView.showResults.
+        """
+        segmentations: Dict[str, List[Path]] = {}
+        if self._seg_dir.exists():
+            for path in self._seg_dir.iterdir():
+                if path.is_file():
+                    segmentations.setdefault(path.stem, []).append(path)
+        return segmentations
+
+    @staticmethod
+    def _get_key(input_path: Path) -> str:
+        return str(input_path.resolve())
+
+    def _read(self) -> Dict[str, ManifestEntry]:
+        if not self._path.exists():
+            return {}
+        try:
+            with open(self._path, "r") as file:
+                raw: dict = json.load(file)
+            return {key: ManifestEntry(**entry) for key, entry in raw.items()}
+        except (ValueError, TypeError):
+            # an unreadable manifest only means everything is predicted again
+            return {}
@@ -0,0 +1,384 @@
+import argparse
+import csv
+import sys
+import tempfile
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import dask.array as da
+import numpy as np
+from bioio import BioImage
+from omegaconf import DictConfig, OmegaConf
+
+from allencell_ml_segmenter.prediction.onnx_backend import (
+    INPUT_NAME,
+    export_to_onnx,
+    get_onnx_path,
+    import_optional,
+    is_exported,
+)
+from allencell_ml_segmenter.prediction.postprocessing import get_threshold
+from allencell_ml_segmenter.utils.experiment_utils import ExperimentUtils
+
+# the quantized model of <checkpoint>.onnx is saved next to it, see
+# get_quantized_path
+QUANTIZED_SUFFIX: str = ".int8"
+# calibration only needs to see the typical range of every activation, a
+# few patches of a few training images are enough
+NUM_CALIBRATION_IMAGES: int = 8
+PATCHES_PER_CALIBRATION_IMAGE: int = 4
+NUM_EVALUATION_IMAGES: int = 8
+# predictions are binarized at this percentage of their dtype's range for
+# Dice, see postprocessing.get_threshold
+DICE_THRESHOLD: float = 50.0
+# column of the ground truth segmentations in the experiment's csvs
+SEG_COLUMN: str = "seg1"
+
+
+def get_quantized_path(checkpoint: Path) -> Path:
+    """
+    Returns where the int8 model with the weights of :param checkpoint: is
+    saved, next to the ONNX model it is quantized from.
+    """
+    onnx_path: Path = get_onnx_path(checkpoint)
+    return onnx_path.with_name(
+        f"{onnx_path.stem}{QUANTIZED_SUFFIX}{onnx_path.suffix}"
+    )
+
+
+def is_quantized(checkpoint: Path) -> bool:
+    """
+    True if the model with the weights of :param checkpoint: has been
+    quantized since it was last exported, see is_exported.
+    """
+    quantized_path: Path = get_quantized_path(checkpoint)
+    return (
+        is_exported(checkpoint)
+        and quantized_path.exists()
+        and quantized_path.stat().st_mtime_ns
+        >= get_onnx_path(checkpoint).stat().st_mtime_ns
+    )
+
+
+def get_calibration_images(
+    train_csv: Path, num_images: int = NUM_CALIBRATION_IMAGES, seed: int = 0
+) -> List[Path]:
+    """
+    Returns a random sample of :param num_images: raw images of the training
+    csv at :param train_csv:, the same sample for the same :param seed:.
+    """
+    with open(train_csv, "r", newline="") as file:
+        images: List[Path] = [Path(row["raw"]) for row in csv.DictReader(file)]
+    if not images:
+        raise ValueError(f"{train_csv} has no images to calibrate with")
+    rng: np.random.Generator = np.random.default_rng(seed)
+    return [
+        images[i]
+        for i in sorted(
+            rng.choice(len(images), min(num_images, len(images)), False)
+        )
+    ]
+
+
+def _write_input_csv(input_csv: Path, images: List[Path]) -> None:
+    # laid out as the prediction service writes its inputs, cyto-dl's
+    # datamodule reads the raw and split columns
+    with open(input_csv, "w", newline="") as file:
+        writer = csv.writer(file)
+        writer.writerow(["", "raw", "split"])
+        for i, image in enumerate(images):
+            writer.writerow([str(i), str(image), "test"])
+
+
+def get_calibration_patches(
+    config_path: Path,
+    checkpoint: Path,
+    images: List[Path],
+    patches_per_image: int = PATCHES_PER_CALIBRATION_IMAGE,
+    seed: int = 0,
+) -> List[np.ndarray]:
+    """
+    Returns random patches of the inputs' size to the model's forward pass
+    (the inference roi_size) from :param images:, transformed as prediction
+    transforms them, so they are what the quantized model will see.
+    """
+    # imported here, as they import cyto-dl
+    from allencell_ml_segmenter.services.prediction_model_cache import (
+        create_prediction_dataloader,
+        load_config,
+    )
+    from allencell_ml_segmenter.services.prediction_service import (
+        get_prediction_overrides,
+    )
+
+    rng: np.random.Generator = np.random.default_rng(seed)
+    patches: List[np.ndarray] = []
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        input_csv: Path = Path(tmp_dir) / "calibration.csv"
+        _write_input_csv(input_csv, images)
+        cfg: DictConfig = load_config(
+            config_path, get_prediction_overrides(checkpoint, input_csv)
+        )
+        roi_size: List[int] = list(
+            OmegaConf.select(cfg, "model.inference_args.roi_size")
+        )
+        x_key: str = OmegaConf.select(cfg, "model.x_key", default="raw")
+        for batch in create_prediction_dataloader(cfg):
+            # [1, channels, *spatial]
+            x: np.ndarray = np.asarray(batch[x_key], dtype=np.float32)
+            for _ in range(patches_per_image):
+                starts: List[int] = [
+                    int(rng.integers(0, max(1, dim - side + 1)))
+                    for dim, side in zip(x.shape[2:], roi_size)
+                ]
+                patches.append(
+                    x[
+                        (slice(None), slice(None))
+                        + tuple(
+                            slice(start, start + side)
+                            for start, side in zip(starts, roi_size)
+                        )
+                    ]
+                )
+    return patches
+
+
+def quantize_onnx_model(
+    onnx_path: Path, quantized_path: Path, patches: List[np.ndarray]
+) -> Path:
+    """
+    Quantizes the weights and activations of the ONNX model at :param
+    onnx_path: to int8 with ONNX Runtime's static quantization, with
+    activation ranges calibrated on :param patches:, and saves it to :param
+    quantized_path:.
+    """
+    quantization: Any = import_optional("onnxruntime.quantization")
+
+    class _CalibrationReader(quantization.CalibrationDataReader):
+        def __init__(self) -> None:
+            self._patches = iter(patches)
+
+        def get_next(self) -> Optional[Dict[str, np.ndarray]]:
+            patch: Optional[np.ndarray] = next(self._patches, None)
+            return None if patch is None else {INPUT_NAME: patch}
+
+    quantization.quantize_static(
+        str(onnx_path),
+        str(quantized_path),
+        _CalibrationReader(),
+        quant_format=quantization.QuantFormat.QDQ,
+        activation_type=quantization.QuantType.QUInt8,
+        weight_type=quantization.QuantType.QInt8,
+        per_channel=True,
+    )
+    return quantized_path
+
+
+def quantize(config_path: Path, checkpoint: Path, train_csv: Path) -> Path:
+    """
+    Quantizes the model of the train config at :param config_path: with the
+    weights of :param checkpoint: to int8, exporting it to ONNX first if
+    needed, and calibrated on images of the training csv at :param
+    train_csv:. Returns the path of the quantized model.
+    """
+    if is_exported(checkpoint):
+        onnx_path: Path = get_onnx_path(checkpoint)
+    else:
+        onnx_path = export_to_onnx(config_path, checkpoint)
+    patches: List[np.ndarray] = get_calibration_patches(
+        config_path, checkpoint, get_calibration_images(train_csv)
+    )
+    return quantize_onnx_model(
+        onnx_path, get_quantized_path(checkpoint), patches
+    )
+
+
+def get_dice(prediction: np.ndarray, truth: np.ndarray) -> float:
+    """
+    Returns the Dice coefficient of the foregrounds (non zero voxels) of
+    :param prediction: and :param truth:, 1 if both are empty.
+    """
+    prediction = prediction.astype(bool)
+    truth = truth.astype(bool)
+    total: int = int(prediction.sum() + truth.sum())
+    if total == 0:
+        return 1.0
+    return 2 * int(np.logical_and(prediction, truth).sum()) / total
+
+
+def _read_zyx(path: Path) -> np.ndarray:
+    return BioImage(path).get_image_data("ZYX", C=0)
+
+
+def get_mean_dice(
+    seg_dir: Path, images: List[Path], truths: List[Path]
+) -> float:
+    """
+    Returns the mean Dice of the segmentations in :param seg_dir: of
+    :param images:, binarized at DICE_THRESHOLD, against :param truths:.
+    """
+    dices: List[float] = []
+    for image, truth in zip(images, truths):
+        prediction: np.ndarray = _read_zyx(seg_dir / f"{image.stem}.tif")
+        threshold: float = get_threshold(
+            da.from_array(prediction), simple_threshold=DICE_THRESHOLD
+        )
+        dices.append(get_dice(prediction > threshold, _read_zyx(truth)))
+    return float(np.mean(dices)) if dices else 0.0
+
+
+@dataclass
+class QuantizationReport:
+    num_images: int
+    # predicted images per second with the fp32 and int8 ONNX models
+    fp32_images_per_second: float
+    int8_images_per_second: float
+    # mean Dice against the ground truth
+    fp32_dice: float
+    int8_dice: float
+
+    def get_speedup(self) -> float:
+        return (
+            self.int8_images_per_second / self.fp32_images_per_second
+            if self.fp32_images_per_second > 0
+            else 0.0
+        )
+
+    def get_dice_delta(self) -> float:
+        return self.int8_dice - self.fp32_dice
+
+    def __str__(self) -> str:
+        return (
+            f"On {self.num_images} images, int8 predicts "
+            f"{self.get_speedup():.2f}x as fast as ONNX fp32 "
+            f"({self.int8_images_per_second:.2f} vs "
+            f"{self.fp32_images_per_second:.2f} images/s), "
+            f"Dice {self.int8_dice:.4f} vs {self.fp32_dice:.4f} "
+            f"(delta {self.get_dice_delta():+.4f})"
+        )
+
+
+def evaluate_quantization(
+    experiment_path: Path,
+    checkpoint: Path,
+    images_csv: Path,
+    output_dir: Path,
+    num_images: int = NUM_EVALUATION_IMAGES,
+) -> QuantizationReport:
+    """
+    Predicts the first :param num_images: images of :param images_csv: (with
+    raw and seg1 columns, like the experiment's test.csv) with the fp32 and
+    the int8 model of :param checkpoint: into :param output_dir:, and
+    compares their throughput and Dice. Both are predicted by ONNX Runtime,
+    so the speedup and Dice delta are against the fp32 ONNX backend, not the
+    torch backend.
+    """
+    # imported here, as batch prediction imports this module through the
+    # prediction service
+    from allencell_ml_segmenter.prediction.batch_prediction import (
+        BatchPredictionSummary,
+        run_batch_prediction,
+    )
+    from allencell_ml_segmenter.prediction.model import PredictionBackend
+
+    with open(images_csv, "r", newline="") as file:
+        rows: List[Dict[str, str]] = list(csv.DictReader(file))[:num_images]
+    if not rows:
+        raise ValueError(f"{images_csv} has no images to evaluate with")
+    images: List[Path] = [Path(row["raw"]) for row in rows]
+    truths: List[Path] = [Path(row[SEG_COLUMN]) for row in rows]
+    output_dir.mkdir(parents=True, exist_ok=True)
+    input_csv: Path = output_dir / "evaluation.csv"
+    _write_input_csv(input_csv, images)
+
+    images_per_second: Dict[PredictionBackend, float] = {}
+    dices: Dict[PredictionBackend, float] = {}
+    for backend in [PredictionBackend.ONNX, PredictionBackend.ONNX_INT8]:
+        backend_dir: Path = output_dir / backend.value
+        summary: BatchPredictionSummary = run_batch_prediction(
+            experiment_path,
+            input_csv,
+            backend_dir,
+            checkpoint=checkpoint,
+            backend=backend,
+        )
+        images_per_second[backend] = summary.get_images_per_second()
+        dices[backend] = get_mean_dice(backend_dir / "seg", images, truths)
+    return QuantizationReport(
+        len(images),
+        images_per_second[PredictionBackend.ONNX],
+        images_per_second[PredictionBackend.ONNX_INT8],
+        dices[PredictionBackend.ONNX],
+        dices[PredictionBackend.ONNX_INT8],
+    )
+
+
+def _get_parser() -> argparse.ArgumentParser:
+    parser: argparse.ArgumentParser = argparse.ArgumentParser(
+        description="Quantize a trained Segmenter ML experiment's model to "
+        "int8 for prediction with --backend onnx-int8, and compare its speed "
+        "and Dice with the fp32 model on the onnx backend."
+    )
+    parser.add_argument(
+        "--experiment",
+        type=Path,
+        required=True,
+        help="experiment directory, inside the experiments home",
+    )
+    parser.add_argument(
+        "--checkpoint",
+        type=Path,
+        default=None,
+        help="checkpoint path (default: best checkpoint)",
+    )
+    parser.add_argument(
+        "--evaluation-output",
+        type=Path,
+        default=None,
+        help="directory to save the predictions of the comparison to "
+        "(default: a temporary directory)",
+    )
+    parser.add_argument(
+        "--no-evaluation",
+        action="store_true",
+        help="only quantize, without comparing to the fp32 model",
+    )
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args: argparse.Namespace = _get_parser().parse_args(argv)
+    experiment_path: Path = args.experiment.resolve()
+    checkpoint: Optional[Path] = args.checkpoint or (
+        ExperimentUtils.get_best_ckpt(
+            experiment_path.parent, experiment_path.name
+        )
+    )
+    try:
+        if checkpoint is None:
+            raise ValueError("Experiment has no checkpoints to quantize")
+        quantized_path: Path = quantize(
+            experiment_path / "train_config.yaml",
+            checkpoint,
+            experiment_path / "data" / "train.csv",
+        )
+        print(f"Quantized to {quantized_path}")
+        if args.no_evaluation:
+            return 0
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            report: QuantizationReport = evaluate_quantization(
+                experiment_path,
+                checkpoint,
+                experiment_path / "data" / "test.csv",
+                args.evaluation_output or Path(tmp_dir),
+            )
+    except (ValueError, ImportError) as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 1
+    print(report)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,94 @@
+import math
+from dataclasses import dataclass
+from enum import Enum
+from typing import Any, Dict, List, Optional
+
+# rough peak memory per voxel of a tile while it goes through the model: float32
+# activations of the widest layers of the network, with their skip connections
+BYTES_PER_TILE_VOXEL: int = 4 * 256
+# tile sides are kept divisible by the model's total downsampling
+TILE_MULTIPLE: int = 16
+# depth of tiles sized for 3D models, tall stacks are tiled along z instead
+DEFAULT_TILE_DEPTH: int = 32
+
+
+class BlendMode(Enum):
+    # how overlapping tiles are combined, see monai's sliding_window_inference
+    CONSTANT = "constant"
+    GAUSSIAN = "gaussian"
+
+
+@dataclass
+class TiledInference:
+    """
+    Predicts images in tiles of :param tile_shape: (ZYX or YX), or in tiles
+    sized to fit in :param memory_budget_mb: if no tile shape is given.
+    Neighbouring tiles overlap by :param overlap: (a fraction of the tile) and
+    are blended with :param blend_mode:.
+    """
+
+    tile_shape: Optional[List[int]] = None
+    memory_budget_mb: Optional[int] = None
+    overlap: float = 0.25
+    blend_mode: BlendMode = BlendMode.GAUSSIAN
+
+    def __post_init__(self) -> None:
+        if self.tile_shape is None and self.memory_budget_mb is None:
+            raise ValueError("Tiled inference needs a tile shape or budget")
+        if self.tile_shape is not None and (
+            len(self.tile_shape) not in [2, 3]
+            or any(side < 1 for side in self.tile_shape)
+        ):
+            raise ValueError(f"Invalid tile shape {self.tile_shape}")
+        if self.memory_budget_mb is not None and self.memory_budget_mb < 1:
+            raise ValueError("memory budget must be at least 1 MB")
+        if not 0 <= self.overlap < 1:
+            raise ValueError("overlap must be at least 0 and less than 1")
+
+    def get_tile_shape(self, spatial_dims: int) -> List[int]:
+        """
+        Returns the tile shape, sized from the memory budget for a model with
+        :param spatial_dims: if none was given.
+        """
+        if self.tile_shape is not None:
+            if len(self.tile_shape) != spatial_dims:
+                raise ValueError(
+                    f"Tile shape {self.tile_shape} does not have {spatial_dims} dimensions"
+                )
+            return self.tile_shape
+        # checked in __post_init__
+        assert self.memory_budget_mb is not None
+        return get_tile_shape_for_budget(self.memory_budget_mb, spatial_dims)
+
+    def get_overrides(self, spatial_dims: int) -> Dict[str, Any]:
+        """
+        Returns the cyto-dl overrides for this tiling of a model with :param
+        spatial_dims:, see PredictionService.build_overrides.
+        """
+        return {
+            "model.inference_args.roi_size": self.get_tile_shape(spatial_dims),
+            "model.inference_args.overlap": self.overlap,
+            "model.inference_args.mode": self.blend_mode.value,
+            # one tile at a time, so the budget holds
+            "model.inference_args.sw_batch_size": 1,
+            # tiles are stitched in main memory rather than on the GPU, so
+            # GPU memory only has to fit the tile being predicted
+            "model.inference_args.device": "cpu",
+        }
+
+
+def get_tile_shape_for_budget(
+    memory_budget_mb: int, spatial_dims: int
+) -> List[int]:
+    """
+    Returns the largest tile shape (ZYX or YX, with square YX) whose sides
+    are multiples of TILE_MULTIPLE and that fits in :param memory_budget_mb:
+    according to BYTES_PER_TILE_VOXEL. Never smaller than TILE_MULTIPLE.
+    """
+    if spatial_dims not in [2, 3]:
+        raise ValueError(f"Cannot tile {spatial_dims} spatial dimensions")
+    voxels: float = memory_budget_mb * 1024 * 1024 / BYTES_PER_TILE_VOXEL
+    depth: int = DEFAULT_TILE_DEPTH if spatial_dims == 3 else 1
+    side: int = math.isqrt(int(voxels / depth))
+    side = max(TILE_MULTIPLE, side // TILE_MULTIPLE * TILE_MULTIPLE)
+    return [depth, side, side] if spatial_dims == 3 else [side, side]
@@ -1,6 +1,5 @@
 from pathlib import Path
-from typing import Optional
-import numpy as np
+from typing import Dict, List, Optional, Set, Tuple
 from qtpy.QtCore import Qt
 
 from allencell_ml_segmenter._style import Style
@@ -33,7 +32,13 @@ from qtpy.QtWidgets import (
 from allencell_ml_segmenter.main.i_viewer import IViewer
 from allencell_ml_segmenter.core.image_data_extractor import (
     IImageDataExtractor,
-    AICSImageDataExtractor,
+    CachingImageDataExtractor,
+    ImageArray,
+)
+from allencell_ml_segmenter.core.task_executor import (
+    ITaskExecutor,
+    TaskHandle,
+    ThreadPoolTaskExecutor,
 )
 
 
@@ -47,13 +52,24 @@ class PredictionView(View, MainWindow):
         main_model: MainModel,
         prediction_model: PredictionModel,
         viewer: IViewer,
-        img_data_extractor: IImageDataExtractor = AICSImageDataExtractor.global_instance(),
+        img_data_extractor: IImageDataExtractor = CachingImageDataExtractor.global_instance(),
+        task_executor: ITaskExecutor = ThreadPoolTaskExecutor.global_instance(),
     ):
         super().__init__()
         self._main_model: MainModel = main_model
         self._prediction_model: PredictionModel = prediction_model
         self._viewer: IViewer = viewer
         self._img_data_extractor = img_data_extractor
+        self._task_executor: ITaskExecutor = task_executor
+
+        # results of the latest prediction from napari layers, by stem. Results
+        # are decoded off the main thread and shown as they are written.
+        self._result_raw_paths: Dict[str, Path] = {}
+        self._shown_results: Set[str] = set()
+        self._decoding_results: Set[str] = set()
+        self._failed_results: Set[str] = set()
+        self._decode_handles: List[TaskHandle] = []
+        self._prediction_done: bool = False
 
         self._service: ModelFileService = ModelFileService(
             self._prediction_model
@@ -133,6 +149,10 @@ class PredictionView(View, MainWindow):
                     total_num_images,
                 )
             )
+            self._reset_results()
+            progress_tracker.prediction_signals.prediction_written.connect(
+                self._on_prediction_written
+            )
             self.startLongTaskWithProgressBar(progress_tracker)
 
     def doWork(self) -> None:
@@ -153,49 +173,22 @@ class PredictionView(View, MainWindow):
             == PredictionInputMode.FROM_NAPARI_LAYERS
             and output_path is not None
         ):
-            raw_imgs: Optional[list[Path]] = (
-                self._prediction_model.get_selected_paths()
-            )
+            if not self._result_raw_paths:
+                # not set if results were not streamed while predicting
+                self._set_result_raw_paths()
             segmentations: list[Path] = (
                 FileUtils.get_all_files_in_dir_ignore_hidden(output_path)
             )
             channel: Optional[int] = (
                 self._prediction_model.get_image_input_channel_index()
             )
-            if raw_imgs is None or channel is None:
+            if channel is None:
                 raise RuntimeError("Insufficient data to show results")
 
-            # here, we will pair raw images and segmentations based on the stem component of their paths
-            stem_to_data: dict[str, dict[str, Path]] = {
-                raw_img.stem: {"raw": raw_img} for raw_img in raw_imgs
-            }
+            self._prediction_done = True
+            # results already shown while predicting are skipped
             for seg in segmentations:
-                # ignore files in the folder that aren't from most recent predictions
-                if seg.stem in stem_to_data:
-                    stem_to_data[seg.stem]["seg"] = seg
-
-            self._viewer.clear_layers()
-            for data in stem_to_data.values():
-                raw_np_data: Optional[np.ndarray] = (
-                    self._img_data_extractor.extract_image_data(
-                        data["raw"], channel=channel
-                    ).np_data
-                )
-                seg_np_data: Optional[np.ndarray] = (
-                    self._img_data_extractor.extract_image_data(
-                        data["seg"], seg=1
-                    ).np_data
-                )
-                if raw_np_data is not None:
-                    self._viewer.add_image(
-                        raw_np_data,
-                        f"[raw] {data['raw'].name}",
-                    )
-                if seg_np_data is not None:
-                    self._viewer.add_labels(
-                        seg_np_data,
-                        name=f"[seg] {data['seg'].name}",
-                    )
+                self._show_result(seg, channel)
         # Display popup with saved images path if prediction inputs are from a directory
         else:
             dialog_box = DialogBox(
@@ -205,5 +198,91 @@ class PredictionView(View, MainWindow):
             if dialog_box.get_selection() and output_path is not None:
                 FileUtils.open_directory_in_window(output_path)
 
+    def _reset_results(self) -> None:
+        for handle in self._decode_handles:
+            handle.cancel()
+        self._decode_handles = []
+        self._result_raw_paths = {}
+        self._shown_results = set()
+        self._decoding_results = set()
+        self._failed_results = set()
+        self._prediction_done = False
+        if (
+            self._prediction_model.get_prediction_input_mode()
+            == PredictionInputMode.FROM_NAPARI_LAYERS
+        ):
+            self._set_result_raw_paths()
+
+    def _set_result_raw_paths(self) -> None:
+        # taken before any result is shown, showing results changes the layers
+        # and with them the selected paths
+        raw_imgs: Optional[list[Path]] = (
+            self._prediction_model.get_selected_paths()
+        )
+        # here, we will pair raw images and segmentations based on the stem component of their paths
+        self._result_raw_paths = {
+            raw_img.stem: raw_img for raw_img in raw_imgs or []
+        }
+
+    def _on_prediction_written(self, seg: Path) -> None:
+        channel: Optional[int] = (
+            self._prediction_model.get_image_input_channel_index()
+        )
+        if channel is not None:
+            self._show_result(seg, channel)
+
+    def _show_result(self, seg: Path, channel: int) -> None:
+        raw: Optional[Path] = self._result_raw_paths.get(seg.stem)
+        # ignore files in the folder that aren't from most recent predictions
+        if (
+            raw is None
+            or seg.stem in self._shown_results
+            or seg.stem in self._decoding_results
+        ):
+            return
+        self._decoding_results.add(seg.stem)
+        self._decode_handles.append(
+            self._task_executor.exec(
+                lambda: self._decode_result(raw, seg, channel),
+                on_return=lambda data: self._add_result(raw, seg, data),
+                on_error=lambda _: self._on_decode_error(seg, channel),
+            )
+        )
+
+    def _decode_result(
+        self, raw: Path, seg: Path, channel: int
+    ) -> Tuple[Optional[ImageArray], Optional[ImageArray]]:
+        return (
+            self._img_data_extractor.extract_image_data(
+                raw, channel=channel
+            ).np_data,
+            self._img_data_extractor.extract_image_data(seg, seg=1).np_data,
+        )
+
+    def _add_result(
+        self,
+        raw: Path,
+        seg: Path,
+        data: Tuple[Optional[ImageArray], Optional[ImageArray]],
+    ) -> None:
+        self._decoding_results.discard(seg.stem)
+        if not self._shown_results:
+            # the first result replaces whatever was shown before
+            self._viewer.clear_layers()
+        self._shown_results.add(seg.stem)
+        raw_np_data, seg_np_data = data
+        if raw_np_data is not None:
+            self._viewer.add_image(raw_np_data, f"[raw] {raw.name}")
+        if seg_np_data is not None:
+            self._viewer.add_labels(seg_np_data, name=f"[seg] {seg.name}")
+
+    def _on_decode_error(self, seg: Path, channel: int) -> None:
+        self._decoding_results.discard(seg.stem)
+        # it may have been read before it was completely written, so try once
+        # more when prediction is done (showResults tries the others)
+        if self._prediction_done and seg.stem not in self._failed_results:
+            self._failed_results.add(seg.stem)
+            self._show_result(seg, channel)
+
     def focus_changed(self) -> None:
         self._viewer.clear_layers()
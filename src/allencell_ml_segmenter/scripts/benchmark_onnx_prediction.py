@@ -0,0 +1,95 @@
+# This file is intended to be run by hand on an inference machine, e.g.
+# python -m allencell_ml_segmenter.scripts.benchmark_onnx_prediction \
+#     --experiment <experiments home>/<experiment> --input <image dir> \
+#     --output <scratch dir> [--int8]
+import argparse
+import time
+from pathlib import Path
+from typing import Dict, List
+
+import numpy as np
+import tifffile
+
+from allencell_ml_segmenter.prediction.batch_prediction import (
+    BatchPredictionSummary,
+    run_batch_prediction,
+)
+from allencell_ml_segmenter.prediction.model import PredictionBackend
+from allencell_ml_segmenter.prediction.onnx_backend import export_experiment
+
+
+def _get_max_difference(torch_dir: Path, onnx_dir: Path) -> float:
+    # largest difference between the backends' segmentations of any image
+    differences: List[float] = [
+        float(
+            np.max(
+                np.abs(
+                    tifffile.imread(seg).astype(np.float64)
+                    - tifffile.imread(onnx_dir / seg.name)
+                )
+            )
+        )
+        for seg in sorted(torch_dir.glob("*.tif"))
+    ]
+    return max(differences, default=0.0)
+
+
+def main() -> None:
+    parser: argparse.ArgumentParser = argparse.ArgumentParser(
+        description="Compares prediction latency and throughput of the "
+        "torch and ONNX Runtime backends on the same images."
+    )
+    parser.add_argument("--experiment", type=Path, required=True)
+    parser.add_argument("--input", type=Path, required=True)
+    parser.add_argument("--output", type=Path, required=True)
+    parser.add_argument(
+        "--int8",
+        action="store_true",
+        help="also benchmark the int8 model, quantizing it first if needed",
+    )
+    args: argparse.Namespace = parser.parse_args()
+
+    # exported up front, so that export time is not counted as prediction
+    start: float = time.perf_counter()
+    onnx_path: Path = export_experiment(args.experiment)
+    print(f"Exported {onnx_path} in {time.perf_counter() - start:.1f}s")
+
+    summaries: Dict[PredictionBackend, BatchPredictionSummary] = {}
+    backends: List[PredictionBackend] = [
+        PredictionBackend.TORCH,
+        PredictionBackend.ONNX,
+    ]
+    # opt-in, as quantizing takes a while and changes the segmentations
+    if args.int8:
+        backends.append(PredictionBackend.ONNX_INT8)
+    for backend in backends:
+        # separate output dirs, so every run predicts every image
+        summaries[backend] = run_batch_prediction(
+            args.experiment,
+            args.input,
+            args.output / backend.value,
+            backend=backend,
+        )
+        print(f"{backend.value}: {summaries[backend]}")
+
+    baseline: float = summaries[
+        PredictionBackend.TORCH
+    ].get_images_per_second()
+    print(f"{'backend':>8}{'s/image':>10}{'images/s':>12}{'speedup':>10}")
+    for backend, summary in summaries.items():
+        images_per_second: float = summary.get_images_per_second()
+        print(
+            f"{backend.value:>8}"
+            f"{1 / images_per_second if images_per_second else 0.0:>10.2f}"
+            f"{images_per_second:>12.2f}"
+            f"{images_per_second / baseline if baseline else 0.0:>10.2f}"
+        )
+    max_difference: float = _get_max_difference(
+        args.output / PredictionBackend.TORCH.value / "seg",
+        args.output / PredictionBackend.ONNX.value / "seg",
+    )
+    print(f"largest difference between segmentations: {max_difference}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+# This file is intended to be run by hand on an inference machine, e.g.
+# python -m allencell_ml_segmenter.scripts.benchmark_sharded_prediction \
+#     --experiment <experiments home>/<experiment> --input <image dir> \
+#     --output <scratch dir> --shards 1 2 4 8 16
+import argparse
+from pathlib import Path
+from typing import List
+
+from allencell_ml_segmenter.prediction.batch_prediction import (
+    BatchPredictionSummary,
+    run_batch_prediction,
+)
+
+
+def main() -> None:
+    parser: argparse.ArgumentParser = argparse.ArgumentParser(
+        description="Measures how prediction throughput scales with the "
+        "number of shards."
+    )
+    parser.add_argument("--experiment", type=Path, required=True)
+    parser.add_argument("--input", type=Path, required=True)
+    parser.add_argument("--output", type=Path, required=True)
+    parser.add_argument("--shards", type=int, nargs="+", default=[1, 2, 4])
+    args: argparse.Namespace = parser.parse_args()
+
+    summaries: List[BatchPredictionSummary] = []
+    for num_shards in args.shards:
+        # separate output dirs, so every run predicts every image
+        summaries.append(
+            run_batch_prediction(
+                args.experiment,
+                args.input,
+                args.output / f"shards_{num_shards}",
+                num_shards=num_shards,
+            )
+        )
+        print(f"{num_shards} shard(s): {summaries[-1]}")
+
+    baseline: float = summaries[0].get_images_per_second()
+    print(f"{'shards':>8}{'images/s':>12}{'speedup':>10}{'efficiency':>12}")
+    for num_shards, summary in zip(args.shards, summaries):
+        speedup: float = (
+            summary.get_images_per_second() / baseline if baseline else 0.0
+        )
+        print(
+            f"{num_shards:>8}{summary.get_images_per_second():>12.2f}"
+            f"{speedup:>10.2f}{speedup / num_shards * args.shards[0]:>12.0%}"
+        )
+
+
+if __name__ == "__main__":
+    main()
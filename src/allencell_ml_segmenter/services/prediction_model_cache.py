@@ -0,0 +1,195 @@
+import gc
+import hashlib
+import json
+import threading
+from collections.abc import MutableMapping
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+import hydra
+import torch
+from cyto_dl import utils as cyto_utils  # type: ignore
+from cyto_dl.api.model import CytoDLModel  # type: ignore
+from omegaconf import DictConfig, OmegaConf
+
+# (config path, config mtime, checkpoint path, checkpoint mtime, digest of the
+# model config without its save_dir and inference_args, onnx model path, onnx
+# model mtime)
+ModelKey = Tuple[str, int, str, int, str, str, int]
+
+
+def load_config(config_path: Path, overrides: Dict[str, Any]) -> DictConfig:
+    """
+    Returns the resolved cyto-dl config at :param config_path: with :param
+    overrides: applied, as cyto-dl's evaluate would use it.
+    """
+    cyto_api: CytoDLModel = CytoDLModel()
+    cyto_api.load_config_from_file(config_path)
+    cyto_api.override_config(overrides)
+    cfg: DictConfig = cyto_api.cfg
+    if not cfg.checkpoint.ckpt_path:
+        raise ValueError("Checkpoint path must be included for prediction")
+    OmegaConf.resolve(cfg)
+    cyto_utils.remove_aux_key(cfg)
+    return cfg
+
+
+def load_model(cfg: DictConfig) -> Any:
+    """
+    Returns the model of :param cfg: (see load_config) with the weights of
+    its checkpoint loaded, restored as the trainer would.
+    """
+    model: Any = hydra.utils.instantiate(cfg.model, _recursive_=False)
+    checkpoint: Dict[str, Any] = torch.load(
+        Path(cfg.checkpoint.ckpt_path), map_location="cpu", weights_only=False
+    )
+    model.on_load_checkpoint(checkpoint)
+    model.load_state_dict(
+        checkpoint["state_dict"],
+        strict=cfg.checkpoint.get("strict", True),
+    )
+    return model
+
+
+def create_prediction_dataloader(cfg: DictConfig) -> Any:
+    """
+    Returns the dataloader of the inputs to predict of :param cfg: (see
+    load_config).
+    """
+    data: Any = cyto_utils.create_dataloader(cfg.data)
+    if isinstance(data, MutableMapping):
+        data = data["predict_dataloaders"]
+    return data
+
+
+class PredictionModelCache:
+    """
+    Keeps the model of the last prediction in memory with its checkpoint
+    weights loaded, so that predicting again with the same config and
+    checkpoint only has to load the new inputs. Otherwise predicts as cyto-dl's
+    evaluate does, which builds the model and reads the checkpoint every time.
+    Holds at most one model, call release to free its memory.
+    """
+
+    _instance: Optional["PredictionModelCache"] = None
+
+    def __init__(self) -> None:
+        self._key: Optional[ModelKey] = None
+        self._model: Optional[Any] = None
+        # a prediction must not release the model another one is using
+        self._lock: threading.Lock = threading.Lock()
+
+    def predict(
+        self,
+        config_path: Path,
+        overrides: Dict[str, Any],
+        onnx_path: Optional[Path] = None,
+    ) -> None:
+        """
+        Predicts with the config at :param config_path: and :param overrides:
+        (see PredictionService.build_overrides), reusing the cached model if it
+        was built from the same config and checkpoint. If :param onnx_path: is
+        given, the model's forward pass is run by ONNX Runtime with the model
+        exported there, see OnnxForward. Blocks until all predictions have
+        been written.
+        """
+        cfg: DictConfig = load_config(config_path, overrides)
+
+        data: Any = create_prediction_dataloader(cfg)
+        with self._lock:
+            model: Any = self._get_model(config_path, cfg, onnx_path)
+            trainer: Any = hydra.utils.instantiate(
+                cfg.trainer,
+                logger=cyto_utils.instantiate_loggers(cfg.get("logger")),
+                callbacks=cyto_utils.instantiate_callbacks(
+                    cfg.get("callbacks")
+                ),
+            )
+            # weights are already loaded, the trainer must not restore them
+            trainer.predict(model=model, dataloaders=data, ckpt_path=None)
+
+    def is_loaded(self) -> bool:
+        return self._model is not None
+
+    def release(self) -> None:
+        """
+        Drops the cached model and frees the memory it used, including GPU
+        memory. Waits for a prediction using the model to finish.
+        """
+        with self._lock:
+            self._release()
+
+    def _release(self) -> None:
+        if self._model is None:
+            return
+        self._model = None
+        self._key = None
+        gc.collect()
+        if torch.cuda.is_available():
+            torch.cuda.empty_cache()
+
+    def _get_model(
+        self, config_path: Path, cfg: DictConfig, onnx_path: Optional[Path]
+    ) -> Any:
+        ckpt_path: Path = Path(cfg.checkpoint.ckpt_path)
+        key: ModelKey = self._get_key(config_path, ckpt_path, cfg, onnx_path)
+        if self._model is None or key != self._key:
+            self._release()
+            # restored as the trainer would, but only once
+            model: Any = load_model(cfg)
+            if onnx_path is not None:
+                # imported here, as onnxruntime is an optional dependency
+                from allencell_ml_segmenter.prediction.onnx_backend import (
+                    OnnxForward,
+                )
+
+                # the sliding window inference of cyto-dl's models predicts
+                # tiles with model.forward, so only that has to be replaced
+                model.forward = OnnxForward(onnx_path)
+            self._model = model
+            self._key = key
+
+        # heads are given the save_dir when the model is built, so point them
+        # at this run's output directory
+        save_dir: Optional[str] = cfg.model.get("save_dir")
+        task_heads: Optional[Any] = getattr(self._model, "task_heads", None)
+        if save_dir is not None and task_heads is not None:
+            for head in task_heads.values():
+                head.update_params({"save_dir": save_dir})
+        # inference args, like the sliding window batch size, are read from
+        # the hparams at every prediction, so apply this run's
+        inference_args: Optional[Any] = cfg.model.get("inference_args")
+        hparams: Optional[Any] = getattr(self._model, "hparams", None)
+        if inference_args is not None and hparams is not None:
+            hparams["inference_args"] = OmegaConf.to_container(inference_args)
+        return self._model
+
+    @staticmethod
+    def _get_key(
+        config_path: Path,
+        ckpt_path: Path,
+        cfg: DictConfig,
+        onnx_path: Optional[Path],
+    ) -> ModelKey:
+        model_cfg: Dict[str, Any] = OmegaConf.to_container(cfg.model)  # type: ignore
+        # both are applied to the cached model, see _get_model
+        model_cfg.pop("save_dir", None)
+        model_cfg.pop("inference_args", None)
+        digest: str = hashlib.sha1(
+            json.dumps(model_cfg, sort_keys=True, default=str).encode()
+        ).hexdigest()
+        return (
+            str(config_path.resolve()),
+            config_path.stat().st_mtime_ns,
+            str(ckpt_path.resolve()),
+            ckpt_path.stat().st_mtime_ns,
+            digest,
+            str(onnx_path.resolve()) if onnx_path is not None else "",
+            onnx_path.stat().st_mtime_ns if onnx_path is not None else 0,
+        )
+
+    @classmethod
+    def global_instance(cls) -> "PredictionModelCache":
+        if cls._instance is None:
+            cls._instance = PredictionModelCache()
+        return cls._instance
@@ -1,4 +1,7 @@
 import csv
+import multiprocessing
+import os
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
 
 from allencell_ml_segmenter.core.subscriber import Subscriber
 from allencell_ml_segmenter.core.event import Event
@@ -7,16 +10,105 @@ from allencell_ml_segmenter.main.experiments_model import ExperimentsModel
 from allencell_ml_segmenter.prediction.model import (
     PredictionModel,
     PredictionInputMode,
+    PredictionBackend,
+    SIMPLE_THRESHOLD,
+)
+from allencell_ml_segmenter.prediction.postprocessing import (
+    AUTO_THRESHOLD_METHODS,
+    PostprocessingCallback,
 )
 
+from allencell_ml_segmenter.services.prediction_model_cache import (
+    PredictionModelCache,
+)
 from allencell_ml_segmenter.utils.cuda_util import CUDAUtils
+from allencell_ml_segmenter.prediction.prediction_manifest import (
+    PredictionManifest,
+)
+from allencell_ml_segmenter.prediction.tiled_inference import TiledInference
+from allencell_ml_segmenter.prediction.batched_prediction import (
+    BatchedPrediction,
+    SpatialShape,
+    bucket_by_shape,
+)
+from allencell_ml_segmenter.prediction.onnx_backend import (
+    export_to_onnx,
+    get_onnx_path,
+    is_exported,
+    is_onnx_available,
+)
+from allencell_ml_segmenter.prediction.quantization import (
+    get_quantized_path,
+    is_quantized,
+    quantize,
+)
 from allencell_ml_segmenter.utils.file_utils import FileUtils
+from allencell_ml_segmenter.utils.file_writer import IFileWriter, FileWriter
 
 from pathlib import Path
-from typing import Union, Any, List, Optional
+from typing import Union, Any, List, Optional, Dict, Tuple
 
 from cyto_dl.api.model import CytoDLModel  # type: ignore
-from napari.utils.notifications import show_warning  # type: ignore
+from omegaconf import OmegaConf
+
+
+def show_warning(msg: str) -> None:
+    # napari is imported on first use so that batch prediction can run this
+    # service on machines without a display
+    from napari.utils.notifications import show_warning as napari_warning  # type: ignore
+
+    napari_warning(msg)
+
+
+def predict_shard(
+    config_path: Path,
+    overrides: Dict[str, Any],
+    num_threads: int,
+    onnx_path: Optional[Path] = None,
+) -> None:
+    """
+    Predicts the inputs in overrides["data.path"] using at most :param
+    num_threads: torch threads, with ONNX Runtime and the model exported to
+    :param onnx_path: if given. Runs in a worker process of
+    PredictionService.run_sharded_prediction, so it must be importable.
+    """
+    # imported here so that only worker processes pay for it
+    import torch
+
+    torch.set_num_threads(num_threads)
+    if onnx_path is not None:
+        PredictionModelCache().predict(config_path, overrides, onnx_path)
+        return
+    cyto_api: CytoDLModel = CytoDLModel()
+    cyto_api.load_config_from_file(config_path)
+    cyto_api.override_config(overrides)
+    cyto_api.predict()
+
+
+def get_prediction_overrides(
+    checkpoint: Path, input_path: Path
+) -> Dict[str, Any]:
+    """
+    Returns the overrides every prediction with the weights of :param
+    checkpoint: needs, for the inputs in the csv at :param input_path: (as
+    written by PredictionService.write_csv_for_inputs).
+    """
+    overrides: Dict[str, Any] = dict()
+    # Default overrides needed for prediction
+    overrides["test"] = False
+    overrides["train"] = False
+    overrides["mode"] = "predict"
+    overrides["task_name"] = "predict_task_from_app"
+    # Need these overrides to load in csv's
+    overrides["data.columns"] = ["raw", "split"]
+    overrides["data.split_column"] = "split"
+    overrides["checkpoint.ckpt_path"] = str(checkpoint)
+
+    # This override is needed to for inference with cyto-dl, because we default to auto otherwise
+    overrides["data.batch_size"] = 1
+
+    overrides["data.path"] = str(input_path)
+    return overrides
 
 
 class PredictionService(Subscriber):
@@ -30,10 +122,20 @@ class PredictionService(Subscriber):
         self,
         prediction_model: PredictionModel,
         experiments_model: ExperimentsModel,
+        file_writer: IFileWriter = FileWriter.global_instance(),
+        model_cache: Optional[
+            PredictionModelCache
+        ] = PredictionModelCache.global_instance(),
     ):
         super().__init__()
         self._prediction_model: PredictionModel = prediction_model
         self._experiments_model: ExperimentsModel = experiments_model
+        self._file_writer: IFileWriter = file_writer
+        # keeps the model loaded between runs, None to load it for every run
+        self._model_cache: Optional[PredictionModelCache] = model_cache
+        # inputs of the current run, to be recorded in the output directory's
+        # manifest once predicted. None unless predicting incrementally.
+        self._manifest_inputs: Optional[List[Path]] = None
 
         self._prediction_model.subscribe(
             Event.PROCESS_PREDICTION,
@@ -47,19 +149,241 @@ class PredictionService(Subscriber):
             self._prediction_setup,
         )
 
+        self._experiments_model.subscribe(
+            Event.ACTION_EXPERIMENT_APPLIED,
+            self,
+            self._release_model,
+        )
+
+    def release_model(self) -> None:
+        """
+        Frees the memory of the model kept loaded between runs, if any.
+        """
+        if self._model_cache is not None:
+            self._model_cache.release()
+
+    def _release_model(self, _: Event) -> None:
+        # the loaded model belongs to the previous experiment
+        self.release_model()
+
     def _predict_model(self, _: Event) -> None:
         """
         Predict segmentations using model according to spec
         """
-        cyto_api: CytoDLModel = CytoDLModel()
-        cyto_api.load_config_from_file(
-            self._experiments_model.get_train_config_path()
-        )
         ckpt: Optional[Path] = self._experiments_model.get_best_ckpt()
         if ckpt is None:
             raise RuntimeError("No checkpoint. Cannot predict")
-        cyto_api.override_config(self.build_overrides(ckpt))
-        cyto_api.predict()
+        if self._prediction_model.get_num_shards() > 1:
+            self.run_sharded_prediction(ckpt)
+        elif self._prediction_model.get_batched_prediction() is not None:
+            self.run_batched_prediction(ckpt)
+        else:
+            self.run_prediction(ckpt)
+
+    def run_prediction(self, checkpoint: Path) -> None:
+        """
+        Predict segmentations for the inputs in the prediction model using the
+        selected experiment's model, with weights from :param checkpoint:.
+        Blocks until all predictions have been written.
+        """
+        config_path: Path = self._experiments_model.get_train_config_path()
+        overrides: Dict[str, Any] = self.build_overrides(checkpoint)
+        self._predict(config_path, overrides, self.get_onnx_model(checkpoint))
+        self._record_predicted_inputs(checkpoint)
+
+    def run_batched_prediction(self, checkpoint: Path) -> None:
+        """
+        Like run_prediction, but splits the inputs into buckets of the same
+        spatial shape, and predicts each bucket in batches as large as the
+        prediction model's BatchedPrediction allows. Outputs are saved per
+        input as for run_prediction. Blocks until all buckets are done.
+        """
+        input_path: Optional[Path] = (
+            self._prediction_model.get_input_image_path()
+        )
+        if input_path is None:
+            raise RuntimeError("Path to prediction input undefined")
+        batched_prediction: Optional[BatchedPrediction] = (
+            self._prediction_model.get_batched_prediction()
+        )
+        if batched_prediction is None:
+            raise RuntimeError("Batched prediction is not selected")
+
+        overrides: Dict[str, Any] = self.build_overrides(checkpoint)
+        config_path: Path = self._experiments_model.get_train_config_path()
+        onnx_path: Optional[Path] = self.get_onnx_model(checkpoint)
+        roi_size: Optional[List[int]] = self._get_roi_size(overrides)
+        for bucket, shape, num_images in self.bucket_prediction_csv(
+            input_path
+        ):
+            batch_size: int = batched_prediction.get_batch_size(
+                shape, roi_size, num_images
+            )
+            bucket_overrides: Dict[str, Any] = {
+                **overrides,
+                "data.path": str(bucket),
+                "data.batch_size": batch_size,
+            }
+            # tiled inference predicts one window at a time to hold its
+            # budget, otherwise the windows of a batch are predicted together
+            if "model.inference_args.sw_batch_size" not in overrides:
+                bucket_overrides["model.inference_args.sw_batch_size"] = (
+                    batch_size
+                )
+            self._predict(config_path, bucket_overrides, onnx_path)
+        self._record_predicted_inputs(checkpoint)
+
+    def _predict(
+        self,
+        config_path: Path,
+        overrides: Dict[str, Any],
+        onnx_path: Optional[Path],
+    ) -> None:
+        if self._model_cache is not None:
+            self._model_cache.predict(config_path, overrides, onnx_path)
+        elif onnx_path is not None:
+            PredictionModelCache().predict(config_path, overrides, onnx_path)
+        else:
+            cyto_api: CytoDLModel = CytoDLModel()
+            cyto_api.load_config_from_file(config_path)
+            cyto_api.override_config(overrides)
+            cyto_api.predict()
+
+    def run_sharded_prediction(
+        self, checkpoint: Path, executor: Optional[Executor] = None
+    ) -> None:
+        """
+        Like run_prediction, but splits the input csv into the prediction
+        model's number of shards and predicts each shard in its own process,
+        with its own share of the cpu cores. All shards save to the same output
+        directory, so progress can be tracked as for a single run. Blocks until
+        all shards are done, and raises the first error of any shard.
+        :param executor: runs the shards and is shut down afterwards, defaults
+        to a process pool with one process per shard
+        """
+        input_path: Optional[Path] = (
+            self._prediction_model.get_input_image_path()
+        )
+        if input_path is None:
+            raise RuntimeError("Path to prediction input undefined")
+
+        shards: List[Path] = self.split_prediction_csv(
+            input_path, self._prediction_model.get_num_shards()
+        )
+        num_threads: int = self._prediction_model.get_threads_per_shard() or (
+            max(1, (os.cpu_count() or 1) // len(shards))
+        )
+        overrides: Dict[str, Any] = self.build_overrides(checkpoint)
+        config_path: Path = self._experiments_model.get_train_config_path()
+        # exported once, before the shards need it
+        onnx_path: Optional[Path] = self.get_onnx_model(checkpoint)
+
+        if executor is None:
+            # spawn, so that workers do not inherit Qt or torch thread state
+            executor = ProcessPoolExecutor(
+                max_workers=len(shards),
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        with executor:
+            futures: List[Future] = [
+                executor.submit(
+                    predict_shard,
+                    config_path,
+                    {**overrides, "data.path": str(shard)},
+                    num_threads,
+                    onnx_path,
+                )
+                for shard in shards
+            ]
+            for future in futures:
+                future.result()
+        self._record_predicted_inputs(checkpoint)
+
+    def get_onnx_model(self, checkpoint: Path) -> Optional[Path]:
+        """
+        Returns the path of the selected experiment's model with the weights
+        of :param checkpoint: exported to ONNX if predicting with an ONNX
+        backend, exporting (and for int8, quantizing) it first if needed.
+        None for the torch backend.
+        """
+        backend: PredictionBackend = self._prediction_model.get_backend()
+        if backend == PredictionBackend.TORCH:
+            return None
+        config_path: Path = self._experiments_model.get_train_config_path()
+        if backend == PredictionBackend.ONNX_INT8:
+            if is_quantized(checkpoint):
+                return get_quantized_path(checkpoint)
+            return quantize(
+                config_path,
+                checkpoint,
+                self._experiments_model.get_csv_path() / "train.csv",
+            )
+        if is_exported(checkpoint):
+            return get_onnx_path(checkpoint)
+        return export_to_onnx(config_path, checkpoint)
+
+    def split_prediction_csv(
+        self, csv_path: Path, num_shards: int
+    ) -> List[Path]:
+        """
+        Splits the prediction csv at :param csv_path: (as written by
+        write_csv_for_inputs, or selected by the user) into at most :param
+        num_shards: csvs of contiguous rows with the same header, and returns
+        their paths. No shard is empty.
+        """
+        with open(csv_path, "r", newline="") as file:
+            rows: List[List[str]] = list(csv.reader(file))
+        header: List[str] = rows[0]
+        data_rows: List[List[str]] = rows[1:]
+        num_shards = max(1, min(num_shards, len(data_rows)))
+
+        shard_dir: Path = self._experiments_model.get_csv_path() / (
+            "prediction_csv"
+        )
+        shard_dir.mkdir(parents=True, exist_ok=True)
+        shard_paths: List[Path] = []
+        for i in range(num_shards):
+            # shard sizes differ by at most one row
+            start: int = i * len(data_rows) // num_shards
+            end: int = (i + 1) * len(data_rows) // num_shards
+            shard_path: Path = shard_dir / f"{csv_path.stem}_shard_{i}.csv"
+            with open(shard_path, "w", newline="") as file:
+                writer = csv.writer(file)
+                writer.writerow(header)
+                writer.writerows(data_rows[start:end])
+            shard_paths.append(shard_path)
+        return shard_paths
+
+    def bucket_prediction_csv(
+        self, csv_path: Path
+    ) -> List[Tuple[Path, SpatialShape, int]]:
+        """
+        Splits the prediction csv at :param csv_path: into csvs of the rows
+        whose raw images have the same spatial shape, and returns their paths
+        with that shape and their number of rows, see bucket_by_shape.
+        """
+        with open(csv_path, "r", newline="") as file:
+            rows: List[List[str]] = list(csv.reader(file))
+        header: List[str] = rows[0]
+        data_rows: List[List[str]] = rows[1:]
+        raw_column: int = header.index("raw")
+        buckets: Dict[SpatialShape, List[int]] = bucket_by_shape(
+            [Path(row[raw_column]) for row in data_rows]
+        )
+
+        bucket_dir: Path = self._experiments_model.get_csv_path() / (
+            "prediction_csv"
+        )
+        bucket_dir.mkdir(parents=True, exist_ok=True)
+        bucket_csvs: List[Tuple[Path, SpatialShape, int]] = []
+        for i, (shape, indices) in enumerate(buckets.items()):
+            bucket_path: Path = bucket_dir / f"{csv_path.stem}_bucket_{i}.csv"
+            with open(bucket_path, "w", newline="") as file:
+                writer = csv.writer(file)
+                writer.writerow(header)
+                writer.writerows(data_rows[index] for index in indices)
+            bucket_csvs.append((bucket_path, shape, len(indices)))
+        return bucket_csvs
 
     def _prediction_setup(self, _: Event) -> None:
         if self._able_to_continue_prediction():
@@ -97,6 +421,21 @@ class PredictionService(Subscriber):
                 f"Please select an output folder to save predictions to."
             )
             return False
+
+        try:
+            self._get_postprocessing_callback()
+        except ValueError as e:
+            show_warning(str(e))
+            return False
+
+        if (
+            self._prediction_model.get_backend() != PredictionBackend.TORCH
+            and not is_onnx_available()
+        ):
+            show_warning(
+                "Please install onnx and onnxruntime to predict with ONNX Runtime."
+            )
+            return False
         return True
 
     def _write_csv_for_prediction(self) -> None:
@@ -113,9 +452,15 @@ class PredictionService(Subscriber):
             )
             # dont set state if we have an error in setup
         elif input_mode_selected == PredictionInputMode.FROM_PATH:
-            self._prediction_model.set_total_num_images(
-                self._setup_inputs_from_path()
-            )
+            num_images: int = self.setup_inputs_from_path()
+            if num_images == 0:
+                show_warning(
+                    "All input images have already been predicted into the output folder."
+                )
+                # there is nothing to predict, so prediction must not start
+                self._prediction_model.set_total_num_images(None)
+            else:
+                self._prediction_model.set_total_num_images(num_images)
         elif input_mode_selected == PredictionInputMode.FROM_NAPARI_LAYERS:
             self._prediction_model.set_total_num_images(
                 self._setup_inputs_from_napari()
@@ -126,27 +471,14 @@ class PredictionService(Subscriber):
         Build an overrides list for the cyto-dl API containing the
         overrides requried to run predictions, formatted as cyto-dl expects.
         """
-        overrides: dict[str, Any] = dict()
-        # Default overrides needed for prediction
-        overrides["test"] = False
-        overrides["train"] = False
-        overrides["mode"] = "predict"
-        overrides["task_name"] = "predict_task_from_app"
-        # Need these overrides to load in csv's
-        overrides["data.columns"] = ["raw", "split"]
-        overrides["data.split_column"] = "split"
-        overrides["checkpoint.ckpt_path"] = str(checkpoint)
-
-        # This override is needed to for inference with cyto-dl, because we default to auto otherwise
-        overrides["data.batch_size"] = 1
-
         input_path: Optional[Path] = (
             self._prediction_model.get_input_image_path()
         )
         if input_path is None:
             raise RuntimeError("Path to prediction input undefined")
-
-        overrides["data.path"] = str(input_path)
+        overrides: dict[str, Any] = get_prediction_overrides(
+            checkpoint, input_path
+        )
 
         # overrides from model
         # if output_dir is not set, will default to saving in the experiment folder
@@ -170,8 +502,101 @@ class PredictionService(Subscriber):
         else:
             overrides["trainer.accelerator"] = "cpu"
 
+        postprocessing: Optional[Dict[str, Any]] = (
+            self._get_postprocessing_callback()
+        )
+        if postprocessing is not None:
+            overrides["callbacks.postprocessing"] = postprocessing
+
+        tiled_inference: Optional[TiledInference] = (
+            self._prediction_model.get_tiled_inference()
+        )
+        if tiled_inference is not None:
+            overrides.update(
+                tiled_inference.get_overrides(
+                    self._get_spatial_dims(tiled_inference)
+                )
+            )
+
         return overrides
 
+    def _get_postprocessing_callback(self) -> Optional[Dict[str, Any]]:
+        """
+        Returns the config of the callback that postprocesses segmentations
+        while predicting, or None if no postprocessing is selected. Raises a
+        ValueError if the selected postprocessing is incomplete.
+        """
+        seg_dir: Optional[Path] = (
+            self._prediction_model.get_output_prediction_directory()
+        )
+        output_dir: Optional[Path] = (
+            self._prediction_model.get_output_seg_directory()
+        )
+        if (
+            not self._prediction_model.is_postprocessing()
+            or seg_dir is None
+            or output_dir is None
+        ):
+            return None
+
+        simple_threshold: Optional[float] = None
+        auto_threshold: Optional[str] = None
+        if (
+            self._prediction_model.get_postprocessing_method()
+            == SIMPLE_THRESHOLD
+        ):
+            simple_threshold = (
+                self._prediction_model.get_postprocessing_simple_threshold()
+            )
+            if simple_threshold is None:
+                raise ValueError("Please select a threshold.")
+        else:
+            auto_threshold = (
+                self._prediction_model.get_postprocessing_auto_threshold()
+            )
+            if auto_threshold not in AUTO_THRESHOLD_METHODS:
+                raise ValueError(
+                    f"Please select one of {', '.join(AUTO_THRESHOLD_METHODS)} as auto threshold."
+                )
+        return {
+            "_target_": f"{PostprocessingCallback.__module__}.{PostprocessingCallback.__name__}",
+            "seg_dir": str(seg_dir),
+            "output_dir": str(output_dir),
+            # resolved per shard in sharded prediction
+            "input_csv": "${data.path}",
+            "simple_threshold": simple_threshold,
+            "auto_threshold": auto_threshold,
+        }
+
+    def _get_spatial_dims(self, tiled_inference: TiledInference) -> int:
+        if tiled_inference.tile_shape is not None:
+            return len(tiled_inference.tile_shape)
+        # set for every experiment trained by the plugin
+        spatial_dims: Optional[int] = OmegaConf.select(
+            OmegaConf.load(self._experiments_model.get_train_config_path()),
+            "spatial_dims",
+        )
+        if spatial_dims is None:
+            raise RuntimeError(
+                "Cannot size tiles, the experiment has no spatial_dims"
+            )
+        return int(spatial_dims)
+
+    def _get_roi_size(self, overrides: Dict[str, Any]) -> Optional[List[int]]:
+        # the size of the windows images are predicted in, None if whole
+        roi_size: Optional[Any] = overrides.get(
+            "model.inference_args.roi_size"
+        )
+        if roi_size is None:
+            roi_size = OmegaConf.select(
+                OmegaConf.load(
+                    self._experiments_model.get_train_config_path()
+                ),
+                "model.inference_args.roi_size",
+                throw_on_resolution_failure=False,
+            )
+        return list(roi_size) if roi_size is not None else None
+
     def write_csv_for_inputs(self, list_images: List[Path]) -> None:
         """
         write csv for inputs and return the total number of images
@@ -188,23 +613,36 @@ class PredictionService(Subscriber):
 
             self._prediction_model.set_input_image_path(csv_path)
 
-    def _setup_inputs_from_path(self) -> int:
+    def setup_inputs_from_path(self, checkpoint: Optional[Path] = None) -> int:
         """
-        setup inputs from path and return total number of images to predict
+        setup inputs from path and return total number of images to predict.
+        When predicting incrementally, only inputs that have not been predicted
+        with :param checkpoint: (default: the best checkpoint) are included.
         """
         # User has selected a directory or a csv as input images
         input_path: Optional[Path] = (
             self._prediction_model.get_input_image_path()
         )
+        self._manifest_inputs = None
         if input_path is not None and input_path.is_dir():
             all_files: list[Path] = (
                 FileUtils.get_all_files_in_dir_ignore_hidden(input_path)
             )
+            if self._prediction_model.is_incremental():
+                all_files = self._get_unpredicted_inputs(all_files, checkpoint)
             # if input path selected is a directory, we need to manually write a CSV for cyto-dl
             self.write_csv_for_inputs(all_files)
             return len(all_files)
         elif input_path is not None and input_path.suffix == ".csv":
-            return self._grab_csv_data_rows(input_path)
+            if not self._prediction_model.is_incremental():
+                return self._grab_csv_data_rows(input_path)
+            # the selected csv cannot be used as is, so write one with just
+            # the inputs that still need predicting
+            unpredicted: List[Path] = self._get_unpredicted_inputs(
+                self._read_csv_inputs(input_path), checkpoint
+            )
+            self.write_csv_for_inputs(unpredicted)
+            return len(unpredicted)
         else:
             # This should not be possible with FileInputWidget- throw an error.
             raise ValueError(
@@ -212,6 +650,65 @@ class PredictionService(Subscriber):
             )
         # if a csv is selected, do nothing
 
+    def _get_manifest(self) -> Optional[PredictionManifest]:
+        output_dir: Optional[Path] = (
+            self._prediction_model.get_output_directory()
+        )
+        seg_dir: Optional[Path] = (
+            self._prediction_model.get_output_seg_directory()
+        )
+        if output_dir is None or seg_dir is None:
+            return None
+        return PredictionManifest(output_dir, seg_dir, self._file_writer)
+
+    def _get_unpredicted_inputs(
+        self, inputs: List[Path], checkpoint: Optional[Path]
+    ) -> List[Path]:
+        """
+        Returns the inputs that are not in the output directory's manifest
+        (or have changed since), and remembers them for recording once they
+        have been predicted.
+        """
+        ckpt: Optional[Path] = (
+            checkpoint or self._experiments_model.get_best_ckpt()
+        )
+        manifest: Optional[PredictionManifest] = self._get_manifest()
+        if ckpt is None or manifest is None:
+            return inputs
+        self._manifest_inputs = manifest.get_unpredicted(
+            inputs,
+            self._get_manifest_checkpoint_id(ckpt),
+            self._prediction_model.get_image_input_channel_index(),
+        )
+        return self._manifest_inputs
+
+    def _record_predicted_inputs(self, checkpoint: Path) -> None:
+        manifest: Optional[PredictionManifest] = self._get_manifest()
+        if self._manifest_inputs is None or manifest is None:
+            return
+        manifest.record(
+            self._manifest_inputs,
+            self._get_manifest_checkpoint_id(checkpoint),
+            self._prediction_model.get_image_input_channel_index(),
+        )
+        self._manifest_inputs = None
+
+    def _get_manifest_checkpoint_id(self, checkpoint: Path) -> str:
+        checkpoint_id: str = PredictionManifest.get_checkpoint_id(checkpoint)
+        if not self._prediction_model.is_postprocessing():
+            return checkpoint_id
+        # postprocessed segmentations also depend on the postprocessing
+        return (
+            f"{checkpoint_id}:{self._prediction_model.get_postprocessing_method()}"
+            f":{self._prediction_model.get_postprocessing_simple_threshold()}"
+            f":{self._prediction_model.get_postprocessing_auto_threshold()}"
+        )
+
+    @staticmethod
+    def _read_csv_inputs(path: Path) -> List[Path]:
+        with open(path, "r", newline="") as file:
+            return [Path(row["raw"]) for row in csv.DictReader(file)]
+
     def _grab_csv_data_rows(self, path: Path) -> int:
         file = open(path, "r+")
         reader = csv.reader(file)
@@ -1,3 +1,4 @@
+import threading
 from pathlib import Path
 
 from allencell_ml_segmenter.core.channel_extraction import (
@@ -16,9 +17,28 @@ from allencell_ml_segmenter.main.experiments_model import ExperimentsModel
 from allencell_ml_segmenter.training.training_model import (
     TrainingModel,
     ImageType,
+    ModelSize,
 )
-from typing import Optional
+from typing import Any, Optional
 from napari.utils.notifications import show_warning, show_error  # type: ignore
+from allencell_ml_segmenter.training.dataset_preparation import (
+    prepare_dataset,
+)
+from allencell_ml_segmenter.training.loader_tuning import tune_loader
+from allencell_ml_segmenter.training.training_runner import (
+    MESSAGE_EPOCH,
+    MESSAGE_STARTED,
+    TrainingResult,
+    TrainingRunner,
+)
+from allencell_ml_segmenter.training.patch_size_recommender import (
+    PatchSizeRecommendation,
+    recommend_patch_size,
+)
+from allencell_ml_segmenter.config.i_user_settings import (
+    IExperimentsHomeSettings,
+)
+from allencell_ml_segmenter.config.loader_settings import LoaderSettings
 from allencell_ml_segmenter.utils.cyto_overrides_manager import (
     CytoDLOverridesManager,
 )
@@ -30,7 +50,6 @@ from allencell_ml_segmenter.core.task_executor import (
 from collections import namedtuple
 from allencell_ml_segmenter.main.main_model import MIN_DATASET_SIZE
 
-
 DirectoryData = namedtuple(
     "DirectoryData",
     [
@@ -39,6 +58,7 @@ DirectoryData = namedtuple(
         "raw_channels",
         "seg1_channels",
         "seg2_channels",
+        "image_shape",
     ],
 )
 
@@ -59,54 +79,159 @@ class TrainingService(Subscriber):
         self._training_model: TrainingModel = training_model
         self._experiments_model: ExperimentsModel = experiments_model
         self._task_executor: ITaskExecutor = task_executor
+        self._training_runner: Optional[TrainingRunner] = None
+        # set to stop the running dataset preparation
+        self._preparation_cancel_event: Optional[threading.Event] = None
         self._training_model.subscribe(
             Event.PROCESS_TRAINING,
             self,
             self._train_model_handler,
         )
+        self._training_model.subscribe(
+            Event.PROCESS_TRAINING_CANCEL,
+            self,
+            self._cancel_training_handler,
+        )
+        self._training_model.subscribe(
+            Event.PROCESS_DATASET_PREPARATION,
+            self,
+            self._prepare_dataset_handler,
+        )
+        self._training_model.subscribe(
+            Event.PROCESS_DATASET_PREPARATION_CANCEL,
+            self,
+            self._cancel_dataset_preparation_handler,
+        )
         self._img_data_extractor: IImageDataExtractor = img_data_extractor
         self._training_model.signals.images_directory_set.connect(
             self._training_image_directory_selected
         )
+        self._training_model.signals.model_size_set.connect(
+            self._recommend_patch_size
+        )
 
     def _train_model_handler(self, _: Event) -> None:
         """
-        Trains the model according to the spec
+        Trains the model according to the spec, in a process of its own
         """
         # Only supporting segmentation config for now, in the future this will be an option in the UI
         self._training_model.set_experiment_type("segmentation_plugin")
+        self._training_model.set_training_error(None)
         # TODO make set_images_directory and get_images_directory less brittle.
         #  https://github.com/AllenCell/allencell-ml-segmenter/issues/156
         if self._able_to_continue_training():
-            cyto_dl_model = CytoDLModel()
-            if self._training_model.is_using_existing_model():
-                # ITERATIVE TRAINING: train starting from existing model weights
-                cyto_dl_model.load_config_from_file(
-                    str(
-                        self._experiments_model.get_train_config_path(
-                            self._training_model.get_existing_model()
-                        )
-                    )
-                )
-            else:
-                # NEW TRAINING: load the default experiment config
-                cyto_dl_model.load_default_experiment(
-                    self._training_model.get_experiment_type(),
-                    output_dir=f"{self._experiments_model.get_user_experiments_path()}/{self._experiments_model.get_experiment_name()}",
+            config_path: Path = self._experiments_model.get_train_config_path()
+            # created first, so that training can be cancelled while it is
+            # set up
+            self._training_runner = TrainingRunner(
+                config_path, on_message=self._on_training_message
+            )
+            try:
+                num_threads: Optional[int] = self._tune_loader()
+                cyto_dl_model: CytoDLModel = self._get_training_config()
+                cyto_dl_model.print_config()
+                cyto_dl_model.save_config(config_path)
+                result: TrainingResult = self._training_runner.run(num_threads)
+            finally:
+                # a failed set up must not leave a runner to cancel
+                self._training_runner = None
+            if result.error is not None:
+                self._training_model.set_training_error(result.error)
+
+    def _on_training_message(self, kind: str, payload: Any) -> None:
+        """
+        Reports the progress the training process sends
+        """
+        if kind == MESSAGE_STARTED:
+            self._training_model.set_training_progress(0, payload)
+        elif kind == MESSAGE_EPOCH:
+            self._training_model.set_training_progress(
+                payload, self._training_model.get_epochs_to_train()
+            )
+
+    def _cancel_training_handler(self, _: Event) -> None:
+        """
+        Stops training, which saves what it has trained so far
+        """
+        if self._training_runner is not None:
+            self._training_runner.cancel()
+
+    def _prepare_dataset_handler(self, _: Event) -> None:
+        """
+        Caches the training images of the spec ahead of training, so that
+        training starts with its first epoch
+        """
+        self._training_model.set_experiment_type("segmentation_plugin")
+        if self._able_to_continue_training():
+            cancel_event: threading.Event = threading.Event()
+            self._preparation_cancel_event = cancel_event
+            try:
+                prepare_dataset(
+                    self._get_training_config().cfg, cancel_event=cancel_event
                 )
-            cyto_overrides_manager: CytoDLOverridesManager = (
-                CytoDLOverridesManager(
-                    self._experiments_model, self._training_model
+            finally:
+                self._preparation_cancel_event = None
+
+    def _cancel_dataset_preparation_handler(self, _: Event) -> None:
+        """
+        Stops dataset preparation, the images cached so far stay cached
+        """
+        if self._preparation_cancel_event is not None:
+            self._preparation_cancel_event.set()
+
+    def _tune_loader(self) -> Optional[int]:
+        """
+        Finds the fastest data loading settings for this machine on its first
+        training, and returns its tuned torch threads to train with
+        """
+        user_settings: IExperimentsHomeSettings = (
+            self._experiments_model.get_user_settings()
+        )
+        loader_settings: Optional[LoaderSettings] = (
+            user_settings.get_loader_settings()
+        )
+        if (
+            loader_settings is None
+            or not loader_settings.is_for_this_machine()
+        ):
+            try:
+                loader_settings = tune_loader(self._get_training_config().cfg)
+            except Exception as e:
+                # training can go on with the default settings
+                show_warning(f"Could not tune data loading: {e}")
+                return None
+            user_settings.set_loader_settings(loader_settings)
+        return loader_settings.num_threads
+
+    def _get_training_config(self) -> CytoDLModel:
+        """
+        Returns a cyto-dl model with the training config of the spec loaded
+        """
+        cyto_dl_model = CytoDLModel()
+        if self._training_model.is_using_existing_model():
+            # ITERATIVE TRAINING: train starting from existing model weights
+            cyto_dl_model.load_config_from_file(
+                str(
+                    self._experiments_model.get_train_config_path(
+                        self._training_model.get_existing_model()
+                    )
                 )
             )
-            cyto_dl_model.override_config(
-                cyto_overrides_manager.get_training_overrides()
+        else:
+            # NEW TRAINING: load the default experiment config
+            cyto_dl_model.load_default_experiment(
+                self._training_model.get_experiment_type(),
+                output_dir=f"{self._experiments_model.get_user_experiments_path()}/{self._experiments_model.get_experiment_name()}",
             )
-            cyto_dl_model.print_config()
-            cyto_dl_model.save_config(
-                self._experiments_model.get_train_config_path()
+        cyto_overrides_manager: CytoDLOverridesManager = (
+            CytoDLOverridesManager(
+                self._experiments_model, self._training_model
             )
-            cyto_dl_model.train()
+        )
+        cyto_dl_model.override_config(
+            cyto_overrides_manager.get_training_overrides()
+        )
+        return cyto_dl_model
 
     def _able_to_continue_training(self) -> bool:
         # TODO: refactor- these checks should be in the View before we start a thread for training.
@@ -164,27 +289,35 @@ class TrainingService(Subscriber):
             )
 
         training_csv: Path = training_dir / "train.csv"
-        raw_data: ImageData = self._img_data_extractor.extract_image_data(
-            get_img_path_from_csv(training_csv, column="raw"), np_data=False
+        raw_data: ImageData = self._img_data_extractor.extract_image_metadata(
+            get_img_path_from_csv(training_csv, column="raw")
         )
-        seg1_data: ImageData = self._img_data_extractor.extract_image_data(
-            get_img_path_from_csv(training_csv, column="seg1"), np_data=False
+        seg1_data: ImageData = self._img_data_extractor.extract_image_metadata(
+            get_img_path_from_csv(training_csv, column="seg1")
         )
         seg2_data: Optional[ImageData]
         try:
             seg2_path: Path = get_img_path_from_csv(training_csv, "seg2")
-            seg2_data = self._img_data_extractor.extract_image_data(
-                seg2_path, np_data=False
+            seg2_data = self._img_data_extractor.extract_image_metadata(
+                seg2_path
             )
         except ValueError:
             seg2_data = None
 
+        spatial_dims: int = (
+            3 if raw_data.dim_z is not None and raw_data.dim_z > 1 else 2
+        )
         return DirectoryData(
             num_imgs,
-            3 if raw_data.dim_z is not None and raw_data.dim_z > 1 else 2,
+            spatial_dims,
             raw_data.channels,
             seg1_data.channels,
             seg2_data.channels if seg2_data else None,
+            [
+                raw_data.dim_z if spatial_dims == 3 else 1,
+                raw_data.dim_y,
+                raw_data.dim_x,
+            ],
         )
 
     def _on_training_dir_data_extracted(self, dir_data: DirectoryData) -> None:
@@ -196,7 +329,9 @@ class TrainingService(Subscriber):
                 ImageType.SEG2: dir_data.seg2_channels,
             }
         )
+        self._training_model.set_image_shape(dir_data.image_shape)
         self._training_model.set_spatial_dims(dir_data.spatial_dims)
+        self._recommend_patch_size()
 
     def _on_training_dir_data_error(self, e: Exception) -> None:
         self._training_model.set_total_num_images(0)
@@ -207,8 +342,51 @@ class TrainingService(Subscriber):
                 ImageType.SEG2: None,
             }
         )
+        self._training_model.set_image_shape(None)
         show_error(f"Failed to get data from training directory: {e}")
 
+    def _get_patch_size_recommendation(
+        self,
+    ) -> Optional[PatchSizeRecommendation]:
+        image_shape: Optional[list[int]] = (
+            self._training_model.get_image_shape()
+        )
+        spatial_dims: Optional[int] = self._training_model.get_spatial_dims()
+        if image_shape is None or spatial_dims is None:
+            return None
+        # the size of an existing model is not known, nor has a new one's
+        # been chosen before the images are selected
+        model_size: ModelSize = (
+            self._training_model.get_model_size() or ModelSize.MEDIUM
+        )
+        # the model reads the selected raw channel, and has an output for
+        # each segmentation
+        has_seg2: bool = (
+            self._training_model.get_num_channels(ImageType.SEG2) is not None
+        )
+        return recommend_patch_size(
+            image_shape,
+            spatial_dims,
+            in_channels=1,
+            out_channels=2 if has_seg2 else 1,
+            filters=model_size.value,
+        )
+
+    def _recommend_patch_size(self) -> None:
+        """
+        Recommends the largest patch and batch size that fit in memory for
+        the selected images and model size
+        """
+        if self._training_model.get_image_shape() is None:
+            return
+        self._task_executor.exec(
+            self._get_patch_size_recommendation,
+            on_return=self._training_model.set_patch_size_recommendation,
+            on_error=lambda e: show_warning(
+                f"Could not recommend a patch size: {e}"
+            ),
+        )
+
     def _training_image_directory_selected(self) -> None:
         training_dir: Optional[Path] = (
             self._training_model.get_images_directory()
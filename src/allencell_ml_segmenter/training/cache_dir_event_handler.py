@@ -6,16 +6,17 @@ class CacheDirEventHandler(FileSystemEventHandler):
     """
     A CacheDirEventHandler calls :param progress_callback: when a .pt file
     is created in the watched directory with the number of .pt files that have
-    been created.
+    been created, counting from the :param num_files: already there.
     """
 
     def __init__(
         self,
         progress_callback: Callable,
+        num_files: int = 0,
     ):
         super().__init__()
         self._progress_callback: Callable = progress_callback
-        self._num_files = 0
+        self._num_files = num_files
 
     # override
     def on_created(self, event: FileSystemEvent) -> None:
@@ -0,0 +1,334 @@
+import argparse
+import copy
+import csv
+import hashlib
+import json
+import multiprocessing
+import os
+import sys
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor, as_completed
+from dataclasses import dataclass
+from importlib.metadata import PackageNotFoundError, version
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from omegaconf import DictConfig, OmegaConf
+
+from allencell_ml_segmenter.training.training_model import (
+    ImageType,
+    TrainingModel,
+)
+
+# prepared datasets are shared by the experiments of an experiments home, in
+# <experiments home>/.datasets/<digest of what was cached>, hidden so that
+# they are not listed as experiments
+DATASETS_DIR: str = ".datasets"
+# the splits cyto-dl caches, the others are read as they are used
+CACHED_SPLITS: List[str] = ["train", "val"]
+# each worker holds an image and its transforms in memory
+DEFAULT_MAX_WORKERS: int = 8
+
+# datasets of each worker process, by split
+_worker_datasets: Dict[str, Any] = {}
+
+
+def get_dataset_overrides(
+    training_model: TrainingModel,
+) -> Dict[str, Any]:
+    """
+    Returns the cyto-dl overrides of :param training_model: that change what
+    is cached of the training images: the same overrides always give the same
+    cached files.
+    """
+    images_directory: Optional[Path] = training_model.get_images_directory()
+    if images_directory is None:
+        raise ValueError(
+            "Training data path was not set but get_dataset_overrides was called."
+        )
+    patch_size: Optional[List[int]] = training_model.get_patch_size()
+    if patch_size is None:
+        raise ValueError(
+            "Patch size is required, but is not set, and get_dataset_overrides was called."
+        )
+    overrides: Dict[str, Any] = {
+        "data.path": str(images_directory),
+        "data._aux.patch_shape": patch_size,
+    }
+    dims: Optional[int] = training_model.get_spatial_dims()
+    if dims is not None:
+        overrides["spatial_dims"] = dims
+    for key, image_type in [
+        ("input_channel", ImageType.RAW),
+        ("target_col1_channel", ImageType.SEG1),
+        ("target_col2_channel", ImageType.SEG2),
+    ]:
+        channel: Optional[int] = training_model.get_selected_channel(
+            image_type
+        )
+        if channel is not None:
+            overrides[key] = channel
+    return overrides
+
+
+def get_dataset_content_digest(images_directory: Path) -> str:
+    """
+    Returns a digest of what is cached of :param images_directory: (containing
+    train/val/test csvs): the csvs of the cached splits, and the size and
+    modification time of each file they list. monai names cached files by the
+    paths of an item, so images changed in place must change the digest to be
+    prepared again.
+    """
+    digest: Any = hashlib.sha1()
+    for split in CACHED_SPLITS:
+        csv_path: Path = images_directory / f"{split}.csv"
+        if not csv_path.is_file():
+            continue
+        contents: bytes = csv_path.read_bytes()
+        digest.update(split.encode())
+        digest.update(contents)
+        rows: List[List[str]] = list(
+            csv.reader(contents.decode("utf-8", errors="replace").splitlines())
+        )
+        for row in rows:
+            for value in row:
+                path: Path = Path(value)
+                if value and path.is_file():
+                    stat: os.stat_result = path.stat()
+                    digest.update(
+                        f"{value}:{stat.st_size}:{stat.st_mtime_ns}".encode()
+                    )
+    return digest.hexdigest()
+
+
+def get_dataset_cache_dir(
+    experiments_home: Path, dataset_overrides: Dict[str, Any]
+) -> Path:
+    """
+    Returns the cache directory in :param experiments_home: of the training
+    images prepared with :param dataset_overrides: (see
+    get_dataset_overrides), as they are on disk now (see
+    get_dataset_content_digest).
+    """
+    try:
+        cyto_dl_version: str = version("cyto-dl")
+    except PackageNotFoundError:
+        cyto_dl_version = ""
+    images_directory: Path = Path(dataset_overrides["data.path"]).resolve()
+    key: Dict[str, Any] = {
+        **dataset_overrides,
+        "data.path": str(images_directory),
+        "content": get_dataset_content_digest(images_directory),
+        # the transforms of the cached files come with cyto-dl's configs
+        "cyto_dl": cyto_dl_version,
+    }
+    digest: str = hashlib.sha1(
+        json.dumps(key, sort_keys=True).encode()
+    ).hexdigest()
+    return experiments_home / DATASETS_DIR / digest[:16]
+
+
+def count_dataset_items(images_directory: Path) -> int:
+    """
+    Returns the number of files cached for the training images in :param
+    images_directory: (containing train/val/test csvs), one per row of the
+    cached splits.
+    """
+    num_items: int = 0
+    for split in CACHED_SPLITS:
+        csv_path: Path = images_directory / f"{split}.csv"
+        if csv_path.exists():
+            with open(csv_path, newline="") as fr:
+                num_items += sum(1 for _ in csv.DictReader(fr))
+    return num_items
+
+
+def get_cache_file(dataset: Any, index: int) -> Path:
+    """
+    Returns the file the item at :param index: of the monai PersistentDataset
+    :param dataset: is cached to, named by the hash of the item as the dataset
+    names it.
+    """
+    item_hash: str = dataset.hash_func(dataset.data[index]).decode("utf-8")
+    return dataset.cache_dir / f"{item_hash}{dataset.transform_hash}.pt"
+
+
+def get_uncached_indices(dataset: Any) -> List[int]:
+    """
+    Returns the indices of the items of :param dataset: that have no cached
+    file yet.
+    """
+    return [
+        i
+        for i in range(len(dataset.data))
+        if not get_cache_file(dataset, i).is_file()
+    ]
+
+
+def _get_cached_datasets(data_cfg: DictConfig) -> Dict[str, Any]:
+    # imported here, so that importing this module does not import cyto-dl
+    from cyto_dl import utils as cyto_utils  # type: ignore
+    from monai.data import PersistentDataset
+
+    datamodule: Any = cyto_utils.create_dataloader(data_cfg)
+    return {
+        split: dataset
+        for split, dataset in datamodule.datasets.items()
+        if split in CACHED_SPLITS and isinstance(dataset, PersistentDataset)
+    }
+
+
+def _init_worker(data_container: Any) -> None:
+    # each worker builds the datasets once, rather than receiving them with
+    # every item
+    _worker_datasets.update(
+        _get_cached_datasets(OmegaConf.create(data_container))
+    )
+
+
+def _cache_item(split: str, index: int) -> None:
+    dataset: Any = _worker_datasets[split]
+    dataset._cachecheck(dataset.data[index])
+
+
+@dataclass
+class DatasetPreparationSummary:
+    """
+    Number of files of a prepared dataset, and how many of them were already
+    cached.
+    """
+
+    num_items: int
+    num_skipped: int
+
+    def get_num_cached(self) -> int:
+        return self.num_items - self.num_skipped
+
+
+def prepare_dataset(
+    cfg: DictConfig,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    progress_callback: Optional[Callable[[int, int], None]] = None,
+    cancel_event: Optional[threading.Event] = None,
+) -> DatasetPreparationSummary:
+    """
+    Caches the training and validation images of the cyto-dl training config
+    :param cfg: to its data.cache_dir, as training would before its first
+    epoch, with up to :param max_workers: processes (no more than there are
+    cores). Items already cached are
+    skipped, so preparing again resumes an interrupted preparation. Calls
+    :param progress_callback: with the number of items done and the total
+    after each one. Stops after the items being cached once :param
+    cancel_event: is set, with their worker processes.
+    """
+    from cyto_dl import utils as cyto_utils  # type: ignore
+
+    cfg = copy.deepcopy(cfg)
+    OmegaConf.resolve(cfg)
+    cyto_utils.remove_aux_key(cfg)
+    if not cfg.data.get("cache_dir"):
+        raise ValueError("Training config has no data.cache_dir to prepare")
+
+    datasets: Dict[str, Any] = _get_cached_datasets(cfg.data)
+    num_items: int = sum(len(dataset.data) for dataset in datasets.values())
+    todo: List[Tuple[str, int]] = [
+        (split, i)
+        for split, dataset in datasets.items()
+        for i in get_uncached_indices(dataset)
+    ]
+    num_done: int = num_items - len(todo)
+    if progress_callback is not None:
+        progress_callback(num_done, num_items)
+
+    if max_workers <= 1 or len(todo) <= 1:
+        _worker_datasets.update(datasets)
+        for split, i in todo:
+            if cancel_event is not None and cancel_event.is_set():
+                break
+            _cache_item(split, i)
+            num_done += 1
+            if progress_callback is not None:
+                progress_callback(num_done, num_items)
+        _worker_datasets.clear()
+    else:
+        data_container: Any = OmegaConf.to_container(cfg.data)
+        # spawned, as forking a process that has started torch's or Qt's
+        # threads is unsafe
+        executor: ProcessPoolExecutor = ProcessPoolExecutor(
+            max_workers=min(max_workers, os.cpu_count() or 1, len(todo)),
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(data_container,),
+        )
+        try:
+            futures: List[Future] = [
+                executor.submit(_cache_item, split, i) for split, i in todo
+            ]
+            for future in as_completed(futures):
+                future.result()
+                num_done += 1
+                if progress_callback is not None:
+                    progress_callback(num_done, num_items)
+                if cancel_event is not None and cancel_event.is_set():
+                    break
+        finally:
+            # items not started yet are dropped, and the workers are reaped
+            # before returning, so that none is left writing to the cache
+            executor.shutdown(wait=True, cancel_futures=True)
+    return DatasetPreparationSummary(
+        num_items=num_items, num_skipped=num_items - len(todo)
+    )
+
+
+def _get_parser() -> argparse.ArgumentParser:
+    parser: argparse.ArgumentParser = argparse.ArgumentParser(
+        description="Cache the training images of a Segmenter ML training "
+        "config ahead of training, so that training starts with its first "
+        "epoch. Files already cached are skipped."
+    )
+    parser.add_argument(
+        "--config",
+        type=Path,
+        required=True,
+        help="training config, e.g. an experiment's train_config.yaml",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=DEFAULT_MAX_WORKERS,
+        help="most processes caching images, at most one per core",
+    )
+    return parser
+
+
+def _print_progress(num_done: int, num_items: int) -> None:
+    print(f"\rFiles cached: {num_done} / {num_items}", end="", flush=True)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args: argparse.Namespace = _get_parser().parse_args(argv)
+    if not args.config.exists():
+        print(f"error: {args.config} does not exist", file=sys.stderr)
+        return 1
+    cfg: Any = OmegaConf.load(args.config)
+    if not isinstance(cfg, DictConfig):
+        print(
+            f"error: {args.config} is not a training config", file=sys.stderr
+        )
+        return 1
+    try:
+        summary: DatasetPreparationSummary = prepare_dataset(
+            cfg, args.workers, _print_progress
+        )
+    except ValueError as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 1
+    print(
+        f"\nCached {summary.get_num_cached()} files, "
+        f"{summary.num_skipped} already cached"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,63 @@
+from pathlib import Path
+from typing import Optional
+
+from watchdog.observers import Observer
+from watchdog.observers.api import BaseObserver
+
+from allencell_ml_segmenter.core.progress_tracker import ProgressTracker
+from allencell_ml_segmenter.training.cache_dir_event_handler import (
+    CacheDirEventHandler,
+)
+
+
+class DatasetPreparationProgressTracker(ProgressTracker):
+    """
+    A DatasetPreparationProgressTracker measures progress by counting the .pt
+    files cached in a dataset's cache directory, including the ones cached
+    before preparation started.
+    """
+
+    def __init__(self, cache_path: Path, total_files: int):
+        """
+        :param cache_path: path to the cache directory of the dataset
+        :param total_files: number of files cached for the whole dataset
+        """
+        # a dataset may be prepared for a cache directory that does not exist
+        # yet, but we need it before we try to set an observer on it
+        if not cache_path.exists():
+            cache_path.mkdir(parents=True)
+        num_cached: int = len(list(cache_path.rglob("*.pt")))
+        super().__init__(
+            progress_minimum=0,
+            progress_maximum=total_files,
+            label_text=f"Files cached: {num_cached} / {total_files}",
+        )
+        self._cache_path: Path = cache_path
+        self._total_files: int = total_files
+        self._num_cached: int = num_cached
+        self._observer: Optional[BaseObserver] = None
+        self.set_progress(min(num_cached, total_files))
+
+    # override
+    def start_tracker(self) -> None:
+        self.stop_tracker()
+        self._observer = Observer()
+        cache_handler: CacheDirEventHandler = CacheDirEventHandler(
+            self._set_cache_progress, self._num_cached
+        )
+        self._observer.schedule(
+            cache_handler, path=str(self._cache_path.resolve()), recursive=True
+        )
+        self._observer.start()
+
+    # override
+    def stop_tracker(self) -> None:
+        if self._observer:
+            self._observer.stop()
+
+    def _set_cache_progress(self, num_cached: int) -> None:
+        # files of images no longer in the dataset may be counted too
+        self.set_progress(min(num_cached, self._total_files))
+        self.set_label_text(
+            f"Files cached: {num_cached} / {self._total_files}"
+        )
@@ -0,0 +1,131 @@
+import copy
+import csv
+import itertools
+import os
+import platform
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, List, Optional, Tuple
+
+import torch
+from omegaconf import DictConfig, OmegaConf
+
+from allencell_ml_segmenter.config.loader_settings import (
+    LoaderSettings,
+    get_machine_id,
+)
+
+# batches loaded per candidate, the first of which includes starting the
+# worker processes, as every epoch does
+PROBE_BATCHES: int = 4
+
+# (DataLoader workers, torch threads)
+Candidate = Tuple[int, int]
+
+
+def get_candidates(num_cores: int, can_use_workers: bool) -> List[Candidate]:
+    """
+    Returns the loader settings worth probing on a machine with :param
+    num_cores:, fewest workers first: no workers, then powers of two leaving
+    at least one core to train on, each with the remaining cores or half of
+    them as torch threads. Only torch threads vary if not :param
+    can_use_workers:.
+    """
+    worker_counts: List[int] = [0]
+    while can_use_workers and max(1, worker_counts[-1] * 2) < num_cores:
+        worker_counts.append(max(1, worker_counts[-1] * 2))
+    candidates: List[Candidate] = []
+    for num_workers in worker_counts:
+        free_cores: int = max(1, num_cores - num_workers)
+        for num_threads in [free_cores, max(1, free_cores // 2)]:
+            if (num_workers, num_threads) not in candidates:
+                candidates.append((num_workers, num_threads))
+    return candidates
+
+
+def _write_probe_csv(train_csv: Path, probe_dir: Path, num_rows: int) -> None:
+    # the probe reads only the rows it loads, and no other split
+    with open(train_csv, newline="") as fr:
+        reader: csv.DictReader = csv.DictReader(fr)
+        rows: List[dict] = list(itertools.islice(reader, num_rows))
+        fieldnames: Any = reader.fieldnames
+    with open(probe_dir / "train.csv", "w", newline="") as fw:
+        writer: csv.DictWriter = csv.DictWriter(fw, fieldnames=fieldnames)
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def probe_loader(
+    data_cfg: DictConfig, candidate: Candidate, num_batches: int
+) -> float:
+    """
+    Returns the seconds per batch of the train dataloader of the resolved
+    cyto-dl data config :param data_cfg: with the workers and torch threads
+    of :param candidate:, timed over :param num_batches: batches.
+    """
+    # imported here, so that importing this module does not import cyto-dl
+    from cyto_dl import utils as cyto_utils  # type: ignore
+
+    num_workers, num_threads = candidate
+    cfg: DictConfig = copy.deepcopy(data_cfg)
+    cfg.num_workers = num_workers
+    previous_threads: int = torch.get_num_threads()
+    torch.set_num_threads(num_threads)
+    try:
+        start: float = time.perf_counter()
+        loader: Any = cyto_utils.create_dataloader(cfg).train_dataloader()
+        loaded: int = sum(1 for _ in itertools.islice(loader, num_batches))
+        return (time.perf_counter() - start) / max(loaded, 1)
+    finally:
+        torch.set_num_threads(previous_threads)
+
+
+def tune_loader(
+    cfg: DictConfig,
+    num_batches: int = PROBE_BATCHES,
+    candidates: Optional[List[Candidate]] = None,
+) -> LoaderSettings:
+    """
+    Returns the fastest loader settings for this machine, found by loading
+    :param num_batches: batches of the train.csv of the cyto-dl training
+    config :param cfg: with each of :param candidates: (default: see
+    get_candidates). The probe does not use the dataset cache, so every
+    candidate runs the whole of the training transforms. The rows are
+    loaded once before timing, so that every candidate reads them from the
+    OS's file cache rather than only the first reading them from disk.
+    Torch threads are tuned for loading only, not for the training step.
+    """
+    from cyto_dl import utils as cyto_utils  # type: ignore
+
+    if candidates is None:
+        candidates = get_candidates(
+            os.cpu_count() or 1,
+            # on macOS, cyto-dl's dataloader workers cannot be started
+            can_use_workers=platform.system() != "Darwin",
+        )
+    cfg = copy.deepcopy(cfg)
+    OmegaConf.resolve(cfg)
+    cyto_utils.remove_aux_key(cfg)
+    batch_size: Any = cfg.data.get("batch_size", 1)
+    num_rows: int = num_batches * (
+        batch_size if isinstance(batch_size, int) else 1
+    )
+
+    with tempfile.TemporaryDirectory() as probe_dir:
+        _write_probe_csv(
+            Path(cfg.data.path) / "train.csv", Path(probe_dir), num_rows
+        )
+        cfg.data.path = probe_dir
+        cfg.data.cache_dir = None
+        # warm-up, discarded
+        probe_loader(cfg.data, (0, torch.get_num_threads()), num_batches)
+        best: Candidate = candidates[0]
+        best_seconds: float = float("inf")
+        for candidate in candidates:
+            seconds: float = probe_loader(cfg.data, candidate, num_batches)
+            if seconds < best_seconds:
+                best, best_seconds = candidate, seconds
+    return LoaderSettings(
+        num_workers=best[0], num_threads=best[1], machine=get_machine_id()
+    )
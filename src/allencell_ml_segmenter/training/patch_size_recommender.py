@@ -0,0 +1,167 @@
+import os
+from dataclasses import dataclass
+from typing import Callable, List, Optional
+
+import torch
+
+from allencell_ml_segmenter.training.patch_size_validator import (
+    PATCH_SIZE_MULTIPLE_OF,
+)
+
+# share of the available memory a recommendation may use, the rest is left
+# for the data loader workers, the optimizer and everything else running
+MEMORY_HEADROOM: float = 0.5
+# float32 values kept per voxel and filter of each level of the model for the
+# backward pass: convolution, normalization and activation outputs of the
+# encoder and the decoder
+VALUES_PER_FILTER: int = 6
+BYTES_PER_VALUE: int = 4
+# the gradients of the activations roughly double the forward pass memory
+BACKWARD_FACTOR: int = 2
+# largest patch side considered, and largest batch recommended
+MAX_PATCH_SIDE: int = 512
+MAX_BATCH_SIZE: int = 16
+
+
+@dataclass
+class PatchSizeRecommendation:
+    """
+    The largest ZYX :param patch_size: (Z of 1 for 2D images) and :param
+    batch_size: found to fit in memory, expected to use :param num_bytes:.
+    """
+
+    patch_size: List[int]
+    batch_size: int
+    num_bytes: int
+
+
+def get_available_memory() -> int:
+    """
+    Returns the bytes of memory available to train with: free GPU memory if
+    training would run on a GPU, else available system memory.
+    """
+    if torch.cuda.is_available():
+        return torch.cuda.mem_get_info()[0]
+    try:
+        import psutil  # type: ignore
+
+        return int(psutil.virtual_memory().available)
+    except ImportError:
+        return os.sysconf("SC_AVPHYS_PAGES") * os.sysconf("SC_PAGE_SIZE")
+
+
+def estimate_training_bytes(
+    patch_size: List[int],
+    batch_size: int,
+    in_channels: int,
+    out_channels: int,
+    filters: List[int],
+) -> int:
+    """
+    Returns the estimated memory of a training step on :param batch_size:
+    patches of :param patch_size: (ZYX) through a U-Net with :param filters:
+    per level, each level halving every spatial dim of the previous one.
+    """
+    spatial_dims: int = 3 if patch_size[0] > 1 else 2
+    voxels: int = patch_size[0] * patch_size[1] * patch_size[2]
+    values_per_voxel: float = in_channels + out_channels
+    for level, num_filters in enumerate(filters):
+        values_per_voxel += (
+            VALUES_PER_FILTER * num_filters / 2 ** (spatial_dims * level)
+        )
+    return int(
+        batch_size
+        * voxels
+        * values_per_voxel
+        * BYTES_PER_VALUE
+        * BACKWARD_FACTOR
+    )
+
+
+def _fit_side(side: int, image_side: int) -> int:
+    # patches no larger than the image, in multiples the model accepts
+    if image_side < PATCH_SIZE_MULTIPLE_OF:
+        # no multiple fits, so the patch spans the whole side
+        return image_side
+    fitted: int = min(side, image_side)
+    return fitted - fitted % PATCH_SIZE_MULTIPLE_OF
+
+
+def get_candidate_patch_sizes(
+    image_shape: List[int], spatial_dims: int
+) -> List[List[int]]:
+    """
+    Returns the ZYX patch sizes worth considering for images of :param
+    image_shape: (ZYX), largest first: cubes (squares in 2D) of power of two
+    sides, cut down to the image.
+    """
+    candidates: List[List[int]] = []
+    side: int = MAX_PATCH_SIDE
+    while side >= PATCH_SIZE_MULTIPLE_OF:
+        patch_size: List[int] = [
+            _fit_side(side, image_shape[0]) if spatial_dims == 3 else 1,
+            _fit_side(side, image_shape[1]),
+            _fit_side(side, image_shape[2]),
+        ]
+        if patch_size not in candidates:
+            candidates.append(patch_size)
+        side //= 2
+    return candidates
+
+
+def can_allocate(num_bytes: int) -> bool:
+    """
+    True if :param num_bytes: can be allocated and written to, on the GPU if
+    training would run on one. Freed right away.
+    """
+    device: str = "cuda" if torch.cuda.is_available() else "cpu"
+    try:
+        # written to, as untouched memory may not be committed
+        block: torch.Tensor = torch.zeros(
+            max(1, num_bytes // BYTES_PER_VALUE),
+            dtype=torch.float32,
+            device=device,
+        )
+        del block
+        return True
+    except (RuntimeError, MemoryError):
+        return False
+    finally:
+        if device == "cuda":
+            torch.cuda.empty_cache()
+
+
+def recommend_patch_size(
+    image_shape: List[int],
+    spatial_dims: int,
+    in_channels: int,
+    out_channels: int,
+    filters: List[int],
+    available_bytes: Optional[int] = None,
+    allocate: Callable[[int], bool] = can_allocate,
+) -> Optional[PatchSizeRecommendation]:
+    """
+    Returns the largest patch size for images of :param image_shape: (ZYX),
+    with the largest batch size, whose estimated training memory (see
+    estimate_training_bytes) fits in MEMORY_HEADROOM of :param
+    available_bytes: (default: see get_available_memory) and which :param
+    allocate: confirms can be allocated. None if not even the smallest patch
+    fits.
+    """
+    if available_bytes is None:
+        available_bytes = get_available_memory()
+    budget: int = int(available_bytes * MEMORY_HEADROOM)
+    for patch_size in get_candidate_patch_sizes(image_shape, spatial_dims):
+        per_patch: int = estimate_training_bytes(
+            patch_size, 1, in_channels, out_channels, filters
+        )
+        batch_size: int = min(MAX_BATCH_SIZE, budget // per_patch)
+        while batch_size >= 1:
+            if allocate(batch_size * per_patch):
+                return PatchSizeRecommendation(
+                    patch_size=patch_size,
+                    batch_size=batch_size,
+                    num_bytes=batch_size * per_patch,
+                )
+            batch_size //= 2
+    return None
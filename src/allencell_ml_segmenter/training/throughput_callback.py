@@ -0,0 +1,286 @@
+import csv
+import io
+import json
+import sys
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import IO, Any, Dict, List, Optional
+
+import torch
+from lightning.pytorch import Callback, LightningModule, Trainer
+from lightning.pytorch.loggers import CSVLogger
+from lightning.pytorch.utilities.data import extract_batch_size
+
+# written next to the metrics.csv of the training run
+THROUGHPUT_CSV: str = "throughput.csv"
+THROUGHPUT_SUMMARY: str = "throughput_summary.json"
+THROUGHPUT_FIELDS: List[str] = [
+    "epoch",
+    "step",
+    "batch_size",
+    "data_wait_s",
+    "forward_s",
+    "backward_s",
+    "step_s",
+    "samples_per_s",
+    "peak_rss_mb",
+]
+# steps spending more of their time waiting for data are I/O-bound
+IO_BOUND_DATA_WAIT: float = 0.5
+# bytes read from the end of the csv for its last row, rows are far shorter
+_TAIL_BYTES: int = 4096
+
+
+def get_peak_rss_mb() -> Optional[float]:
+    """
+    Returns the peak resident memory of this process in MB, or None if it
+    cannot be read on this platform.
+    """
+    try:
+        import resource
+    except ImportError:
+        # Windows
+        try:
+            import psutil  # type: ignore
+
+            return psutil.Process().memory_info().peak_wset / 1024**2
+        except (ImportError, AttributeError):
+            return None
+    max_rss: int = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # in bytes on macOS, in KB elsewhere
+    return max_rss / 1024**2 if sys.platform == "darwin" else max_rss / 1024
+
+
+@dataclass
+class ThroughputSummary:
+    """
+    Throughput of a whole training run, see ThroughputCallback.
+    """
+
+    num_steps: int
+    num_samples: int
+    samples_per_s: float
+    mean_data_wait_s: float
+    mean_forward_s: float
+    mean_backward_s: float
+    mean_step_s: float
+    # of the time of each step and the wait for its data
+    data_wait_fraction: float
+    peak_rss_mb: Optional[float]
+
+    def is_io_bound(self) -> bool:
+        return self.data_wait_fraction > IO_BOUND_DATA_WAIT
+
+    def describe(self) -> str:
+        bound: str = "I/O-bound" if self.is_io_bound() else "compute-bound"
+        memory: str = (
+            ""
+            if self.peak_rss_mb is None
+            else f", peak memory {self.peak_rss_mb:.0f} MB"
+        )
+        return (
+            f"{self.samples_per_s:.1f} samples/s, "
+            f"{self.data_wait_fraction:.0%} of the time waiting for data "
+            f"({bound}){memory}"
+        )
+
+
+def read_throughput_summary(log_dir: Path) -> Optional[ThroughputSummary]:
+    """
+    Returns the throughput summary of the training run logged to :param
+    log_dir:, or None if it has none (e.g. it did not finish).
+    """
+    summary_path: Path = log_dir / THROUGHPUT_SUMMARY
+    if not summary_path.exists():
+        return None
+    return ThroughputSummary(**json.loads(summary_path.read_text()))
+
+
+def read_last_throughput_row(csv_path: Path) -> Optional[Dict[str, str]]:
+    """
+    Returns the last row of the throughput csv at :param csv_path:, reading
+    only the end of it, or None if it has no rows yet.
+    """
+    with csv_path.open("rb") as fr:
+        fr.seek(0, io.SEEK_END)
+        fr.seek(max(0, fr.tell() - _TAIL_BYTES))
+        lines: List[str] = fr.read().decode().splitlines()
+    # the last line may still be being written
+    for line in reversed(lines):
+        values: List[str] = next(csv.reader([line]), [])
+        if len(values) == len(THROUGHPUT_FIELDS) and values[0] != "epoch":
+            return dict(zip(THROUGHPUT_FIELDS, values))
+    return None
+
+
+class ThroughputCallback(Callback):
+    """
+    Records the time each training step waits for its batch, spends in the
+    forward and backward passes and takes as a whole, its samples/s and the
+    peak memory of the training process, to throughput.csv next to the
+    metrics.csv of the run. Writes a summary of the run to
+    throughput_summary.json when training ends.
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._log_dir: Optional[Path] = None
+        self._file: Optional[IO[str]] = None
+        self._writer: Optional[csv.DictWriter] = None
+        self._sync_cuda: bool = False
+        self._last_batch_end: float = 0.0
+        self._step_start: float = 0.0
+        self._backward_start: float = 0.0
+        self._data_wait: float = 0.0
+        self._forward: float = 0.0
+        self._backward: float = 0.0
+        self._totals: Dict[str, float] = {}
+
+    def _now(self) -> float:
+        # cuda runs asynchronously, its work is only done once synchronized
+        if self._sync_cuda:
+            torch.cuda.synchronize()
+        return time.perf_counter()
+
+    @staticmethod
+    def _get_log_dir(trainer: Trainer) -> Optional[Path]:
+        for logger in trainer.loggers:
+            if isinstance(logger, CSVLogger):
+                return Path(logger.log_dir)
+        return Path(trainer.log_dir) if trainer.log_dir else None
+
+    # override
+    def setup(
+        self, trainer: Trainer, pl_module: LightningModule, stage: str
+    ) -> None:
+        if stage != "fit" or not trainer.is_global_zero:
+            return
+        self._log_dir = self._get_log_dir(trainer)
+        if self._log_dir is None:
+            return
+        self._log_dir.mkdir(parents=True, exist_ok=True)
+        self._file = (self._log_dir / THROUGHPUT_CSV).open("w", newline="")
+        self._writer = csv.DictWriter(self._file, fieldnames=THROUGHPUT_FIELDS)
+        self._writer.writeheader()
+        self._sync_cuda = pl_module.device.type == "cuda"
+        self._totals = {
+            "steps": 0,
+            "samples": 0,
+            "data_wait_s": 0.0,
+            "forward_s": 0.0,
+            "backward_s": 0.0,
+            "step_s": 0.0,
+        }
+
+    # override
+    def on_train_epoch_start(
+        self, trainer: Trainer, pl_module: LightningModule
+    ) -> None:
+        # the first wait of an epoch includes starting the loader's workers
+        self._last_batch_end = self._now()
+
+    # override
+    def on_train_batch_start(
+        self,
+        trainer: Trainer,
+        pl_module: LightningModule,
+        batch: Any,
+        batch_idx: int,
+    ) -> None:
+        self._step_start = self._now()
+        self._data_wait = self._step_start - self._last_batch_end
+        self._forward = 0.0
+        self._backward = 0.0
+
+    # override
+    def on_before_backward(
+        self, trainer: Trainer, pl_module: LightningModule, loss: Any
+    ) -> None:
+        self._backward_start = self._now()
+        self._forward = self._backward_start - self._step_start
+
+    # override
+    def on_after_backward(
+        self, trainer: Trainer, pl_module: LightningModule
+    ) -> None:
+        self._backward = self._now() - self._backward_start
+
+    # override
+    def on_train_batch_end(
+        self,
+        trainer: Trainer,
+        pl_module: LightningModule,
+        outputs: Any,
+        batch: Any,
+        batch_idx: int,
+    ) -> None:
+        self._last_batch_end = self._now()
+        if self._writer is None or self._file is None:
+            return
+        step: float = self._last_batch_end - self._step_start
+        try:
+            batch_size: int = extract_batch_size(batch)
+        except Exception:
+            batch_size = 1
+        self._writer.writerow(
+            {
+                "epoch": trainer.current_epoch,
+                "step": trainer.global_step,
+                "batch_size": batch_size,
+                "data_wait_s": f"{self._data_wait:.6f}",
+                "forward_s": f"{self._forward:.6f}",
+                "backward_s": f"{self._backward:.6f}",
+                "step_s": f"{step:.6f}",
+                "samples_per_s": f"{batch_size / (self._data_wait + step):.3f}",
+                "peak_rss_mb": get_peak_rss_mb() or "",
+            }
+        )
+        # flushed, so that the training view can show it live
+        self._file.flush()
+        self._totals["steps"] += 1
+        self._totals["samples"] += batch_size
+        self._totals["data_wait_s"] += self._data_wait
+        self._totals["forward_s"] += self._forward
+        self._totals["backward_s"] += self._backward
+        self._totals["step_s"] += step
+
+    def get_summary(self) -> Optional[ThroughputSummary]:
+        """
+        Returns the throughput of the steps recorded so far, or None if there
+        are none.
+        """
+        num_steps: int = int(self._totals.get("steps", 0))
+        if num_steps == 0:
+            return None
+        total_s: float = self._totals["data_wait_s"] + self._totals["step_s"]
+        return ThroughputSummary(
+            num_steps=num_steps,
+            num_samples=int(self._totals["samples"]),
+            samples_per_s=self._totals["samples"] / total_s,
+            mean_data_wait_s=self._totals["data_wait_s"] / num_steps,
+            mean_forward_s=self._totals["forward_s"] / num_steps,
+            mean_backward_s=self._totals["backward_s"] / num_steps,
+            mean_step_s=self._totals["step_s"] / num_steps,
+            data_wait_fraction=self._totals["data_wait_s"] / total_s,
+            peak_rss_mb=get_peak_rss_mb(),
+        )
+
+    # override
+    def on_train_end(
+        self, trainer: Trainer, pl_module: LightningModule
+    ) -> None:
+        summary: Optional[ThroughputSummary] = self.get_summary()
+        if summary is not None and self._log_dir is not None:
+            (self._log_dir / THROUGHPUT_SUMMARY).write_text(
+                json.dumps(asdict(summary), indent=2)
+            )
+
+    # override
+    def teardown(
+        self, trainer: Trainer, pl_module: LightningModule, stage: str
+    ) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+            self._writer = None
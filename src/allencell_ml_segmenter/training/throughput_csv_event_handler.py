@@ -0,0 +1,43 @@
+from watchdog.events import FileSystemEvent, FileSystemEventHandler
+from pathlib import Path
+from typing import Callable, Dict, Optional
+
+from allencell_ml_segmenter.training.throughput_callback import (
+    read_last_throughput_row,
+)
+
+
+class ThroughputCSVEventHandler(FileSystemEventHandler):
+    """
+    A ThroughputCSVEventHandler calls label_text_callback upon any changes to
+    the provided target_path throughput CSV file (see ThroughputCallback),
+    passing a description of the latest training step to the callback.
+    """
+
+    def __init__(self, target_path: Path, label_text_callback: Callable):
+        super().__init__()
+        self._target_path: Path = target_path
+        self._label_text_callback: Callable = label_text_callback
+
+    # override
+    def on_any_event(self, event: FileSystemEvent) -> None:
+        try:
+            if not self._target_path.samefile(str(event.src_path)):
+                return
+        except OSError:
+            # either file does not exist (yet)
+            return
+        row: Optional[Dict[str, str]] = read_last_throughput_row(
+            self._target_path
+        )
+        if row is not None:
+            memory: str = (
+                f", peak memory {float(row['peak_rss_mb']):.0f} MB"
+                if row["peak_rss_mb"]
+                else ""
+            )
+            self._label_text_callback(
+                f"{float(row['samples_per_s']):.1f} samples/s, "
+                f"step {float(row['step_s']):.2f}s, "
+                f"data wait {float(row['data_wait_s']):.2f}s{memory}"
+            )
@@ -7,6 +7,9 @@ from allencell_ml_segmenter.main.experiments_model import ExperimentsModel
 from allencell_ml_segmenter.main.main_model import MainModel, ImageType
 from qtpy.QtCore import QObject, Signal
 from allencell_ml_segmenter.utils.experiment_utils import ExperimentUtils
+from allencell_ml_segmenter.training.patch_size_recommender import (
+    PatchSizeRecommendation,
+)
 
 
 class TrainingType(Enum):
@@ -37,6 +40,9 @@ class TrainingModelSignals(QObject):
     num_channels_set: Signal = Signal()
     images_directory_set: Signal = Signal()
     spatial_dims_set: Signal = Signal()
+    model_size_set: Signal = Signal()
+    patch_size_recommended: Signal = Signal()
+    training_progress_set: Signal = Signal()
 
 
 class TrainingModel(Publisher):
@@ -61,6 +67,17 @@ class TrainingModel(Publisher):
         }
         self._model_path: Optional[Path] = None  # if None, start a new model
         self._patch_size: Optional[list[int]] = None
+        self._batch_size: Optional[int] = None
+        # ZYX shape of the training images, Z is 1 for 2D images
+        self._image_shape: Optional[list[int]] = None
+        self._patch_size_recommendation: Optional[PatchSizeRecommendation] = (
+            None
+        )
+        # epochs trained so far of the epochs the running training trains
+        self._epochs_trained: int = 0
+        self._epochs_to_train: int = 0
+        # why the last training failed, None if it did not
+        self._training_error: Optional[str] = None
         self._spatial_dims: Optional[int] = None
         self._num_epochs: Optional[int] = None
         self._max_time: Optional[int] = None  # in minutes
@@ -182,6 +199,54 @@ class TrainingModel(Publisher):
             )
         self._patch_size = patch_size
 
+    def get_batch_size(self) -> Optional[int]:
+        """
+        Gets batch size, None to train with the config's
+        """
+        return self._batch_size
+
+    def set_batch_size(self, batch_size: Optional[int]) -> None:
+        """
+        Sets batch size
+
+        batch_size (int): number of patches per training step
+        """
+        if batch_size is not None and batch_size < 1:
+            raise ValueError("Batch size must be at least 1.")
+        self._batch_size = batch_size
+
+    def get_image_shape(self) -> Optional[list[int]]:
+        """
+        Gets ZYX shape of the training images (Z is 1 for 2D images)
+        """
+        return self._image_shape
+
+    def set_image_shape(self, image_shape: Optional[list[int]]) -> None:
+        """
+        Sets ZYX shape of the training images
+
+        image_shape (list[int]): shape of the training images, Z is 1 for 2D
+        """
+        self._image_shape = image_shape
+
+    def get_patch_size_recommendation(
+        self,
+    ) -> Optional[PatchSizeRecommendation]:
+        """
+        Gets largest patch and batch size found to fit in memory
+        """
+        return self._patch_size_recommendation
+
+    def set_patch_size_recommendation(
+        self, recommendation: Optional[PatchSizeRecommendation]
+    ) -> None:
+        """
+        Sets largest patch and batch size found to fit in memory, to prefill
+        the training view with
+        """
+        self._patch_size_recommendation = recommendation
+        self.signals.patch_size_recommended.emit()
+
     def get_max_time(self) -> Optional[int]:
         """
         Gets max runtime (in seconds)
@@ -202,6 +267,63 @@ class TrainingModel(Publisher):
         """
         self.dispatch(Event.PROCESS_TRAINING)
 
+    def dispatch_training_cancel(self) -> None:
+        """
+        Dispatches event to stop training
+        """
+        self.dispatch(Event.PROCESS_TRAINING_CANCEL)
+
+    def get_epochs_trained(self) -> int:
+        """
+        Gets epochs trained so far by the running training
+        """
+        return self._epochs_trained
+
+    def get_epochs_to_train(self) -> int:
+        """
+        Gets epochs the running training trains in all
+        """
+        return self._epochs_to_train
+
+    def set_training_progress(
+        self, epochs_trained: int, epochs_to_train: int
+    ) -> None:
+        """
+        Sets progress of the running training, as reported by its process
+
+        epochs_trained (int): epochs trained so far
+        epochs_to_train (int): epochs to train in all
+        """
+        self._epochs_trained = epochs_trained
+        self._epochs_to_train = epochs_to_train
+        self.signals.training_progress_set.emit()
+
+    def get_training_error(self) -> Optional[str]:
+        """
+        Gets why the last training failed, None if it did not
+        """
+        return self._training_error
+
+    def set_training_error(self, error: Optional[str]) -> None:
+        """
+        Sets why the last training failed
+
+        error (str): description of the error training failed with
+        """
+        self._training_error = error
+
+    def dispatch_dataset_preparation(self) -> None:
+        """
+        Dispatches event to cache the training images ahead of training
+        """
+        self.dispatch(Event.PROCESS_DATASET_PREPARATION)
+
+    def dispatch_dataset_preparation_cancel(self) -> None:
+        """
+        Dispatches event to stop caching the training images
+        """
+        self.dispatch(Event.PROCESS_DATASET_PREPARATION_CANCEL)
+
     def use_max_time(self) -> bool:
         """
         Will training run will be based off of max time
@@ -225,6 +347,7 @@ class TrainingModel(Publisher):
                     "No support for non small, medium, and large patch sizes."
                 )
             self._model_size = ModelSize[model_size]
+        self.signals.model_size_set.emit()
 
     def get_model_size(self) -> Optional[ModelSize]:
         return self._model_size
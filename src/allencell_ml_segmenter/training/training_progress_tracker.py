@@ -8,6 +8,10 @@ from allencell_ml_segmenter.training.metrics_csv_event_handler import (
 from allencell_ml_segmenter.training.cache_dir_event_handler import (
     CacheDirEventHandler,
 )
+from allencell_ml_segmenter.training.throughput_callback import THROUGHPUT_CSV
+from allencell_ml_segmenter.training.throughput_csv_event_handler import (
+    ThroughputCSVEventHandler,
+)
 from typing import Optional
 
 
@@ -28,17 +32,23 @@ class TrainingProgressTracker(ProgressTracker):
     ):
         """
         :param csv_path: path to cyto-dl csv directory for an experiment
-        :param cache_path: path to cache directory for an experiment
+        :param cache_path: path to cache directory for an experiment, which
+            may have been prepared ahead of training
         :param num_epochs: number of epochs that will be recorded in the csv
         :param total_files: total number of unique files used for training
         :param version_number: experiment version to track
         """
+        # files of a prepared dataset are not created again
+        num_cached: int = (
+            len(list(cache_path.rglob("*.pt"))) if cache_path.exists() else 0
+        )
         # set to 0, 0 to initially have a spinning progress bar
         super().__init__(
             progress_minimum=0,
             progress_maximum=0,
-            label_text=f"Files cached: 0 / {total_files}",
+            label_text=f"Files cached: {num_cached} / {total_files}",
         )
+        self._num_cached: int = num_cached
         self._num_epochs = num_epochs
 
         self._csv_path: Path = csv_path
@@ -54,6 +64,12 @@ class TrainingProgressTracker(ProgressTracker):
         self._target_path: Path = (
             csv_path / f"version_{version_number}" / "metrics.csv"
         )
+        self._throughput_path: Path = (
+            csv_path / f"version_{version_number}" / THROUGHPUT_CSV
+        )
+        # the label shows the latest loss above the latest step's throughput
+        self._loss_text: str = ""
+        self._throughput_text: str = ""
         self._observer: Optional[BaseObserver] = None
         self._total_files: int = total_files
 
@@ -65,18 +81,40 @@ class TrainingProgressTracker(ProgressTracker):
             self.set_progress_maximum(self._num_epochs)
         self.set_progress(progress)
 
+    def set_epochs_trained(
+        self, epochs_trained: int, epochs_to_train: int
+    ) -> None:
+        """
+        Sets progress to :param epochs_trained: of :param epochs_to_train:
+        """
+        if epochs_to_train > 0:
+            self._num_epochs = epochs_to_train
+        self._set_progress(min(epochs_trained, self._num_epochs))
+
     # override
     def start_tracker(self) -> None:
         self.stop_tracker()
         self._observer = Observer()
+        # epochs trained are reported by the training process, see
+        # set_epochs_trained, the csv gives the loss
         csv_handler: MetricsCSVEventHandler = MetricsCSVEventHandler(
-            self._target_path, self._set_progress, self.set_label_text
+            self._target_path, lambda _: None, self._set_loss_text
         )
         self._observer.schedule(
             csv_handler, path=str(self._csv_path.resolve()), recursive=True
         )
+        throughput_handler: ThroughputCSVEventHandler = (
+            ThroughputCSVEventHandler(
+                self._throughput_path, self._set_throughput_text
+            )
+        )
+        self._observer.schedule(
+            throughput_handler,
+            path=str(self._csv_path.resolve()),
+            recursive=True,
+        )
         cache_handler: CacheDirEventHandler = CacheDirEventHandler(
-            self._set_cache_progress_text
+            self._set_cache_progress_text, self._num_cached
         )
         self._observer.schedule(
             cache_handler, path=str(self._cache_path.resolve()), recursive=True
@@ -92,3 +130,20 @@ class TrainingProgressTracker(ProgressTracker):
         self.set_label_text(
             f"Files cached: {num_cached} / {self._total_files}"
         )
+
+    def _set_loss_text(self, text: str) -> None:
+        self._loss_text = text
+        self._set_training_label_text()
+
+    def _set_throughput_text(self, text: str) -> None:
+        self._throughput_text = text
+        self._set_training_label_text()
+
+    def _set_training_label_text(self) -> None:
+        self.set_label_text(
+            "\n".join(
+                text
+                for text in [self._loss_text, self._throughput_text]
+                if text
+            )
+        )
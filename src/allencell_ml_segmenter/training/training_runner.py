@@ -0,0 +1,258 @@
+import multiprocessing
+import threading
+import time
+import traceback
+from dataclasses import dataclass
+from multiprocessing.connection import Connection
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+from lightning.pytorch import Callback, LightningModule, Trainer
+
+# seconds training is given to stop by itself once cancelled, it stops after
+# the step it is on, before it is terminated
+CANCEL_TIMEOUT_S: float = 30.0
+# seconds a terminated training is given to exit before it is killed
+TERMINATE_TIMEOUT_S: float = 5.0
+_POLL_INTERVAL_S: float = 0.1
+
+# messages sent from the training process, as (kind, payload)
+MESSAGE_STARTED: str = "started"  # payload: epochs to train
+MESSAGE_EPOCH: str = "epoch"  # payload: epochs trained so far
+MESSAGE_FINISHED: str = "finished"
+MESSAGE_CANCELLED: str = "cancelled"
+MESSAGE_ERROR: str = "error"  # payload: description of the error
+
+# pipe to the runner and cancellation event of the training process
+_connection: Optional[Connection] = None
+_cancel_event: Any = None
+
+
+def _send(kind: str, payload: Any = None) -> None:
+    if _connection is not None:
+        _connection.send((kind, payload))
+
+
+class RunnerCallback(Callback):
+    """
+    Sends the progress of training to the TrainingRunner that started it, and
+    stops training once the runner cancels it. Epochs are counted from the
+    one training starts at, which is not 0 when it resumes a checkpoint.
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._start_epoch: int = 0
+
+    @staticmethod
+    def _stop_if_cancelled(trainer: Trainer) -> None:
+        if _cancel_event is not None and _cancel_event.is_set():
+            trainer.should_stop = True
+
+    # override
+    def on_train_start(
+        self, trainer: Trainer, pl_module: LightningModule
+    ) -> None:
+        self._start_epoch = trainer.current_epoch
+        max_epochs: int = trainer.max_epochs or 0
+        _send(MESSAGE_STARTED, max(0, max_epochs - self._start_epoch))
+
+    # override
+    def on_train_epoch_end(
+        self, trainer: Trainer, pl_module: LightningModule
+    ) -> None:
+        _send(MESSAGE_EPOCH, trainer.current_epoch + 1 - self._start_epoch)
+
+    # override
+    def on_train_batch_end(
+        self,
+        trainer: Trainer,
+        pl_module: LightningModule,
+        outputs: Any,
+        batch: Any,
+        batch_idx: int,
+    ) -> None:
+        self._stop_if_cancelled(trainer)
+
+    # override
+    def on_validation_batch_end(
+        self,
+        trainer: Trainer,
+        pl_module: LightningModule,
+        outputs: Any,
+        batch: Any,
+        batch_idx: int,
+        dataloader_idx: int = 0,
+    ) -> None:
+        # validation, and its sanity check before training, can be long
+        self._stop_if_cancelled(trainer)
+
+
+def _train(
+    config_path: str,
+    num_threads: Optional[int],
+    connection: Connection,
+    cancel_event: Any,
+) -> None:
+    # runs in the training process
+    global _connection, _cancel_event
+    _connection, _cancel_event = connection, cancel_event
+    try:
+        import torch
+        from cyto_dl.api.model import CytoDLModel  # type: ignore
+
+        if num_threads is not None:
+            torch.set_num_threads(num_threads)
+        cyto_dl_model: Any = CytoDLModel()
+        cyto_dl_model.load_config_from_file(config_path)
+        cyto_dl_model.override_config(
+            {
+                "callbacks.training_runner": {
+                    "_target_": f"{RunnerCallback.__module__}.{RunnerCallback.__name__}"
+                }
+            }
+        )
+        cyto_dl_model.train()
+        _send(MESSAGE_CANCELLED if cancel_event.is_set() else MESSAGE_FINISHED)
+    except BaseException as e:
+        traceback.print_exc()
+        _send(MESSAGE_ERROR, f"{type(e).__name__}: {e}")
+    finally:
+        connection.close()
+
+
+@dataclass
+class TrainingResult:
+    """
+    How a training run ended: its process's :param exit_code:, whether it was
+    :param cancelled:, and a description of its :param error: if it failed.
+    """
+
+    exit_code: Optional[int]
+    cancelled: bool
+    error: Optional[str]
+
+    def succeeded(self) -> bool:
+        return not self.cancelled and self.error is None
+
+
+class TrainingRunner:
+    """
+    Trains with a saved cyto-dl training config in a process of its own, so
+    that training has every core to itself rather than sharing the napari
+    process with the UI, and a crash or running out of memory ends training
+    without ending napari.
+    """
+
+    def __init__(
+        self,
+        config_path: Path,
+        on_message: Optional[Callable[[str, Any], None]] = None,
+        target: Callable[..., None] = _train,
+    ):
+        """
+        :param config_path: training config, e.g. an experiment's
+            train_config.yaml
+        :param on_message: called with the kind and payload of each message
+            sent from training, see MESSAGE_*
+        :param target: run in the training process with the config path, the
+            torch threads, the connection to send messages on and the
+            cancellation event
+        """
+        self._config_path: Path = config_path
+        self._on_message: Optional[Callable[[str, Any], None]] = on_message
+        self._target: Callable[..., None] = target
+        # spawned, as forking a process that has started torch's or Qt's
+        # threads is unsafe
+        self._context: Any = multiprocessing.get_context("spawn")
+        self._cancel_event: Any = self._context.Event()
+        self._cancel_deadline: Optional[float] = None
+        self._lock: threading.Lock = threading.Lock()
+
+    def cancel(self) -> None:
+        """
+        Stops training after its current step, or terminates it if it has not
+        stopped within CANCEL_TIMEOUT_S. Training that has not started yet
+        does not start. Safe to call from any thread.
+        """
+        with self._lock:
+            if self._cancel_deadline is None:
+                self._cancel_event.set()
+                self._cancel_deadline = time.monotonic() + CANCEL_TIMEOUT_S
+
+    def is_cancelled(self) -> bool:
+        return self._cancel_event.is_set()
+
+    def run(self, num_threads: Optional[int] = None) -> TrainingResult:
+        """
+        Trains in a new process with :param num_threads: torch threads
+        (default: torch's), and returns how training ended once its process
+        has exited.
+        """
+        if self.is_cancelled():
+            return TrainingResult(exit_code=None, cancelled=True, error=None)
+        receiver: Connection
+        sender: Connection
+        receiver, sender = self._context.Pipe(duplex=False)
+        # not daemonic, as the DataLoader starts worker processes of its own
+        process: Any = self._context.Process(
+            target=self._target,
+            args=(
+                str(self._config_path),
+                num_threads,
+                sender,
+                self._cancel_event,
+            ),
+        )
+        process.start()
+        # only the training process may write, so that reading ends once it
+        # has exited
+        sender.close()
+
+        ended: Optional[str] = None
+        error: Optional[str] = None
+        while True:
+            if receiver.poll(_POLL_INTERVAL_S):
+                try:
+                    kind, payload = receiver.recv()
+                except EOFError:
+                    break
+                if kind in [MESSAGE_FINISHED, MESSAGE_CANCELLED]:
+                    ended = kind
+                elif kind == MESSAGE_ERROR:
+                    error = payload
+                if self._on_message is not None:
+                    self._on_message(kind, payload)
+            elif not process.is_alive():
+                break
+            if self._is_past_cancel_deadline():
+                process.terminate()
+                break
+        receiver.close()
+        self._stop(process)
+
+        if error is None and ended is None and not self.is_cancelled():
+            # killed, e.g. by the OS for running out of memory
+            error = f"Training exited with code {process.exitcode}"
+        return TrainingResult(
+            exit_code=process.exitcode,
+            cancelled=ended == MESSAGE_CANCELLED or self.is_cancelled(),
+            error=error,
+        )
+
+    def _is_past_cancel_deadline(self) -> bool:
+        with self._lock:
+            return (
+                self._cancel_deadline is not None
+                and time.monotonic() > self._cancel_deadline
+            )
+
+    @staticmethod
+    def _stop(process: Any) -> None:
+        process.join(TERMINATE_TIMEOUT_S)
+        if process.is_alive():
+            process.terminate()
+            process.join(TERMINATE_TIMEOUT_S)
+        if process.is_alive():
+            process.kill()
+            process.join()
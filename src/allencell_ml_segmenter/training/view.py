@@ -34,11 +34,26 @@ from allencell_ml_segmenter.training.patch_size_validator import (
     PatchSizeValidator,
     PATCH_SIZE_MULTIPLE_OF,
 )
+from allencell_ml_segmenter.training.patch_size_recommender import (
+    PatchSizeRecommendation,
+)
 from allencell_ml_segmenter.widgets.label_with_hint_widget import LabelWithHint
 from qtpy.QtGui import QIntValidator
 from allencell_ml_segmenter.training.training_progress_tracker import (
     TrainingProgressTracker,
 )
+from allencell_ml_segmenter.training.dataset_preparation import (
+    count_dataset_items,
+    get_dataset_cache_dir,
+    get_dataset_overrides,
+)
+from allencell_ml_segmenter.training.throughput_callback import (
+    ThroughputSummary,
+    read_throughput_summary,
+)
+from allencell_ml_segmenter.training.dataset_preparation_progress_tracker import (
+    DatasetPreparationProgressTracker,
+)
 from allencell_ml_segmenter.core.info_dialog_box import InfoDialogBox
 from allencell_ml_segmenter.utils.file_utils import FileUtils
 from allencell_ml_segmenter.utils.experiment_utils import ExperimentUtils
@@ -63,6 +78,17 @@ class TrainingView(View, MainWindow):
         self._main_model: MainModel = main_model
         self._experiments_model: IExperimentsModel = experiments_model
         self._training_model: TrainingModel = training_model
+        # the long task is either preparing the dataset or training
+        self._preparing_dataset: bool = False
+        self._dataset_cache_dir: Optional[Path] = None
+        self._num_dataset_items: int = 0
+        # tracks the running training, see _on_training_progress
+        self._training_progress_tracker: Optional[TrainingProgressTracker] = (
+            None
+        )
+        # values prefilled from the last recommendation, replaced by the next
+        # one unless the user has changed them
+        self._prefilled: dict[QLineEdit, str] = {}
 
         layout: QVBoxLayout = QVBoxLayout()
         self.setLayout(layout)
@@ -243,12 +269,39 @@ class TrainingView(View, MainWindow):
         )
         max_time_layout.addStretch()
         bottom_grid_layout.addLayout(max_time_layout, 4, 1)
+
+        batch_size_label: LabelWithHint = LabelWithHint("Batch size")
+        batch_size_label.set_hint(
+            "Number of patches trained on at once. Larger batches train faster but use more memory. Prefilled, with the patch size, with the largest that fit in available memory."
+        )
+        bottom_grid_layout.addWidget(batch_size_label, 5, 0)
+
+        self._batch_size_input: QLineEdit = QLineEdit()
+        batch_size_validator: QIntValidator = QIntValidator()
+        batch_size_validator.setBottom(1)
+        self._batch_size_input.setValidator(batch_size_validator)
+        self._batch_size_input.setPlaceholderText("1")
+        self._batch_size_input.setObjectName("trainingStepInput")
+        self._batch_size_input.textChanged.connect(
+            self._batch_size_field_handler
+        )
+        bottom_grid_layout.addWidget(self._batch_size_input, 5, 1)
         bottom_grid_layout.setColumnStretch(1, 8)
         bottom_grid_layout.setColumnStretch(0, 3)
 
         bottom_dummy.setLayout(bottom_grid_layout)
         layout.addWidget(bottom_dummy)
 
+        self._prepare_dataset_btn: QPushButton = QPushButton("Prepare dataset")
+        self._prepare_dataset_btn.setObjectName("prepareDatasetBtn")
+        self._prepare_dataset_btn.setToolTip(
+            "(Optional) Cache the training images ahead of training, so that training starts with its first epoch. Experiments training on the same images share the prepared dataset."
+        )
+        layout.addWidget(self._prepare_dataset_btn)
+        self._prepare_dataset_btn.clicked.connect(
+            self.prepare_dataset_btn_handler
+        )
+
         self._train_btn: QPushButton = QPushButton("Start training")
         self._train_btn.setObjectName("trainBtn")
         layout.addWidget(self._train_btn)
@@ -262,6 +315,12 @@ class TrainingView(View, MainWindow):
         self._training_model.signals.spatial_dims_set.connect(
             self._update_spatial_dims_boxes
         )
+        self._training_model.signals.patch_size_recommended.connect(
+            self._prefill_recommendation
+        )
+        self._training_model.signals.training_progress_set.connect(
+            self._on_training_progress
+        )
 
         # apply styling
         self.setStyleSheet(Style.get_stylesheet("training_view.qss"))
@@ -272,34 +331,97 @@ class TrainingView(View, MainWindow):
         """
         if self._patch_size_ok():
             self.set_patch_size()
+            cache_dir: Optional[Path] = self._get_dataset_cache_dir()
+            if cache_dir is None:
+                return
+            self._preparing_dataset = False
             num_epochs: Optional[int] = self._training_model.get_num_epochs()
             progress_tracker: TrainingProgressTracker = (
                 TrainingProgressTracker(
                     self._experiments_model.get_metrics_csv_path(),
-                    self._experiments_model.get_cache_dir(),
+                    cache_dir,
                     num_epochs if num_epochs is not None else 0,
                     self._training_model.get_total_num_images(),
                     self._experiments_model.get_latest_metrics_csv_version()
                     + 1,
                 )
             )
+            self._training_progress_tracker = progress_tracker
             self.startLongTaskWithProgressBar(progress_tracker)
 
+    def prepare_dataset_btn_handler(self) -> None:
+        """
+        Starts caching the training images ahead of training
+        """
+        if self._patch_size_ok():
+            self.set_patch_size()
+            cache_dir: Optional[Path] = self._get_dataset_cache_dir()
+            images_directory: Optional[Path] = (
+                self._training_model.get_images_directory()
+            )
+            if cache_dir is None or images_directory is None:
+                return
+            self._preparing_dataset = True
+            self._dataset_cache_dir = cache_dir
+            self._num_dataset_items = count_dataset_items(images_directory)
+            self.startLongTaskWithProgressBar(
+                DatasetPreparationProgressTracker(
+                    cache_dir, self._num_dataset_items
+                )
+            )
+
+    def _get_dataset_cache_dir(self) -> Optional[Path]:
+        """
+        Returns the cache directory of the selected training images, shared by
+        the experiments training on them. Shows a warning and returns None if
+        the images are not selected yet.
+        """
+        experiments_home: Optional[Path] = (
+            self._experiments_model.get_user_experiments_path()
+        )
+        if experiments_home is None:
+            show_warning("Please set an experiments home before continuing.")
+            return None
+        try:
+            return get_dataset_cache_dir(
+                experiments_home, get_dataset_overrides(self._training_model)
+            )
+        except ValueError:
+            show_warning("User has not selected input images for training")
+            return None
+
     # Abstract methods from View implementations #######################
 
     def doWork(self) -> None:
         """
-        Starts training process
+        Starts dataset preparation or training process
+        """
+        if self._preparing_dataset:
+            self._training_model.dispatch_dataset_preparation()
+        else:
+            self._training_model.dispatch_training()
+
+    def cancelWork(self) -> None:
+        """
+        Stops dataset preparation or training cleanly, both run in processes
+        of their own that the long task thread waits for
         """
-        self._training_model.dispatch_training()
+        if self._preparing_dataset:
+            self._training_model.dispatch_dataset_preparation_cancel()
+        else:
+            self._training_model.dispatch_training_cancel()
 
     def getTypeOfWork(self) -> str:
         """
-        Returns string representation of training process
+        Returns string representation of dataset preparation or training
+        process
         """
-        return "Training"
+        return "Dataset preparation" if self._preparing_dataset else "Training"
 
     def showResults(self) -> None:
+        if self._preparing_dataset:
+            self._show_dataset_preparation_results()
+            return
         # double check to see if a ckpt was generated
         exp_path: Optional[Path] = (
             self._experiments_model.get_user_experiments_path()
@@ -330,20 +452,75 @@ class TrainingView(View, MainWindow):
             if min_loss is None:
                 raise RuntimeError("Cannot compute min loss")
 
-            dialog_box = InfoDialogBox(
-                "Training finished -- Final loss: {:.3f}".format(min_loss)
+            message: str = "Training finished -- Final loss: {:.3f}".format(
+                min_loss
             )
+            throughput: Optional[ThroughputSummary] = read_throughput_summary(
+                csv_path.parent
+            )
+            if throughput is not None:
+                message += f"\nThroughput: {throughput.describe()}"
+            dialog_box = InfoDialogBox(message)
             dialog_box.exec()  # this shows the dialog box
             self._main_model.training_complete()  # this dispatches the event that changes to prediction tab
         else:
-            dialog_box = InfoDialogBox(
-                "Training failed- no model was saved from this run."
-            )
+            message = "Training failed- no model was saved from this run."
+            error: Optional[str] = self._training_model.get_training_error()
+            if error is not None:
+                message += f"\n{error}"
+            dialog_box = InfoDialogBox(message)
             dialog_box.exec()
 
+    def _on_training_progress(self) -> None:
+        if self._training_progress_tracker is not None:
+            self._training_progress_tracker.set_epochs_trained(
+                self._training_model.get_epochs_trained(),
+                self._training_model.get_epochs_to_train(),
+            )
+
+    def _show_dataset_preparation_results(self) -> None:
+        self._preparing_dataset = False
+        num_cached: int = (
+            len(list(self._dataset_cache_dir.rglob("*.pt")))
+            if self._dataset_cache_dir is not None
+            else 0
+        )
+        dialog_box = InfoDialogBox(
+            f"Dataset preparation finished -- Files cached: {num_cached} / {self._num_dataset_items}"
+        )
+        dialog_box.exec()
+
     def _num_epochs_field_handler(self, num_epochs: str) -> None:
         self._training_model.set_num_epochs(int(num_epochs))
 
+    def _batch_size_field_handler(self, batch_size: str) -> None:
+        self._training_model.set_batch_size(
+            int(batch_size) if batch_size else None
+        )
+
+    def _prefill(self, line_edit: QLineEdit, value: str) -> None:
+        # values the user typed are kept
+        if line_edit.text() in ["", self._prefilled.get(line_edit)]:
+            line_edit.setText(value)
+            self._prefilled[line_edit] = value
+
+    def _prefill_recommendation(self) -> None:
+        """
+        Prefills the patch and batch size with the largest found to fit in
+        memory for the selected images and model size
+        """
+        recommendation: Optional[PatchSizeRecommendation] = (
+            self._training_model.get_patch_size_recommendation()
+        )
+        if recommendation is None:
+            return
+        z, y, x = recommendation.patch_size
+        if self._training_model.get_spatial_dims() == 3:
+            self._prefill(self.z_patch_size, str(z))
+        self._prefill(self.y_patch_size, str(y))
+        self._prefill(self.x_patch_size, str(x))
+        self._prefill(self._batch_size_input, str(recommendation.batch_size))
+
     def _max_time_checkbox_slot(self, checked: Qt.CheckState) -> None:
         """
         Triggered when the user selects the "time out after" _timeout_checkbox.
@@ -1,9 +1,17 @@
-from typing import Dict, Union, Optional, List
+from pathlib import Path
+from typing import Any, Dict, Union, Optional, List
 
+from allencell_ml_segmenter.config.loader_settings import LoaderSettings
 from allencell_ml_segmenter.main.experiments_model import ExperimentsModel
+from allencell_ml_segmenter.training.dataset_preparation import (
+    get_dataset_cache_dir,
+    get_dataset_overrides,
+)
+from allencell_ml_segmenter.training.throughput_callback import (
+    ThroughputCallback,
+)
 from allencell_ml_segmenter.training.training_model import (
     TrainingModel,
-    ImageType,
     ModelSize,
 )
 from allencell_ml_segmenter.utils.cuda_util import CUDAUtils
@@ -68,12 +76,14 @@ class CytoDLOverridesManager:
             overrides_dict["trainer.accelerator"] = "gpu"
         else:
             overrides_dict["trainer.accelerator"] = "cpu"
-        overrides_dict["data.num_workers"] = CUDAUtils.get_num_workers()
-
-        # Spatial Dims (required)
-        dims: Optional[int] = self._training_model.get_spatial_dims()
-        if dims is not None:
-            overrides_dict["spatial_dims"] = dims
+        overrides_dict["data.num_workers"] = self._get_num_workers()
+        batch_size: Optional[int] = self._training_model.get_batch_size()
+        if batch_size is not None:
+            overrides_dict["data.batch_size"] = batch_size
+        # samples/s, data wait and step times, next to metrics.csv
+        overrides_dict["callbacks.throughput"] = {
+            "_target_": f"{ThroughputCallback.__module__}.{ThroughputCallback.__name__}"
+        }
 
         # Max Run
         # define max run (in epochs, required)
@@ -93,23 +103,6 @@ class CytoDLOverridesManager:
                 "minutes": self._training_model.get_max_time()
             }
 
-        # Training input path (required)
-        if self._training_model.get_images_directory() is None:
-            raise ValueError(
-                "Training data path was not set but get_training_overrides was called."
-            )
-        overrides_dict["data.path"] = str(
-            self._training_model.get_images_directory()
-        )
-
-        # patch size (required)
-        patch_size: Optional[List[int]] = self._training_model.get_patch_size()
-        if patch_size is None:
-            raise ValueError(
-                "Patch size is required, but is not set, and get_training_overrides was called."
-            )
-        overrides_dict["data._aux.patch_shape"] = patch_size
-
         # Commented out 5/23 brian.kim
         # We no longer support training from a old checkpoint- leaving this in if we want to re-enable this in the
         # future to continue training from an existing checkpoint.
@@ -121,20 +114,31 @@ class CytoDLOverridesManager:
         #             self._experiments_model.get_checkpoint(),
         #         )
         #     )
-        # Channel Override
-        raw_channel: Optional[int] = self._training_model.get_selected_channel(
-            ImageType.RAW
-        )
-        seg1_channel: Optional[int] = (
-            self._training_model.get_selected_channel(ImageType.SEG1)
+        # Training input path, spatial dims, patch size and channels
+        # (required), which are also what is cached of the images
+        dataset_overrides: Dict[str, Any] = get_dataset_overrides(
+            self._training_model
         )
-        seg2_channel: Optional[int] = (
-            self._training_model.get_selected_channel(ImageType.SEG2)
+        overrides_dict.update(dataset_overrides)
+        # experiments with the same images and selections share one cache,
+        # which may have been prepared ahead of training
+        experiments_home: Optional[Path] = (
+            self._experiments_model.get_user_experiments_path()
         )
-        if raw_channel is not None:
-            overrides_dict["input_channel"] = raw_channel
-        if seg1_channel is not None:
-            overrides_dict["target_col1_channel"] = seg1_channel
-        if seg2_channel is not None:
-            overrides_dict["target_col2_channel"] = seg2_channel
+        if experiments_home is not None:
+            overrides_dict["data.cache_dir"] = str(
+                get_dataset_cache_dir(experiments_home, dataset_overrides)
+            )
         return overrides_dict
+
+    def _get_num_workers(self) -> int:
+        # tuned for this machine on its first training, see loader_tuning
+        loader_settings: Optional[LoaderSettings] = (
+            self._experiments_model.get_user_settings().get_loader_settings()
+        )
+        if (
+            loader_settings is not None
+            and loader_settings.is_for_this_machine()
+        ):
+            return loader_settings.num_workers
+        return CUDAUtils.get_num_workers()
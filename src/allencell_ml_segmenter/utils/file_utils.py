@@ -2,16 +2,27 @@ import os
 import platform
 import subprocess
 import random
+from concurrent.futures import Future, ThreadPoolExecutor
 from csv import DictReader
 from pathlib import Path
-from typing import List, Generator, Tuple, Optional
+from typing import Dict, List, Generator, Tuple, Optional, Union
 
-from allencell_ml_segmenter.curation.curation_data_class import CurationRecord
+import numpy as np
+
+from allencell_ml_segmenter.curation.curation_data_class import (
+    CurationRecord,
+    PackedRaster,
+)
 from allencell_ml_segmenter.utils.file_writer import IFileWriter
-from allencell_ml_segmenter.main.main_model import MIN_DATASET_SIZE
 
 LOSS_COLUMN: str = "val/loss_epoch"
 
+# number of masks written concurrently when saving a curation record
+DEFAULT_MASK_WRITE_WORKERS: int = max(1, min(8, os.cpu_count() or 1))
+# array names used in .npz archives of bit-packed rasters
+PACKED_MASK_KEY: str = "packed_mask"
+PACKED_SHAPE_KEY: str = "shape"
+
 
 class FileUtils:
     """
@@ -87,15 +98,33 @@ class FileUtils:
         curation_records: List[CurationRecord],
         csv_dir_path: Path,
         mask_dir_path: Path,
+        max_workers: int = DEFAULT_MASK_WRITE_WORKERS,
     ) -> None:
         """
         Saves the curation record as a train and test csv in csv_path_dir and associated masks in mask_dir_path
         :param curation_record: record to save to csv
         :param csv_dir_path: directory to save csv (csvs will be named train.csv and test.csv)
         :param mask_dir_path: directory in which to save masks (masks will be saved under excluding_masks or
-        merging_masks subdirs)
+        merging_masks subdirs, with rasterized masks next to them, see get_raster_path)
+        :param max_workers: number of masks to write concurrently
+        The mask paths of the saved records are set to where their masks are,
+        so that saving them again only writes the masks changed since.
         """
         train, test = self._train_test_split(curation_records)
+        # test and val share records, so masks are collected before writing to
+        # write each of them once
+        self._write_masks(
+            self._collect_masks(train + test, mask_dir_path),
+            max_workers,
+        )
+        for record in train + test:
+            excl_mask_path, merg_mask_path = self._get_mask_paths(
+                record, mask_dir_path
+            )
+            if record.excluding_mask is not None:
+                record.excluding_mask_path = excl_mask_path
+            if record.merging_mask is not None:
+                record.merging_mask_path = merg_mask_path
         self._write_curation_csv(
             train, csv_dir_path / "train.csv", mask_dir_path
         )
@@ -104,6 +133,49 @@ class FileUtils:
         )
         self._write_curation_csv(test, csv_dir_path / "val.csv", mask_dir_path)
 
+    @staticmethod
+    def load_mask(path: Path) -> np.ndarray:
+        """
+        Loads a mask saved by write_curation_record, or the raster of one
+        (see get_raster_path) unpacked.
+        """
+        if path.suffix == ".npz":
+            return FileUtils.load_packed_raster(path).unpack()
+        # shapes layer data is saved as an object array of polygons
+        return np.load(path, allow_pickle=True)
+
+    @staticmethod
+    def load_packed_raster(path: Path) -> PackedRaster:
+        """
+        Loads a raster saved bit-packed by write_curation_record (see
+        get_raster_path) without unpacking it.
+        """
+        with np.load(path) as archive:
+            return PackedRaster(
+                archive[PACKED_MASK_KEY], tuple(archive[PACKED_SHAPE_KEY])
+            )
+
+    def save_packed_raster(self, path: Path, raster: PackedRaster) -> None:
+        """
+        Saves :param raster: at :param path:, as write_curation_record does.
+        """
+        self._file_writer.np_save_compressed(
+            path,
+            {
+                PACKED_MASK_KEY: raster.bits,
+                PACKED_SHAPE_KEY: np.asarray(raster.shape),
+            },
+        )
+
+    @staticmethod
+    def get_raster_path(mask_path: Path) -> Path:
+        """
+        Returns the path of the bit-packed raster saved next to the polygon
+        mask at :param mask_path:, if the mask was rasterized before saving.
+        Load it with load_mask.
+        """
+        return mask_path.with_name(f"{mask_path.stem}_raster.npz")
+
     def _train_test_split(
         self,
         curation_records: List[CurationRecord],
@@ -114,6 +186,10 @@ class FileUtils:
         if it is > 100, it will become 100. If there are < 4 curation records selected for use, an exception will be thrown.
         :param curation_record: record to split
         """
+        # main_model imports Qt, which batch prediction (also a FileUtils user)
+        # must be able to run without
+        from allencell_ml_segmenter.main.main_model import MIN_DATASET_SIZE
+
         curation_records_to_use: List[CurationRecord] = [
             r for r in curation_records if r.to_use
         ]
@@ -129,6 +205,93 @@ class FileUtils:
             curation_records_to_use[:test_len],
         )
 
+    def _collect_masks(
+        self,
+        curation_records: List[CurationRecord],
+        mask_dir_path: Path,
+    ) -> Dict[Path, Union[np.ndarray, PackedRaster]]:
+        """
+        Returns the masks of :param curation_records: that are not on disk yet,
+        by the path they will be saved at. Records that appear more than once
+        only contribute their masks once. Rasters are saved bit-packed, next to
+        their polygon masks, with them: the raster of a mask that is already on
+        disk has been written with it (see CurationJournal.append_raster).
+        """
+        masks: Dict[Path, Union[np.ndarray, PackedRaster]] = {}
+        for record in curation_records:
+            if not record.to_use:
+                continue
+            excl_mask_path, merg_mask_path = self._get_mask_paths(
+                record, mask_dir_path
+            )
+            if (
+                record.excluding_mask is not None
+                and record.excluding_mask_path is None
+            ):
+                masks[excl_mask_path] = record.excluding_mask
+                if record.excluding_mask_raster is not None:
+                    masks[self.get_raster_path(excl_mask_path)] = (
+                        record.excluding_mask_raster
+                    )
+            if (
+                record.merging_mask is not None
+                and record.merging_mask_path is None
+            ):
+                masks[merg_mask_path] = record.merging_mask
+                if record.merging_mask_raster is not None:
+                    masks[self.get_raster_path(merg_mask_path)] = (
+                        record.merging_mask_raster
+                    )
+        return masks
+
+    def _write_masks(
+        self,
+        masks: Dict[Path, Union[np.ndarray, PackedRaster]],
+        max_workers: int,
+    ) -> None:
+        """
+        Writes :param masks: concurrently. Saving is mostly compression and disk
+        I/O, both of which release the GIL. Raises the first error encountered.
+        """
+        if len(masks) == 0:
+            return
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures: List[Future] = [
+                executor.submit(self._write_mask, path, mask)
+                for path, mask in masks.items()
+            ]
+            for future in futures:
+                future.result()
+
+    def _write_mask(
+        self, path: Path, mask: Union[np.ndarray, PackedRaster]
+    ) -> None:
+        if isinstance(mask, PackedRaster):
+            self.save_packed_raster(path, mask)
+        else:
+            # kept as .npy, which is what training reads masks from
+            self._file_writer.np_save(path, mask)
+
+    @staticmethod
+    def _get_mask_paths(
+        record: CurationRecord, mask_dir_path: Path
+    ) -> Tuple[Path, Path]:
+        """
+        Returns the paths of the (excluding, merging) masks for :param record:.
+        Masks that are already on disk (see CurationJournal) keep their path.
+        """
+        raw_stem: str = record.raw_file.resolve().stem
+        return (
+            record.excluding_mask_path
+            or mask_dir_path
+            / "excluding_masks"
+            / f"excluding_mask_{raw_stem}.npy",
+            record.merging_mask_path
+            or mask_dir_path
+            / "merging_masks"
+            / f"merging_mask_{raw_stem}.npy",
+        )
+
     def _write_curation_csv(
         self,
         curation_records: List[CurationRecord],
@@ -136,10 +299,11 @@ class FileUtils:
         mask_dir_path: Path,
     ) -> None:
         """
-        Saves the curation record as a csv at csv_path and associated masks under mask_dir_path
+        Saves the curation record as a csv at csv_path. Masks are expected to
+        already be saved under mask_dir_path, see _write_masks.
         :param curation_record: record to save to csv
         :param csv_path: path to save csv
-        :param mask_dir_path: directory in which to save masks (masks will be saved under excluding_masks or
+        :param mask_dir_path: directory in which masks are saved (under excluding_masks or
         merging_masks subdirs)
         """
         self._file_writer.csv_open_write_mode(csv_path)
@@ -156,31 +320,12 @@ class FileUtils:
             ],
         )
 
-        get_excl_mask_path = (
-            lambda raw_path: mask_dir_path
-            / "excluding_masks"
-            / f"excluding_mask_{raw_path.stem}.npy"
-        )
-        get_merg_mask_path = (
-            lambda raw_path: mask_dir_path
-            / "merging_masks"
-            / f"merging_mask_{raw_path.stem}.npy"
-        )
-
         idx = 0
         for record in curation_records:
             if record.to_use:
-                if record.excluding_mask is not None:
-                    self._file_writer.np_save(
-                        get_excl_mask_path(record.raw_file.resolve()),
-                        record.excluding_mask,
-                    )
-                if record.merging_mask is not None:
-                    self._file_writer.np_save(
-                        get_merg_mask_path(record.raw_file.resolve()),
-                        record.merging_mask,
-                    )
-
+                excl_mask_path, merg_mask_path = self._get_mask_paths(
+                    record, mask_dir_path
+                )
                 self._file_writer.csv_write_row(
                     csv_path,
                     [
@@ -193,12 +338,12 @@ class FileUtils:
                             else ""
                         ),
                         (
-                            str(get_merg_mask_path(record.raw_file.resolve()))
+                            str(merg_mask_path)
                             if record.merging_mask is not None
                             else ""
                         ),
                         (
-                            str(get_excl_mask_path(record.raw_file.resolve()))
+                            str(excl_mask_path)
                             if record.excluding_mask is not None
                             else ""
                         ),
@@ -11,18 +11,35 @@ class FakeFileWriter(IFileWriter):
         # {path: saved_array}
         self.np_save_state: Dict[Path, np.ndarray] = {}
 
+        # {path: {name: saved_array}}
+        self.np_save_compressed_state: Dict[Path, Dict[str, np.ndarray]] = {}
+
         # {path: {"open": T/F, "rows": [[header1, header2...], [col1, col2...]]}}
         self.csv_state: Dict[Path, Dict[str, Any]] = {}
 
         # {path: json-like-obj}
         self.json_state: dict[Path, Union[list, dict]] = {}
 
+        # {path: [json-like-obj, ...]}
+        self.json_lines_state: Dict[Path, List[dict]] = {}
+
+        # [path, ...]
+        self.removed_state: List[Path] = []
+
     def np_save(self, path: Path, arr: np.ndarray) -> None:
         """
         Saves :param arr: to :param path:
         """
         self.np_save_state[path.resolve()] = arr
 
+    def np_save_compressed(
+        self, path: Path, arrays: Dict[str, np.ndarray]
+    ) -> None:
+        """
+        Saves :param arrays: to :param path:
+        """
+        self.np_save_compressed_state[path.resolve()] = arrays
+
     def csv_open_write_mode(self, path: Path) -> None:
         """
         Opens a CSV at :param path: in write mode. Can only call csv_write_row
@@ -55,3 +72,14 @@ class FakeFileWriter(IFileWriter):
 
     def write_json(self, json_like_obj: Union[list, dict], path: Path) -> None:
         self.json_state[path] = json_like_obj
+
+    def append_json_line(self, json_like_obj: dict, path: Path) -> None:
+        self.json_lines_state.setdefault(path, []).append(json_like_obj)
+
+    def write_json_lines(self, json_like_objs: List[dict], path: Path) -> None:
+        self.json_lines_state[path] = list(json_like_objs)
+
+    def remove(self, path: Path) -> None:
+        self.removed_state.append(path)
+        self.np_save_state.pop(path.resolve(), None)
+        self.np_save_compressed_state.pop(path.resolve(), None)
@@ -2,9 +2,10 @@ from .i_file_writer import IFileWriter
 import numpy as np
 from pathlib import Path
 import csv
+import os
 import json
 from io import TextIOBase
-from typing import List, Tuple, Union, Any, Optional
+from typing import Dict, List, Tuple, Union, Any, Optional
 
 
 class FileWriter(IFileWriter):
@@ -20,6 +21,16 @@ class FileWriter(IFileWriter):
         path.parent.mkdir(parents=True, exist_ok=True)
         np.save(path, arr)
 
+    def np_save_compressed(
+        self, path: Path, arrays: Dict[str, np.ndarray]
+    ) -> None:
+        """
+        Saves :param arrays: to a compressed .npz archive at :param path:, keyed by
+        name. Creates directories as necessary.
+        """
+        path.parent.mkdir(parents=True, exist_ok=True)
+        np.savez_compressed(path, **arrays)  # type: ignore
+
     def csv_open_write_mode(self, path: Path) -> None:
         """
         Opens a CSV at :param path: in write mode. Can only call csv_write_row
@@ -59,6 +70,35 @@ class FileWriter(IFileWriter):
         with open(path, "w") as fw:
             json.dump(json_like_obj, fw)
 
+    def append_json_line(self, json_like_obj: dict, path: Path) -> None:
+        """
+        Appends :param json_like_obj: as a single line of JSON to the file at
+        :param path:. Creates the file and directories as necessary.
+        """
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # a single write per line, so a crash can at most truncate the last line
+        line: str = json.dumps(json_like_obj) + "\n"
+        with open(path, "a") as fa:
+            fa.write(line)
+
+    def write_json_lines(self, json_like_objs: List[dict], path: Path) -> None:
+        """
+        Replaces the file at :param path: with :param json_like_objs:, one
+        line of JSON each. The file is either replaced whole or left as it was.
+        """
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path: Path = path.with_name(f"{path.name}.tmp")
+        with open(tmp_path, "w") as fw:
+            for json_like_obj in json_like_objs:
+                fw.write(json.dumps(json_like_obj) + "\n")
+        os.replace(tmp_path, path)
+
+    def remove(self, path: Path) -> None:
+        """
+        Deletes the file at :param path:, if there is one.
+        """
+        path.unlink(missing_ok=True)
+
     @classmethod
     def global_instance(cls) -> IFileWriter:
         if cls._instance is None:
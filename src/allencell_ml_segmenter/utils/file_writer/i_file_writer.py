@@ -1,7 +1,7 @@
 from abc import ABC, abstractmethod
 import numpy as np
 from pathlib import Path
-from typing import List, Union
+from typing import Dict, List, Union
 
 
 class IFileWriter(ABC):
@@ -17,6 +17,16 @@ class IFileWriter(ABC):
         """
         pass
 
+    @abstractmethod
+    def np_save_compressed(
+        self, path: Path, arrays: Dict[str, np.ndarray]
+    ) -> None:
+        """
+        Saves :param arrays: to a compressed .npz archive at :param path:, keyed by
+        name. Creates directories as necessary.
+        """
+        pass
+
     @abstractmethod
     def csv_open_write_mode(self, path: Path) -> None:
         """
@@ -43,3 +53,26 @@ class IFileWriter(ABC):
     @abstractmethod
     def write_json(self, json_like_obj: Union[list, dict], path: Path) -> None:
         pass
+
+    @abstractmethod
+    def append_json_line(self, json_like_obj: dict, path: Path) -> None:
+        """
+        Appends :param json_like_obj: as a single line of JSON to the file at
+        :param path:. Creates the file and directories as necessary.
+        """
+        pass
+
+    @abstractmethod
+    def write_json_lines(self, json_like_objs: List[dict], path: Path) -> None:
+        """
+        Replaces the file at :param path: with :param json_like_objs:, one
+        line of JSON each. The file is either replaced whole or left as it was.
+        """
+        pass
+
+    @abstractmethod
+    def remove(self, path: Path) -> None:
+        """
+        Deletes the file at :param path:, if there is one.
+        """
+        pass
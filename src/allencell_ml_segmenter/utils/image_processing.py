@@ -1,4 +1,7 @@
+from typing import Iterable, Tuple
+
 import numpy
+from skimage.draw import polygon as draw_polygon
 
 
 def set_all_nonzero_values_to(
@@ -8,3 +11,32 @@ def set_all_nonzero_values_to(
     # set all nonzero values in this :image to :value in-place
     copy[copy > 0] = value
     return copy
+
+
+def rasterize_polygons(
+    polygons: Iterable[numpy.ndarray], shape: Tuple[int, ...]
+) -> numpy.ndarray:
+    """
+    Returns a boolean raster of :param shape: (YX or ZYX) that is True inside
+    any of :param polygons:, e.g. the data of a napari shapes layer. Each
+    polygon is an (N, 2) array of YX vertices or an (N, 3) array of ZYX
+    vertices. A ZYX polygon is drawn in the z plane it was drawn on in napari,
+    a YX polygon on a ZYX raster is drawn in every z plane.
+    """
+    raster: numpy.ndarray = numpy.zeros(shape, dtype=bool)
+    for polygon in polygons:
+        vertices: numpy.ndarray = numpy.asarray(polygon, dtype=float)
+        if len(vertices) == 0:
+            continue
+        rows, cols = draw_polygon(
+            vertices[:, -2], vertices[:, -1], shape=shape[-2:]
+        )
+        if len(shape) == 2:
+            raster[rows, cols] = True
+        elif vertices.shape[1] == 2:
+            raster[:, rows, cols] = True
+        else:
+            z: int = int(round(float(vertices[:, 0].mean())))
+            if 0 <= z < shape[0]:
+                raster[z, rows, cols] = True
+    return raster